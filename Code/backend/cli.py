@@ -20,8 +20,14 @@ import numpy as np
 import torch
 
 from audio_analyzer import AudioAnalyzer
-from cppn import CPPN
-from renderer import Renderer
+from cppn import CPPN, load_cppn
+from cppn_compile import compile_cppn
+from cppn_distill import pick_student
+from cppn_fourier import FourierCPPN
+from cppn_quantize import DEFAULT_MIN_PSNR, quantize_cppn
+from frame_metrics import FrameMetrics
+from renderer import Renderer, make_contact_sheet
+from sweep_engine import feature_rows, write_png
 from video_encoder import VideoEncoder
 
 
@@ -54,6 +60,18 @@ Examples:
   
   # CPU fallback
   python cli.py input.mp3 output.mp4 --device cpu
+  
+  # Compiled CPU inference (fastest for small networks)
+  python cli.py input.mp3 output.mp4 --device cpu --layers 2 --hidden-dim 8 --compile torchscript
+  
+  # 4K on CPU with a Fourier-feature network
+  python cli.py input.mp3 output.mp4 --device cpu --resolution 4k --network fourier --layers 2 --hidden-dim 16
+  
+  # Fast preview of a trained style through its distilled student
+  python cli.py input.mp3 output.mp4 --load-weights style.pth --student always
+  
+  # Int8 CPU inference for large trained styles
+  python cli.py input.mp3 output.mp4 --device cpu --load-weights style.pth --quantize
 """
     )
     
@@ -90,6 +108,14 @@ Examples:
         default=256,  # Optimal: 256 hidden dim for RTX 5070
         help='Hidden layer dimension (default: 256, optimal for RTX 5070)'
     )
+    parser.add_argument(
+        '--network',
+        type=str,
+        default='cppn',
+        choices=['cppn', 'fourier'],
+        help='Random network type: cppn, or fourier (Fourier-feature encoding + tiny MLP; '
+             'try --layers 2 --hidden-dim 16 for 4K on CPU)'
+    )
     parser.add_argument(
         '--evolve', '-e',
         type=float,
@@ -129,6 +155,24 @@ Examples:
         default=None,
         help='Batch size for rendering (default: auto-optimized for GPU)'
     )
+    parser.add_argument(
+        '--compile',
+        type=str,
+        default=None,
+        choices=['torchscript', 'inductor'],
+        help='Run the CPPN through a cached compiled graph (fastest for small networks on CPU)'
+    )
+    parser.add_argument(
+        '--quantize',
+        action='store_true',
+        help='Int8 dynamic quantized Linear layers on CPU (fastest for wide styles)'
+    )
+    parser.add_argument(
+        '--quantize-min-psnr',
+        type=float,
+        default=DEFAULT_MIN_PSNR,
+        help=f'Keep a layer int8 only while output PSNR vs fp32 stays above this (default: {DEFAULT_MIN_PSNR:.0f} dB)'
+    )
     
     # CLIP-optimized weights
     parser.add_argument(
@@ -137,6 +181,20 @@ Examples:
         default=None,
         help='Path to CLIP-optimized CPPN weights (.pth file from clip_optimize_cppn.py)'
     )
+    parser.add_argument(
+        '--student',
+        type=str,
+        default='auto',
+        choices=['auto', 'always', 'never'],
+        help='Render a distilled student of --load-weights (tools/distill_style.py): auto = for '
+             '--stills previews and when the style would exceed --time-budget (default: auto)'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        default=None,
+        help='Seconds the render may take; slower styles switch to their fastest fitting student'
+    )
     
     # Export settings
     parser.add_argument(
@@ -150,6 +208,13 @@ Examples:
         default=None,
         help='Directory for exported frames (default: auto)'
     )
+    parser.add_argument(
+        '--stills',
+        type=str,
+        default=None,
+        help='Comma-separated timestamps in seconds: write PNG stills (and a '
+             'contact sheet) next to the output instead of a video, e.g. 2,5,8'
+    )
     parser.add_argument(
         '--text-overlay',
         type=str,
@@ -190,7 +255,7 @@ def main():
         sys.exit(1)
     
     output_path = Path(args.output)
-    if output_path.exists():
+    if output_path.exists() and not args.stills:
         response = input(f"Output file exists: {output_path}\nOverwrite? (y/N): ")
         if response.lower() != 'y':
             print("Cancelled")
@@ -270,49 +335,46 @@ def main():
                 sys.exit(1)
             
             print(f"[INFO] Loading CLIP-optimized weights from: {weights_path}")
-            checkpoint = torch.load(weights_path, map_location=device)
+            cppn, checkpoint_info = load_cppn(
+                weights_path,
+                input_dim=2 + 1 + audio_analysis['features'].shape[1],
+                hidden_dim=args.hidden_dim,
+                num_layers=args.layers,
+                device=device
+            )
             
-            # Handle both old-style (state_dict only) and new-style (dict with metadata)
-            if isinstance(checkpoint, dict) and 'state_dict' in checkpoint:
-                # Use architecture from checkpoint metadata
-                if 'cppn_config' in checkpoint:
-                    config = checkpoint['cppn_config']
-                    cppn = CPPN(
-                        input_dim=config['input_dim'],
-                        hidden_dim=config['hidden_dim'],
-                        num_layers=config['num_layers'],
-                        device=device
-                    )
-                    print(f"[INFO] Using architecture from checkpoint: {config['num_layers']} layers × {config['hidden_dim']} hidden dim")
-                else:
-                    # Fallback to command-line args
-                    cppn = CPPN(
-                        input_dim=2 + 1 + audio_analysis['features'].shape[1],
-                        hidden_dim=args.hidden_dim,
-                        num_layers=args.layers,
-                        device=device
-                    )
-                
-                cppn.load_state_dict(checkpoint['state_dict'])
-                
-                if 'prompt' in checkpoint:
-                    print(f"[INFO] Optimized for prompt: '{checkpoint['prompt']}'")
-                if 'best_similarity' in checkpoint:
-                    print(f"[INFO] CLIP similarity score: {checkpoint['best_similarity']:.4f}")
-            else:
-                # Old-style: just the state dict
-                cppn = CPPN(
+            if 'cppn_config' in checkpoint_info:
+                config = checkpoint_info['cppn_config']
+                print(f"[INFO] Using architecture from checkpoint: {config['num_layers']} layers × {config['hidden_dim']} hidden dim")
+            if 'prompt' in checkpoint_info:
+                print(f"[INFO] Optimized for prompt: '{checkpoint_info['prompt']}'")
+            if 'best_similarity' in checkpoint_info:
+                print(f"[INFO] CLIP similarity score: {checkpoint_info['best_similarity']:.4f}")
+            
+            student_path = pick_student(
+                weights_path,
+                teacher=cppn,
+                mode=args.student,
+                preview=bool(args.stills),
+                time_budget=args.time_budget,
+                num_frames=audio_analysis['num_frames'],
+                resolution=resolution,
+                audio_features=audio_analysis['features'][audio_analysis['num_frames'] // 2]
+            )
+            if student_path:
+                cppn, checkpoint_info = load_cppn(
+                    student_path,
                     input_dim=2 + 1 + audio_analysis['features'].shape[1],
                     hidden_dim=args.hidden_dim,
                     num_layers=args.layers,
                     device=device
                 )
-                cppn.load_state_dict(checkpoint)
             
             print("[OK] Using CLIP-optimized CPPN (not random initialization!)")
         else:
             # Initialize with command-line args (random weights)
-            cppn = CPPN(
+            network_class = FourierCPPN if args.network == 'fourier' else CPPN
+            cppn = network_class(
                 input_dim=2 + 1 + audio_analysis['features'].shape[1],  # x, y, time + features
                 hidden_dim=args.hidden_dim,
                 num_layers=args.layers,
@@ -321,6 +383,13 @@ def main():
             print("[INFO] Using random initialization (untrained CPPN)")
             print("[TIP] Use --load-weights to load CLIP-optimized styles")
         
+        if args.quantize:
+            cppn = quantize_cppn(cppn, features=audio_analysis['features'], min_psnr=args.quantize_min_psnr)
+            if args.compile:
+                print("Warning: --compile is ignored with --quantize")
+        elif args.compile:
+            cppn = compile_cppn(cppn, backend=args.compile)
+        
         print()
         
         # Step 3: Render frames
@@ -338,10 +407,27 @@ def main():
             print(f"Memory estimate: {memory['total_per_frame_mb']:.2f} MB per frame")
             print()
         
+        if args.stills:
+            # Stills mode: evaluate the CPPN only at the requested timestamps
+            timestamps = [float(t) for t in args.stills.split(',') if t.strip()]
+            times, rows = feature_rows(audio_analysis['features'], timestamps, args.fps)
+            stills = renderer.render_stills(times, rows)
+            
+            stem = output_path.with_suffix('')
+            for timestamp, still in zip(timestamps, stills):
+                print(f"[OK] Still: {write_png(f'{stem}_{timestamp:.2f}s.png', still)}")
+            if len(stills) > 1:
+                sheet = make_contact_sheet(stills, labels=[f"{t:.1f}s" for t in timestamps])
+                print(f"[OK] Contact sheet: {write_png(f'{stem}_sheet.png', sheet)}")
+            
+            print(f"  Processing time: {time.time() - start_time:.1f}s")
+            return
+        
         frame_iterator = renderer.render_sequence(
             audio_analysis,
             fps=args.fps,
-            evolve_rate=args.evolve
+            evolve_rate=args.evolve,
+            metrics=FrameMetrics()
         )
         print()
         
@@ -17,12 +17,132 @@ import clip
 import argparse
 from pathlib import Path
 import json
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from cppn import CPPN
+from cppn_fourier import FourierCPPN
 from audio_analyzer import AudioAnalyzer
 
 
+# CLIP's image normalization
+CLIP_MEAN = [0.48145466, 0.4578275, 0.40821073]
+CLIP_STD = [0.26862954, 0.26130258, 0.27577711]
+
+
+def representative_features(analysis: dict) -> Tuple[int, np.ndarray]:
+    """
+    Pick the audio frame styles are optimized at.
+    
+    Args:
+        analysis: AudioAnalyzer.analyze() result
+    
+    Returns:
+        Tuple of (frame index, raw feature vector) 25% into the track
+        (usually has good dynamics)
+    """
+    frame_idx = int(analysis['duration'] * 0.25 * analysis['fps'])
+    frame_idx = min(frame_idx, analysis['num_frames'] - 1)
+    return frame_idx, analysis['features'][frame_idx]
+
+
+def optimization_grid(resolution: int, audio_tensor: torch.Tensor, time_value: float = 0.5) -> torch.Tensor:
+    """
+    CPPN inputs of the optimization image.
+    
+    Args:
+        resolution: Image side in pixels
+        audio_tensor: Audio feature vector (on the target device)
+        time_value: Fixed time input
+    
+    Returns:
+        Input tensor (resolution², 2 + 1 + features): [-π, π] coordinates,
+        time and audio features
+    """
+    device = audio_tensor.device
+    
+    # Coordinate grid with CRITICAL scaling to [-π, π]
+    x = torch.linspace(-np.pi, np.pi, resolution, device=device)
+    y = torch.linspace(-np.pi, np.pi, resolution, device=device)
+    X, Y = torch.meshgrid(x, y, indexing='ij')
+    coords = torch.stack([X.flatten(), Y.flatten()], dim=-1)
+    
+    time_tensor = torch.full((coords.shape[0], 1), time_value, device=device)
+    audio_batch = audio_tensor.unsqueeze(0).expand(coords.shape[0], -1)
+    
+    return torch.cat([coords, time_tensor, audio_batch], dim=-1)
+
+
+def clip_input(image: torch.Tensor) -> torch.Tensor:
+    """
+    Differentiable CLIP preprocessing.
+    
+    Args:
+        image: RGB image (H, W, 3) in [0, 1]
+    
+    Returns:
+        Normalized (1, 3, 224, 224) tensor
+    """
+    # Clamp, permute to CHW and add batch dimension (NO .detach()!)
+    clip_image = torch.clamp(image, 0, 1).permute(2, 0, 1).unsqueeze(0)
+    
+    # Resize to 224x224 using differentiable interpolation
+    clip_image = torch.nn.functional.interpolate(
+        clip_image,
+        size=(224, 224),
+        mode='bicubic',
+        align_corners=False
+    )
+    
+    mean = torch.tensor(CLIP_MEAN, device=image.device).view(1, 3, 1, 1)
+    std = torch.tensor(CLIP_STD, device=image.device).view(1, 3, 1, 1)
+    return (clip_image - mean) / std
+
+
+def clip_similarity(
+    cppns: List[nn.Module],
+    prompt: str,
+    audio_features: np.ndarray,
+    clip_model_name: str = "RN50",
+    resolution: int = 256,
+    device: Optional[str] = None
+) -> List[float]:
+    """
+    Score networks against a prompt the way optimization does.
+    
+    Args:
+        cppns: Networks to score (e.g. a style and its compressed copy)
+        prompt: Text description the style was optimized for
+        audio_features: Raw audio feature vector (see representative_features)
+        clip_model_name: CLIP model to use
+        resolution: Image side in pixels
+        device: Device for CLIP (default: first network's device)
+    
+    Returns:
+        Cosine similarity per network
+    """
+    device = device or cppns[0].device
+    clip_model, _ = clip.load(clip_model_name, device=device)
+    clip_model.eval()
+    
+    audio_tensor = torch.tensor(audio_features, dtype=torch.float32, device=device)
+    cppn_input = optimization_grid(resolution, audio_tensor)
+    
+    scores = []
+    with torch.no_grad():
+        text_features = clip_model.encode_text(clip.tokenize([prompt]).to(device))
+        text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+        
+        for cppn in cppns:
+            cppn.eval()
+            dtype = next(cppn.parameters()).dtype
+            rgb = cppn(cppn_input.to(dtype)).float()
+            image_features = clip_model.encode_image(clip_input(rgb.reshape(resolution, resolution, 3)))
+            image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+            scores.append((image_features.float() * text_features.float()).sum().item())
+    
+    return scores
+
+
 def optimize_cppn_with_clip(
     prompt: str,
     audio_file: str,
@@ -35,6 +155,9 @@ def optimize_cppn_with_clip(
     clip_model_name: str = "RN50",
     hidden_dim: int = 256,
     num_layers: int = 4,
+    network: str = "cppn",
+    num_frequencies: int = 32,
+    max_frequency: float = 64.0,
     verbose: bool = True
 ) -> dict:
     """
@@ -52,6 +175,10 @@ def optimize_cppn_with_clip(
         clip_model_name: CLIP model to use ("RN50", "RN101", "ViT-B/32", "ViT-B/16")
         hidden_dim: Hidden layer dimension (default: 256)
         num_layers: Number of CPPN layers (default: 4)
+        network: "cppn" or "fourier" (FourierCPPN: Fourier-feature encoding
+            feeding a tiny audio-modulated MLP, see cppn_fourier.py)
+        num_frequencies: Encoding frequencies (fourier network)
+        max_frequency: Highest encoding frequency (fourier network)
         verbose: Print progress messages
         
     Returns:
@@ -84,7 +211,18 @@ def optimize_cppn_with_clip(
         print("Initializing CPPN...")
     # Input: x, y (2) + time (1) + audio features (9) = 12 dimensions
     # Disable FP16 for CLIP optimization - needs stable gradients
-    cppn = CPPN(input_dim=12, hidden_dim=hidden_dim, num_layers=num_layers, device=device, use_fp16=False).to(device)
+    if network == "fourier":
+        cppn = FourierCPPN(
+            input_dim=12,
+            hidden_dim=hidden_dim,
+            num_layers=num_layers,
+            num_frequencies=num_frequencies,
+            max_frequency=max_frequency,
+            device=device,
+            use_fp16=False
+        )
+    else:
+        cppn = CPPN(input_dim=12, hidden_dim=hidden_dim, num_layers=num_layers, device=device, use_fp16=False).to(device)
     
     # Calculate and display parameter count
     num_params = sum(p.numel() for p in cppn.parameters())
@@ -99,11 +237,8 @@ def optimize_cppn_with_clip(
     
     # Get features from 25% into the track (usually has good dynamics)
     audio_duration = analysis['duration']
-    representative_time = audio_duration * 0.25
-    frame_idx = int(representative_time * analysis['fps'])
-    frame_idx = min(frame_idx, analysis['num_frames'] - 1)
-    
-    audio_features = analysis['features'][frame_idx]
+    frame_idx, audio_features = representative_features(analysis)
+    representative_time = frame_idx / analysis['fps']
     audio_tensor = torch.tensor(audio_features, dtype=torch.float32, device=device)
     
     if verbose:
@@ -135,27 +270,15 @@ def optimize_cppn_with_clip(
             print(f"Resolution {res_idx + 1}/{len(resolution_pyramid)}: {resolution}×{resolution}")
             print("=" * 60)
         
-        # Generate coordinate grid with CRITICAL scaling to [-π, π]
-        x = torch.linspace(-np.pi, np.pi, resolution, device=device)
-        y = torch.linspace(-np.pi, np.pi, resolution, device=device)
-        X, Y = torch.meshgrid(x, y, indexing='ij')
-        coords = torch.stack([X.flatten(), Y.flatten()], dim=-1)
-        
-        # Add time dimension (use fixed time for optimization)
-        time_value = 0.5  # Middle of the video
-        time_tensor = torch.full((coords.shape[0], 1), time_value, device=device)
-        
-        # Expand audio features to match coordinate batch
-        audio_batch = audio_tensor.unsqueeze(0).expand(coords.shape[0], -1)
-        
         # Combine inputs: [coords (2), time (1), audio (9)] = 12D
-        cppn_input = torch.cat([coords, time_tensor, audio_batch], dim=-1)
+        # Fixed time for optimization: middle of the video
+        cppn_input = optimization_grid(resolution, audio_tensor, time_value=0.5)
         
         if verbose and res_idx == 0:
             print(f"CPPN input shape: {cppn_input.shape}")
-            print(f"  Coords: {coords.shape}")
-            print(f"  Time: {time_tensor.shape}")
-            print(f"  Audio: {audio_batch.shape}")
+            print(f"  Coords: {(cppn_input.shape[0], 2)}")
+            print(f"  Time: {(cppn_input.shape[0], 1)}")
+            print(f"  Audio: {(cppn_input.shape[0], audio_tensor.shape[0])}")
             print()
         
         # Optimization loop for this resolution
@@ -166,25 +289,8 @@ def optimize_cppn_with_clip(
             rgb = cppn(cppn_input)
             image = rgb.reshape(resolution, resolution, 3)
             
-            # Differentiable preprocessing for CLIP (NO .detach()!)
-            # 1. Clamp to [0, 1]
-            image_clamped = torch.clamp(image, 0, 1)
-            
-            # 2. Permute to CHW format and add batch dimension
-            clip_image = image_clamped.permute(2, 0, 1).unsqueeze(0)  # (1, 3, H, W)
-            
-            # 3. Resize to 224x224 using differentiable interpolation
-            clip_image = torch.nn.functional.interpolate(
-                clip_image, 
-                size=(224, 224), 
-                mode='bicubic', 
-                align_corners=False
-            )
-            
-            # 4. Normalize with CLIP's mean and std (differentiable!)
-            mean = torch.tensor([0.48145466, 0.4578275, 0.40821073], device=device).view(1, 3, 1, 1)
-            std = torch.tensor([0.26862954, 0.26130258, 0.27577711], device=device).view(1, 3, 1, 1)
-            clip_image = (clip_image - mean) / std
+            # Differentiable preprocessing for CLIP (clamp, resize, normalize)
+            clip_image = clip_input(image)
             
             # Get CLIP image features
             image_features = clip_model.encode_image(clip_image)
@@ -239,7 +345,7 @@ def optimize_cppn_with_clip(
         'audio_file': str(audio_file),
         'resolution_pyramid': resolution_pyramid,
         'iterations': iterations,
-        'cppn_config': {
+        'cppn_config': cppn.cppn_config() if network == "fourier" else {
             'input_dim': 12,
             'hidden_dim': hidden_dim,
             'num_layers': num_layers  # Use actual number of layers
@@ -269,13 +375,7 @@ def optimize_cppn_with_clip(
     preview_path = output_path.with_suffix('.png')
     with torch.no_grad():
         final_res = resolution_pyramid[-1]
-        x = torch.linspace(-np.pi, np.pi, final_res, device=device)
-        y = torch.linspace(-np.pi, np.pi, final_res, device=device)
-        X, Y = torch.meshgrid(x, y, indexing='ij')
-        coords = torch.stack([X.flatten(), Y.flatten()], dim=-1)
-        time_tensor = torch.full((coords.shape[0], 1), 0.5, device=device)
-        audio_batch = audio_tensor.unsqueeze(0).expand(coords.shape[0], -1)
-        cppn_input = torch.cat([coords, time_tensor, audio_batch], dim=-1)
+        cppn_input = optimization_grid(final_res, audio_tensor)
         
         rgb = cppn(cppn_input)
         image = rgb.reshape(final_res, final_res, 3)
@@ -354,6 +454,25 @@ def main():
         default=4,
         help='Number of CPPN layers (default: 4, try 2-3 for organic patterns)'
     )
+    parser.add_argument(
+        '--network',
+        type=str,
+        default='cppn',
+        choices=['cppn', 'fourier'],
+        help='Network type: cppn, or fourier (Fourier-feature encoding + tiny MLP, try --layers 2 --hidden-dim 32)'
+    )
+    parser.add_argument(
+        '--frequencies',
+        type=int,
+        default=32,
+        help='Encoding frequencies for --network fourier (default: 32)'
+    )
+    parser.add_argument(
+        '--max-frequency',
+        type=float,
+        default=64.0,
+        help='Highest encoding frequency for --network fourier (default: 64)'
+    )
     parser.add_argument(
         '--device',
         type=str,
@@ -381,6 +500,9 @@ def main():
         clip_model_name=args.clip_model,
         hidden_dim=args.hidden_dim,
         num_layers=args.layers,
+        network=args.network,
+        num_frequencies=args.frequencies,
+        max_frequency=args.max_frequency,
         verbose=not args.quiet
     )
     
@@ -391,7 +513,7 @@ def main():
     print(f"   Preview: {result['preview_path']}")
     print(f"   History: {result['history_path']}")
     print("\nNext step: Generate a video!")
-    print(f"   python cli.py {{audio}} output.mp4 --load-weights {result['output_path']} --layers {args.layers} --hidden-dim {args.hidden_dim}")
+    print(f"   python cli.py {{audio}} output.mp4 --load-weights {result['output_path']}")
     print("\n" + "=" * 60)
 
 
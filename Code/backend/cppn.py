@@ -17,7 +17,80 @@ Usage:
 import torch
 import torch.nn as nn
 import numpy as np
-from typing import Tuple, List
+from pathlib import Path
+from typing import Dict, Tuple, List, Optional
+
+
+def cycle_activation(x: torch.Tensor, layer_index: int) -> torch.Tensor:
+    """
+    Activation of hidden layer `layer_index`.
+    
+    Alternates between different activation functions every layer;
+    this creates complex, bio-inspired patterns.
+    """
+    if layer_index % 4 == 0:
+        return torch.sin(x)  # Sine wave patterns
+    elif layer_index % 4 == 1:
+        return torch.cos(x)  # Cosine wave patterns
+    elif layer_index % 4 == 2:
+        return torch.exp(-x**2)  # Gaussian blobs
+    else:
+        return torch.tanh(x)  # Smooth transitions
+
+
+class LowRankLinear(nn.Module):
+    """
+    Linear layer factorized as up(down(x)).
+    
+    Stores rank × (in + out) weights instead of in × out, and each pixel
+    pays two thin matmuls instead of one square one (see cppn_compress.py).
+    """
+    
+    def __init__(self, in_features: int, out_features: int, rank: int):
+        super().__init__()
+        
+        self.in_features = in_features
+        self.out_features = out_features
+        self.rank = rank
+        
+        self.down = nn.Linear(in_features, rank, bias=False)
+        self.up = nn.Linear(rank, out_features)
+    
+    @classmethod
+    def from_linear(cls, layer: nn.Linear, rank: int) -> 'LowRankLinear':
+        """
+        Factorize a Linear layer with truncated SVD.
+        
+        Args:
+            layer: Layer to factorize
+            rank: Number of singular values to keep
+        
+        Returns:
+            LowRankLinear closest to the layer at this rank
+        """
+        with torch.no_grad():
+            weight = layer.weight.detach().float()
+            U, S, Vh = torch.linalg.svd(weight, full_matrices=False)
+            root = S[:rank].sqrt()
+            
+            lowrank = cls(layer.in_features, layer.out_features, rank).to(weight.device)
+            lowrank.down.weight.copy_(root.unsqueeze(1) * Vh[:rank])
+            lowrank.up.weight.copy_(U[:, :rank] * root)
+            lowrank.up.bias.copy_(layer.bias.float())
+        
+        return lowrank.to(layer.weight.dtype)
+    
+    @property
+    def weight(self) -> torch.Tensor:
+        """Equivalent dense weight (out, in)."""
+        return self.up.weight @ self.down.weight
+    
+    @property
+    def bias(self) -> torch.Tensor:
+        return self.up.bias
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.up(self.down(x))
 
 
 class CPPN(nn.Module):
@@ -30,7 +103,8 @@ class CPPN(nn.Module):
         num_layers: int = 10,
         output_dim: int = 3,  # RGB
         device: str = 'cuda' if torch.cuda.is_available() else 'cpu',
-        use_fp16: bool = True  # Disable for CLIP optimization (needs stable gradients)
+        use_fp16: bool = True,  # Disable for CLIP optimization (needs stable gradients)
+        ranks: Optional[List[Optional[int]]] = None
     ):
         """
         Initialize CPPN.
@@ -41,6 +115,8 @@ class CPPN(nn.Module):
             num_layers: Number of hidden layers
             output_dim: Output dimension (3 for RGB)
             device: 'cuda' or 'cpu'
+            ranks: Optional rank per hidden layer (None = dense); ranked
+                layers are LowRankLinear (compressed styles)
         """
         super().__init__()
         
@@ -67,6 +143,12 @@ class CPPN(nn.Module):
         # Initialize weights for interesting patterns
         self._initialize_weights()
         
+        # Low-rank layers start as the truncated SVD of their initialization
+        self.ranks = list(ranks) if ranks else [None] * num_layers
+        for i, rank in enumerate(self.ranks):
+            if rank:
+                self.layers[i] = LowRankLinear.from_linear(self.layers[i], rank)
+        
         # Move to device (with fallback check)
         try:
             self.to(device)
@@ -95,6 +177,8 @@ class CPPN(nn.Module):
         
         print(f"CPPN running on: {self.device}")
         print(f"  Layers: {num_layers}, Hidden dim: {hidden_dim}")
+        if any(self.ranks):
+            print(f"  Low-rank layers: {', '.join(f'{i}:{r}' for i, r in enumerate(self.ranks) if r)}")
         print(f"  Total parameters: {self.count_parameters():,}")
     
     def _initialize_weights(self):
@@ -120,18 +204,7 @@ class CPPN(nn.Module):
         """
         # Apply mixed activations through hidden layers
         for i, layer in enumerate(self.layers):
-            x = layer(x)
-            
-            # Alternate between different activation functions
-            # This creates complex, bio-inspired patterns
-            if i % 4 == 0:
-                x = torch.sin(x)  # Sine wave patterns
-            elif i % 4 == 1:
-                x = torch.cos(x)  # Cosine wave patterns
-            elif i % 4 == 2:
-                x = self._gaussian(x)  # Gaussian blobs
-            else:
-                x = torch.tanh(x)  # Smooth transitions
+            x = cycle_activation(layer(x), i)
         
         # Output layer with sigmoid for RGB [0, 1]
         x = self.output_layer(x)
@@ -139,10 +212,6 @@ class CPPN(nn.Module):
         
         return x
     
-    def _gaussian(self, x: torch.Tensor) -> torch.Tensor:
-        """Gaussian activation function."""
-        return torch.exp(-x**2)
-    
     def count_parameters(self) -> int:
         """Count total trainable parameters."""
         return sum(p.numel() for p in self.parameters() if p.requires_grad)
@@ -238,6 +307,93 @@ class CPPN(nn.Module):
         return rgb_image
 
 
+def load_cppn(
+    weights_path: str,
+    input_dim: int,
+    hidden_dim: int,
+    num_layers: int,
+    device: str = 'cuda' if torch.cuda.is_available() else 'cpu'
+) -> Tuple[CPPN, Dict]:
+    """
+    Load saved CPPN weights (e.g. from clip_optimize_cppn.py).
+    
+    Handles both new-style checkpoints (dict with 'state_dict' and metadata)
+    and old-style bare state dicts. The architecture is taken from the
+    checkpoint's 'cppn_config' when present, otherwise from the arguments;
+    compressed styles list their low-rank layers under 'ranks', and
+    'type': 'fourier' styles are built as FourierCPPN (cppn_fourier.py).
+    
+    Args:
+        weights_path: Path to .pth file
+        input_dim: Fallback number of input features
+        hidden_dim: Fallback hidden layer dimension
+        num_layers: Fallback number of hidden layers
+        device: 'cuda' or 'cpu'
+    
+    Returns:
+        Tuple of (cppn, checkpoint metadata without the state dict)
+    """
+    checkpoint = torch.load(weights_path, map_location=device)
+    
+    if isinstance(checkpoint, dict) and 'state_dict' in checkpoint:
+        state_dict = checkpoint['state_dict']
+        metadata = {key: value for key, value in checkpoint.items() if key != 'state_dict'}
+    else:
+        state_dict, metadata = checkpoint, {}
+    
+    config = metadata.get('cppn_config', {})
+    if config.get('type') == 'fourier':
+        from cppn_fourier import FourierCPPN
+        cppn = FourierCPPN(device=device, **{key: value for key, value in config.items() if key != 'type'})
+    else:
+        cppn = CPPN(
+            input_dim=config.get('input_dim', input_dim),
+            hidden_dim=config.get('hidden_dim', hidden_dim),
+            num_layers=config.get('num_layers', num_layers),
+            device=device,
+            ranks=config.get('ranks')
+        )
+    cppn.load_state_dict(state_dict)
+    
+    return cppn, metadata
+
+
+def save_cppn(cppn: CPPN, output_path: str, metadata: Optional[Dict] = None) -> str:
+    """
+    Save CPPN weights in the checkpoint format load_cppn() reads.
+    
+    Args:
+        cppn: CPPN or FourierCPPN instance
+        output_path: Destination .pth path
+        metadata: Optional extra metadata (prompt, similarity, ...)
+    
+    Returns:
+        Path to the written file
+    """
+    if hasattr(cppn, 'cppn_config'):
+        config = cppn.cppn_config()
+    else:
+        config = {
+            'input_dim': cppn.input_dim,
+            'hidden_dim': cppn.hidden_dim,
+            'num_layers': cppn.num_layers
+        }
+        if any(cppn.ranks):
+            config['ranks'] = cppn.ranks
+    
+    info = {key: value for key, value in (metadata or {}).items() if key != 'cppn_config'}
+    checkpoint = {
+        'state_dict': {key: value.detach().float().cpu() for key, value in cppn.state_dict().items()},
+        **info,
+        'cppn_config': config
+    }
+    
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(checkpoint, output_path)
+    return str(output_path)
+
+
 if __name__ == '__main__':
     # Test CPPN
     print("Testing CPPN...")
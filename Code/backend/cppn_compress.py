@@ -0,0 +1,176 @@
+"""
+CPPN Compression - Low-rank factorization of trained styles
+
+The hidden layers of 256-wide CLIP-optimized styles are 256×256 matrices,
+but most of their energy sits in a few singular directions. factorize_cppn()
+replaces each hidden Linear with the truncated SVD W ≈ U_r S_r V_r^T, stored
+as two thin layers (LowRankLinear in cppn.py): at rank r every pixel pays
+r × 512 instead of 256 × 256 multiply-adds. The rank is fixed or chosen per
+layer from a relative error budget, and layers that would not get cheaper
+stay dense.
+
+finetune() optionally trains the factorized network briefly to match the
+original's output on sample renderer inputs, recovering most of the
+truncation error. Compressed styles are ordinary checkpoints (the ranks are
+stored in 'cppn_config'), so load_cppn(), cli.py --load-weights and the
+Renderer use them unchanged.
+
+Usage:
+    student = factorize_cppn(cppn, error_budget=0.05)
+    finetune(student, cppn, calibration_inputs(12, features), steps=300)
+    
+    python tools/compress_style.py style.pth --error-budget 0.05 --finetune-steps 300
+"""
+
+import contextlib
+import copy
+import io
+import math
+import time
+from typing import List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from cppn import LowRankLinear
+
+
+def rank_for_error(singular_values: torch.Tensor, error_budget: float) -> int:
+    """
+    Smallest rank whose truncation keeps the relative Frobenius error within budget.
+    
+    Args:
+        singular_values: Singular values in descending order
+        error_budget: Allowed ||W - W_r|| / ||W|| (e.g. 0.05)
+    
+    Returns:
+        Rank (at least 1)
+    """
+    energy = (singular_values.double() ** 2).tolist()
+    total = sum(energy)
+    dropped = total
+    for rank, value in enumerate(energy, start=1):
+        dropped -= value
+        if math.sqrt(max(dropped, 0.0) / total) <= error_budget:
+            return rank
+    return len(energy)
+
+
+def factorize_cppn(cppn, rank: Optional[int] = None, error_budget: Optional[float] = None):
+    """
+    Low-rank copy of a CPPN (hidden-to-hidden layers only).
+    
+    Args:
+        cppn: CPPN network instance (left unchanged)
+        rank: Fixed rank for every hidden layer
+        error_budget: Per-layer relative Frobenius error budget (used when
+            rank is None)
+    
+    Returns:
+        New CPPN with LowRankLinear layers and .ranks set
+    """
+    if rank is None and error_budget is None:
+        raise ValueError("Give a rank or an error budget")
+    if getattr(cppn, 'encoding', None):
+        raise ValueError(f"Low-rank compression supports plain CPPNs only (got a {cppn.encoding} CPPN)")
+    
+    student = copy.deepcopy(cppn)
+    ranks: List[Optional[int]] = [None] * cppn.num_layers
+    
+    # The input layer (x, y, time, audio -> hidden) is tiny: keep it dense
+    for i in range(1, cppn.num_layers):
+        layer = cppn.layers[i]
+        weight = layer.weight.detach().float()
+        if rank is not None:
+            layer_rank = min(rank, min(weight.shape))
+        else:
+            layer_rank = rank_for_error(torch.linalg.svdvals(weight), error_budget)
+        
+        # Only factorize when two thin matmuls are cheaper than one square one
+        if layer_rank * (layer.in_features + layer.out_features) < layer.in_features * layer.out_features:
+            student.layers[i] = LowRankLinear.from_linear(layer, layer_rank)
+            ranks[i] = layer_rank
+    
+    student.ranks = ranks
+    return student
+
+
+def finetune(
+    student: nn.Module,
+    teacher: nn.Module,
+    inputs: torch.Tensor,
+    steps: int = 200,
+    learning_rate: float = 1e-4,
+    batch_size: int = 16384,
+    log_interval: int = 50
+) -> List[float]:
+    """
+    Train a network briefly to reproduce another network's RGB output.
+    
+    Args:
+        student: Network to train (fp32)
+        teacher: Reference network (not modified)
+        inputs: Sample CPPN inputs (see cppn_quantize.calibration_inputs)
+        steps: Optimization steps
+        learning_rate: Adam learning rate
+        batch_size: Inputs per step
+        log_interval: Print progress every N steps
+    
+    Returns:
+        Loss (MSE) per step
+    """
+    device = next(student.parameters()).device
+    inputs = inputs.to(device)
+    
+    teacher.eval()
+    with torch.no_grad():
+        targets = teacher(inputs.to(next(teacher.parameters()).dtype)).float()
+    
+    optimizer = torch.optim.Adam(student.parameters(), lr=learning_rate)
+    student.train()
+    losses = []
+    
+    for step in range(steps):
+        batch = torch.randint(0, len(inputs), (min(batch_size, len(inputs)),), device=device)
+        optimizer.zero_grad()
+        loss = torch.mean((student(inputs[batch]) - targets[batch]) ** 2)
+        loss.backward()
+        optimizer.step()
+        losses.append(loss.item())
+        
+        if (step + 1) % log_interval == 0 or step == steps - 1:
+            print(f"  Fine-tune step {step + 1:4d}/{steps} | MSE {loss.item():.2e}")
+    
+    student.eval()
+    return losses
+
+
+def render_fps(cppn, resolution, audio_features: np.ndarray, frames: int = 3) -> float:
+    """
+    Measure single-frame render throughput.
+    
+    Args:
+        cppn: Network to render
+        resolution: (width, height) in pixels
+        audio_features: Scaled audio feature vector
+        frames: Frames to time (after one warm-up frame)
+    
+    Returns:
+        Frames per second
+    """
+    from renderer import Renderer
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        renderer = Renderer(cppn, resolution=resolution)
+        renderer.render_frame(0.5, audio_features)
+    
+    if renderer.device == 'cuda':
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(frames):
+        renderer.render_frame(0.5, audio_features)
+    if renderer.device == 'cuda':
+        torch.cuda.synchronize()
+    return frames / (time.perf_counter() - start)
+
@@ -0,0 +1,206 @@
+"""
+CPPN Distillation - Small, fast students of large trained styles
+
+A style optimized at 4×256 renders slowly at 1080p, while 2-3 layer, 8-32
+hidden networks already look great. distill() trains such a small student
+CPPN to reproduce the teacher's RGB output on (x, y, t, audio) inputs sampled
+across the track's real feature distribution.
+
+Students are saved next to their teacher as <teacher>_student_<L>x<H>.pth
+(ordinary checkpoints with the teacher's metadata plus a 'distillation'
+fidelity report: PSNR, CLIP similarity, frames/sec). pick_student() lets
+cli.py swap a student in automatically for previews or when the teacher
+would not finish within a time budget.
+
+Usage:
+    student, report = distill(teacher, features, hidden_dim=16, num_layers=2)
+    
+    python tools/distill_style.py ../styles/organic.pth --layers 2 --hidden-dim 16
+    python cli.py song.mp3 out.mp4 --load-weights ../styles/organic.pth --time-budget 600
+"""
+
+import contextlib
+import io
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from cppn import CPPN
+from cppn_compress import finetune, render_fps
+from cppn_quantize import calibration_inputs, psnr
+
+
+def student_path(teacher_path: str, num_layers: int, hidden_dim: int) -> Path:
+    """Where a student of this architecture is stored (next to its teacher)."""
+    teacher_path = Path(teacher_path)
+    return teacher_path.with_name(f"{teacher_path.stem}_student_{num_layers}x{hidden_dim}.pth")
+
+
+def track_features(audio_path: str, audio_scale: float, fps: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Analyze a track for sampling inputs and CLIP scoring.
+    
+    Args:
+        audio_path: Path to audio file
+        audio_scale: Audio feature scaling (as cli.py --audio-scale)
+        fps: Feature frames per second
+    
+    Returns:
+        Tuple of (scaled features as the renderer sees them, raw feature
+        row 25% into the track as clip_optimize_cppn.py scores styles)
+    """
+    from audio_analyzer import AudioAnalyzer
+    from sweep_engine import prepare_features
+    
+    analyzer = AudioAnalyzer()
+    analysis = analyzer.analyze(str(audio_path), fps=fps)
+    scaled = prepare_features(analyzer.normalize_features(analysis['features'], method='minmax'), audio_scale, 'cpu')
+    raw_row = analysis['features'][min(int(analysis['duration'] * 0.25 * fps), analysis['num_frames'] - 1)]
+    return scaled, raw_row
+
+
+def distill(
+    teacher,
+    features: Optional[np.ndarray] = None,
+    hidden_dim: int = 16,
+    num_layers: int = 2,
+    steps: int = 2000,
+    learning_rate: float = 1e-3,
+    num_samples: int = 262144,
+    seed: int = 0
+) -> Tuple[CPPN, Dict]:
+    """
+    Train a small student CPPN to match a teacher's output.
+    
+    Args:
+        teacher: Trained CPPN (fp32)
+        features: Scaled audio features of the track (inputs are sampled
+            from its frames); None samples the default --audio-scale range
+        hidden_dim: Student hidden layer dimension
+        num_layers: Student hidden layers
+        steps: Training steps
+        learning_rate: Adam learning rate
+        num_samples: Size of the training input pool
+        seed: Random seed (student init and input sampling)
+    
+    Returns:
+        Tuple of (student, report with held-out PSNR and final loss)
+    """
+    torch.manual_seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        student = CPPN(
+            input_dim=teacher.input_dim,
+            hidden_dim=hidden_dim,
+            num_layers=num_layers,
+            device=teacher.device,
+            use_fp16=False
+        )
+    
+    train_inputs = calibration_inputs(teacher.input_dim, features, num_samples=num_samples, seed=seed)
+    test_inputs = calibration_inputs(teacher.input_dim, features, num_samples=65536, seed=seed + 1)
+    
+    losses = finetune(
+        student, teacher, train_inputs, steps=steps, learning_rate=learning_rate, log_interval=max(1, steps // 10)
+    )
+    
+    test_inputs = test_inputs.to(teacher.device)
+    with torch.no_grad():
+        score = psnr(teacher(test_inputs), student(test_inputs))
+    
+    return student, {
+        'num_layers': num_layers,
+        'hidden_dim': hidden_dim,
+        'steps': steps,
+        'final_loss': losses[-1] if losses else None,
+        'psnr': score,
+        'parameters': student.count_parameters(),
+        'teacher_parameters': teacher.count_parameters()
+    }
+
+
+def find_students(teacher_path: str) -> List[Tuple[Path, Dict]]:
+    """
+    Students stored next to a teacher.
+    
+    Args:
+        teacher_path: Teacher .pth path
+    
+    Returns:
+        List of (student path, 'distillation' report), best PSNR first
+    """
+    teacher_path = Path(teacher_path)
+    students = []
+    for path in sorted(teacher_path.parent.glob(f"{teacher_path.stem}_student_*.pth")):
+        try:
+            checkpoint = torch.load(path, map_location='cpu')
+        except (RuntimeError, OSError) as e:
+            print(f"Warning: Ignoring unreadable student {path.name}: {e}")
+            continue
+        report = checkpoint.get('distillation') if isinstance(checkpoint, dict) else None
+        if report:
+            students.append((path, report))
+    
+    students.sort(key=lambda item: item[1].get('psnr', 0.0), reverse=True)
+    return students
+
+
+def pick_student(
+    teacher_path: str,
+    teacher=None,
+    mode: str = 'auto',
+    preview: bool = False,
+    time_budget: Optional[float] = None,
+    num_frames: int = 0,
+    resolution: Optional[Tuple[int, int]] = None,
+    audio_features: Optional[np.ndarray] = None
+) -> Optional[Path]:
+    """
+    Decide whether to render a distilled student instead of its teacher.
+    
+    Args:
+        teacher_path: Teacher .pth path
+        teacher: Loaded teacher (timed against the budget)
+        mode: 'auto' (previews and over-budget renders), 'always' or 'never'
+        preview: The render is a preview (e.g. cli.py --stills)
+        time_budget: Seconds the render may take (auto mode)
+        num_frames: Frames to render
+        resolution: (width, height) of the render
+        audio_features: Scaled audio feature vector for the timing frame
+    
+    Returns:
+        Student path, or None to render the teacher
+    """
+    if mode == 'never':
+        return None
+    
+    students = find_students(teacher_path)
+    if not students:
+        if mode == 'always':
+            print(f"Warning: No distilled student found for {Path(teacher_path).name}. Using the teacher...")
+        return None
+    
+    if mode == 'always' or preview:
+        path, report = students[0]
+        print(f"[INFO] Using distilled student {path.name} ({report.get('psnr', 0.0):.1f} dB vs teacher)")
+        return path
+    
+    if not time_budget or teacher is None or not num_frames:
+        return None
+    
+    # Time one teacher frame; students scale by their measured speedup
+    teacher_time = num_frames / render_fps(teacher, resolution, audio_features, frames=1)
+    if teacher_time <= time_budget:
+        print(f"[INFO] Teacher fits the time budget (~{teacher_time:.0f}s of {time_budget:.0f}s)")
+        return None
+    
+    def estimate(report):
+        speedup = report.get('fps', 0.0) / max(report.get('teacher_fps', 0.0), 1e-9)
+        return teacher_time / max(speedup, 1e-9)
+    
+    fitting = [(path, report) for path, report in students if estimate(report) <= time_budget]
+    path, report = fitting[0] if fitting else min(students, key=lambda item: estimate(item[1]))
+    print(f"[INFO] Teacher needs ~{teacher_time:.0f}s (budget {time_budget:.0f}s): "
+          f"using student {path.name} (~{estimate(report):.0f}s, {report.get('psnr', 0.0):.1f} dB)")
+    return path
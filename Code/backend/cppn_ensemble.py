@@ -0,0 +1,295 @@
+"""
+CPPN Ensemble - Evaluate many same-shape CPPNs in one batched forward pass
+
+Small CPPNs (hidden_dim 4-32) are far too cheap per forward pass to keep a
+CPU or GPU busy; rendering them one by one is dominated by per-call overhead.
+CPPNEnsemble stacks the weights of M networks with identical shape into
+(M, in, out) tensors and evaluates all of them on one shared input batch
+with batched matrix multiplies (`matmul` for the shared first layer, then
+`baddbmm`), producing M outputs per pixel.
+
+MultiStyleCPPN extends this to networks of different shapes (e.g. trained
+.pth styles next to random presets): members are grouped by shape into one
+CPPNEnsemble each, and the groups' outputs are reassembled in input order.
+
+Renderer accepts either in place of a single CPPN: the coordinate grid and
+per-frame inputs are built once, and every frame comes back as an
+(M, H, W, 3) stack - one image per member.
+
+Usage:
+    ensemble = CPPNEnsemble.from_seeds(range(100), input_dim=12, hidden_dim=8, num_layers=2)
+    renderer = Renderer(ensemble, resolution=(640, 360))
+    stacks = renderer.render_stills([0.5], features[[frame_idx]])  # [(100, H, W, 3)]
+    
+    styles = MultiStyleCPPN([cppn_a, cppn_b, cppn_c], labels=['a', 'b', 'c'])
+"""
+
+import contextlib
+import io
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from cppn import CPPN, cycle_activation
+
+
+class CPPNEnsemble(nn.Module):
+    """Stacked weights of several same-shape CPPNs."""
+    
+    def __init__(
+        self,
+        cppns: List[CPPN],
+        labels: Optional[List[str]] = None,
+        audio_scales: Optional[Sequence[float]] = None
+    ):
+        """
+        Initialize ensemble from existing networks.
+        
+        Args:
+            cppns: Networks with identical input/hidden/output dims, depth,
+                device and dtype
+            labels: Optional per-member labels (e.g. "seed 42")
+            audio_scales: Optional per-member audio feature scaling, folded
+                into the input layer so members with different --audio-scale
+                share one unscaled feature tensor
+        """
+        super().__init__()
+        
+        if any(getattr(cppn, 'encoding', None) for cppn in cppns):
+            raise ValueError("Ensembles stack plain CPPNs only (not Fourier-encoded networks)")
+        
+        first = cppns[0]
+        shape = (first.input_dim, first.hidden_dim, first.num_layers, first.output_dim)
+        for cppn in cppns[1:]:
+            if (cppn.input_dim, cppn.hidden_dim, cppn.num_layers, cppn.output_dim) != shape:
+                raise ValueError("All ensemble members must have the same shape")
+        
+        self.input_dim, self.hidden_dim, self.num_layers, self.output_dim = shape
+        self.device = first.device
+        self.num_members = len(cppns)
+        self.labels = labels or [str(i) for i in range(len(cppns))]
+        
+        # nn.Linear computes x @ W.T + b; store W.T so members are bmm-ready
+        self.weights = nn.ParameterList([
+            nn.Parameter(torch.stack([c.layers[i].weight.detach().t() for c in cppns]))
+            for i in range(self.num_layers)
+        ])
+        self.biases = nn.ParameterList([
+            nn.Parameter(torch.stack([c.layers[i].bias.detach().unsqueeze(0) for c in cppns]))
+            for i in range(self.num_layers)
+        ])
+        self.output_weight = nn.Parameter(torch.stack([c.output_layer.weight.detach().t() for c in cppns]))
+        self.output_bias = nn.Parameter(torch.stack([c.output_layer.bias.detach().unsqueeze(0) for c in cppns]))
+        
+        # Inputs are [x, y, time, audio...]: scale the audio rows of W0.
+        # The scales are kept so evolution mutates the unscaled weights (as
+        # a single CPPN fed pre-scaled features would)
+        weight = self.weights[0]
+        scales = [1.0] * self.num_members if audio_scales is None else list(audio_scales)
+        self.register_buffer('audio_scales', torch.tensor(scales, dtype=weight.dtype, device=weight.device).view(-1, 1, 1))
+        if audio_scales is not None:
+            with torch.no_grad():
+                weight[:, 3:, :] *= self.audio_scales
+    
+    @classmethod
+    def from_seeds(
+        cls,
+        seeds: Iterable[int],
+        input_dim: int,
+        hidden_dim: int,
+        num_layers: int,
+        device: str = 'cpu',
+        use_fp16: bool = True
+    ) -> 'CPPNEnsemble':
+        """
+        Build one member per seed, initialized exactly like cli.py --seed.
+        
+        Args:
+            seeds: Random seeds
+            input_dim: Number of input features (coordinates + audio)
+            hidden_dim: Hidden layer dimension
+            num_layers: Number of hidden layers
+            device: 'cuda' or 'cpu'
+            use_fp16: FP16 weights on CUDA (as CPPN)
+        
+        Returns:
+            Ensemble labeled by seed
+        """
+        seeds = list(seeds)
+        cppns = []
+        for seed in seeds:
+            torch.manual_seed(seed)
+            np.random.seed(seed)
+            # Members are tiny; skip the per-network init banner
+            with contextlib.redirect_stdout(io.StringIO()):
+                cppns.append(CPPN(
+                    input_dim=input_dim,
+                    hidden_dim=hidden_dim,
+                    num_layers=num_layers,
+                    device=device,
+                    use_fp16=use_fp16
+                ))
+        
+        ensemble = cls(cppns, labels=[f"seed {seed}" for seed in seeds])
+        print(f"CPPN ensemble: {len(seeds)} × {num_layers}L × {hidden_dim}D on {ensemble.device}")
+        return ensemble
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Evaluate every member on a shared input batch.
+        
+        Args:
+            x: Input tensor (batch_size, input_dim), shared by all members
+        
+        Returns:
+            RGB output (num_members, batch_size, 3) in range [0, 1]
+        """
+        # (N, in) @ (M, in, hidden) broadcasts to (M, N, hidden)
+        h = cycle_activation(torch.matmul(x, self.weights[0]) + self.biases[0], 0)
+        
+        for i in range(1, self.num_layers):
+            h = cycle_activation(torch.baddbmm(self.biases[i], h, self.weights[i]), i)
+        
+        return torch.sigmoid(torch.baddbmm(self.output_bias, h, self.output_weight))
+    
+    def count_parameters(self) -> int:
+        """Count trainable parameters of one member."""
+        return sum(p.numel() for p in self.parameters() if p.requires_grad) // self.num_members
+    
+    def evolve_weights(self, mutation_rate: Union[float, Sequence[float]] = 0.01):
+        """
+        Evolve every member's weights (independent noise per member).
+        
+        Args:
+            mutation_rate: Amount of random mutation to apply, or one rate
+                per member
+        """
+        if not isinstance(mutation_rate, (int, float)):
+            param = self.output_weight
+            mutation_rate = torch.tensor(list(mutation_rate), dtype=param.dtype, device=param.device).view(-1, 1, 1)
+        
+        with torch.no_grad():
+            for param in self.parameters():
+                noise = torch.randn_like(param) * mutation_rate
+                if param is self.weights[0]:
+                    # Folded audio rows: scale the noise like the weights
+                    noise[:, 3:, :] *= self.audio_scales
+                param.add_(noise)
+    
+    def member(self, index: int) -> CPPN:
+        """
+        Extract one member as a standalone CPPN (e.g. for a full render).
+        
+        Args:
+            index: Member index
+        
+        Returns:
+            CPPN with that member's weights
+        """
+        dtype = self.output_weight.dtype
+        with contextlib.redirect_stdout(io.StringIO()):
+            cppn = CPPN(
+                input_dim=self.input_dim,
+                hidden_dim=self.hidden_dim,
+                num_layers=self.num_layers,
+                output_dim=self.output_dim,
+                device=self.device,
+                use_fp16=dtype == torch.float16
+            )
+        
+        with torch.no_grad():
+            for i, layer in enumerate(cppn.layers):
+                layer.weight.copy_(self.weights[i][index].t())
+                layer.bias.copy_(self.biases[i][index, 0])
+            cppn.output_layer.weight.copy_(self.output_weight[index].t())
+            cppn.output_layer.bias.copy_(self.output_bias[index, 0])
+        
+        return cppn
+
+
+class MultiStyleCPPN(nn.Module):
+    """Several CPPNs of any shape, evaluated as one CPPNEnsemble per shape."""
+    
+    def __init__(
+        self,
+        cppns: List[CPPN],
+        labels: Optional[List[str]] = None,
+        audio_scales: Optional[Sequence[float]] = None
+    ):
+        """
+        Group networks by shape and stack each group.
+        
+        Args:
+            cppns: Networks sharing input_dim and device (hidden size, depth
+                and dtype may differ)
+            labels: Optional per-member labels (e.g. style names)
+            audio_scales: Optional per-member audio feature scaling (see
+                CPPNEnsemble)
+        """
+        super().__init__()
+        
+        if len({cppn.input_dim for cppn in cppns}) != 1:
+            raise ValueError("All styles must take the same inputs (input_dim)")
+        
+        self.input_dim = cppns[0].input_dim
+        self.output_dim = cppns[0].output_dim
+        self.device = cppns[0].device
+        self.num_members = len(cppns)
+        self.labels = labels or [str(i) for i in range(len(cppns))]
+        
+        groups: Dict[tuple, List[int]] = {}
+        for i, cppn in enumerate(cppns):
+            shape = (cppn.hidden_dim, cppn.num_layers, cppn.output_dim, next(cppn.parameters()).dtype)
+            groups.setdefault(shape, []).append(i)
+        self.member_indices = list(groups.values())
+        
+        self.groups = nn.ModuleList([
+            CPPNEnsemble(
+                [cppns[i] for i in indices],
+                labels=[self.labels[i] for i in indices],
+                audio_scales=None if audio_scales is None else [audio_scales[i] for i in indices]
+            )
+            for indices in self.member_indices
+        ])
+        
+        # Position of each member in the concatenated group outputs
+        order = [i for indices in self.member_indices for i in indices]
+        self._inverse_order = torch.argsort(torch.tensor(order)).to(self.groups[0].output_weight.device)
+        
+        print(f"Multi-style CPPN: {self.num_members} styles in {len(self.groups)} shape groups")
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Evaluate every style on a shared input batch.
+        
+        Args:
+            x: Input tensor (batch_size, input_dim), shared by all styles
+        
+        Returns:
+            RGB output (num_members, batch_size, 3) in range [0, 1]
+        """
+        if len(self.groups) == 1:
+            return self.groups[0](x)
+        
+        outputs = [group(x.to(group.output_weight.dtype)).float() for group in self.groups]
+        return torch.cat(outputs)[self._inverse_order]
+    
+    def count_parameters(self) -> int:
+        """Count trainable parameters per style (average)."""
+        return sum(p.numel() for p in self.parameters() if p.requires_grad) // self.num_members
+    
+    def evolve_weights(self, mutation_rate: Union[float, Sequence[float]] = 0.01):
+        """
+        Evolve every style's weights.
+        
+        Args:
+            mutation_rate: Amount of random mutation to apply, or one rate
+                per style
+        """
+        for group, indices in zip(self.groups, self.member_indices):
+            if isinstance(mutation_rate, (int, float)):
+                group.evolve_weights(mutation_rate)
+            else:
+                group.evolve_weights([mutation_rate[i] for i in indices])
@@ -0,0 +1,215 @@
+"""
+Fourier CPPN - Fourier-feature encoded CPPN for high-resolution detail at low MLP cost
+
+In CPPN all detail has to come from a deep, wide sine/cosine MLP evaluated
+per pixel, so cost grows with hidden_dim × layers × pixels. FourierCPPN moves
+the detail into a fixed encoding instead:
+
+- (x, y, t) is projected onto `num_frequencies` precomputed frequency
+  vectors, octave-spaced from 1 to `max_frequency` in random directions
+  (a multiresolution encoding), and encoded as [sin, cos] of the phases
+- a tiny MLP (e.g. 2 × 16, same sin/cos/gaussian/tanh cycle and sigmoid
+  output as CPPN) maps the encoding to RGB
+- audio features modulate every hidden layer (FiLM: per-unit scale and
+  shift computed from the audio inputs)
+
+A 2 × 16 FourierCPPN with 32 frequencies costs ~2k multiply-adds per pixel
+against ~200k for a 4 × 256 CPPN, which makes 4K renders feasible on CPU.
+It takes the same [x, y, time, audio...] inputs, so Renderer, cli.py and
+clip_optimize_cppn.py (--network fourier) use it as a drop-in CPPN; styles
+are saved with cppn_config 'type': 'fourier' and loaded by load_cppn().
+
+Usage:
+    cppn = FourierCPPN(input_dim=12, hidden_dim=16, num_layers=2)
+    renderer = Renderer(cppn, resolution=(3840, 2160))
+    
+    python cppn_fourier.py    # per-pixel cost and CPU speed vs CPPN
+"""
+
+import math
+from typing import Dict
+
+import torch
+import torch.nn as nn
+
+from cppn import cycle_activation
+
+
+class FourierCPPN(nn.Module):
+    """Tiny audio-modulated MLP on a fixed multiresolution Fourier encoding of (x, y, t)."""
+    
+    encoding = 'fourier'
+    
+    def __init__(
+        self,
+        input_dim: int = 12,  # x, y, time + 9 audio features
+        hidden_dim: int = 16,
+        num_layers: int = 2,
+        output_dim: int = 3,  # RGB
+        num_frequencies: int = 32,
+        max_frequency: float = 64.0,
+        time_frequency: float = 4.0,
+        device: str = 'cuda' if torch.cuda.is_available() else 'cpu',
+        use_fp16: bool = True
+    ):
+        """
+        Initialize Fourier CPPN.
+        
+        Args:
+            input_dim: Number of input features (coordinates + audio)
+            hidden_dim: Hidden layer dimension
+            num_layers: Number of hidden layers
+            output_dim: Output dimension (3 for RGB)
+            num_frequencies: Number of encoding frequencies (2× encoding features)
+            max_frequency: Highest spatial frequency (radians per coordinate unit)
+            time_frequency: Highest temporal frequency (radians per time unit)
+            device: 'cuda' or 'cpu'
+            use_fp16: FP16 on CUDA (as CPPN)
+        """
+        super().__init__()
+        
+        self.input_dim = input_dim
+        self.hidden_dim = hidden_dim
+        self.num_layers = num_layers
+        self.output_dim = output_dim
+        self.num_frequencies = num_frequencies
+        self.max_frequency = max_frequency
+        self.time_frequency = time_frequency
+        self.device = device
+        self.use_fp16 = use_fp16
+        
+        # Octave-spaced magnitudes in random directions; buffers, so saved
+        # styles keep their exact encoding
+        magnitudes = torch.logspace(0, math.log10(max_frequency), num_frequencies)
+        angles = torch.rand(num_frequencies) * 2 * math.pi
+        self.register_buffer('frequencies', torch.stack([magnitudes * torch.cos(angles),
+                                                         magnitudes * torch.sin(angles)]))
+        self.register_buffer('time_frequencies', (torch.rand(1, num_frequencies) * 2 - 1) * time_frequency)
+        
+        # Tiny MLP on [sin, cos] of the phases
+        self.layers = nn.ModuleList([nn.Linear(2 * num_frequencies, hidden_dim)])
+        for _ in range(num_layers - 1):
+            self.layers.append(nn.Linear(hidden_dim, hidden_dim))
+        self.output_layer = nn.Linear(hidden_dim, output_dim)
+        
+        # Audio -> per-layer (scale, shift) of every hidden unit
+        self.modulation = nn.Linear(input_dim - 3, 2 * hidden_dim * num_layers)
+        
+        self._initialize_weights()
+        
+        self.to(device)
+        if device == 'cuda' and use_fp16:
+            self.half()
+        
+        print(f"Fourier CPPN running on: {self.device}")
+        print(f"  Layers: {num_layers}, Hidden dim: {hidden_dim}, Frequencies: {num_frequencies} (max {max_frequency:g})")
+        print(f"  Total parameters: {self.count_parameters():,}")
+    
+    def _initialize_weights(self):
+        """Initialize weights with the same gains as CPPN."""
+        for layer in self.layers:
+            nn.init.xavier_uniform_(layer.weight, gain=5.0)
+            nn.init.zeros_(layer.bias)
+        
+        nn.init.xavier_uniform_(self.output_layer.weight, gain=1.0)
+        nn.init.zeros_(self.output_layer.bias)
+        
+        # Strong enough that untrained networks visibly react to audio
+        nn.init.xavier_uniform_(self.modulation.weight, gain=5.0)
+        nn.init.zeros_(self.modulation.bias)
+    
+    def cppn_config(self) -> Dict:
+        """Architecture as stored in checkpoints (see load_cppn)."""
+        return {
+            'type': 'fourier',
+            'input_dim': self.input_dim,
+            'hidden_dim': self.hidden_dim,
+            'num_layers': self.num_layers,
+            'output_dim': self.output_dim,
+            'num_frequencies': self.num_frequencies,
+            'max_frequency': self.max_frequency,
+            'time_frequency': self.time_frequency
+        }
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Forward pass.
+        
+        Args:
+            x: Input tensor (batch_size, input_dim)
+               Expected: [x_coord, y_coord, time, audio_features...]
+        
+        Returns:
+            RGB output (batch_size, 3) in range [0, 1]
+        """
+        # Phases: coordinates · frequencies + time · time frequencies
+        phase = torch.addmm(x[:, 2:3] * self.time_frequencies, x[:, :2], self.frequencies)
+        h = torch.cat([torch.sin(phase), torch.cos(phase)], dim=1)
+        
+        film = self.modulation(x[:, 3:])
+        
+        for i, layer in enumerate(self.layers):
+            offset = 2 * self.hidden_dim * i
+            scale = film[:, offset:offset + self.hidden_dim]
+            shift = film[:, offset + self.hidden_dim:offset + 2 * self.hidden_dim]
+            h = cycle_activation(layer(h) * (1 + scale) + shift, i)
+        
+        return torch.sigmoid(self.output_layer(h))
+    
+    def count_parameters(self) -> int:
+        """Count total trainable parameters."""
+        return sum(p.numel() for p in self.parameters() if p.requires_grad)
+    
+    def evolve_weights(self, mutation_rate: float = 0.01):
+        """
+        Evolve network weights for "living math" effect (the encoding stays fixed).
+        
+        Args:
+            mutation_rate: Amount of random mutation to apply
+        """
+        with torch.no_grad():
+            for param in self.parameters():
+                param.add_(torch.randn_like(param) * mutation_rate)
+
+
+def macs_per_pixel(model: nn.Module) -> int:
+    """Multiply-adds per pixel of a CPPN or FourierCPPN forward pass."""
+    macs = sum(m.in_features * m.out_features for m in model.modules() if isinstance(m, nn.Linear))
+    if getattr(model, 'encoding', None) == 'fourier':
+        macs += 3 * model.num_frequencies
+    return macs
+
+
+if __name__ == '__main__':
+    # Compare per-pixel cost and CPU speed against CPPN
+    import time
+    
+    from cppn import CPPN
+    
+    print("Comparing Fourier CPPN with CPPN (CPU)...")
+    
+    batch_size = 100000  # Renderer's CPU batch size
+    pixels_4k = 3840 * 2160
+    x = torch.rand(batch_size, 12) - 0.5
+    
+    models = [
+        ('CPPN 4×256', CPPN(input_dim=12, hidden_dim=256, num_layers=4, device='cpu')),
+        ('CPPN 2×16', CPPN(input_dim=12, hidden_dim=16, num_layers=2, device='cpu')),
+        ('Fourier 2×16', FourierCPPN(input_dim=12, hidden_dim=16, num_layers=2, device='cpu')),
+        ('Fourier 3×32', FourierCPPN(input_dim=12, hidden_dim=32, num_layers=3, device='cpu')),
+    ]
+    
+    print()
+    for name, model in models:
+        model.eval()
+        with torch.no_grad():
+            model(x)
+            start = time.perf_counter()
+            for _ in range(3):
+                model(x)
+        seconds = (time.perf_counter() - start) / 3
+        
+        print(f"  {name:<14} {macs_per_pixel(model):>8,} MACs/pixel  "
+              f"{1000 * seconds:7.1f} ms/batch  ~{seconds * pixels_4k / batch_size:5.2f} s per 4K frame")
+    
+    print("\n[OK] Comparison complete!")
@@ -0,0 +1,481 @@
+"""
+NumPy CPPN - Torch-free CPPN inference for light render workers and previews
+
+Importing torch costs seconds and hundreds of MB just to evaluate a small
+MLP. NumpyCPPN runs the same network (sin / cos / gaussian / tanh
+alternation, sigmoid output) with NumPy only:
+
+- weights are stored transposed and contiguous as float32
+- every layer writes into preallocated buffers (matmul / ufuncs with out=),
+  so a forward pass allocates nothing
+- pixels are processed in tiles sized so one tile's activations stay in L2
+  cache
+
+Weights are exported once from a CPPN or .pth style to a torch-free .npz
+(export_weights / tools/export_numpy_style.py); loading an .npz needs only
+NumPy, so a render node starts in milliseconds.
+
+Optional fast math (fast_math=True) replaces sin / cos / exp with
+polynomials (Chebyshev fits, evaluated in float32). Maximum absolute error
+measured over dense grids:
+    sin, cos:        <= 2e-5 for |x| <= 100 (range reduction adds ~1e-7·|x|)
+    exp(-x^2):       <= 2e-6 for all x
+Both are far below one 8-bit colour step (1/255 ≈ 4e-3). Whether they beat
+NumPy's own kernels depends on the build (SIMD sin/exp are already fast on
+recent x86 NumPy); benchmark with `python cppn_numpy.py`.
+
+Usage:
+    model = NumpyCPPN.load('style.npz')
+    renderer = NumpyRenderer(model, resolution=(640, 360))
+    frame = renderer.render_frame(0.5, audio_features)
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Tiles are sized so one tile's activations fit in this much cache
+DEFAULT_L2_BYTES = 1024 * 1024
+
+# Same coordinate range as renderer._coordinate_grid
+COORD_SCALE = 0.5
+
+# sin(r) ≈ r · P(r²) on [-π, π] (odd Chebyshev fit, degree 9)
+_SIN_COEFFS = np.array([
+    0.999979115810066, -0.16662401686742173, 0.008308850562908907,
+    -0.0001926317970547227, 2.147054556441236e-06
+], dtype=np.float32)
+
+# 2^-f ≈ Q(f) on [0, 1] (Chebyshev fit, degree 4)
+_EXP2_COEFFS = np.array([
+    0.9999980945467194, -0.6930506671068464, 0.23943921320323633,
+    -0.053226833517722734, 0.006841991446895008
+], dtype=np.float32)
+
+_TWO_PI = np.float32(2 * np.pi)
+_INV_TWO_PI = np.float32(1 / (2 * np.pi))
+_HALF_PI = np.float32(np.pi / 2)
+_LOG2_E = np.float32(np.log2(np.e))
+
+
+def fast_sin(x: np.ndarray, r2: np.ndarray, acc: np.ndarray) -> np.ndarray:
+    """
+    In-place polynomial sine (see module docstring for error bounds).
+    
+    Args:
+        x: float32 array, overwritten with sin(x)
+        r2, acc: float32 scratch arrays of the same shape
+    
+    Returns:
+        x
+    """
+    # Range reduction to [-π, π]
+    np.multiply(x, _INV_TWO_PI, out=acc)
+    np.rint(acc, out=acc)
+    acc *= _TWO_PI
+    x -= acc
+    
+    # Horner in r²
+    np.multiply(x, x, out=r2)
+    acc.fill(_SIN_COEFFS[-1])
+    for coeff in _SIN_COEFFS[-2::-1]:
+        acc *= r2
+        acc += coeff
+    
+    x *= acc
+    return x
+
+
+def fast_cos(x: np.ndarray, r2: np.ndarray, acc: np.ndarray) -> np.ndarray:
+    """In-place polynomial cosine: cos(x) = sin(x + π/2)."""
+    x += _HALF_PI
+    return fast_sin(x, r2, acc)
+
+
+def fast_gaussian(x: np.ndarray, n: np.ndarray, acc: np.ndarray) -> np.ndarray:
+    """
+    In-place polynomial exp(-x²) (see module docstring for error bounds).
+    
+    Args:
+        x: float32 array, overwritten with exp(-x²)
+        n, acc: float32 scratch arrays of the same shape
+    
+    Returns:
+        x
+    """
+    # exp(-u) = 2^-t with t = u·log2(e) = n + f, f in [0, 1); t >= 126 is ~0
+    np.multiply(x, x, out=x)
+    x *= _LOG2_E
+    np.minimum(x, 126.0, out=x)
+    np.floor(x, out=n)
+    x -= n
+    
+    acc.fill(_EXP2_COEFFS[-1])
+    for coeff in _EXP2_COEFFS[-2::-1]:
+        acc *= x
+        acc += coeff
+    
+    # 2^-n straight from the float32 exponent bits, written over x
+    bits = x.view(np.int32)
+    np.copyto(bits, n, casting='unsafe')
+    np.subtract(127, bits, out=bits)
+    np.left_shift(bits, 23, out=bits)
+    
+    x *= acc
+    return x
+
+
+def export_weights(cppn, output_path: str, metadata: Optional[Dict] = None) -> Path:
+    """
+    Write a torch CPPN's weights to a torch-free .npz file.
+    
+    Args:
+        cppn: CPPN network instance
+        output_path: Destination .npz path
+        metadata: Optional extra metadata (e.g. the .pth checkpoint's prompt)
+    
+    Returns:
+        Path to the written file
+    """
+    if getattr(cppn, 'encoding', None):
+        raise ValueError(f"NumPy export supports plain CPPNs only (got a {cppn.encoding} CPPN); use ONNX")
+    
+    arrays = {}
+    for i, layer in enumerate(cppn.layers):
+        arrays[f'weight_{i}'] = layer.weight.detach().float().cpu().numpy()
+        arrays[f'bias_{i}'] = layer.bias.detach().float().cpu().numpy()
+    arrays['output_weight'] = cppn.output_layer.weight.detach().float().cpu().numpy()
+    arrays['output_bias'] = cppn.output_layer.bias.detach().float().cpu().numpy()
+    
+    config = {
+        'input_dim': cppn.input_dim,
+        'hidden_dim': cppn.hidden_dim,
+        'num_layers': cppn.num_layers,
+        'output_dim': cppn.output_dim
+    }
+    info = {key: value for key, value in (metadata or {}).items() if key != 'cppn_config'}
+    arrays['config'] = np.array(json.dumps({'cppn_config': config, **info}, default=str))
+    
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(output_path, **arrays)
+    return output_path
+
+
+class NumpyCPPN:
+    """CPPN forward pass in NumPy with preallocated, cache-sized tiles."""
+    
+    def __init__(
+        self,
+        weights: List[np.ndarray],
+        biases: List[np.ndarray],
+        output_weight: np.ndarray,
+        output_bias: np.ndarray,
+        fast_math: bool = False,
+        l2_bytes: int = DEFAULT_L2_BYTES,
+        metadata: Optional[Dict] = None
+    ):
+        """
+        Initialize from weight arrays in nn.Linear layout (out, in).
+        
+        Args:
+            weights: Hidden layer weights, input layer first
+            biases: Hidden layer biases
+            output_weight: Output layer weight (3, hidden)
+            output_bias: Output layer bias (3,)
+            fast_math: Use polynomial sin / cos / exp
+            l2_bytes: Cache budget per tile
+            metadata: Optional checkpoint metadata (prompt, etc.)
+        """
+        self.weights_t = [np.ascontiguousarray(w.T, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.output_weight_t = np.ascontiguousarray(output_weight.T, dtype=np.float32)
+        self.output_bias = np.asarray(output_bias, dtype=np.float32)
+        self.fast_math = fast_math
+        self.metadata = metadata or {}
+        
+        self.input_dim = self.weights_t[0].shape[0]
+        self.hidden_dim = self.weights_t[0].shape[1]
+        self.num_layers = len(self.weights_t)
+        self.output_dim = self.output_weight_t.shape[1]
+        
+        # Working set per pixel: input row, two activation rows, two scratch rows, output
+        bytes_per_pixel = 4 * (self.input_dim + 4 * self.hidden_dim + self.output_dim)
+        self.tile_size = max(256, (l2_bytes // bytes_per_pixel) // 256 * 256)
+        
+        self._buffers = [np.empty((self.tile_size, self.hidden_dim), dtype=np.float32) for _ in range(4)]
+    
+    @classmethod
+    def load(cls, path: str, fast_math: bool = False, l2_bytes: int = DEFAULT_L2_BYTES) -> 'NumpyCPPN':
+        """
+        Load weights from an .npz export (torch-free) or a .pth style.
+        
+        Args:
+            path: .npz from export_weights(), or .pth (imports torch; old
+                checkpoints without 'cppn_config' assume cli.py defaults)
+            fast_math: Use polynomial sin / cos / exp
+            l2_bytes: Cache budget per tile
+        
+        Returns:
+            NumpyCPPN instance
+        """
+        path = Path(path)
+        if path.suffix == '.pth':
+            from cppn import load_cppn
+            cppn, metadata = load_cppn(str(path), input_dim=12, hidden_dim=256, num_layers=4, device='cpu')
+            return cls.from_cppn(cppn, fast_math=fast_math, l2_bytes=l2_bytes, metadata=metadata)
+        
+        with np.load(path) as data:
+            metadata = json.loads(str(data['config']))
+            num_layers = metadata['cppn_config']['num_layers']
+            return cls(
+                [data[f'weight_{i}'] for i in range(num_layers)],
+                [data[f'bias_{i}'] for i in range(num_layers)],
+                data['output_weight'],
+                data['output_bias'],
+                fast_math=fast_math,
+                l2_bytes=l2_bytes,
+                metadata=metadata
+            )
+    
+    @classmethod
+    def from_cppn(cls, cppn, fast_math: bool = False, l2_bytes: int = DEFAULT_L2_BYTES,
+                  metadata: Optional[Dict] = None) -> 'NumpyCPPN':
+        """Copy the weights of a torch CPPN."""
+        if getattr(cppn, 'encoding', None):
+            raise ValueError(f"NumpyCPPN supports plain CPPNs only (got a {cppn.encoding} CPPN)")
+        return cls(
+            [layer.weight.detach().float().cpu().numpy() for layer in cppn.layers],
+            [layer.bias.detach().float().cpu().numpy() for layer in cppn.layers],
+            cppn.output_layer.weight.detach().float().cpu().numpy(),
+            cppn.output_layer.bias.detach().float().cpu().numpy(),
+            fast_math=fast_math,
+            l2_bytes=l2_bytes,
+            metadata=metadata
+        )
+    
+    def count_parameters(self) -> int:
+        """Count parameters."""
+        return (sum(w.size + b.size for w, b in zip(self.weights_t, self.biases))
+                + self.output_weight_t.size + self.output_bias.size)
+    
+    def _activate(self, h: np.ndarray, layer_index: int, scratch_a: np.ndarray, scratch_b: np.ndarray):
+        """Apply layer `layer_index`'s activation in place (as cppn.cycle_activation)."""
+        kind = layer_index % 4
+        if kind == 0:
+            if self.fast_math:
+                fast_sin(h, scratch_a, scratch_b)
+            else:
+                np.sin(h, out=h)
+        elif kind == 1:
+            if self.fast_math:
+                fast_cos(h, scratch_a, scratch_b)
+            else:
+                np.cos(h, out=h)
+        elif kind == 2:
+            if self.fast_math:
+                fast_gaussian(h, scratch_a, scratch_b)
+            else:
+                np.multiply(h, h, out=h)
+                np.negative(h, out=h)
+                np.exp(h, out=h)
+        else:
+            np.tanh(h, out=h)
+    
+    def forward_tile(self, x: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Evaluate at most tile_size inputs into a caller-provided buffer.
+        
+        Args:
+            x: float32 inputs (n, input_dim), n <= tile_size
+            out: float32 output buffer (n, output_dim)
+        
+        Returns:
+            out, holding RGB in [0, 1]
+        """
+        n = len(x)
+        src, dst, scratch_a, scratch_b = (buffer[:n] for buffer in self._buffers)
+        
+        np.matmul(x, self.weights_t[0], out=src)
+        src += self.biases[0]
+        self._activate(src, 0, scratch_a, scratch_b)
+        
+        for i in range(1, self.num_layers):
+            np.matmul(src, self.weights_t[i], out=dst)
+            dst += self.biases[i]
+            self._activate(dst, i, scratch_a, scratch_b)
+            src, dst = dst, src
+        
+        np.matmul(src, self.output_weight_t, out=out)
+        out += self.output_bias
+        
+        # Sigmoid in place: 1 / (1 + exp(-z))
+        np.negative(out, out=out)
+        np.exp(out, out=out)
+        out += 1.0
+        np.reciprocal(out, out=out)
+        return out
+    
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """
+        Forward pass over any number of inputs.
+        
+        Args:
+            x: Inputs (batch_size, input_dim)
+        
+        Returns:
+            RGB output (batch_size, 3) as float32 in [0, 1]
+        """
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        out = np.empty((len(x), self.output_dim), dtype=np.float32)
+        for start in range(0, len(x), self.tile_size):
+            end = min(start + self.tile_size, len(x))
+            self.forward_tile(x[start:end], out[start:end])
+        return out
+
+
+class NumpyRenderer:
+    """Frame renderer for NumpyCPPN (same inputs and scaling as Renderer)."""
+    
+    def __init__(self, model: NumpyCPPN, resolution: Tuple[int, int] = (640, 360)):
+        """
+        Initialize renderer.
+        
+        Args:
+            model: NumpyCPPN, or any model with its tile interface
+                (tile_size, input_dim, output_dim, forward_tile), e.g.
+                cppn_onnx.OnnxCPPN
+            resolution: (width, height) in pixels
+        """
+        self.model = model
+        self.width, self.height = resolution
+        self.total_pixels = self.width * self.height
+        
+        x_coords = np.linspace(-COORD_SCALE, COORD_SCALE, self.width, dtype=np.float32)
+        y_coords = np.linspace(-COORD_SCALE, COORD_SCALE, self.height, dtype=np.float32)
+        xx, yy = np.meshgrid(x_coords, y_coords)
+        self.x_flat = xx.ravel()
+        self.y_flat = yy.ravel()
+        
+        # Reused per frame: tile input rows and the float RGB frame
+        self._tile_input = np.empty((model.tile_size, model.input_dim), dtype=np.float32)
+        self._rgb = np.empty((self.total_pixels, model.output_dim), dtype=np.float32)
+    
+    def render_frame(self, time: float, audio_features: np.ndarray) -> np.ndarray:
+        """
+        Render a single frame.
+        
+        Args:
+            time: Current time (0 to 1)
+            audio_features: Audio feature vector (already audio-scaled)
+        
+        Returns:
+            RGB image (height, width, 3) as numpy uint8
+        """
+        tile_input = self._tile_input
+        feature_dim = len(audio_features)
+        
+        # Time and audio are constant within a frame: fill them once
+        tile_input[:, 2] = time * 2.0 - 1.0
+        tile_input[:, 3:3 + feature_dim] = np.asarray(audio_features, dtype=np.float32) * 3.0
+        
+        for start in range(0, self.total_pixels, self.model.tile_size):
+            end = min(start + self.model.tile_size, self.total_pixels)
+            tile = tile_input[:end - start]
+            tile[:, 0] = self.x_flat[start:end]
+            tile[:, 1] = self.y_flat[start:end]
+            self.model.forward_tile(tile, self._rgb[start:end])
+        
+        return (self._rgb.reshape(self.height, self.width, -1) * 255).astype(np.uint8)
+    
+    def render_stills(self, times: Sequence[float], audio_features: np.ndarray) -> List[np.ndarray]:
+        """Render one frame per (time, feature row)."""
+        return [self.render_frame(t, row) for t, row in zip(times, audio_features)]
+    
+    def render_sequence(self, audio_analysis: dict, metrics=None) -> Iterator[np.ndarray]:
+        """
+        Render sequence of frames from audio analysis.
+        
+        Args:
+            audio_analysis: Dict with scaled 'features' and 'num_frames'
+            metrics: Optional FrameMetrics updated with every frame
+        
+        Returns:
+            Iterator of RGB frames (numpy uint8 arrays)
+        """
+        features = audio_analysis['features']
+        num_frames = audio_analysis['num_frames']
+        
+        for frame_idx in range(num_frames):
+            frame = self.render_frame(frame_idx / max(1, num_frames - 1), features[frame_idx])
+            if metrics is not None:
+                metrics.update(frame, features[frame_idx])
+            yield frame
+
+
+def max_error_vs_cppn(model: NumpyCPPN, cppn, num_samples: int = 65536, seed: int = 0) -> float:
+    """
+    Compare against CPPN.forward on random renderer-range inputs.
+    
+    Args:
+        model: NumpyCPPN to check
+        cppn: Torch CPPN it was exported from
+        num_samples: Number of random inputs
+        seed: Random seed
+    
+    Returns:
+        Maximum absolute RGB difference (0-1 scale)
+    """
+    import torch
+    
+    rng = np.random.default_rng(seed)
+    x = np.empty((num_samples, model.input_dim), dtype=np.float32)
+    x[:, :2] = rng.uniform(-COORD_SCALE, COORD_SCALE, (num_samples, 2))
+    x[:, 2] = rng.uniform(-1.0, 1.0, num_samples)
+    x[:, 3:] = rng.uniform(-3.0, 3.0, (num_samples, model.input_dim - 3)) * 0.3
+    
+    param = next(cppn.parameters())
+    cppn.eval()
+    with torch.no_grad():
+        reference = cppn(torch.from_numpy(x).to(param.device, dtype=param.dtype)).float().cpu().numpy()
+    
+    return float(np.abs(model(x) - reference).max())
+
+
+if __name__ == '__main__':
+    # Test NumPy backend against CPPN.forward and benchmark it
+    start = time.perf_counter()
+    model = NumpyCPPN(
+        [np.random.randn(8, 12), np.random.randn(8, 8)],
+        [np.zeros(8), np.zeros(8)],
+        np.random.randn(3, 8),
+        np.zeros(3)
+    )
+    print(f"NumPy CPPN ready in {1000 * (time.perf_counter() - start):.1f} ms "
+          f"(tile {model.tile_size:,} pixels)")
+    
+    from cppn import CPPN
+    
+    print("\nChecking against CPPN.forward...")
+    for hidden_dim, num_layers in [(8, 2), (32, 4), (256, 6)]:
+        cppn = CPPN(input_dim=12, hidden_dim=hidden_dim, num_layers=num_layers, device='cpu')
+        for fast_math in (False, True):
+            model = NumpyCPPN.from_cppn(cppn, fast_math=fast_math)
+            error = max_error_vs_cppn(model, cppn)
+            
+            renderer = NumpyRenderer(model, resolution=(640, 360))
+            features = np.random.rand(9).astype(np.float32) * 0.1
+            renderer.render_frame(0.5, features)
+            t0 = time.perf_counter()
+            for _ in range(5):
+                renderer.render_frame(0.5, features)
+            frame_ms = 1000 * (time.perf_counter() - t0) / 5
+            
+            print(f"  {num_layers}L × {hidden_dim}D fast_math={fast_math!s:<5}: "
+                  f"max error {error:.2e}, 360p frame {frame_ms:.1f} ms")
+    
+    print("\n[OK] NumPy CPPN test complete!")
@@ -0,0 +1,204 @@
+"""
+ONNX CPPN - Portable style export and onnxruntime inference
+
+export_onnx() writes any CPPN (e.g. a clip_optimize_cppn.py .pth style,
+architecture from its 'cppn_config') to an ONNX graph with a dynamic batch
+axis. The checkpoint metadata (cppn_config, prompt, similarity) is embedded
+in the model's metadata properties, so the .onnx file is a self-contained
+style.
+
+OnnxCPPN runs the graph with onnxruntime's CPU execution provider. It has
+the same tile interface as cppn_numpy.NumpyCPPN, so NumpyRenderer drives it
+unchanged: each tile's inputs and the renderer's preallocated RGB frame are
+bound to the session with I/O binding, and the outputs are written straight
+into the frame. Neither loading nor rendering imports torch.
+
+Usage:
+    export_onnx(cppn, 'style.onnx', metadata)    # or tools/export_onnx_style.py
+    
+    model = OnnxCPPN('style.onnx', num_threads=4)
+    renderer = NumpyRenderer(model, resolution=(1920, 1080))
+    frame = renderer.render_frame(0.5, audio_features)
+"""
+
+import copy
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# ONNX opset used for export (onnxruntime >= 1.12)
+OPSET_VERSION = 17
+
+# Pixels per onnxruntime call; large enough to amortize the call overhead
+DEFAULT_TILE_SIZE = 65536
+
+INPUT_NAME = 'input'
+OUTPUT_NAME = 'rgb'
+
+
+def export_onnx(cppn, output_path: str, metadata: Optional[Dict] = None,
+                opset_version: int = OPSET_VERSION) -> Path:
+    """
+    Export a CPPN to ONNX with a dynamic batch axis.
+    
+    Args:
+        cppn: CPPN or FourierCPPN instance (exported as fp32 on CPU)
+        output_path: Destination .onnx path
+        metadata: Optional checkpoint metadata (prompt, similarity, ...)
+        opset_version: ONNX opset
+    
+    Returns:
+        Path to the written file
+    """
+    import torch
+    
+    model = copy.deepcopy(cppn).float().cpu().eval()
+    example = torch.zeros((1024, cppn.input_dim), dtype=torch.float32)
+    
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            example,
+            str(output_path),
+            input_names=[INPUT_NAME],
+            output_names=[OUTPUT_NAME],
+            dynamic_axes={INPUT_NAME: {0: 'batch'}, OUTPUT_NAME: {0: 'batch'}},
+            opset_version=opset_version
+        )
+    
+    if hasattr(cppn, 'cppn_config'):
+        config = cppn.cppn_config()
+    else:
+        config = {
+            'input_dim': cppn.input_dim,
+            'hidden_dim': cppn.hidden_dim,
+            'num_layers': cppn.num_layers,
+            'output_dim': cppn.output_dim
+        }
+    info = {key: value for key, value in (metadata or {}).items() if key != 'cppn_config'}
+    
+    try:
+        import onnx
+        
+        graph = onnx.load(str(output_path))
+        onnx.helper.set_model_props(graph, {'cppn': json.dumps({'cppn_config': config, **info}, default=str)})
+        onnx.save(graph, str(output_path))
+    except ImportError:
+        print("Warning: onnx package not installed. Style metadata not embedded in the .onnx file")
+    
+    return output_path
+
+
+class OnnxCPPN:
+    """CPPN inference with onnxruntime (CPU) and I/O binding into caller buffers."""
+    
+    def __init__(self, path: str, num_threads: Optional[int] = None, tile_size: int = DEFAULT_TILE_SIZE):
+        """
+        Load an exported style.
+        
+        Args:
+            path: .onnx file from export_onnx()
+            num_threads: onnxruntime intra-op threads (default: onnxruntime's
+                choice, one per physical core)
+            tile_size: Pixels per onnxruntime call
+        """
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        
+        self.path = Path(path)
+        self.session = ort.InferenceSession(str(path), sess_options=options, providers=['CPUExecutionProvider'])
+        
+        custom = self.session.get_modelmeta().custom_metadata_map
+        self.metadata = json.loads(custom['cppn']) if 'cppn' in custom else {}
+        config = self.metadata.get('cppn_config', {})
+        
+        graph_input = self.session.get_inputs()[0]
+        graph_output = self.session.get_outputs()[0]
+        self.input_name = graph_input.name
+        self.output_name = graph_output.name
+        self.input_dim = graph_input.shape[1]
+        self.output_dim = graph_output.shape[1]
+        self.hidden_dim = config.get('hidden_dim')
+        self.num_layers = config.get('num_layers')
+        self.num_threads = num_threads
+        self.tile_size = tile_size
+        
+        self._binding = self.session.io_binding()
+    
+    def forward_tile(self, x: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Evaluate inputs straight into a caller-provided buffer.
+        
+        Args:
+            x: C-contiguous float32 inputs (n, input_dim)
+            out: C-contiguous float32 output buffer (n, output_dim)
+        
+        Returns:
+            out, holding RGB in [0, 1]
+        """
+        binding = self._binding
+        binding.bind_input(self.input_name, 'cpu', 0, np.float32, list(x.shape), x.ctypes.data)
+        binding.bind_output(self.output_name, 'cpu', 0, np.float32, list(out.shape), out.ctypes.data)
+        self.session.run_with_iobinding(binding)
+        return out
+    
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """
+        Forward pass over any number of inputs.
+        
+        Args:
+            x: Inputs (batch_size, input_dim)
+        
+        Returns:
+            RGB output (batch_size, 3) as float32 in [0, 1]
+        """
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        out = np.empty((len(x), self.output_dim), dtype=np.float32)
+        for start in range(0, len(x), self.tile_size):
+            end = min(start + self.tile_size, len(x))
+            self.forward_tile(x[start:end], out[start:end])
+        return out
+
+
+if __name__ == '__main__':
+    # Test ONNX export against CPPN.forward and benchmark onnxruntime
+    import tempfile
+    
+    from cppn import CPPN
+    from cppn_numpy import NumpyCPPN, NumpyRenderer, max_error_vs_cppn
+    
+    print("Testing ONNX export and onnxruntime inference...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for hidden_dim, num_layers in [(8, 2), (32, 4), (256, 6)]:
+            cppn = CPPN(input_dim=12, hidden_dim=hidden_dim, num_layers=num_layers, device='cpu')
+            path = export_onnx(cppn, Path(tmp_dir) / f"cppn_{num_layers}x{hidden_dim}.onnx")
+            
+            print(f"\n{num_layers}L × {hidden_dim}D:")
+            features = np.random.rand(9).astype(np.float32) * 0.1
+            for name, model in [('numpy', NumpyCPPN.from_cppn(cppn)), ('onnxruntime', OnnxCPPN(path))]:
+                error = max_error_vs_cppn(model, cppn)
+                
+                renderer = NumpyRenderer(model, resolution=(1280, 720))
+                renderer.render_frame(0.5, features)
+                start = time.perf_counter()
+                for _ in range(5):
+                    renderer.render_frame(0.5, features)
+                frame_ms = 1000 * (time.perf_counter() - start) / 5
+                
+                print(f"  {name:<12} max error {error:.2e}, 720p frame {frame_ms:.1f} ms")
+    
+    print("\n[OK] ONNX CPPN test complete!")
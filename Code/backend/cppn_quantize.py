@@ -0,0 +1,297 @@
+"""
+Quantized CPPN - Int8 dynamic quantization for large CPU renders
+
+Wide CLIP-trained styles (256 hidden, 4-10 layers) spend almost all of their
+CPU render time in fp32 matmuls, and use_fp16 only applies on CUDA.
+quantize_cppn() wraps a CPPN so its Linear layers run as int8 dynamic
+quantized matmuls (int8 weights, activations quantized per batch at run time).
+
+Quantization error is amplified by the periodic activations, so layers are
+calibrated one by one on representative renderer inputs (random pixel
+coordinates, times and feature rows of the track being rendered): each layer
+is quantized on top of the layers already accepted and kept only while the
+output PSNR against fp32 stays above `min_psnr`. Rejected layers stay fp32.
+
+Usage:
+    qcppn = quantize_cppn(cppn, features=scaled_features, min_psnr=40.0)
+    renderer = Renderer(qcppn, resolution=(1920, 1080))
+    
+    python cppn_quantize.py    # benchmark fp32 vs int8
+"""
+
+import math
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+try:
+    from torch.ao.quantization import quantize_dynamic
+except ImportError:  # torch < 1.10
+    from torch.quantization import quantize_dynamic
+
+from cppn import cycle_activation
+
+
+# Output PSNR (dB) vs fp32 a quantized layer must keep; 8-bit frame rounding alone is ~59 dB
+DEFAULT_MIN_PSNR = 40.0
+
+# Quantized kernels in order of preference
+ENGINES = ('x86', 'fbgemm', 'qnnpack')
+
+
+def select_engine() -> Optional[str]:
+    """Pick a supported quantized engine for this CPU (None if there is none)."""
+    supported = torch.backends.quantized.supported_engines
+    if torch.backends.quantized.engine in ENGINES:
+        return torch.backends.quantized.engine
+    
+    for engine in ENGINES:
+        if engine in supported:
+            torch.backends.quantized.engine = engine
+            return engine
+    return None
+
+
+def psnr(reference: torch.Tensor, output: torch.Tensor) -> float:
+    """Peak signal-to-noise ratio (dB) of [0, 1] outputs against a reference."""
+    mse = torch.mean((output.float() - reference.float()) ** 2).item()
+    return math.inf if mse == 0 else 10 * math.log10(1.0 / mse)
+
+
+def calibration_inputs(
+    input_dim: int,
+    features: Optional[np.ndarray] = None,
+    num_samples: int = 32768,
+    seed: int = 0
+) -> torch.Tensor:
+    """
+    Random CPPN inputs with the renderer's scaling.
+    
+    Args:
+        input_dim: Number of input features (x, y, time + audio)
+        features: Scaled audio features (num_frames, feature_dim) of the
+            track; rows are sampled with their frame times. Without them,
+            audio inputs are drawn from the default --audio-scale range
+        num_samples: Number of inputs
+        seed: Random seed
+    
+    Returns:
+        float32 CPU tensor (num_samples, input_dim)
+    """
+    rng = np.random.default_rng(seed)
+    x = np.empty((num_samples, input_dim), dtype=np.float32)
+    x[:, :2] = rng.uniform(-0.5, 0.5, (num_samples, 2))
+    
+    if features is not None and len(features):
+        frames = rng.integers(0, len(features), num_samples)
+        x[:, 2] = frames / max(1, len(features) - 1) * 2.0 - 1.0
+        x[:, 3:] = np.asarray(features, dtype=np.float32)[frames] * 3.0
+    else:
+        # Min-max normalized features × default audio scale 0.05 × renderer's 3.0
+        x[:, 2] = rng.uniform(-1.0, 1.0, num_samples)
+        x[:, 3:] = rng.uniform(0.0, 0.15, (num_samples, input_dim - 3))
+    
+    return torch.from_numpy(x)
+
+
+def quantize_linear(layer: nn.Linear) -> nn.Module:
+    """Int8 dynamic quantized copy of a Linear layer (the original is untouched)."""
+    return quantize_dynamic(nn.Sequential(layer), {nn.Linear}, dtype=torch.qint8)[0]
+
+
+class QuantizedCPPN(nn.Module):
+    """CPPN wrapper running calibrated Linear layers as int8 dynamic quantized matmuls."""
+    
+    def __init__(
+        self,
+        cppn,
+        features: Optional[np.ndarray] = None,
+        min_psnr: float = DEFAULT_MIN_PSNR,
+        num_samples: int = 32768
+    ):
+        """
+        Calibrate and quantize a CPPN.
+        
+        Args:
+            cppn: fp32 CPPN on CPU (keeps the authoritative weights)
+            features: Scaled audio features of the track, for calibration
+            min_psnr: Lowest output PSNR (dB) vs fp32 allowed per accepted layer
+            num_samples: Number of calibration inputs
+        """
+        super().__init__()
+        
+        if cppn.device != 'cpu' or next(cppn.parameters()).dtype != torch.float32:
+            raise ValueError("Int8 quantization needs an fp32 CPPN on CPU")
+        
+        self.cppn = cppn
+        self.min_psnr = min_psnr
+        
+        self.input_dim = cppn.input_dim
+        self.hidden_dim = cppn.hidden_dim
+        self.num_layers = cppn.num_layers
+        self.output_dim = cppn.output_dim
+        self.device = cppn.device
+        
+        # Hidden layers, then the output layer (index num_layers)
+        self._fp32 = list(cppn.layers) + [cppn.output_layer]
+        self._layers = list(self._fp32)
+        self.quantized: List[int] = []
+        self.report: Dict = {}
+        self._stale = False
+        
+        self._calibrate(calibration_inputs(cppn.input_dim, features, num_samples))
+    
+    def _run(self, x: torch.Tensor, layers: List[nn.Module]) -> torch.Tensor:
+        """CPPN.forward with the given layer modules."""
+        for i in range(self.num_layers):
+            x = cycle_activation(layers[i](x), i)
+        return torch.sigmoid(layers[-1](x))
+    
+    def _calibrate(self, x: torch.Tensor):
+        """Greedily quantize layers while the output PSNR stays above min_psnr."""
+        self.cppn.eval()
+        layer_reports = []
+        score = math.inf
+        
+        with torch.no_grad():
+            reference = self.cppn(x)
+            
+            for i, layer in enumerate(self._fp32):
+                candidate = list(self._layers)
+                candidate[i] = quantize_linear(layer)
+                candidate_score = psnr(reference, self._run(x, candidate))
+                
+                keep = candidate_score >= self.min_psnr
+                if keep:
+                    self._layers = candidate
+                    self.quantized.append(i)
+                    score = candidate_score
+                
+                layer_reports.append({
+                    'layer': 'output' if i == self.num_layers else i,
+                    'quantized': keep,
+                    'psnr': candidate_score
+                })
+            
+            timings = {}
+            for name, layers in (('fp32', self._fp32), ('int8', self._layers)):
+                self._run(x, layers)
+                start = time.perf_counter()
+                for _ in range(3):
+                    self._run(x, layers)
+                timings[name] = (time.perf_counter() - start) / 3
+        
+        self.report = {
+            'layers': layer_reports,
+            'quantized_layers': len(self.quantized),
+            'psnr': score,
+            'speedup': timings['fp32'] / timings['int8']
+        }
+    
+    def _requantize(self):
+        """Re-quantize accepted layers from the (evolved) fp32 weights."""
+        for i in self.quantized:
+            self._layers[i] = quantize_linear(self._fp32[i])
+        self._stale = False
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Forward pass with the quantized layers.
+        
+        Args:
+            x: Input tensor (batch_size, input_dim)
+        
+        Returns:
+            RGB output (batch_size, 3) in range [0, 1]
+        """
+        if self._stale:
+            self._requantize()
+        return self._run(x, self._layers)
+    
+    def count_parameters(self) -> int:
+        """Count trainable parameters."""
+        return self.cppn.count_parameters()
+    
+    def evolve_weights(self, mutation_rate: float = 0.01):
+        """
+        Evolve the underlying CPPN's weights (re-quantized on next use, with
+        the calibrated layer choice kept).
+        
+        Args:
+            mutation_rate: Amount of random mutation to apply
+        """
+        self.cppn.evolve_weights(mutation_rate=mutation_rate)
+        self._stale = True
+
+
+def quantize_cppn(cppn, features: Optional[np.ndarray] = None, min_psnr: float = DEFAULT_MIN_PSNR):
+    """
+    Wrap a CPPN for int8 inference, printing the calibration report.
+    
+    Args:
+        cppn: CPPN network instance
+        features: Scaled audio features of the track, for calibration
+        min_psnr: Lowest output PSNR (dB) vs fp32 allowed per accepted layer
+    
+    Returns:
+        QuantizedCPPN (or the CPPN itself when quantization is unavailable)
+    """
+    if cppn.device != 'cpu' or next(cppn.parameters()).dtype != torch.float32:
+        print("Warning: Int8 quantization applies to fp32 CPU renders only. Using the CPPN as is...")
+        return cppn
+    
+    if getattr(cppn, 'encoding', None):
+        print(f"Warning: Int8 quantization supports plain CPPNs only (got a {cppn.encoding} CPPN). Using fp32...")
+        return cppn
+    
+    engine = select_engine()
+    if engine is None:
+        print("Warning: No quantized CPU engine available in this torch build. Using fp32...")
+        return cppn
+    
+    print(f"CPPN int8 quantization ({engine}), calibrating against fp32 (min {min_psnr:.0f} dB)...")
+    qcppn = QuantizedCPPN(cppn, features=features, min_psnr=min_psnr)
+    
+    for layer in qcppn.report['layers']:
+        status = 'int8' if layer['quantized'] else 'fp32 (fallback)'
+        print(f"  Layer {layer['layer']!s:<6} {layer['psnr']:6.1f} dB -> {status}")
+    print(f"  {qcppn.report['quantized_layers']}/{len(qcppn.report['layers'])} layers int8, "
+          f"output PSNR {qcppn.report['psnr']:.1f} dB, {qcppn.report['speedup']:.1f}x vs fp32")
+    
+    return qcppn
+
+
+if __name__ == '__main__':
+    # Benchmark fp32 vs int8 inference on CPU
+    from cppn import CPPN
+    
+    print("Benchmarking int8 CPPN inference (CPU)...")
+    
+    batch_size = 100000  # Renderer's CPU batch size
+    repeats = 5
+    
+    for hidden_dim, num_layers in [(32, 4), (256, 4), (256, 6), (256, 10)]:
+        cppn = CPPN(input_dim=12, hidden_dim=hidden_dim, num_layers=num_layers, device='cpu')
+        qcppn = quantize_cppn(cppn)
+        if qcppn is cppn:
+            break
+        
+        x = calibration_inputs(12, num_samples=batch_size, seed=1)
+        timings = {}
+        outputs = {}
+        for name, model in [('fp32', cppn), ('int8', qcppn)]:
+            with torch.no_grad():
+                outputs[name] = model(x)
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    model(x)
+            timings[name] = (time.perf_counter() - start) / repeats
+        
+        print(f"\n{num_layers}L × {hidden_dim}D: fp32 {1000 * timings['fp32']:.1f} ms, "
+              f"int8 {1000 * timings['int8']:.1f} ms/batch ({timings['fp32'] / timings['int8']:.1f}x), "
+              f"held-out PSNR {psnr(outputs['fp32'], outputs['int8']):.1f} dB\n")
+    
+    print("[OK] Benchmark complete!")
@@ -0,0 +1,217 @@
+"""
+Frame Metrics - Streaming visual quality statistics for rendered sequences
+
+Computes cheap, automatic stand-ins for the manual ratings in
+tools/rate_architectures.py while frames are rendered:
+
+- spatial_entropy: luminance histogram entropy (0 = flat, 1 = uniform spread)
+- edge_density: fraction of pixels on a strong luminance edge
+- color_diversity: entropy of a coarse RGB histogram (0-1)
+- flicker: mean absolute frame-to-frame change (0-1)
+- av_onset_corr / av_rms_corr: correlation between frame change and the
+  audio onset strength / RMS energy (audio reactivity)
+
+Frames are strided down to at most `max_side` pixels per side before any
+statistic is taken, and per-frame values are folded into running sums, so
+the cost per frame is a few small NumPy reductions regardless of resolution.
+
+Usage:
+    metrics = FrameMetrics()
+    for frame in renderer.render_sequence(analysis, metrics=metrics):
+        ...
+    summary = metrics.summary()
+"""
+
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+# Column indices of onset strength ('flux') and 'rms' in AudioAnalyzer features
+FLUX_COLUMN = 5
+RMS_COLUMN = 8
+
+# Histogram sizes
+_LUMA_BINS = 32
+_COLOR_LEVELS = 8  # per channel -> 512 color bins
+
+# Luminance step (0-255) counted as an edge between neighbouring samples
+_EDGE_THRESHOLD = 24.0
+
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Weights of the heuristic quality score used for automatic ranking
+SCORE_WEIGHTS = {
+    'spatial_entropy': 0.3,
+    'color_diversity': 0.2,
+    'coherence': 0.2,
+    'reactivity': 0.3
+}
+
+# Per-frame statistics accumulated as running sums (in this order)
+_FRAME_STATS = ('spatial_entropy', 'edge_density', 'color_diversity', 'flicker')
+
+
+def _normalized_entropy(counts: np.ndarray) -> float:
+    """Shannon entropy of a histogram, scaled to [0, 1]."""
+    p = counts[counts > 0] / counts.sum()
+    return float(-(p * np.log2(p)).sum() / np.log2(len(counts)))
+
+
+def _correlation(n: int, sx: float, sy: float, sxx: float, syy: float, sxy: float) -> float:
+    """Pearson correlation from running sums (0 when undefined)."""
+    if n < 2:
+        return 0.0
+    cov = sxy - sx * sy / n
+    var_x = sxx - sx * sx / n
+    var_y = syy - sy * sy / n
+    if var_x <= 1e-12 or var_y <= 1e-12:
+        return 0.0
+    return float(cov / np.sqrt(var_x * var_y))
+
+
+def quality_score(summary: Dict) -> float:
+    """
+    Combine metric summaries into one heuristic score for ranking.
+    
+    Rewards varied structure and colour, temporal coherence (low flicker)
+    and frame changes that follow the audio.
+    
+    Args:
+        summary: Dict from FrameMetrics.summary()
+    
+    Returns:
+        Score in [0, 1] (higher is better)
+    """
+    coherence = 1.0 / (1.0 + 20.0 * summary.get('flicker', 0.0))
+    reactivity = max(0.0, summary.get('av_onset_corr', 0.0), summary.get('av_rms_corr', 0.0))
+    
+    components = {
+        'spatial_entropy': summary.get('spatial_entropy', 0.0),
+        'color_diversity': summary.get('color_diversity', 0.0),
+        'coherence': coherence,
+        'reactivity': reactivity
+    }
+    return float(sum(SCORE_WEIGHTS[name] * value for name, value in components.items()))
+
+
+class FrameMetrics:
+    """Streaming quality statistics over a rendered frame sequence."""
+    
+    def __init__(self, max_side: int = 64, audio_columns: Sequence[int] = (FLUX_COLUMN, RMS_COLUMN)):
+        """
+        Initialize metrics accumulator.
+        
+        Args:
+            max_side: Longest side of the downsampled frame used for statistics
+            audio_columns: Feature columns correlated with frame change
+                (onset strength, RMS)
+        """
+        self.max_side = max_side
+        self.audio_columns = list(audio_columns)
+        
+        self.num_frames = 0
+        self.elapsed = 0.0
+        
+        self._sums = np.zeros(len(_FRAME_STATS))
+        self._sq_sums = np.zeros(len(_FRAME_STATS))
+        self._previous: Optional[np.ndarray] = None
+        
+        # Running sums for correlating frame change with each audio column
+        num_audio = len(self.audio_columns)
+        self._av_n = 0
+        self._av_sx = 0.0
+        self._av_sxx = 0.0
+        self._av_sy = np.zeros(num_audio)
+        self._av_syy = np.zeros(num_audio)
+        self._av_sxy = np.zeros(num_audio)
+    
+    def update(self, frame: np.ndarray, audio_features: Optional[np.ndarray] = None):
+        """
+        Add one rendered frame.
+        
+        Args:
+            frame: RGB frame (H, W, 3) as uint8
+            audio_features: Audio feature vector the frame was rendered from
+        """
+        start = time.perf_counter()
+        
+        stride = max(1, -(-max(frame.shape[:2]) // self.max_side))
+        small = frame[::stride, ::stride].astype(np.float32)
+        luma = small @ _LUMA_WEIGHTS
+        
+        # Spatial entropy of the luminance histogram
+        luma_bins = np.minimum((luma * (_LUMA_BINS / 256.0)).astype(np.intp), _LUMA_BINS - 1)
+        entropy = _normalized_entropy(np.bincount(luma_bins.ravel(), minlength=_LUMA_BINS))
+        
+        # Edge density from horizontal / vertical luminance steps
+        grad_x = np.abs(np.diff(luma, axis=1))[:-1, :]
+        grad_y = np.abs(np.diff(luma, axis=0))[:, :-1]
+        edge_density = float(np.mean(np.maximum(grad_x, grad_y) > _EDGE_THRESHOLD)) if grad_x.size else 0.0
+        
+        # Color diversity of a coarse RGB histogram
+        levels = (small * (_COLOR_LEVELS / 256.0)).astype(np.intp)
+        color_index = (levels[..., 0] * _COLOR_LEVELS + levels[..., 1]) * _COLOR_LEVELS + levels[..., 2]
+        color_diversity = _normalized_entropy(
+            np.bincount(color_index.ravel(), minlength=_COLOR_LEVELS ** 3)
+        )
+        
+        # Temporal flicker: frame-difference energy
+        if self._previous is not None:
+            flicker = float(np.mean(np.abs(small - self._previous)) / 255.0)
+        else:
+            flicker = 0.0
+        
+        values = np.array([entropy, edge_density, color_diversity, flicker])
+        self._sums += values
+        self._sq_sums += values * values
+        
+        # Correlate frame change with audio (needs a previous frame)
+        if (self._previous is not None and audio_features is not None
+                and len(audio_features) > max(self.audio_columns, default=-1)):
+            audio = np.asarray(audio_features, dtype=np.float64)[self.audio_columns]
+            self._av_n += 1
+            self._av_sx += flicker
+            self._av_sxx += flicker * flicker
+            self._av_sy += audio
+            self._av_syy += audio * audio
+            self._av_sxy += flicker * audio
+        
+        self._previous = small
+        self.num_frames += 1
+        self.elapsed += time.perf_counter() - start
+    
+    def summary(self) -> Dict:
+        """
+        Summarize the sequence.
+        
+        Returns:
+            Dict with the mean of each statistic, 'flicker_std',
+            'av_onset_corr', 'av_rms_corr', 'score', 'num_frames' and
+            'overhead_s' (time spent computing metrics)
+        """
+        if self.num_frames == 0:
+            return {'num_frames': 0}
+        
+        means = self._sums / self.num_frames
+        summary = {name: float(value) for name, value in zip(_FRAME_STATS, means)}
+        
+        # Flicker is undefined on the first frame
+        changes = max(1, self.num_frames - 1)
+        flicker_mean = self._sums[3] / changes
+        summary['flicker'] = float(flicker_mean)
+        summary['flicker_std'] = float(np.sqrt(max(0.0, self._sq_sums[3] / changes - flicker_mean ** 2)))
+        
+        correlations = [
+            _correlation(self._av_n, self._av_sx, self._av_sy[i], self._av_sxx, self._av_syy[i], self._av_sxy[i])
+            for i in range(len(self.audio_columns))
+        ]
+        summary['av_onset_corr'] = correlations[0] if correlations else 0.0
+        summary['av_rms_corr'] = correlations[1] if len(correlations) > 1 else 0.0
+        
+        summary['score'] = quality_score(summary)
+        summary['num_frames'] = self.num_frames
+        summary['overhead_s'] = self.elapsed
+        
+        return summary
@@ -8,13 +8,17 @@ Provides 527 audio classes including instruments, vocals, genres, and sound text
 import time
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import torch
 import torch.nn.functional as F
 import torchaudio
+import torchaudio.compliance.kaldi as ta_kaldi
 from transformers import (
+    ASTFeatureExtractor,
+    AutoConfig,
     AutoFeatureExtractor,
     AutoModelForAudioClassification,
 )
@@ -22,6 +26,43 @@ from transformers import (
 
 DEFAULT_MODEL = "MIT/ast-finetuned-audioset-10-10-0.4593"
 
+# Supported post-training quantization modes (CPU only)
+QUANTIZE_MODES = ("int8",)
+
+# Default location for cached quantized weights
+QUANTIZED_CACHE_DIR = Path.home() / ".cache" / "music_analysis" / "quantized"
+
+
+@lru_cache(maxsize=4)
+def _load_resampled_waveform(
+    audio_path: str, mtime_ns: int, target_sr: int
+) -> torch.Tensor:
+    """
+    Load an audio file as a normalized mono waveform at `target_sr`.
+
+    Results are cached (keyed on path and modification time) so repeated
+    analyses of the same file skip decoding and resampling.
+
+    Args:
+        audio_path: Resolved path to audio file
+        mtime_ns: File modification time, used to invalidate the cache
+        target_sr: Sample rate expected by the feature extractor
+
+    Returns:
+        1-D waveform tensor scaled to [-1, 1]
+    """
+    waveform, sample_rate = torchaudio.load(audio_path)
+
+    # Convert to mono to match model expectations
+    if waveform.dim() == 2:
+        waveform = waveform.mean(dim=0)
+
+    if sample_rate != target_sr:
+        waveform = torchaudio.functional.resample(waveform, sample_rate, target_sr)
+
+    # Normalize waveform to [-1, 1]
+    return waveform / waveform.abs().max().clamp(min=1e-8)
+
 
 @dataclass
 class AudioEventPrediction:
@@ -40,6 +81,7 @@ class AudioEventClassifier:
         model_name: str = DEFAULT_MODEL,
         device: Optional[str] = None,
         cache_dir: Optional[str] = None,
+        quantize: Optional[str] = None,
     ) -> None:
         """
         Initialize genre classifier.
@@ -48,17 +90,32 @@ class AudioEventClassifier:
             model_name: HuggingFace model identifier
             device: Preferred device ('cpu', 'cuda', or None for auto)
             cache_dir: Optional directory for model cache
+            quantize: Optional quantization mode ('int8' for dynamic
+                quantization of Linear layers, CPU only)
         """
+        if quantize is not None and quantize not in QUANTIZE_MODES:
+            raise ValueError(
+                f"Unsupported quantization mode: {quantize} "
+                f"(choose from {', '.join(QUANTIZE_MODES)})"
+            )
+
         self.model_name = model_name
         self.cache_dir = cache_dir
+        self.quantize = quantize
         self.device = self._resolve_device(device)
         self.version = "0.1.0"
 
-        self.model = AutoModelForAudioClassification.from_pretrained(
-            model_name,
-            cache_dir=cache_dir,
-            trust_remote_code=True,
-        ).to(self.device)
+        if quantize and self.device != "cpu":
+            print(
+                f"Warning: {quantize} quantization is CPU-only, "
+                f"ignoring device '{self.device}'"
+            )
+            self.device = "cpu"
+
+        if quantize:
+            self.model = self._load_quantized_model()
+        else:
+            self.model = self._load_float_model().to(self.device)
         self.model.eval()
 
         self.feature_extractor = AutoFeatureExtractor.from_pretrained(
@@ -78,6 +135,10 @@ class AudioEventClassifier:
         window_seconds: float = 10.0,
         overlap: float = 0.25,
         max_chunks: Optional[int] = None,
+        batch_size: int = 8,
+        early_stop: bool = False,
+        stop_tolerance: float = 0.02,
+        min_chunks: int = 4,
     ) -> Dict:
         """
         Analyze audio file and detect audio events.
@@ -88,6 +149,12 @@ class AudioEventClassifier:
             window_seconds: Analysis window size in seconds (default 10s for AST)
             overlap: Window overlap ratio (0.0 - 0.9)
             max_chunks: Optional maximum number of chunks to process
+            batch_size: Number of chunks per model forward pass
+            early_stop: Process chunks in strided order and stop once the
+                primary label has settled (useful when only tagging)
+            stop_tolerance: Maximum change in the top-1 vs top-2 probability
+                margin between batches for the result to count as stable
+            min_chunks: Minimum number of chunks processed before stopping
 
         Returns:
             Dictionary containing audio event predictions and metadata
@@ -95,68 +162,71 @@ class AudioEventClassifier:
         start_time = time.time()
         audio_path = Path(audio_path)
 
-        waveform, sample_rate = torchaudio.load(str(audio_path))
-
-        # Convert to mono to match model expectations
-        if waveform.dim() == 2:
-            waveform = waveform.mean(dim=0)
-
-        target_sr = self.feature_extractor.sampling_rate
-        if sample_rate != target_sr:
-            waveform = torchaudio.functional.resample(
-                waveform, sample_rate, target_sr
-            )
-            sample_rate = target_sr
-
-        # Normalize waveform to [-1, 1]
-        waveform = waveform / waveform.abs().max().clamp(min=1e-8)
+        sample_rate = self.feature_extractor.sampling_rate
+        waveform = _load_resampled_waveform(
+            str(audio_path.resolve()), audio_path.stat().st_mtime_ns, sample_rate
+        )
 
         chunk_samples = max(int(window_seconds * sample_rate), 1)
         total_samples = waveform.shape[-1]
 
         if total_samples <= chunk_samples:
-            segments = [waveform]
+            segment_length = total_samples
             segment_ranges = [(0, total_samples)]
         else:
+            segment_length = chunk_samples
             step = max(int(chunk_samples * (1.0 - overlap)), 1)
-            segments = []
+
+            # Snap the hop to the filterbank frame grid so every window's
+            # features are an exact slice of the shared filterbank
+            if self._shared_fbank:
+                frame_shift = self._fbank_frame_shift(sample_rate)
+                step = max(round(step / frame_shift), 1) * frame_shift
+
             segment_ranges = []
             for start in range(0, total_samples, step):
                 end = min(start + chunk_samples, total_samples)
-                chunk = waveform[start:end]
-
-                if chunk.shape[-1] < chunk_samples:
-                    padding = chunk_samples - chunk.shape[-1]
-                    chunk = F.pad(chunk, (0, padding))
-
-                segments.append(chunk)
                 segment_ranges.append((start, end))
 
-                if max_chunks and len(segments) >= max_chunks:
+                if max_chunks and len(segment_ranges) >= max_chunks:
                     break
 
-        logits_list: List[torch.Tensor] = []
-        chunk_predictions: List[Dict] = []
         analysis_top_k = max(1, min(top_k, len(self.labels)))
 
-        for idx, (chunk, (start_idx, end_idx)) in enumerate(
-            zip(segments, segment_ranges)
-        ):
-            inputs = self.feature_extractor(
-                chunk.cpu().numpy(),
-                sampling_rate=sample_rate,
-                return_tensors="pt",
+        # Build features for every chunk up front, then run the model in
+        # mini-batches so the transformer matmuls are large enough to
+        # saturate the available cores.
+        inputs, pad_value = self._extract_chunk_features(
+            waveform, segment_ranges, segment_length, sample_rate
+        )
+        pad_to = getattr(self.feature_extractor, "max_length", None)
+
+        if early_stop:
+            chunk_order, chunk_logits, stopped_early = self._infer_logits_adaptive(
+                inputs,
+                batch_size,
+                stop_tolerance=stop_tolerance,
+                min_chunks=min_chunks,
+                pad_to=pad_to,
+                pad_value=pad_value,
             )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-            with torch.no_grad():
-                outputs = self.model(**inputs)
+        else:
+            chunk_order = list(range(len(segment_ranges)))
+            chunk_logits = self._infer_logits(
+                inputs, batch_size, pad_to=pad_to, pad_value=pad_value
+            )
+            stopped_early = False
 
-            logits = outputs.logits[0].cpu()
-            logits_list.append(logits)
+        chunk_probabilities = torch.softmax(chunk_logits, dim=-1)
+        chunk_scores, chunk_indices = torch.topk(
+            chunk_probabilities, analysis_top_k, dim=-1
+        )
 
-            probabilities = torch.softmax(logits, dim=-1)
-            scores, indices = torch.topk(probabilities, analysis_top_k)
+        chunk_predictions: List[Dict] = []
+        for row, idx in enumerate(chunk_order):
+            start_idx, end_idx = segment_ranges[idx]
+            scores = chunk_scores[row]
+            indices = chunk_indices[row]
 
             chunk_predictions.append(
                 {
@@ -176,7 +246,7 @@ class AudioEventClassifier:
                 }
             )
 
-        avg_logits = torch.stack(logits_list, dim=0).mean(dim=0)
+        avg_logits = chunk_logits.mean(dim=0)
         probabilities = torch.softmax(avg_logits, dim=-1)
         scores, indices = torch.topk(probabilities, analysis_top_k)
 
@@ -214,18 +284,423 @@ class AudioEventClassifier:
                 "analyzer": "audio_event_classifier",
                 "version": self.version,
                 "model_name": self.model_name,
+                "quantize": self.quantize,
                 "model_labels_count": len(self.labels),
                 "device": self.device,
                 "sample_rate": sample_rate,
                 "window_seconds": window_seconds,
                 "overlap": overlap,
                 "num_chunks": len(chunk_predictions),
+                "batch_size": batch_size,
+                "shared_filterbank": self._shared_fbank,
+                "early_stopping": {
+                    "enabled": early_stop,
+                    "stop_tolerance": stop_tolerance if early_stop else None,
+                    "chunks_used": len(chunk_predictions),
+                    "chunks_available": len(segment_ranges),
+                    "stopped_early": stopped_early,
+                },
                 "timestamp": datetime.now().isoformat(),
             },
         }
 
         return results
 
+    def _load_float_model(self) -> torch.nn.Module:
+        """Load the full-precision model from HuggingFace."""
+        return AutoModelForAudioClassification.from_pretrained(
+            self.model_name,
+            cache_dir=self.cache_dir,
+            trust_remote_code=True,
+        )
+
+    def _quantized_cache_path(self) -> Path:
+        """
+        Get the on-disk location of the cached quantized weights.
+
+        The torch version is part of the filename because packed int8
+        parameters are not guaranteed to be portable across releases.
+        """
+        cache_root = (
+            Path(self.cache_dir) / "quantized"
+            if self.cache_dir
+            else QUANTIZED_CACHE_DIR
+        )
+        model_slug = self.model_name.replace("/", "--")
+        torch_version = torch.__version__.split("+")[0]
+        return cache_root / f"{model_slug}-{self.quantize}-torch{torch_version}.pt"
+
+    @staticmethod
+    def _quantize_dynamic(model: torch.nn.Module) -> torch.nn.Module:
+        """Apply int8 dynamic quantization to all Linear layers."""
+        return torch.ao.quantization.quantize_dynamic(
+            model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    def _load_quantized_model(self) -> torch.nn.Module:
+        """
+        Load the int8 model, reusing cached quantized weights when present.
+
+        On a cache hit the model skeleton is built from its config and the
+        packed weights are loaded directly, skipping both the float checkpoint
+        load and the quantization pass.
+
+        Returns:
+            Dynamically quantized model on CPU
+        """
+        cache_path = self._quantized_cache_path()
+
+        if cache_path.exists():
+            try:
+                config = AutoConfig.from_pretrained(
+                    self.model_name,
+                    cache_dir=self.cache_dir,
+                    trust_remote_code=True,
+                )
+                model = AutoModelForAudioClassification.from_config(
+                    config, trust_remote_code=True
+                )
+                model = self._quantize_dynamic(model)
+                model.load_state_dict(torch.load(cache_path, map_location="cpu"))
+                return model
+            except Exception as exc:
+                print(
+                    f"Warning: Failed to load cached quantized model ({exc}), "
+                    f"re-quantizing"
+                )
+
+        model = self._quantize_dynamic(self._load_float_model())
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            torch.save(model.state_dict(), cache_path)
+        except OSError as exc:
+            print(f"Warning: Could not cache quantized model ({exc})")
+
+        return model
+
+    def compare_with_float(
+        self,
+        audio_paths: List[str],
+        **analyze_kwargs,
+    ) -> Dict:
+        """
+        Measure label agreement between this quantized model and the float model.
+
+        Args:
+            audio_paths: Sample set of audio files to compare on
+            **analyze_kwargs: Arguments forwarded to `analyze`
+
+        Returns:
+            Dictionary with per-file and aggregate agreement statistics
+        """
+        if not self.quantize:
+            raise ValueError("compare_with_float requires a quantized classifier")
+
+        float_classifier = AudioEventClassifier(
+            model_name=self.model_name,
+            device="cpu",
+            cache_dir=self.cache_dir,
+        )
+
+        files = []
+        for audio_path in audio_paths:
+            quantized = self.analyze(audio_path, **analyze_kwargs)
+            reference = float_classifier.analyze(audio_path, **analyze_kwargs)
+
+            chunk_matches = [
+                q["top_label"] == f["top_label"]
+                for q, f in zip(
+                    quantized["chunk_predictions"], reference["chunk_predictions"]
+                )
+            ]
+            quantized_labels = {p["label"] for p in quantized["predictions"]}
+            reference_labels = {p["label"] for p in reference["predictions"]}
+
+            files.append(
+                {
+                    "filename": Path(audio_path).name,
+                    "primary_label": quantized["primary_label"],
+                    "float_primary_label": reference["primary_label"],
+                    "primary_match": (
+                        quantized["primary_label"] == reference["primary_label"]
+                    ),
+                    "chunk_agreement": (
+                        sum(chunk_matches) / len(chunk_matches)
+                        if chunk_matches
+                        else 0.0
+                    ),
+                    "top_k_overlap": len(quantized_labels & reference_labels)
+                    / max(len(reference_labels), 1),
+                    "processing_time": quantized["processing_time"],
+                    "float_processing_time": reference["processing_time"],
+                }
+            )
+
+        num_files = max(len(files), 1)
+        quantized_time = sum(f["processing_time"] for f in files)
+        float_time = sum(f["float_processing_time"] for f in files)
+
+        return {
+            "quantize": self.quantize,
+            "num_files": len(files),
+            "primary_agreement": round(
+                sum(f["primary_match"] for f in files) / num_files, 3
+            ),
+            "chunk_agreement": round(
+                sum(f["chunk_agreement"] for f in files) / num_files, 3
+            ),
+            "top_k_overlap": round(
+                sum(f["top_k_overlap"] for f in files) / num_files, 3
+            ),
+            "processing_time": round(quantized_time, 3),
+            "float_processing_time": round(float_time, 3),
+            "speedup": round(float_time / quantized_time, 2)
+            if quantized_time > 0
+            else None,
+            "files": files,
+        }
+
+    @property
+    def _shared_fbank(self) -> bool:
+        """Whether chunk features can be sliced from one shared filterbank."""
+        return isinstance(self.feature_extractor, ASTFeatureExtractor)
+
+    @staticmethod
+    def _fbank_frame_shift(sample_rate: int) -> int:
+        """Kaldi filterbank hop in samples (10 ms)."""
+        return int(sample_rate * 0.010)
+
+    @staticmethod
+    def _fbank_frame_length(sample_rate: int) -> int:
+        """Kaldi filterbank window in samples (25 ms)."""
+        return int(sample_rate * 0.025)
+
+    def _extract_chunk_features(
+        self,
+        waveform: torch.Tensor,
+        segment_ranges: List[Tuple[int, int]],
+        segment_length: int,
+        sample_rate: int,
+    ) -> Tuple[Dict[str, torch.Tensor], float]:
+        """
+        Build model inputs for every analysis window.
+
+        For AST the log-mel filterbank is computed once over the whole signal
+        and each window is a strided view into it. Kaldi filterbank frames are
+        computed independently, so as long as window starts sit on the frame
+        grid the slices match per-window extraction exactly. Other feature
+        extractors fall back to one batched extractor call.
+
+        Args:
+            waveform: Mono waveform at the extractor sampling rate
+            segment_ranges: (start, end) sample indices of each window
+            segment_length: Window length in samples (zero-padded past the end)
+            sample_rate: Waveform sample rate
+
+        Returns:
+            Tuple of (model inputs, fill value for frames padded up to the
+            model's expected length)
+        """
+        last_start = segment_ranges[-1][0]
+        padding = max(last_start + segment_length - waveform.shape[-1], 0)
+        if padding:
+            waveform = F.pad(waveform, (0, padding))
+
+        frame_shift = self._fbank_frame_shift(sample_rate)
+        frame_length = self._fbank_frame_length(sample_rate)
+
+        if not self._shared_fbank or segment_length < frame_length:
+            segments = [
+                waveform[start:start + segment_length].cpu().numpy()
+                for start, _ in segment_ranges
+            ]
+            inputs = self.feature_extractor(
+                segments,
+                sampling_rate=sample_rate,
+                return_tensors="pt",
+            )
+            return dict(inputs), 0.0
+
+        extractor = self.feature_extractor
+        fbank = ta_kaldi.fbank(
+            waveform.unsqueeze(0),
+            sample_frequency=sample_rate,
+            window_type="hanning",
+            num_mel_bins=extractor.num_mel_bins,
+        )
+
+        # AST pads short windows with zeros before normalizing
+        pad_value = 0.0
+        if extractor.do_normalize:
+            fbank = (fbank - extractor.mean) / (extractor.std * 2)
+            pad_value = (0.0 - extractor.mean) / (extractor.std * 2)
+        fbank = fbank.contiguous()
+
+        window_frames = 1 + (segment_length - frame_length) // frame_shift
+        window_frames = min(window_frames, extractor.max_length)
+
+        num_windows = len(segment_ranges)
+        step_frames = (
+            (segment_ranges[1][0] - segment_ranges[0][0]) // frame_shift
+            if num_windows > 1
+            else 0
+        )
+        num_bins = fbank.shape[1]
+        windows = fbank.as_strided(
+            (num_windows, window_frames, num_bins),
+            (step_frames * num_bins, num_bins, 1),
+        )
+
+        return {"input_values": windows}, pad_value
+
+    @staticmethod
+    def _strided_order(num_chunks: int) -> List[int]:
+        """
+        Order chunk indices coarse-to-fine across the track.
+
+        Starts with a sparse stride covering the whole track and halves it
+        until every chunk is included, e.g. 10 chunks -> 0, 8, 4, 2, 6, 1, ...
+
+        Args:
+            num_chunks: Number of available chunks
+
+        Returns:
+            Permutation of range(num_chunks)
+        """
+        order: List[int] = []
+        seen = set()
+        stride = 1 << max(num_chunks - 1, 0).bit_length()
+
+        while stride >= 1:
+            for idx in range(0, num_chunks, stride):
+                if idx not in seen:
+                    seen.add(idx)
+                    order.append(idx)
+            stride //= 2
+
+        return order
+
+    def _infer_logits_adaptive(
+        self,
+        inputs: Dict[str, torch.Tensor],
+        batch_size: int,
+        stop_tolerance: float,
+        min_chunks: int,
+        pad_to: Optional[int] = None,
+        pad_value: float = 0.0,
+    ) -> Tuple[List[int], torch.Tensor, bool]:
+        """
+        Run the model on chunks in strided order until the primary label settles.
+
+        After each mini-batch the running mean of the logits is updated. The
+        run stops once at least `min_chunks` chunks are done, the top-1 label
+        is unchanged since the previous batch, and its probability margin over
+        the runner-up moved by no more than `stop_tolerance`.
+
+        Args:
+            inputs: Feature tensors with a leading chunk dimension
+            batch_size: Maximum number of chunks per forward pass
+            stop_tolerance: Allowed change in top-1/top-2 margin between batches
+            min_chunks: Minimum number of chunks processed before stopping
+            pad_to: Frame count to pad `input_values` to, if shorter
+            pad_value: Fill value for padded frames
+
+        Returns:
+            Tuple of (processed chunk indices in ascending order, their logits,
+            whether processing stopped before all chunks were used)
+        """
+        batch_size = max(1, int(batch_size))
+        num_chunks = next(iter(inputs.values())).shape[0]
+        order = self._strided_order(num_chunks)
+
+        processed: List[int] = []
+        logits_parts: List[torch.Tensor] = []
+        logits_sum: Optional[torch.Tensor] = None
+        previous: Optional[Tuple[int, float]] = None
+        stopped_early = False
+
+        for batch_start in range(0, num_chunks, batch_size):
+            batch_indices = order[batch_start:batch_start + batch_size]
+            index_tensor = torch.tensor(batch_indices, dtype=torch.long)
+            batch_inputs = {k: v[index_tensor] for k, v in inputs.items()}
+
+            batch_logits = self._infer_logits(
+                batch_inputs, batch_size, pad_to=pad_to, pad_value=pad_value
+            )
+            processed.extend(batch_indices)
+            logits_parts.append(batch_logits)
+
+            batch_sum = batch_logits.sum(dim=0)
+            logits_sum = batch_sum if logits_sum is None else logits_sum + batch_sum
+
+            probabilities = torch.softmax(logits_sum / len(processed), dim=-1)
+            top_scores, top_indices = torch.topk(probabilities, 2)
+            current = (int(top_indices[0]), float(top_scores[0] - top_scores[1]))
+
+            if (
+                len(processed) >= min_chunks
+                and len(processed) < num_chunks
+                and previous is not None
+                and current[0] == previous[0]
+                and abs(current[1] - previous[1]) <= stop_tolerance
+            ):
+                stopped_early = True
+                break
+
+            previous = current
+
+        chunk_logits = torch.cat(logits_parts, dim=0)
+        ascending = sorted(range(len(processed)), key=lambda row: processed[row])
+
+        return (
+            [processed[row] for row in ascending],
+            chunk_logits[ascending],
+            stopped_early,
+        )
+
+    def _infer_logits(
+        self,
+        inputs: Dict[str, torch.Tensor],
+        batch_size: int,
+        pad_to: Optional[int] = None,
+        pad_value: float = 0.0,
+    ) -> torch.Tensor:
+        """
+        Run the model over batched features in mini-batches.
+
+        Args:
+            inputs: Feature tensors with a leading chunk dimension
+            batch_size: Maximum number of chunks per forward pass
+            pad_to: Frame count to pad `input_values` to, if shorter
+            pad_value: Fill value for padded frames
+
+        Returns:
+            Logits tensor of shape (num_chunks, num_labels) on CPU
+        """
+        batch_size = max(1, int(batch_size))
+        num_chunks = next(iter(inputs.values())).shape[0]
+
+        batch_logits: List[torch.Tensor] = []
+        with torch.no_grad():
+            for batch_start in range(0, num_chunks, batch_size):
+                batch = {
+                    k: v[batch_start:batch_start + batch_size]
+                    for k, v in inputs.items()
+                }
+
+                values = batch.get("input_values")
+                if pad_to and values is not None and values.shape[1] < pad_to:
+                    batch["input_values"] = F.pad(
+                        values, (0, 0, 0, pad_to - values.shape[1]), value=pad_value
+                    )
+
+                batch = {k: v.contiguous().to(self.device) for k, v in batch.items()}
+                outputs = self.model(**batch)
+                batch_logits.append(outputs.logits.cpu())
+
+        return torch.cat(batch_logits, dim=0)
+
     @staticmethod
     def _resolve_device(device: Optional[str]) -> str:
         """Resolve device string."""
@@ -0,0 +1,387 @@
+"""
+Native Segmenter - Dependency-light music structure segmentation
+
+Built-in replacement for MSAF using only librosa, NumPy and SciPy:
+
+1. Beat-synchronous MFCC + chroma features (one STFT pass)
+2. Self-similarity and recurrence affinity matrices
+3. Checkerboard-kernel novelty curve (Foote) for boundaries
+4. Laplacian spectral clustering (McFee & Ellis) for segment labels
+
+Features and affinities are computed once per track; every hierarchy level is
+derived from the same affinity matrix.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import librosa
+import numpy as np
+import scipy.linalg
+import scipy.ndimage
+import scipy.signal
+from scipy.cluster.vq import kmeans2
+from scipy.sparse.csgraph import laplacian
+
+
+@dataclass
+class SegmentationFeatures:
+    """Beat-synchronous features and affinities for one track."""
+
+    beat_times: np.ndarray
+    duration: float
+    ssm: np.ndarray
+    affinity: np.ndarray
+
+    @property
+    def num_beats(self) -> int:
+        return len(self.beat_times)
+
+
+class NativeSegmenter:
+    """Segment music into sections using novelty and spectral clustering."""
+
+    def __init__(
+        self,
+        sr: int = 22050,
+        hop_length: int = 512,
+        kernel_size: int = 16,
+        min_segment_beats: int = 8,
+        peak_threshold: float = 0.1,
+        max_labels: int = 8,
+    ):
+        """
+        Initialize native segmenter.
+
+        Args:
+            sr: Sample rate of the input signal
+            hop_length: Hop length for STFT and beat tracking
+            kernel_size: Half-width of the checkerboard kernel in beats
+            min_segment_beats: Minimum segment length in beats
+            peak_threshold: Minimum novelty peak prominence (0-1, relative)
+            max_labels: Upper bound on the number of distinct section labels
+        """
+        self.sr = sr
+        self.hop_length = hop_length
+        self.kernel_size = kernel_size
+        self.min_segment_beats = min_segment_beats
+        self.peak_threshold = peak_threshold
+        self.max_labels = max_labels
+
+    def compute_features(self, y: np.ndarray) -> SegmentationFeatures:
+        """
+        Compute beat-synchronous features and affinity matrices.
+
+        Args:
+            y: Mono audio signal at `self.sr`
+
+        Returns:
+            SegmentationFeatures shared by all segmentation levels
+
+        Raises:
+            ValueError: If the signal is too short to segment
+        """
+        duration = librosa.get_duration(y=y, sr=self.sr)
+
+        # One STFT feeds MFCC, chroma and the onset envelope
+        power = np.abs(librosa.stft(y, hop_length=self.hop_length)) ** 2
+        mel_db = librosa.power_to_db(
+            librosa.feature.melspectrogram(S=power, sr=self.sr)
+        )
+        mfcc = librosa.feature.mfcc(S=mel_db, n_mfcc=13)
+        chroma = librosa.feature.chroma_stft(S=power, sr=self.sr)
+        onset_env = librosa.onset.onset_strength(S=mel_db, sr=self.sr)
+
+        _, beats = librosa.beat.beat_track(
+            onset_envelope=onset_env, sr=self.sr, hop_length=self.hop_length
+        )
+
+        # Fall back to a fixed half-second grid for beatless material
+        if len(beats) < 2 * self.min_segment_beats:
+            grid = max(int(0.5 * self.sr / self.hop_length), 1)
+            beats = np.arange(0, power.shape[1], grid)
+
+        beats = librosa.util.fix_frames(beats, x_min=0)
+        if len(beats) < 2 * self.min_segment_beats:
+            raise ValueError("Audio too short for native segmentation")
+
+        beat_times = librosa.frames_to_time(
+            beats, sr=self.sr, hop_length=self.hop_length
+        )
+        mfcc_sync = librosa.util.sync(mfcc, beats, aggregate=np.mean)
+        chroma_sync = librosa.util.sync(chroma, beats, aggregate=np.median)
+
+        features = np.vstack([self._standardize(mfcc_sync), self._standardize(chroma_sync)])
+
+        # Cosine self-similarity in [-1, 1]
+        unit = features / np.maximum(np.linalg.norm(features, axis=0, keepdims=True), 1e-8)
+        ssm = (unit.T @ unit).astype(np.float32)
+
+        affinity = self._recurrence_affinity(features, mfcc_sync)
+
+        return SegmentationFeatures(
+            beat_times=beat_times,
+            duration=duration,
+            ssm=ssm,
+            affinity=affinity,
+        )
+
+    def segment(
+        self,
+        features: SegmentationFeatures,
+        num_labels: Optional[int] = None,
+    ) -> Dict:
+        """
+        Find section boundaries from novelty peaks and label them by clustering.
+
+        Args:
+            features: Output of `compute_features`
+            num_labels: Number of distinct labels (None = eigengap heuristic)
+
+        Returns:
+            Dictionary with boundary times, segment labels and a segment-level
+            similarity matrix
+        """
+        novelty = self.novelty(features.ssm, self.kernel_size)
+        peaks, _ = scipy.signal.find_peaks(
+            novelty,
+            distance=self.min_segment_beats,
+            prominence=self.peak_threshold,
+        )
+        bounds = self._beat_bounds(peaks, features.num_beats)
+
+        evecs, evals = self._laplacian_embedding(features.affinity)
+        if num_labels is None:
+            num_labels = self._eigengap(evals)
+        beat_labels = self._cluster(evecs, num_labels)
+
+        labels = self._segment_labels(beat_labels, bounds, num_labels)
+
+        return {
+            "boundaries": self._bound_times(bounds, features),
+            "labels": labels,
+            "similarity_matrix": self._segment_similarity(features.ssm, bounds),
+        }
+
+    def segment_hierarchical(
+        self,
+        features: SegmentationFeatures,
+        num_levels: int = 2,
+    ) -> List[Dict]:
+        """
+        Derive coarse-to-fine segmentations from one affinity matrix.
+
+        Level `l` clusters the Laplacian embedding into `l + 2` groups and
+        places boundaries where the beat-level cluster changes.
+
+        Args:
+            features: Output of `compute_features`
+            num_levels: Number of hierarchical levels
+
+        Returns:
+            List of per-level dictionaries with boundary times and labels
+        """
+        evecs, _ = self._laplacian_embedding(features.affinity)
+
+        levels = []
+        for level in range(num_levels):
+            num_labels = min(level + 2, self.max_labels, features.num_beats)
+            beat_labels = self._cluster(evecs, num_labels)
+
+            changes = np.flatnonzero(np.diff(beat_labels)) + 1
+            bounds = self._beat_bounds(changes, features.num_beats)
+            labels = self._segment_labels(beat_labels, bounds, num_labels)
+
+            levels.append(
+                {
+                    "boundaries": self._bound_times(bounds, features),
+                    "labels": labels,
+                }
+            )
+
+        return levels
+
+    @staticmethod
+    def novelty(ssm: np.ndarray, kernel_size: int) -> np.ndarray:
+        """
+        Compute a Foote novelty curve with a Gaussian-tapered checkerboard kernel.
+
+        All kernel placements along the diagonal are evaluated at once via a
+        strided window view and a single einsum.
+
+        Args:
+            ssm: Self-similarity matrix (n x n), centered around zero
+            kernel_size: Kernel half-width in beats
+
+        Returns:
+            Novelty curve of length n, scaled to [0, 1]
+        """
+        n = ssm.shape[0]
+        half = max(1, min(kernel_size, n // 2))
+
+        offsets = np.arange(-half, half) + 0.5
+        taper = np.exp(-0.5 * (offsets / (0.5 * half)) ** 2)
+        signed = np.sign(offsets) * taper
+        kernel = np.outer(signed, signed).astype(ssm.dtype)
+
+        padded = np.pad(ssm, half, mode="constant")
+        windows = np.lib.stride_tricks.sliding_window_view(padded, (2 * half, 2 * half))
+        diagonal = np.arange(n)
+        novelty = np.einsum("nij,ij->n", windows[diagonal, diagonal], kernel)
+
+        novelty = np.maximum(novelty, 0.0)
+        peak = novelty.max()
+        return novelty / peak if peak > 0 else novelty
+
+    @staticmethod
+    def _standardize(features: np.ndarray) -> np.ndarray:
+        """Z-score each feature dimension over time."""
+        mean = features.mean(axis=1, keepdims=True)
+        std = features.std(axis=1, keepdims=True)
+        return (features - mean) / np.maximum(std, 1e-8)
+
+    @staticmethod
+    def _recurrence_affinity(features: np.ndarray, mfcc_sync: np.ndarray) -> np.ndarray:
+        """
+        Combine repetition (recurrence) and local continuity (path) affinities.
+
+        Args:
+            features: Stacked beat-synchronous features (d x n)
+            mfcc_sync: Beat-synchronous MFCCs (13 x n) for path similarity
+
+        Returns:
+            Symmetric affinity matrix (n x n)
+        """
+        recurrence = librosa.segment.recurrence_matrix(
+            features, width=3, mode="affinity", sym=True
+        )
+        smooth = librosa.segment.timelag_filter(scipy.ndimage.median_filter)
+        recurrence = smooth(recurrence, size=(1, 7))
+
+        path_distance = np.sum(np.diff(mfcc_sync, axis=1) ** 2, axis=0)
+        sigma = np.median(path_distance)
+        path_sim = np.exp(-path_distance / max(sigma, 1e-8))
+        path = np.diag(path_sim, k=1) + np.diag(path_sim, k=-1)
+
+        # Balance the two graphs so neither dominates the random walk
+        deg_path = path.sum(axis=1)
+        deg_rec = recurrence.sum(axis=1)
+        mu = deg_path.dot(deg_path + deg_rec) / max(
+            np.sum((deg_path + deg_rec) ** 2), 1e-8
+        )
+
+        return (mu * recurrence + (1 - mu) * path).astype(np.float32)
+
+    def _laplacian_embedding(self, affinity: np.ndarray) -> tuple:
+        """
+        Compute smoothed, row-normalizable Laplacian eigenvectors.
+
+        Args:
+            affinity: Symmetric affinity matrix (n x n)
+
+        Returns:
+            Tuple of (eigenvectors n x k, eigenvalues k) for the smallest
+            `max_labels + 1` eigenvalues
+        """
+        n = affinity.shape[0]
+        num_vectors = min(self.max_labels + 1, n)
+
+        lap = laplacian(affinity, normed=True)
+        evals, evecs = scipy.linalg.eigh(lap, subset_by_index=[0, num_vectors - 1])
+
+        evecs = scipy.ndimage.median_filter(evecs, size=(9, 1))
+        return evecs, evals
+
+    def _eigengap(self, evals: np.ndarray) -> int:
+        """Pick the number of clusters at the largest eigenvalue gap."""
+        if len(evals) < 3:
+            return 2
+        gaps = np.diff(evals)
+        return int(np.clip(np.argmax(gaps[1:]) + 2, 2, self.max_labels))
+
+    @staticmethod
+    def _cluster(evecs: np.ndarray, num_labels: int) -> np.ndarray:
+        """
+        K-means on the first `num_labels` normalized Laplacian eigenvectors.
+
+        Args:
+            evecs: Laplacian eigenvectors (n x k)
+            num_labels: Number of clusters
+
+        Returns:
+            Cluster index per beat
+        """
+        num_labels = max(1, min(num_labels, evecs.shape[1]))
+        embedding = evecs[:, :num_labels]
+        norms = np.linalg.norm(embedding, axis=1, keepdims=True)
+        embedding = embedding / np.maximum(norms, 1e-8)
+
+        _, beat_labels = kmeans2(embedding, num_labels, minit="++", seed=0)
+        return beat_labels
+
+    def _beat_bounds(self, cut_beats: np.ndarray, num_beats: int) -> np.ndarray:
+        """
+        Turn boundary beat indices into a sorted bound array [0, ..., n].
+
+        Segments shorter than `min_segment_beats` are merged into their
+        predecessor.
+        """
+        cuts = np.unique(np.asarray(cut_beats, dtype=int))
+        cuts = cuts[(cuts > 0) & (cuts < num_beats)]
+
+        bounds = [0]
+        for cut in cuts:
+            if cut - bounds[-1] >= self.min_segment_beats:
+                bounds.append(int(cut))
+        if num_beats - bounds[-1] < self.min_segment_beats and len(bounds) > 1:
+            bounds.pop()
+        bounds.append(num_beats)
+
+        return np.asarray(bounds)
+
+    @staticmethod
+    def _segment_labels(
+        beat_labels: np.ndarray, bounds: np.ndarray, num_labels: int
+    ) -> List[str]:
+        """
+        Assign each segment the majority cluster of its beats.
+
+        Labels are lettered in order of first appearance (A, B, C, ...).
+        """
+        one_hot = np.eye(max(num_labels, int(beat_labels.max()) + 1))[beat_labels]
+        counts = np.add.reduceat(one_hot, bounds[:-1], axis=0)
+        clusters = counts.argmax(axis=1)
+
+        letters: Dict[int, str] = {}
+        labels = []
+        for cluster in clusters:
+            if cluster not in letters:
+                letters[cluster] = chr(ord("A") + len(letters))
+            labels.append(letters[cluster])
+        return labels
+
+    @staticmethod
+    def _bound_times(bounds: np.ndarray, features: SegmentationFeatures) -> List[float]:
+        """Convert beat bounds to times in seconds, ending at the track duration."""
+        times = features.beat_times[bounds[:-1]].tolist()
+        times.append(features.duration)
+        return [float(t) for t in times]
+
+    @staticmethod
+    def _segment_similarity(ssm: np.ndarray, bounds: np.ndarray) -> List[List[float]]:
+        """
+        Mean self-similarity between every pair of segments, in [0, 1].
+
+        Args:
+            ssm: Beat-level cosine self-similarity matrix
+            bounds: Segment bounds in beats
+
+        Returns:
+            NxN segment similarity matrix
+        """
+        starts = bounds[:-1]
+        block_sums = np.add.reduceat(np.add.reduceat(ssm, starts, axis=0), starts, axis=1)
+        sizes = np.diff(bounds)
+        similarity = block_sums / np.outer(sizes, sizes)
+        similarity = np.clip((similarity + 1.0) / 2.0, 0.0, 1.0)
+        return np.round(similarity, 3).tolist()
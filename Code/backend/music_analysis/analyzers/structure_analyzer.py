@@ -2,7 +2,8 @@
 Structure Analyzer - Music segmentation and structure analysis
 
 Uses MSAF (Music Structure Analysis Framework) to detect structural boundaries
-and segment songs into intro, verse, chorus, bridge, outro, etc.
+and segment songs into intro, verse, chorus, bridge, outro, etc. Falls back to
+the built-in native segmenter when MSAF is missing or fails.
 """
 
 import time
@@ -14,13 +15,15 @@ from typing import Dict, List, Optional
 import librosa
 import numpy as np
 
+from .native_segmenter import NativeSegmenter
+
 # Try to import MSAF, but don't fail if it's not available
 try:
     import msaf
     MSAF_AVAILABLE = True
 except ImportError:
     MSAF_AVAILABLE = False
-    print("Warning: MSAF not available, using simple segmentation")
+    print("Warning: MSAF not available, using native segmentation")
 
 # Suppress warnings
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -29,15 +32,18 @@ warnings.filterwarnings('ignore', category=UserWarning)
 class StructureAnalyzer:
     """Analyze music structure and detect segment boundaries."""
     
-    def __init__(self, sr: int = 22050):
+    def __init__(self, sr: int = 22050, hop_length: int = 512):
         """
         Initialize structure analyzer.
         
         Args:
             sr: Target sample rate for analysis
+            hop_length: Hop length for native feature extraction
         """
         self.sr = sr
+        self.hop_length = hop_length
         self.version = "0.1.0"
+        self.segmenter = NativeSegmenter(sr=sr, hop_length=hop_length)
     
     def analyze(
         self,
@@ -51,7 +57,8 @@ class StructureAnalyzer:
         
         Args:
             audio_path: Path to audio file
-            algorithm: Segmentation algorithm ('cnmf', 'foote', 'olda', 'scluster', 'sf')
+            algorithm: Segmentation algorithm ('cnmf', 'foote', 'olda', 'scluster',
+                'sf', or 'native' for the built-in engine)
             boundary_algorithm: Boundary detection algorithm
             label_algorithm: Label estimation algorithm
             
@@ -71,7 +78,11 @@ class StructureAnalyzer:
         duration = librosa.get_duration(y=y, sr=sr)
         
         # Run segmentation
-        if MSAF_AVAILABLE:
+        used_algorithm = algorithm
+        segments = None
+        similarity_matrix = None
+        
+        if MSAF_AVAILABLE and algorithm != "native":
             try:
                 # Segment boundaries (times in seconds)
                 boundaries, labels = msaf.process(
@@ -81,33 +92,27 @@ class StructureAnalyzer:
                     feature="mfcc"  # Use MFCC features
                 )
                 
-                # Convert boundaries to segments
-                segments = []
-                for i in range(len(boundaries) - 1):
-                    start_time_seg = float(boundaries[i])
-                    end_time_seg = float(boundaries[i + 1])
-                    label = self._interpret_label(labels[i], i) if labels is not None else f"segment_{i}"
-                    
-                    segments.append({
-                        "start": round(start_time_seg, 2),
-                        "end": round(end_time_seg, 2),
-                        "duration": round(end_time_seg - start_time_seg, 2),
-                        "label": label,
-                        "index": i
-                    })
+                labels = list(labels) if labels is not None else None
+                segments = self._build_segments(boundaries, labels)
                 
                 # Calculate segment similarity if we have labels
-                similarity_matrix = None
                 if labels is not None:
                     similarity_matrix = self._calculate_similarity_matrix(labels)
                 
             except Exception as e:
-                # Fallback: create simple segmentation based on duration
-                print(f"Warning: MSAF processing failed ({e}), using simple segmentation")
+                print(f"Warning: MSAF processing failed ({e}), using native segmentation")
+        
+        if segments is None:
+            used_algorithm = "native"
+            try:
+                native = self.segmenter.segment(self.segmenter.compute_features(y))
+                segments = self._build_segments(native["boundaries"], native["labels"])
+                similarity_matrix = native["similarity_matrix"]
+            except Exception as e:
+                # Last resort: fixed-duration segments
+                print(f"Warning: Native segmentation failed ({e}), using simple segmentation")
+                used_algorithm = "simple"
                 boundaries, segments, similarity_matrix = self._simple_segmentation(duration)
-        else:
-            # Use simple segmentation if MSAF not available
-            boundaries, segments, similarity_matrix = self._simple_segmentation(duration)
         
         processing_time = time.time() - start_time
         
@@ -115,7 +120,7 @@ class StructureAnalyzer:
             "segments": segments,
             "num_segments": len(segments),
             "boundary_times": [seg["start"] for seg in segments] + [segments[-1]["end"]],
-            "algorithm": algorithm,
+            "algorithm": used_algorithm,
             "duration": round(duration, 2),
             "processing_time": round(processing_time, 3),
             "metadata": {
@@ -123,7 +128,7 @@ class StructureAnalyzer:
                 "filepath": str(audio_path.absolute()),
                 "analyzer": "structure_analyzer",
                 "version": self.version,
-                "model": f"MSAF-{algorithm}",
+                "model": used_algorithm if used_algorithm in ("native", "simple") else f"MSAF-{used_algorithm}",
                 "timestamp": datetime.now().isoformat(),
                 "sample_rate": sr,
                 "audio_duration": round(duration, 2)
@@ -136,13 +141,46 @@ class StructureAnalyzer:
         
         return results
     
-    def _interpret_label(self, label: str, index: int) -> str:
+    def _build_segments(self, boundaries, labels: Optional[List]) -> List[Dict]:
+        """
+        Convert boundary times and per-segment labels into segment dictionaries.
+        
+        Args:
+            boundaries: Boundary times in seconds (N + 1 entries)
+            labels: Optional list of N segment labels
+            
+        Returns:
+            List of segment dictionaries
+        """
+        num_segments = len(boundaries) - 1
+        segments = []
+        for i in range(num_segments):
+            start_time_seg = float(boundaries[i])
+            end_time_seg = float(boundaries[i + 1])
+            label = (
+                self._interpret_label(labels[i], i, num_segments)
+                if labels is not None
+                else f"segment_{i}"
+            )
+            
+            segments.append({
+                "start": round(start_time_seg, 2),
+                "end": round(end_time_seg, 2),
+                "duration": round(end_time_seg - start_time_seg, 2),
+                "label": label,
+                "index": i
+            })
+        
+        return segments
+    
+    def _interpret_label(self, label: str, index: int, num_segments: int) -> str:
         """
         Interpret MSAF label into meaningful section name.
         
         Args:
             label: MSAF label
             index: Segment index
+            num_segments: Total number of segments
             
         Returns:
             Interpreted label string
@@ -153,7 +191,7 @@ class StructureAnalyzer:
         # Simple heuristic based on position
         if index == 0:
             return f"intro ({label})"
-        elif index == len(label) - 1:
+        elif index == num_segments - 1:
             return f"outro ({label})"
         else:
             # Try to identify repeated sections (verses/choruses)
@@ -169,15 +207,9 @@ class StructureAnalyzer:
         Returns:
             NxN similarity matrix
         """
-        n = len(labels)
-        matrix = [[0.0] * n for _ in range(n)]
-        
-        for i in range(n):
-            for j in range(n):
-                # 1.0 if same label, 0.0 otherwise
-                matrix[i][j] = 1.0 if labels[i] == labels[j] else 0.0
-        
-        return matrix
+        # 1.0 if same label, 0.0 otherwise
+        labels = np.asarray([str(label) for label in labels])
+        return (labels[:, None] == labels[None, :]).astype(float).tolist()
     
     def _simple_segmentation(self, duration: float) -> tuple:
         """
@@ -243,38 +275,30 @@ class StructureAnalyzer:
         y, sr = librosa.load(str(audio_path), sr=self.sr)
         duration = librosa.get_duration(y=y, sr=sr)
         
-        # Run hierarchical analysis
-        if not MSAF_AVAILABLE:
-            print("Warning: MSAF not available, hierarchical analysis not supported")
-            hierarchies = []
-        else:
-            try:
-                hierarchies = []
-                
-                for level in range(num_levels):
-                    # Use different sensitivity levels
-                    boundaries, labels = msaf.process(
-                        str(audio_path),
-                        feature="mfcc"
-                    )
-                    
-                    level_segments = []
-                    for i in range(len(boundaries) - 1):
-                        level_segments.append({
-                            "start": round(float(boundaries[i]), 2),
-                            "end": round(float(boundaries[i + 1]), 2),
-                            "label": labels[i] if labels is not None else f"L{level}_seg{i}"
-                        })
-                    
-                    hierarchies.append({
-                        "level": level,
-                        "segments": level_segments,
-                        "num_segments": len(level_segments)
-                    })
+        # All levels share one feature/affinity computation
+        try:
+            features = self.segmenter.compute_features(y)
+            levels = self.segmenter.segment_hierarchical(features, num_levels=num_levels)
+        except Exception as e:
+            print(f"Warning: Hierarchical analysis failed ({e})")
+            levels = []
+        
+        hierarchies = []
+        for level, level_result in enumerate(levels):
+            boundaries = level_result["boundaries"]
+            level_segments = []
+            for i in range(len(boundaries) - 1):
+                level_segments.append({
+                    "start": round(boundaries[i], 2),
+                    "end": round(boundaries[i + 1], 2),
+                    "label": level_result["labels"][i]
+                })
             
-            except Exception as e:
-                print(f"Warning: Hierarchical analysis failed ({e})")
-                hierarchies = []
+            hierarchies.append({
+                "level": level,
+                "segments": level_segments,
+                "num_segments": len(level_segments)
+            })
         
         processing_time = time.time() - start_time
         
@@ -286,7 +310,8 @@ class StructureAnalyzer:
             "metadata": {
                 "filename": audio_path.name,
                 "analyzer": "structure_analyzer",
-                "mode": "hierarchical"
+                "mode": "hierarchical",
+                "model": "native"
             }
         }
         
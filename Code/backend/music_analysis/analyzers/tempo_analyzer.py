@@ -1,7 +1,8 @@
 """
 Tempo Analyzer - Extract BPM and beat positions
 
-Uses librosa beat tracking to extract tempo and beat timestamps.
+Uses librosa beat tracking to extract tempo and beat timestamps, and an
+autocorrelation tempogram for a local tempo curve over time.
 """
 
 import time
@@ -27,12 +28,19 @@ class TempoAnalyzer:
         self.sr = sr
         self.hop_length = hop_length
         self.version = "0.1.0"
+        
+        # Decoded track state (onset envelope, tempo curves) for the most
+        # recently analyzed file, keyed by (path, mtime)
+        self._track_key: Optional[Tuple[str, int]] = None
+        self._track_state: Dict = {}
     
     def analyze(
         self,
         audio_path: str,
         onset_envelope: Optional[np.ndarray] = None,
-        start_bpm: float = 120.0
+        start_bpm: float = 120.0,
+        local_tempo: bool = False,
+        resolution: float = 1.0
     ) -> Dict:
         """
         Analyze tempo and beats in an audio file.
@@ -41,6 +49,8 @@ class TempoAnalyzer:
             audio_path: Path to audio file
             onset_envelope: Pre-computed onset envelope (optional)
             start_bpm: Initial BPM estimate for tracking
+            local_tempo: Also compute a tempogram-based tempo curve
+            resolution: Tempo curve resolution in seconds
             
         Returns:
             Dictionary with tempo analysis results
@@ -53,15 +63,14 @@ class TempoAnalyzer:
         start_time = time.time()
         audio_path = Path(audio_path)
         
-        # Load audio
-        y, sr = librosa.load(str(audio_path), sr=self.sr)
-        duration = librosa.get_duration(y=y, sr=sr)
+        # Load audio and onset envelope (cached per file)
+        state = self._load_track(audio_path)
+        sr = state["sr"]
+        duration = state["duration"]
         
         # Extract onset envelope
         if onset_envelope is None:
-            onset_envelope = librosa.onset.onset_strength(
-                y=y, sr=sr, hop_length=self.hop_length
-            )
+            onset_envelope = state["onset_envelope"]
         
         # Estimate tempo
         tempo, beat_frames = librosa.beat.beat_track(
@@ -114,8 +123,198 @@ class TempoAnalyzer:
             }
         }
         
+        if local_tempo:
+            results["tempo_curve"] = self.local_tempo(
+                str(audio_path), resolution=resolution, prior_bpm=start_bpm
+            )
+        
         return results
     
+    def _load_track(self, audio_path: Path) -> Dict:
+        """
+        Load audio and compute the onset envelope, reusing the cached state.
+        
+        Only the most recent file is kept, so section queries and repeated
+        analyses of one track don't reload or re-transform the audio.
+        
+        Args:
+            audio_path: Path to audio file
+            
+        Returns:
+            Track state dictionary (sr, duration, onset_envelope, caches)
+        """
+        audio_path = Path(audio_path)
+        key = (str(audio_path.resolve()), audio_path.stat().st_mtime_ns)
+        
+        if key != self._track_key:
+            y, sr = librosa.load(str(audio_path), sr=self.sr)
+            self._track_state = {
+                "sr": sr,
+                "duration": librosa.get_duration(y=y, sr=sr),
+                "onset_envelope": librosa.onset.onset_strength(
+                    y=y, sr=sr, hop_length=self.hop_length
+                ),
+                "tempo_curves": {},
+            }
+            self._track_key = key
+        
+        return self._track_state
+    
+    def local_tempo(
+        self,
+        audio_path: str,
+        resolution: float = 1.0,
+        win_length: int = 384,
+        min_bpm: float = 40.0,
+        max_bpm: float = 240.0,
+        prior_bpm: Optional[float] = 120.0
+    ) -> Dict:
+        """
+        Compute a local tempo curve from an autocorrelation tempogram.
+        
+        The onset envelope and tempogram are computed once per track; curves
+        are cached per parameter set, so section queries are cheap lookups.
+        
+        Args:
+            audio_path: Path to audio file
+            resolution: Curve resolution in seconds
+            win_length: Tempogram window length in onset frames (~8.9s at defaults)
+            min_bpm: Lowest tempo considered
+            max_bpm: Highest tempo considered
+            prior_bpm: Center of a one-octave log-normal tempo prior that
+                suppresses octave errors (None to disable)
+            
+        Returns:
+            Dictionary with curve times, BPM and confidence per step
+            
+        Example:
+            >>> analyzer = TempoAnalyzer()
+            >>> curve = analyzer.local_tempo("mix.mp3", resolution=2.0)
+            >>> print(curve["bpm_range"])
+        """
+        state = self._load_track(audio_path)
+        params = (resolution, win_length, min_bpm, max_bpm, prior_bpm)
+        
+        if params not in state["tempo_curves"]:
+            state["tempo_curves"][params] = self._compute_tempo_curve(
+                state["onset_envelope"], state["sr"], state["duration"], *params
+            )
+        
+        return state["tempo_curves"][params]
+    
+    def _compute_tempo_curve(
+        self,
+        onset_envelope: np.ndarray,
+        sr: int,
+        duration: float,
+        resolution: float,
+        win_length: int,
+        min_bpm: float,
+        max_bpm: float,
+        prior_bpm: Optional[float]
+    ) -> Dict:
+        """
+        Reduce a tempogram to one tempo estimate per `resolution` seconds.
+        
+        Tempogram columns are averaged per step with a single reduceat, the
+        best lag is picked per step and refined with parabolic interpolation.
+        
+        Returns:
+            Tempo curve dictionary
+        """
+        tempogram = librosa.feature.tempogram(
+            onset_envelope=onset_envelope,
+            sr=sr,
+            hop_length=self.hop_length,
+            win_length=win_length
+        )
+        
+        # Average tempogram columns within each curve step
+        frames_per_step = max(1, int(round(resolution * sr / self.hop_length)))
+        starts = np.arange(0, tempogram.shape[1], frames_per_step)
+        counts = np.diff(np.append(starts, tempogram.shape[1]))
+        blocks = np.add.reduceat(tempogram, starts, axis=1) / counts
+        
+        # Restrict to lags inside the BPM range (lag 0 is infinite BPM)
+        frames_per_minute = 60.0 * sr / self.hop_length
+        lags = np.arange(tempogram.shape[0])
+        lag_min = max(1, int(np.floor(frames_per_minute / max_bpm)))
+        lag_max = min(len(lags) - 2, int(np.ceil(frames_per_minute / min_bpm)))
+        candidate_lags = lags[lag_min:lag_max + 1]
+        
+        scores = blocks[lag_min:lag_max + 1]
+        if prior_bpm:
+            candidate_bpms = frames_per_minute / candidate_lags
+            prior = np.exp(-0.5 * np.log2(candidate_bpms / prior_bpm) ** 2)
+            scores = scores * prior[:, None]
+        
+        steps = np.arange(blocks.shape[1])
+        best = candidate_lags[np.argmax(scores, axis=0)]
+        
+        # Parabolic interpolation around the peak lag
+        left = blocks[best - 1, steps]
+        center = blocks[best, steps]
+        right = blocks[best + 1, steps]
+        denom = left - 2 * center + right
+        denom = np.where(np.abs(denom) > 1e-10, denom, np.inf)
+        shift = 0.5 * (left - right) / denom
+        refined_lags = best + np.clip(shift, -0.5, 0.5)
+        
+        bpm = frames_per_minute / refined_lags
+        # Tempogram columns are normalized to 1 at lag 0, so the peak
+        # autocorrelation is a periodicity strength in [0, 1]
+        confidence = np.clip(center, 0.0, 1.0)
+        
+        times = librosa.frames_to_time(
+            starts + counts / 2.0, sr=sr, hop_length=self.hop_length
+        )
+        times = np.minimum(times, duration)
+        
+        return {
+            "times": np.round(times, 3).tolist(),
+            "bpm": np.round(bpm, 2).tolist(),
+            "confidence": np.round(confidence, 3).tolist(),
+            "resolution": resolution,
+            "win_length": win_length,
+            "bpm_range": [round(float(bpm.min()), 2), round(float(bpm.max()), 2)],
+        }
+    
+    @staticmethod
+    def tempo_for_section(
+        tempo_curve: Dict, start_time: float, end_time: float
+    ) -> Tuple[float, float]:
+        """
+        Read BPM and confidence for a time range from a tempo curve.
+        
+        BPM is the confidence-weighted median of the curve steps inside the
+        range; confidence is their mean.
+        
+        Args:
+            tempo_curve: Output of `local_tempo`
+            start_time: Section start in seconds
+            end_time: Section end in seconds
+            
+        Returns:
+            Tuple of (bpm, confidence)
+        """
+        times = np.asarray(tempo_curve["times"])
+        bpm = np.asarray(tempo_curve["bpm"])
+        confidence = np.asarray(tempo_curve["confidence"])
+        
+        mask = (times >= start_time) & (times < end_time)
+        if not mask.any():
+            # Section shorter than one step: use the nearest step
+            mask = np.zeros_like(times, dtype=bool)
+            mask[np.argmin(np.abs(times - (start_time + end_time) / 2.0))] = True
+        
+        section_bpm = bpm[mask]
+        weights = confidence[mask] + 1e-6
+        order = np.argsort(section_bpm)
+        cumulative = np.cumsum(weights[order])
+        median_idx = order[np.searchsorted(cumulative, cumulative[-1] / 2.0)]
+        
+        return float(section_bpm[median_idx]), float(confidence[mask].mean())
+    
     def _calculate_beat_confidence(
         self, beat_times: np.ndarray, tempo: float
     ) -> float:
@@ -189,43 +388,69 @@ class TempoAnalyzer:
         self,
         audio_path: str,
         start_time: float,
-        end_time: float
+        end_time: float,
+        resolution: float = 1.0
     ) -> Dict:
         """
         Analyze tempo for a specific section of audio.
         
+        Queries the cached track-level tempo curve and beat grid instead of
+        reloading the audio, so many sections of one file are cheap.
+        
         Args:
             audio_path: Path to audio file
             start_time: Start time in seconds
             end_time: End time in seconds
+            resolution: Tempo curve resolution in seconds
             
         Returns:
             Tempo analysis for the specified section
         """
-        # Load only the specified section
-        y, sr = librosa.load(
-            audio_path,
-            sr=self.sr,
-            offset=start_time,
-            duration=end_time - start_time
-        )
+        query_start = time.time()
+        audio_path = Path(audio_path)
+        state = self._load_track(audio_path)
         
-        # Create temporary file path for metadata
-        temp_path = Path(audio_path).with_name(
-            f"{Path(audio_path).stem}_section_{start_time}-{end_time}.mp3"
-        )
+        tempo_curve = self.local_tempo(str(audio_path), resolution=resolution)
+        tempo, confidence = self.tempo_for_section(tempo_curve, start_time, end_time)
         
-        # Analyze section
-        results = self.analyze(str(temp_path))
+        # Beat grid for the whole track, tracked once
+        if "beat_times" not in state:
+            _, beat_frames = librosa.beat.beat_track(
+                onset_envelope=state["onset_envelope"],
+                sr=state["sr"],
+                hop_length=self.hop_length
+            )
+            state["beat_times"] = librosa.frames_to_time(
+                beat_frames, sr=state["sr"], hop_length=self.hop_length
+            )
         
-        # Adjust beat times to absolute positions
-        results["beats"] = [t + start_time for t in results["beats"]]
-        results["metadata"]["section"] = {
-            "start": start_time,
-            "end": end_time
-        }
+        beat_times = state["beat_times"]
+        section_beats = beat_times[(beat_times >= start_time) & (beat_times < end_time)]
         
-        return results
+        return {
+            "tempo": round(tempo, 2),
+            "tempo_confidence": round(confidence, 3),
+            "num_beats": len(section_beats),
+            "beats": section_beats.tolist(),
+            "hop_length": self.hop_length,
+            "sr": state["sr"],
+            "duration": round(end_time - start_time, 2),
+            "processing_time": round(time.time() - query_start, 3),
+            "metadata": {
+                "filename": audio_path.name,
+                "filepath": str(audio_path.absolute()),
+                "analyzer": "tempo_analyzer",
+                "version": self.version,
+                "model": "librosa-tempogram",
+                "timestamp": datetime.now().isoformat(),
+                "sample_rate": state["sr"],
+                "audio_duration": round(state["duration"], 2),
+                "section": {
+                    "start": start_time,
+                    "end": end_time
+                }
+            }
+        }
 
 
 def analyze_tempo(audio_path: str, **kwargs) -> Dict:
@@ -3,6 +3,7 @@ CLI command for chord detection
 
 Usage:
     python -m music_analysis.cli.analyze_chords audio.mp3
+    python -m music_analysis.cli.analyze_chords library/*.mp3 --workers 8
     python -m music_analysis.cli.analyze_chords audio.mp3 --output results/
     python -m music_analysis.cli.analyze_chords audio.mp3 --smoothing 3
 """
@@ -16,6 +17,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from music_analysis.analyzers.chord_detector import ChordDetector
+from music_analysis.visualization.render_pool import RenderPool, default_workers
 
 
 def main():
@@ -36,6 +38,9 @@ Examples:
   
   # JSON only (no plots)
   python -m music_analysis.cli.analyze_chords song.mp3 --format json
+  
+  # Analyze a library, rendering plots/HTML on 8 processes
+  python -m music_analysis.cli.analyze_chords library/*.mp3 --workers 8
 """
     )
     
@@ -43,7 +48,8 @@ Examples:
     parser.add_argument(
         'audio',
         type=str,
-        help='Input audio file (MP3, WAV, FLAC, etc.)'
+        nargs='+',
+        help='Input audio file(s) (MP3, WAV, FLAC, etc.)'
     )
     
     # Optional arguments
@@ -69,6 +75,26 @@ Examples:
         help='Smoothing window size (default: 5 frames, higher = fewer changes)'
     )
     
+    parser.add_argument(
+        '--compact-report',
+        action='store_true',
+        help='Offline, size-bounded HTML report (local plotly.js, decimated charts, lazy sidecars)'
+    )
+    
+    parser.add_argument(
+        '--max-points',
+        type=int,
+        default=2000,
+        help='Maximum points per chart series in compact reports (default: 2000)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Processes for plot/HTML rendering (default: one per CPU, up to the number of files)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -77,11 +103,12 @@ Examples:
     
     args = parser.parse_args()
     
-    # Validate input file
-    audio_path = Path(args.audio)
-    if not audio_path.exists():
-        print(f"Error: Audio file not found: {audio_path}")
-        sys.exit(1)
+    # Validate input files
+    audio_paths = [Path(path) for path in args.audio]
+    for audio_path in audio_paths:
+        if not audio_path.exists():
+            print(f"Error: Audio file not found: {audio_path}")
+            sys.exit(1)
     
     # Setup output directory
     if args.output:
@@ -91,106 +118,87 @@ Examples:
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Run analysis
-    if args.verbose:
-        print(f"Analyzing chords: {audio_path.name}")
-        print(f"Smoothing window: {args.smoothing} frames")
-    
-    try:
-        detector = ChordDetector()
-        results = detector.analyze(
-            str(audio_path),
-            smoothing_window=args.smoothing
-        )
-        
-        if args.verbose:
-            print(f"[OK] Analysis complete in {results['processing_time']:.2f}s")
-    
-    except Exception as e:
-        print(f"Error during analysis: {e}")
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
-    
-    # Save JSON
-    json_path = output_dir / f"{audio_path.stem}_chords.json"
-    with open(json_path, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    if args.verbose or args.format == 'json':
-        print(f"[OK] JSON saved: {json_path}")
-    
-    # Generate plots if requested
-    if args.format in ['plot', 'both', 'html']:
-        try:
-            from music_analysis.visualization.plot_chords import plot_chords
+    # Plots and HTML reports render in worker processes (inline for one file)
+    workers = args.workers or default_workers(len(audio_paths))
+    analyzed = []
+    failed = 0
+    
+    with RenderPool(workers) as pool:
+        for audio_path in audio_paths:
+            # Run analysis
+            if args.verbose:
+                print(f"Analyzing chords: {audio_path.name}")
+                print(f"Smoothing window: {args.smoothing} frames")
             
-            plot_path = output_dir / f"{audio_path.stem}_chords.png"
-            plot_chords(results, str(audio_path), plot_path)
+            try:
+                detector = ChordDetector()
+                results = detector.analyze(
+                    str(audio_path),
+                    smoothing_window=args.smoothing
+                )
+                
+                if args.verbose:
+                    print(f"[OK] Analysis complete in {results['processing_time']:.2f}s")
             
-            if args.verbose or args.format == 'plot':
-                print(f"[OK] Plot saved: {plot_path}")
-        
-        except ImportError:
-            print("Warning: Visualization module not available. Skipping plots.")
-            plot_path = None
-        except Exception as e:
-            print(f"Warning: Plot generation failed: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
-            plot_path = None
-    else:
-        plot_path = None
-    
-    # Generate HTML report if requested
-    if args.format in ['html', 'both']:
-        try:
-            from music_analysis.visualization.html_generator import generate_html_report
+            except Exception as e:
+                print(f"Error during analysis of {audio_path.name}: {e}")
+                if args.verbose:
+                    import traceback
+                    traceback.print_exc()
+                failed += 1
+                continue
             
-            html_path = output_dir / f"{audio_path.stem}_chords.html"
-            generate_html_report(
-                results,
-                str(audio_path),
-                html_path,
-                plot_path,
-                analysis_type='chords'
-            )
+            # Save JSON
+            json_path = output_dir / f"{audio_path.stem}_chords.json"
+            with open(json_path, 'w') as f:
+                json.dump(results, f, indent=2)
             
-            if args.verbose:
-                print(f"[OK] HTML report saved: {html_path}")
+            if args.verbose or args.format == 'json':
+                print(f"[OK] JSON saved: {json_path}")
+            
+            # Queue plot and HTML report rendering
+            if args.format != 'json':
+                pool.submit(
+                    audio_path.name,
+                    results,
+                    str(audio_path),
+                    str(output_dir / f"{audio_path.stem}_chords"),
+                    'chords',
+                    output_format=args.format,
+                    compact=args.compact_report,
+                    max_points=args.max_points,
+                    verbose=args.verbose
+                )
+            
+            analyzed.append((audio_path, results))
         
-        except ImportError:
-            print("Warning: HTML generator not available. Skipping HTML report.")
-        except Exception as e:
-            print(f"Warning: HTML generation failed: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
+        for _, outcome in pool.results():
+            for message in outcome['messages']:
+                print(message)
     
     # Print summary
-    print(f"\n=== Chord Detection Results ===")
-    print(f"File: {audio_path.name}")
-    print(f"Chord changes: {results['chord_changes']}")
-    print(f"Unique chords: {results['unique_chords']}")
-    print(f"Duration: {results['duration']:.1f}s")
-    print(f"Processing time: {results['processing_time']:.2f}s")
-    
-    print(f"\nChord vocabulary: {', '.join(results['chord_vocabulary'][:10])}")
-    if len(results['chord_vocabulary']) > 10:
-        print(f"  ... and {len(results['chord_vocabulary']) - 10} more")
-    
-    print(f"\nFirst 10 chord changes:")
-    for i, chord in enumerate(results['chords'][:10]):
-        print(f"  {i+1}. {chord['time']:.1f}s: {chord['chord']} ({chord['confidence']:.2%}, {chord['duration']:.1f}s)")
-    
-    if len(results['chords']) > 10:
-        print(f"  ... and {len(results['chords']) - 10} more changes")
+    for audio_path, results in analyzed:
+        print(f"\n=== Chord Detection Results ===")
+        print(f"File: {audio_path.name}")
+        print(f"Chord changes: {results['chord_changes']}")
+        print(f"Unique chords: {results['unique_chords']}")
+        print(f"Duration: {results['duration']:.1f}s")
+        print(f"Processing time: {results['processing_time']:.2f}s")
+        
+        print(f"\nChord vocabulary: {', '.join(results['chord_vocabulary'][:10])}")
+        if len(results['chord_vocabulary']) > 10:
+            print(f"  ... and {len(results['chord_vocabulary']) - 10} more")
+        
+        print(f"\nFirst 10 chord changes:")
+        for i, chord in enumerate(results['chords'][:10]):
+            print(f"  {i+1}. {chord['time']:.1f}s: {chord['chord']} ({chord['confidence']:.2%}, {chord['duration']:.1f}s)")
+        
+        if len(results['chords']) > 10:
+            print(f"  ... and {len(results['chords']) - 10} more changes")
     
     print(f"\nOutputs saved to: {output_dir}")
     
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == '__main__':
@@ -3,6 +3,7 @@ CLI command for audio event classification.
 
 Usage:
     python -m music_analysis.cli.analyze_genre audio.mp3
+    python -m music_analysis.cli.analyze_genre library/*.mp3 --workers 8
     python -m music_analysis.cli.analyze_genre audio.mp3 --output results/
     python -m music_analysis.cli.analyze_genre audio.mp3 --window-seconds 10 --overlap 0.25 --top-k 10
 """
@@ -16,6 +17,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from music_analysis.analyzers.genre_classifier import AudioEventClassifier, DEFAULT_MODEL
+from music_analysis.visualization.render_pool import RenderPool, default_workers
 
 
 def main() -> int:
@@ -40,15 +42,31 @@ Examples:
   # Limit to first few segments for quick preview
   python -m music_analysis.cli.analyze_genre song.mp3 --max-chunks 3
 
+  # Larger inference batches for multi-core CPU throughput
+  python -m music_analysis.cli.analyze_genre song.mp3 --batch-size 16
+
+  # Fast tagging: stop once the primary label is stable
+  python -m music_analysis.cli.analyze_genre song.mp3 --early-stop --batch-size 4
+
+  # Int8 quantized model for CPU-only machines
+  python -m music_analysis.cli.analyze_genre song.mp3 --quantize int8
+
+  # Check int8 label agreement against the float model on a sample set
+  python -m music_analysis.cli.analyze_genre song.mp3 --quantize int8 --compare-float a.mp3 b.mp3
+
   # Force CPU inference (if GPU unavailable)
   python -m music_analysis.cli.analyze_genre song.mp3 --device cpu --verbose
+
+  # Analyze a library, rendering plots/HTML on 8 processes
+  python -m music_analysis.cli.analyze_genre library/*.mp3 --workers 8
 """
     )
 
     parser.add_argument(
         "audio",
         type=str,
-        help="Input audio file (MP3, WAV, FLAC, etc.)",
+        nargs="+",
+        help="Input audio file(s) (MP3, WAV, FLAC, etc.)",
     )
     parser.add_argument(
         "--output",
@@ -89,6 +107,45 @@ Examples:
         default=None,
         help="Maximum number of analysis chunks to process (default: all)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Number of chunks per model forward pass (default: 8)",
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="Stop once the primary label is stable (chunks processed in strided order)",
+    )
+    parser.add_argument(
+        "--stop-tolerance",
+        type=float,
+        default=0.02,
+        help="Max change in top-1/top-2 probability margin to count as stable (default: 0.02)",
+    )
+    parser.add_argument(
+        "--min-chunks",
+        type=int,
+        default=4,
+        help="Minimum chunks processed before early stopping (default: 4)",
+    )
+    parser.add_argument(
+        "--quantize",
+        type=str,
+        choices=["int8"],
+        default=None,
+        help="Quantize model Linear layers for faster CPU inference (default: off)",
+    )
+    parser.add_argument(
+        "--compare-float",
+        type=str,
+        nargs="*",
+        default=None,
+        metavar="AUDIO",
+        help="With --quantize, report label agreement against the float model "
+        "on these files (default: the input audio files)",
+    )
     parser.add_argument(
         "--device",
         type=str,
@@ -108,6 +165,23 @@ Examples:
         default=None,
         help="Optional directory for model caching",
     )
+    parser.add_argument(
+        "--compact-report",
+        action="store_true",
+        help="Offline, size-bounded HTML report (local plotly.js, decimated charts, lazy sidecars)",
+    )
+    parser.add_argument(
+        "--max-points",
+        type=int,
+        default=2000,
+        help="Maximum points per chart series in compact reports (default: 2000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for plot/HTML rendering (default: one per CPU, up to the number of files)",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -117,10 +191,11 @@ Examples:
 
     args = parser.parse_args()
 
-    audio_path = Path(args.audio)
-    if not audio_path.exists():
-        print(f"Error: Audio file not found: {audio_path}")
-        return 1
+    audio_paths = [Path(path) for path in args.audio]
+    for audio_path in audio_paths:
+        if not audio_path.exists():
+            print(f"Error: Audio file not found: {audio_path}")
+            return 1
 
     if args.output:
         output_dir = Path(args.output)
@@ -133,104 +208,135 @@ Examples:
     else:
         device = args.device
 
+    if args.compare_float is not None and not args.quantize:
+        print("Error: --compare-float requires --quantize")
+        return 1
+
     if args.verbose:
         print(f"Loading model: {args.model}")
+        if args.quantize:
+            print(f"Quantization: {args.quantize}")
         print(f"Device: {device or 'auto'}")
-        print(f"Analyzing: {audio_path.name}")
         print(
             f"Window: {args.window_seconds:.1f}s | "
             f"Overlap: {args.overlap:.2f} | "
-            f"Top-K: {args.top_k}"
+            f"Top-K: {args.top_k} | "
+            f"Batch: {args.batch_size}"
         )
 
+    analyze_kwargs = dict(
+        top_k=args.top_k,
+        window_seconds=args.window_seconds,
+        overlap=args.overlap,
+        max_chunks=args.max_chunks,
+        batch_size=args.batch_size,
+        early_stop=args.early_stop,
+        stop_tolerance=args.stop_tolerance,
+        min_chunks=args.min_chunks,
+    )
+
     try:
         classifier = AudioEventClassifier(
             model_name=args.model,
             device=device,
             cache_dir=args.cache_dir,
+            quantize=args.quantize,
         )
-        results = classifier.analyze(
-            str(audio_path),
-            top_k=args.top_k,
-            window_seconds=args.window_seconds,
-            overlap=args.overlap,
-            max_chunks=args.max_chunks,
-        )
+
+        report = None
+        if args.compare_float is not None:
+            sample_paths = args.compare_float or [str(path) for path in audio_paths]
+            report = classifier.compare_with_float(sample_paths, **analyze_kwargs)
     except Exception as exc:
-        print(f"Error during audio event classification: {exc}")
+        print(f"Error loading model: {exc}")
         if args.verbose:
             import traceback
 
             traceback.print_exc()
         return 1
 
-    json_path = output_dir / f"{audio_path.stem}_genre.json"
-    with open(json_path, "w", encoding="utf-8") as json_file:
-        json.dump(results, json_file, indent=2)
-
-    if args.verbose or args.format == "json":
-        print(f"[OK] JSON saved: {json_path}")
-
-    plot_path = None
-    if args.format in {"plot", "both", "html"}:
-        try:
-            from music_analysis.visualization.plot_genre import plot_genre
-
-            plot_path = output_dir / f"{audio_path.stem}_genre.png"
-            plot_genre(results, str(audio_path), plot_path)
-            if args.verbose or args.format == "plot":
-                print(f"[OK] Plot saved: {plot_path}")
-        except ImportError:
-            print("Warning: Visualization module not available. Skipping plots.")
-        except Exception as exc:
-            print(f"Warning: Plot generation failed: {exc}")
-            if args.verbose:
-                import traceback
-
-                traceback.print_exc()
-            plot_path = None
+    # Plots and HTML reports render in worker processes (inline for one file)
+    workers = args.workers or default_workers(len(audio_paths))
+    analyzed = []
+    failed = 0
 
-    if args.format in {"html", "both"}:
-        try:
-            from music_analysis.visualization.html_generator import (
-                generate_html_report,
-            )
-
-            html_path = output_dir / f"{audio_path.stem}_genre.html"
-            generate_html_report(
-                results,
-                str(audio_path),
-                html_path,
-                plot_path,
-                analysis_type="genre",
-            )
+    with RenderPool(workers) as pool:
+        for audio_path in audio_paths:
             if args.verbose:
-                print(f"[OK] HTML report saved: {html_path}")
-        except ImportError:
-            print("Warning: HTML generator not available. Skipping HTML report.")
-        except Exception as exc:
-            print(f"Warning: HTML generation failed: {exc}")
-            if args.verbose:
-                import traceback
-
-                traceback.print_exc()
-
-    top_label = results["primary_label"]
-    confidence = results["primary_confidence"] * 100
-
-    print("\n=== Audio Event Classification Results ===")
-    print(f"File: {audio_path.name}")
-    print(f"Primary Event: {top_label} ({confidence:.1f}%)")
-    print(f"\nTop {args.top_k} Detected Events:")
-    for entry in results["predictions"]:
-        print(f"  - {entry['label']}: {entry['score'] * 100:.1f}%")
-
-    print(f"\nChunks analyzed: {len(results['chunk_predictions'])}")
-    print(f"Total event classes available: {results['num_labels']}")
-    print(f"Processing time: {results['processing_time']:.2f}s")
+                print(f"Analyzing: {audio_path.name}")
+
+            try:
+                results = classifier.analyze(str(audio_path), **analyze_kwargs)
+                if report is not None:
+                    results["quantization_report"] = report
+            except Exception as exc:
+                print(f"Error during audio event classification of {audio_path.name}: {exc}")
+                if args.verbose:
+                    import traceback
+
+                    traceback.print_exc()
+                failed += 1
+                continue
+
+            json_path = output_dir / f"{audio_path.stem}_genre.json"
+            with open(json_path, "w", encoding="utf-8") as json_file:
+                json.dump(results, json_file, indent=2)
+
+            if args.verbose or args.format == "json":
+                print(f"[OK] JSON saved: {json_path}")
+
+            if args.format != "json":
+                pool.submit(
+                    audio_path.name,
+                    results,
+                    str(audio_path),
+                    str(output_dir / f"{audio_path.stem}_genre"),
+                    "genre",
+                    output_format=args.format,
+                    compact=args.compact_report,
+                    max_points=args.max_points,
+                    verbose=args.verbose,
+                )
+
+            analyzed.append((audio_path, results))
+
+        for _, outcome in pool.results():
+            for message in outcome["messages"]:
+                print(message)
+
+    for audio_path, results in analyzed:
+        top_label = results["primary_label"]
+        confidence = results["primary_confidence"] * 100
+
+        print("\n=== Audio Event Classification Results ===")
+        print(f"File: {audio_path.name}")
+        print(f"Primary Event: {top_label} ({confidence:.1f}%)")
+        print(f"\nTop {args.top_k} Detected Events:")
+        for entry in results["predictions"]:
+            print(f"  - {entry['label']}: {entry['score'] * 100:.1f}%")
+
+        early_stopping = results["metadata"]["early_stopping"]
+        if early_stopping["enabled"]:
+            print(
+                f"\nChunks analyzed: {early_stopping['chunks_used']} of "
+                f"{early_stopping['chunks_available']}"
+                f"{' (stopped early)' if early_stopping['stopped_early'] else ''}"
+            )
+        else:
+            print(f"\nChunks analyzed: {len(results['chunk_predictions'])}")
+        print(f"Total event classes available: {results['num_labels']}")
+        print(f"Processing time: {results['processing_time']:.2f}s")
+
+    if report:
+        print(f"\n{report['quantize']} vs float ({report['num_files']} files):")
+        print(f"  Primary label agreement: {report['primary_agreement'] * 100:.1f}%")
+        print(f"  Chunk label agreement: {report['chunk_agreement'] * 100:.1f}%")
+        print(f"  Top-K overlap: {report['top_k_overlap'] * 100:.1f}%")
+        if report["speedup"]:
+            print(f"  Speedup: {report['speedup']:.2f}x")
     print(f"Outputs saved to: {output_dir}")
 
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ CLI command for key detection
 
 Usage:
     python -m music_analysis.cli.analyze_key audio.mp3
+    python -m music_analysis.cli.analyze_key library/*.mp3 --workers 8
     python -m music_analysis.cli.analyze_key audio.mp3 --output results/
     python -m music_analysis.cli.analyze_key audio.mp3 --time-varying
 """
@@ -16,6 +17,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from music_analysis.analyzers.key_detector import KeyDetector
+from music_analysis.visualization.render_pool import RenderPool, default_workers
 
 
 def main():
@@ -36,6 +38,9 @@ Examples:
   
   # JSON only (no plots)
   python -m music_analysis.cli.analyze_key song.mp3 --format json
+  
+  # Analyze a library, rendering plots/HTML on 8 processes
+  python -m music_analysis.cli.analyze_key library/*.mp3 --workers 8
 """
     )
     
@@ -43,7 +48,8 @@ Examples:
     parser.add_argument(
         'audio',
         type=str,
-        help='Input audio file (MP3, WAV, FLAC, etc.)'
+        nargs='+',
+        help='Input audio file(s) (MP3, WAV, FLAC, etc.)'
     )
     
     # Optional arguments
@@ -82,6 +88,26 @@ Examples:
         help='Hop length for chroma extraction (default: 512)'
     )
     
+    parser.add_argument(
+        '--compact-report',
+        action='store_true',
+        help='Offline, size-bounded HTML report (local plotly.js, decimated charts, lazy sidecars)'
+    )
+    
+    parser.add_argument(
+        '--max-points',
+        type=int,
+        default=2000,
+        help='Maximum points per chart series in compact reports (default: 2000)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Processes for plot/HTML rendering (default: one per CPU, up to the number of files)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -90,11 +116,12 @@ Examples:
     
     args = parser.parse_args()
     
-    # Validate input file
-    audio_path = Path(args.audio)
-    if not audio_path.exists():
-        print(f"Error: Audio file not found: {audio_path}")
-        sys.exit(1)
+    # Validate input files
+    audio_paths = [Path(path) for path in args.audio]
+    for audio_path in audio_paths:
+        if not audio_path.exists():
+            print(f"Error: Audio file not found: {audio_path}")
+            sys.exit(1)
     
     # Setup output directory
     if args.output:
@@ -104,106 +131,94 @@ Examples:
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Run analysis
-    if args.verbose:
-        mode = "time-varying" if args.time_varying else "global"
-        print(f"Analyzing key ({mode}): {audio_path.name}")
+    # Plots and HTML reports render in worker processes (inline for one file)
+    workers = args.workers or default_workers(len(audio_paths))
+    analyzed = []
+    failed = 0
     
-    try:
-        detector = KeyDetector(hop_length=args.hop_length)
-        
-        if args.time_varying:
-            results = detector.analyze_time_varying(
-                str(audio_path),
-                window_size=args.window_size
-            )
-        else:
-            results = detector.analyze(str(audio_path))
-        
-        if args.verbose:
-            proc_time = results.get('processing_time', 0)
-            print(f"[OK] Analysis complete in {proc_time:.2f}s")
-    
-    except Exception as e:
-        print(f"Error during analysis: {e}")
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
-    
-    # Save JSON
-    suffix = "_key_timevarying" if args.time_varying else "_key"
-    json_path = output_dir / f"{audio_path.stem}{suffix}.json"
-    with open(json_path, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    if args.verbose or args.format == 'json':
-        print(f"[OK] JSON saved: {json_path}")
-    
-    # Generate plots if requested
-    if args.format in ['plot', 'both', 'html']:
-        try:
-            from music_analysis.visualization.plot_key import plot_key
+    with RenderPool(workers) as pool:
+        for audio_path in audio_paths:
+            # Run analysis
+            if args.verbose:
+                mode = "time-varying" if args.time_varying else "global"
+                print(f"Analyzing key ({mode}): {audio_path.name}")
             
-            plot_path = output_dir / f"{audio_path.stem}{suffix}.png"
-            plot_key(results, str(audio_path), plot_path, args.time_varying)
+            try:
+                detector = KeyDetector(hop_length=args.hop_length)
+                
+                if args.time_varying:
+                    results = detector.analyze_time_varying(
+                        str(audio_path),
+                        window_size=args.window_size
+                    )
+                else:
+                    results = detector.analyze(str(audio_path))
+                
+                if args.verbose:
+                    proc_time = results.get('processing_time', 0)
+                    print(f"[OK] Analysis complete in {proc_time:.2f}s")
             
-            if args.verbose or args.format == 'plot':
-                print(f"[OK] Plot saved: {plot_path}")
-        
-        except ImportError:
-            print("Warning: Visualization module not available. Skipping plots.")
-            plot_path = None
-        except Exception as e:
-            print(f"Warning: Plot generation failed: {e}")
-            plot_path = None
-    else:
-        plot_path = None
-    
-    # Generate HTML report if requested
-    if args.format in ['html', 'both']:
-        try:
-            from music_analysis.visualization.html_generator import generate_html_report
+            except Exception as e:
+                print(f"Error during analysis of {audio_path.name}: {e}")
+                if args.verbose:
+                    import traceback
+                    traceback.print_exc()
+                failed += 1
+                continue
             
-            html_path = output_dir / f"{audio_path.stem}{suffix}.html"
-            generate_html_report(
-                results,
-                str(audio_path),
-                html_path,
-                plot_path,
-                analysis_type='key'
-            )
+            # Save JSON
+            suffix = "_key_timevarying" if args.time_varying else "_key"
+            json_path = output_dir / f"{audio_path.stem}{suffix}.json"
+            with open(json_path, 'w') as f:
+                json.dump(results, f, indent=2)
             
-            if args.verbose:
-                print(f"[OK] HTML report saved: {html_path}")
+            if args.verbose or args.format == 'json':
+                print(f"[OK] JSON saved: {json_path}")
+            
+            # Queue plot and HTML report rendering
+            if args.format != 'json':
+                pool.submit(
+                    audio_path.name,
+                    results,
+                    str(audio_path),
+                    str(output_dir / f"{audio_path.stem}{suffix}"),
+                    'key',
+                    output_format=args.format,
+                    plot_args=(args.time_varying,),
+                    compact=args.compact_report,
+                    max_points=args.max_points,
+                    verbose=args.verbose
+                )
+            
+            analyzed.append((audio_path, results))
         
-        except ImportError:
-            print("Warning: HTML generator not available. Skipping HTML report.")
-        except Exception as e:
-            print(f"Warning: HTML generation failed: {e}")
+        for _, outcome in pool.results():
+            for message in outcome['messages']:
+                print(message)
     
     # Print summary
-    print(f"\n=== Key Detection Results ===")
-    print(f"File: {audio_path.name}")
-    
-    if args.time_varying:
-        print(f"Overall Key: {results['overall_key']} {results['overall_scale']}")
-        print(f"Key changes detected: {results['num_changes']}")
-        print(f"Window size: {results['window_size']}s")
-        print(f"Duration: {results['duration']:.1f}s")
-    else:
-        print(f"Key: {results['key']} {results['scale']}")
-        print(f"Confidence: {results['confidence']:.2%}")
-        print(f"Relative key: {results['relative_key']}")
-        print(f"\nAlternative keys:")
-        for alt in results['alternatives']:
-            print(f"  - {alt['key']}: {alt['confidence']:.2%}")
-        print(f"Duration: {results['duration']:.1f}s")
-        print(f"Processing time: {results['processing_time']:.2f}s")
+    for audio_path, results in analyzed:
+        print(f"\n=== Key Detection Results ===")
+        print(f"File: {audio_path.name}")
+        
+        if args.time_varying:
+            print(f"Overall Key: {results['overall_key']} {results['overall_scale']}")
+            print(f"Key changes detected: {results['num_changes']}")
+            print(f"Window size: {results['window_size']}s")
+            print(f"Duration: {results['duration']:.1f}s")
+        else:
+            print(f"Key: {results['key']} {results['scale']}")
+            print(f"Confidence: {results['confidence']:.2%}")
+            print(f"Relative key: {results['relative_key']}")
+            print(f"\nAlternative keys:")
+            for alt in results['alternatives']:
+                print(f"  - {alt['key']}: {alt['confidence']:.2%}")
+            print(f"Duration: {results['duration']:.1f}s")
+            print(f"Processing time: {results['processing_time']:.2f}s")
     
     print(f"\nOutputs saved to: {output_dir}")
     
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == '__main__':
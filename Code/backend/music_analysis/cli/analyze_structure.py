@@ -3,6 +3,7 @@ CLI command for music structure analysis
 
 Usage:
     python -m music_analysis.cli.analyze_structure audio.mp3
+    python -m music_analysis.cli.analyze_structure library/*.mp3 --workers 8
     python -m music_analysis.cli.analyze_structure audio.mp3 --output results/
     python -m music_analysis.cli.analyze_structure audio.mp3 --algorithm cnmf
 """
@@ -16,6 +17,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from music_analysis.analyzers.structure_analyzer import StructureAnalyzer
+from music_analysis.visualization.render_pool import RenderPool, default_workers
 
 
 def main():
@@ -34,8 +36,14 @@ Examples:
   # Use different algorithm
   python -m music_analysis.cli.analyze_structure song.mp3 --algorithm foote
   
+  # Built-in segmentation (no MSAF required)
+  python -m music_analysis.cli.analyze_structure song.mp3 --algorithm native
+  
   # JSON only (no plots)
   python -m music_analysis.cli.analyze_structure song.mp3 --format json
+  
+  # Analyze a library, rendering plots/HTML on 8 processes
+  python -m music_analysis.cli.analyze_structure library/*.mp3 --workers 8
 """
     )
     
@@ -43,7 +51,8 @@ Examples:
     parser.add_argument(
         'audio',
         type=str,
-        help='Input audio file (MP3, WAV, FLAC, etc.)'
+        nargs='+',
+        help='Input audio file(s) (MP3, WAV, FLAC, etc.)'
     )
     
     # Optional arguments
@@ -66,8 +75,28 @@ Examples:
         '--algorithm',
         type=str,
         default='cnmf',
-        choices=['cnmf', 'foote', 'olda', 'scluster', 'sf'],
-        help='Segmentation algorithm (default: cnmf)'
+        choices=['cnmf', 'foote', 'olda', 'scluster', 'sf', 'native'],
+        help='Segmentation algorithm (default: cnmf, falls back to native without MSAF)'
+    )
+    
+    parser.add_argument(
+        '--compact-report',
+        action='store_true',
+        help='Offline, size-bounded HTML report (local plotly.js, decimated charts, lazy sidecars)'
+    )
+    
+    parser.add_argument(
+        '--max-points',
+        type=int,
+        default=2000,
+        help='Maximum points per chart series in compact reports (default: 2000)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Processes for plot/HTML rendering (default: one per CPU, up to the number of files)'
     )
     
     parser.add_argument(
@@ -78,11 +107,12 @@ Examples:
     
     args = parser.parse_args()
     
-    # Validate input file
-    audio_path = Path(args.audio)
-    if not audio_path.exists():
-        print(f"Error: Audio file not found: {audio_path}")
-        sys.exit(1)
+    # Validate input files
+    audio_paths = [Path(path) for path in args.audio]
+    for audio_path in audio_paths:
+        if not audio_path.exists():
+            print(f"Error: Audio file not found: {audio_path}")
+            sys.exit(1)
     
     # Setup output directory
     if args.output:
@@ -92,102 +122,83 @@ Examples:
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Run analysis
-    if args.verbose:
-        print(f"Analyzing structure: {audio_path.name}")
-        print(f"Algorithm: {args.algorithm}")
-    
-    try:
-        analyzer = StructureAnalyzer()
-        results = analyzer.analyze(
-            str(audio_path),
-            algorithm=args.algorithm
-        )
-        
-        if args.verbose:
-            print(f"[OK] Analysis complete in {results['processing_time']:.2f}s")
-    
-    except Exception as e:
-        print(f"Error during analysis: {e}")
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
-    
-    # Save JSON
-    json_path = output_dir / f"{audio_path.stem}_structure.json"
-    with open(json_path, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    if args.verbose or args.format == 'json':
-        print(f"[OK] JSON saved: {json_path}")
-    
-    # Generate plots if requested
-    if args.format in ['plot', 'both', 'html']:
-        try:
-            from music_analysis.visualization.plot_structure import plot_structure
+    # Plots and HTML reports render in worker processes (inline for one file)
+    workers = args.workers or default_workers(len(audio_paths))
+    analyzed = []
+    failed = 0
+    
+    with RenderPool(workers) as pool:
+        for audio_path in audio_paths:
+            # Run analysis
+            if args.verbose:
+                print(f"Analyzing structure: {audio_path.name}")
+                print(f"Algorithm: {args.algorithm}")
             
-            plot_path = output_dir / f"{audio_path.stem}_structure.png"
-            plot_structure(results, str(audio_path), plot_path)
+            try:
+                analyzer = StructureAnalyzer()
+                results = analyzer.analyze(
+                    str(audio_path),
+                    algorithm=args.algorithm
+                )
+                
+                if args.verbose:
+                    print(f"[OK] Analysis complete in {results['processing_time']:.2f}s")
             
-            if args.verbose or args.format == 'plot':
-                print(f"[OK] Plot saved: {plot_path}")
-        
-        except ImportError:
-            print("Warning: Visualization module not available. Skipping plots.")
-            plot_path = None
-        except Exception as e:
-            print(f"Warning: Plot generation failed: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
-            plot_path = None
-    else:
-        plot_path = None
-    
-    # Generate HTML report if requested
-    if args.format in ['html', 'both']:
-        try:
-            from music_analysis.visualization.html_generator import generate_html_report
+            except Exception as e:
+                print(f"Error during analysis of {audio_path.name}: {e}")
+                if args.verbose:
+                    import traceback
+                    traceback.print_exc()
+                failed += 1
+                continue
             
-            html_path = output_dir / f"{audio_path.stem}_structure.html"
-            generate_html_report(
-                results,
-                str(audio_path),
-                html_path,
-                plot_path,
-                analysis_type='structure'
-            )
+            # Save JSON
+            json_path = output_dir / f"{audio_path.stem}_structure.json"
+            with open(json_path, 'w') as f:
+                json.dump(results, f, indent=2)
             
-            if args.verbose:
-                print(f"[OK] HTML report saved: {html_path}")
+            if args.verbose or args.format == 'json':
+                print(f"[OK] JSON saved: {json_path}")
+            
+            # Queue plot and HTML report rendering
+            if args.format != 'json':
+                pool.submit(
+                    audio_path.name,
+                    results,
+                    str(audio_path),
+                    str(output_dir / f"{audio_path.stem}_structure"),
+                    'structure',
+                    output_format=args.format,
+                    compact=args.compact_report,
+                    max_points=args.max_points,
+                    verbose=args.verbose
+                )
+            
+            analyzed.append((audio_path, results))
         
-        except ImportError:
-            print("Warning: HTML generator not available. Skipping HTML report.")
-        except Exception as e:
-            print(f"Warning: HTML generation failed: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
+        for _, outcome in pool.results():
+            for message in outcome['messages']:
+                print(message)
     
     # Print summary
-    print(f"\n=== Structure Analysis Results ===")
-    print(f"File: {audio_path.name}")
-    print(f"Algorithm: {results['algorithm']}")
-    print(f"Segments detected: {results['num_segments']}")
-    print(f"Duration: {results['duration']:.1f}s")
-    print(f"Processing time: {results['processing_time']:.2f}s")
-    
-    print(f"\nSegment breakdown:")
-    for i, seg in enumerate(results['segments'][:10]):  # Show first 10
-        print(f"  {i+1}. {seg['start']:.1f}s - {seg['end']:.1f}s: {seg['label']} ({seg['duration']:.1f}s)")
-    
-    if len(results['segments']) > 10:
-        print(f"  ... and {len(results['segments']) - 10} more segments")
+    for audio_path, results in analyzed:
+        print(f"\n=== Structure Analysis Results ===")
+        print(f"File: {audio_path.name}")
+        print(f"Algorithm: {results['algorithm']}")
+        print(f"Segments detected: {results['num_segments']}")
+        print(f"Duration: {results['duration']:.1f}s")
+        print(f"Processing time: {results['processing_time']:.2f}s")
+        
+        print(f"\nSegment breakdown:")
+        for i, seg in enumerate(results['segments'][:10]):  # Show first 10
+            print(f"  {i+1}. {seg['start']:.1f}s - {seg['end']:.1f}s: {seg['label']} ({seg['duration']:.1f}s)")
+        
+        if len(results['segments']) > 10:
+            print(f"  ... and {len(results['segments']) - 10} more segments")
     
     print(f"\nOutputs saved to: {output_dir}")
     
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == '__main__':
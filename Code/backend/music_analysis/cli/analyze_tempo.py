@@ -3,6 +3,7 @@ CLI command for tempo analysis
 
 Usage:
     python -m music_analysis.cli.analyze_tempo audio.mp3
+    python -m music_analysis.cli.analyze_tempo library/*.mp3 --workers 8
     python -m music_analysis.cli.analyze_tempo audio.mp3 --output results/
     python -m music_analysis.cli.analyze_tempo audio.mp3 --format json
 """
@@ -16,6 +17,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from music_analysis.analyzers.tempo_analyzer import TempoAnalyzer
+from music_analysis.visualization.render_pool import RenderPool, default_workers
 
 
 def main():
@@ -36,6 +38,12 @@ Examples:
   
   # Specify initial BPM estimate
   python -m music_analysis.cli.analyze_tempo song.mp3 --start-bpm 140
+  
+  # Local tempo curve every 2 seconds (DJ mixes, tempo drift)
+  python -m music_analysis.cli.analyze_tempo mix.mp3 --local-tempo --tempo-resolution 2
+  
+  # Analyze a library, rendering plots/HTML on 8 processes
+  python -m music_analysis.cli.analyze_tempo library/*.mp3 --workers 8
 """
     )
     
@@ -43,7 +51,8 @@ Examples:
     parser.add_argument(
         'audio',
         type=str,
-        help='Input audio file (MP3, WAV, FLAC, etc.)'
+        nargs='+',
+        help='Input audio file(s) (MP3, WAV, FLAC, etc.)'
     )
     
     # Optional arguments
@@ -76,6 +85,39 @@ Examples:
         help='Hop length for analysis (default: 512)'
     )
     
+    parser.add_argument(
+        '--local-tempo',
+        action='store_true',
+        help='Also compute a local tempo curve (for tracks with tempo drift)'
+    )
+    
+    parser.add_argument(
+        '--tempo-resolution',
+        type=float,
+        default=1.0,
+        help='Local tempo curve resolution in seconds (default: 1.0)'
+    )
+    
+    parser.add_argument(
+        '--compact-report',
+        action='store_true',
+        help='Offline, size-bounded HTML report (local plotly.js, decimated charts, lazy sidecars)'
+    )
+    
+    parser.add_argument(
+        '--max-points',
+        type=int,
+        default=2000,
+        help='Maximum points per chart series in compact reports (default: 2000)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Processes for plot/HTML rendering (default: one per CPU, up to the number of files)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -84,11 +126,12 @@ Examples:
     
     args = parser.parse_args()
     
-    # Validate input file
-    audio_path = Path(args.audio)
-    if not audio_path.exists():
-        print(f"Error: Audio file not found: {audio_path}")
-        sys.exit(1)
+    # Validate input files
+    audio_paths = [Path(path) for path in args.audio]
+    for audio_path in audio_paths:
+        if not audio_path.exists():
+            print(f"Error: Audio file not found: {audio_path}")
+            sys.exit(1)
     
     # Setup output directory
     if args.output:
@@ -98,93 +141,83 @@ Examples:
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Run analysis
-    if args.verbose:
-        print(f"Analyzing tempo: {audio_path.name}")
-        print(f"Start BPM estimate: {args.start_bpm}")
-    
-    try:
-        analyzer = TempoAnalyzer(hop_length=args.hop_length)
-        results = analyzer.analyze(
-            str(audio_path),
-            start_bpm=args.start_bpm
-        )
-        
-        if args.verbose:
-            print(f"[OK] Analysis complete in {results['processing_time']:.2f}s")
-    
-    except Exception as e:
-        print(f"Error during analysis: {e}")
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
-    
-    # Save JSON
-    json_path = output_dir / f"{audio_path.stem}_tempo.json"
-    with open(json_path, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    if args.verbose or args.format == 'json':
-        print(f"[OK] JSON saved: {json_path}")
-    
-    # Generate plots if requested
-    if args.format in ['plot', 'both', 'html']:
-        try:
-            from music_analysis.visualization.plot_tempo import plot_tempo
+    # Plots and HTML reports render in worker processes (inline for one file)
+    workers = args.workers or default_workers(len(audio_paths))
+    analyzed = []
+    failed = 0
+    
+    with RenderPool(workers) as pool:
+        for audio_path in audio_paths:
+            # Run analysis
+            if args.verbose:
+                print(f"Analyzing tempo: {audio_path.name}")
+                print(f"Start BPM estimate: {args.start_bpm}")
             
-            plot_path = output_dir / f"{audio_path.stem}_tempo.png"
-            plot_tempo(results, str(audio_path), plot_path)
+            try:
+                analyzer = TempoAnalyzer(hop_length=args.hop_length)
+                results = analyzer.analyze(
+                    str(audio_path),
+                    start_bpm=args.start_bpm,
+                    local_tempo=args.local_tempo,
+                    resolution=args.tempo_resolution
+                )
+                
+                if args.verbose:
+                    print(f"[OK] Analysis complete in {results['processing_time']:.2f}s")
             
-            if args.verbose or args.format == 'plot':
-                print(f"[OK] Plot saved: {plot_path}")
-        
-        except ImportError:
-            print("Warning: Visualization module not available. Skipping plots.")
-            plot_path = None
-        except Exception as e:
-            print(f"Warning: Plot generation failed: {e}")
-            plot_path = None
-    else:
-        plot_path = None
-    
-    # Generate HTML report if requested
-    if args.format in ['html', 'both']:
-        try:
-            from music_analysis.visualization.html_generator import generate_html_report
+            except Exception as e:
+                print(f"Error during analysis of {audio_path.name}: {e}")
+                if args.verbose:
+                    import traceback
+                    traceback.print_exc()
+                failed += 1
+                continue
             
-            html_path = output_dir / f"{audio_path.stem}_tempo.html"
-            generate_html_report(
-                results,
-                str(audio_path),
-                html_path,
-                plot_path,
-                analysis_type='tempo'
-            )
+            # Save JSON
+            json_path = output_dir / f"{audio_path.stem}_tempo.json"
+            with open(json_path, 'w') as f:
+                json.dump(results, f, indent=2)
             
-            if args.verbose:
-                print(f"[OK] HTML report saved: {html_path}")
+            if args.verbose or args.format == 'json':
+                print(f"[OK] JSON saved: {json_path}")
+            
+            # Queue plot and HTML report rendering
+            if args.format != 'json':
+                pool.submit(
+                    audio_path.name,
+                    results,
+                    str(audio_path),
+                    str(output_dir / f"{audio_path.stem}_tempo"),
+                    'tempo',
+                    output_format=args.format,
+                    compact=args.compact_report,
+                    max_points=args.max_points,
+                    verbose=args.verbose
+                )
+            
+            analyzed.append((audio_path, results))
         
-        except ImportError:
-            print("Warning: HTML generator not available. Skipping HTML report.")
-        except Exception as e:
-            print(f"Warning: HTML generation failed: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
+        for _, outcome in pool.results():
+            for message in outcome['messages']:
+                print(message)
     
     # Print summary
-    print(f"\n=== Tempo Analysis Results ===")
-    print(f"File: {audio_path.name}")
-    print(f"Tempo: {results['tempo']} BPM")
-    print(f"Confidence: {results['tempo_confidence']:.2%}")
-    print(f"Time Signature: {results['time_signature']}")
-    print(f"Beats detected: {results['num_beats']}")
-    print(f"Duration: {results['duration']:.1f}s")
-    print(f"Processing time: {results['processing_time']:.2f}s")
+    for audio_path, results in analyzed:
+        print(f"\n=== Tempo Analysis Results ===")
+        print(f"File: {audio_path.name}")
+        print(f"Tempo: {results['tempo']} BPM")
+        print(f"Confidence: {results['tempo_confidence']:.2%}")
+        print(f"Time Signature: {results['time_signature']}")
+        print(f"Beats detected: {results['num_beats']}")
+        if 'tempo_curve' in results:
+            low, high = results['tempo_curve']['bpm_range']
+            print(f"Local tempo range: {low:.1f} - {high:.1f} BPM")
+        print(f"Duration: {results['duration']:.1f}s")
+        print(f"Processing time: {results['processing_time']:.2f}s")
+    
     print(f"\nOutputs saved to: {output_dir}")
     
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == '__main__':
@@ -0,0 +1 @@
+"""Unit tests for music_analysis (run from Code/backend: pytest music_analysis/tests/)."""
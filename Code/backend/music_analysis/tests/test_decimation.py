@@ -0,0 +1,57 @@
+"""Tests for visualization.decimation length limits and endpoint handling."""
+
+import numpy as np
+import pytest
+
+from music_analysis.visualization.decimation import lttb_indices, stride_indices
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 10, 1001])
+@pytest.mark.parametrize('n_out', [0, 1, 2, 3, 7, 1000, 5000])
+def test_stride_indices_length(n, n_out):
+    indices = stride_indices(n, n_out)
+
+    assert len(indices) == min(n, n_out)
+    assert np.all(np.diff(indices) > 0)
+    if len(indices):
+        assert indices[0] == 0
+        assert indices[-1] < n
+
+
+@pytest.mark.parametrize('n, n_out', [(10, 2), (1001, 7), (5000, 1000)])
+def test_stride_indices_keeps_endpoints(n, n_out):
+    indices = stride_indices(n, n_out)
+
+    assert indices[0] == 0
+    assert indices[-1] == n - 1
+
+
+def test_stride_indices_short_series_unchanged():
+    np.testing.assert_array_equal(stride_indices(5, 5), np.arange(5))
+    np.testing.assert_array_equal(stride_indices(5, 100), np.arange(5))
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 10, 1001])
+@pytest.mark.parametrize('n_out', [0, 1, 2, 3, 7, 1000, 5000])
+def test_lttb_indices_length(n, n_out):
+    rng = np.random.default_rng(n * 31 + n_out)
+    x = np.arange(n, dtype=float)
+    y = rng.standard_normal(n)
+
+    indices = lttb_indices(x, y, n_out)
+
+    assert len(indices) == min(n, n_out)
+    assert np.all(np.diff(indices) > 0)
+    if n_out >= 2 and n > 1:
+        assert indices[0] == 0
+        assert indices[-1] == n - 1
+
+
+def test_lttb_indices_keeps_spike():
+    y = np.zeros(10000)
+    y[4321] = 100.0
+
+    indices = lttb_indices(np.arange(len(y)), y, 50)
+
+    assert 4321 in indices
+    assert 4321 not in stride_indices(len(y), 50)
@@ -0,0 +1,81 @@
+"""
+Series Decimation - Downsample long series for lightweight charts
+
+Index-selection helpers used by compact HTML reports. Each function returns
+sorted indices into the original series so any parallel per-point data
+(labels, sizes, hover text) can be sliced consistently.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+
+def stride_indices(n: int, n_out: int) -> np.ndarray:
+    """
+    Evenly spaced indices, keeping the first and last point when n_out >= 2.
+
+    Args:
+        n: Length of the original series
+        n_out: Maximum number of points to keep
+
+    Returns:
+        Sorted index array of length min(n, n_out) (just the first point
+        for n_out == 1)
+    """
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 2:
+        return np.arange(max(n_out, 0))
+    return np.unique(np.round(np.linspace(0, n - 1, n_out)).astype(int))
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the point in each bucket that forms the largest triangle with the
+    previously kept point and the mean of the next bucket, which preserves the
+    visual shape of a line far better than striding.
+
+    Args:
+        x: Monotonic x values
+        y: Series values
+        n_out: Number of points to keep (below 3, falls back to
+            stride_indices)
+
+    Returns:
+        Sorted index array of length min(len(x), n_out)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 3:
+        return stride_indices(n, n_out)
+
+    # Interior points are split into n_out - 2 buckets
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        indices[bucket + 1] = previous
+
+    return indices
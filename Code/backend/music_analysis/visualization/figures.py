@@ -0,0 +1,45 @@
+"""
+Figure Templates - Reusable matplotlib figures for batch rendering
+
+Plot functions draw into a cached Figure per (template, size) instead of
+creating and tearing down a pyplot figure for every track. Template figures
+are not registered with pyplot and render through Agg, so they are safe to use
+in headless worker processes.
+"""
+
+from typing import Dict, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+_TEMPLATES: Dict[Tuple[str, Tuple[float, float]], Figure] = {}
+
+
+def template_figure(name: str, figsize: tuple) -> Figure:
+    """
+    Get a cleared figure for a plot template, creating it on first use.
+    
+    Args:
+        name: Template name (one per plot function)
+        figsize: Figure size in inches
+        
+    Returns:
+        Empty Figure with an Agg canvas attached
+    """
+    key = (name, tuple(figsize))
+    fig = _TEMPLATES.get(key)
+    
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _TEMPLATES[key] = fig
+    else:
+        fig.clf()
+    
+    return fig
+
+
+def release_figure(fig: Figure) -> None:
+    """Clear a template figure so it doesn't keep the last track's artists alive."""
+    fig.clf()
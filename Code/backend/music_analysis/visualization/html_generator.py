@@ -2,21 +2,41 @@
 HTML Report Generator - Create interactive HTML reports
 
 Generates self-contained HTML reports with JSON data, plots, and interactive charts.
+
+Compact mode targets long tracks and offline machines: it references one local
+copy of plotly.js instead of the CDN, decimates large series in the inline
+charts, and moves full-resolution charts and raw JSON into sidecar files that
+are only loaded when their panel is expanded.
 """
 
 import base64
 import json
+import os
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Union
 
+from music_analysis.visualization.decimation import lttb_indices, stride_indices
+
+
+PLOTLY_CDN_URL = "https://cdn.plot.ly/plotly-2.26.0.min.js"
+
+# Local plotly.js cache shared by all compact reports on this machine
+PLOTLY_CACHE_PATH = Path.home() / ".cache" / "music_analysis" / "plotly.min.js"
+
+# Default cap on points per series in compact report charts
+DEFAULT_MAX_POINTS = 2000
+
 
 def generate_html_report(
     results: Dict,
     audio_path: str,
     output_path: Union[str, Path],
     plot_path: Optional[Union[str, Path]] = None,
-    analysis_type: str = 'tempo'
+    analysis_type: str = 'tempo',
+    compact: bool = False,
+    max_points: int = DEFAULT_MAX_POINTS
 ) -> None:
     """
     Generate HTML report for music analysis.
@@ -27,35 +47,59 @@ def generate_html_report(
         output_path: Path to save HTML report
         plot_path: Path to plot PNG (optional, will be embedded)
         analysis_type: Type of analysis ('tempo', 'key', 'chords', 'structure', 'genre')
+        compact: Write an offline, size-bounded report with lazy-loaded
+            sidecars (`<name>_detail.html`, `<name>_data.json`) and a shared
+            local `plotly.min.js` in the output directory
+        max_points: Maximum points per chart series in compact mode
     """
     audio_name = Path(audio_path).name
+    output_path = Path(output_path)
     
-    # Embed plot as base64 if provided
+    if compact:
+        plotly_tag = _local_plotly_tag(output_path.parent)
+    else:
+        plotly_tag = f'<script src="{PLOTLY_CDN_URL}"></script>'
+    
+    # Embed plot as base64 if provided (compact reports link the PNG instead)
     plot_html = ""
     if plot_path and Path(plot_path).exists():
-        with open(plot_path, 'rb') as f:
-            plot_base64 = base64.b64encode(f.read()).decode('utf-8')
-            plot_html = f'<img src="data:image/png;base64,{plot_base64}" style="width: 100%; max-width: 1200px; height: auto;">'
+        if compact:
+            plot_src = Path(os.path.relpath(plot_path, output_path.parent)).as_posix()
+            plot_html = f'<img src="{plot_src}" loading="lazy" style="width: 100%; max-width: 1200px; height: auto;">'
+        else:
+            with open(plot_path, 'rb') as f:
+                plot_base64 = base64.b64encode(f.read()).decode('utf-8')
+                plot_html = f'<img src="data:image/png;base64,{plot_base64}" style="width: 100%; max-width: 1200px; height: auto;">'
     
     # Generate type-specific content
-    if analysis_type == 'tempo':
-        summary_html = _generate_tempo_summary(results)
-        interactive_html = _generate_tempo_interactive(results)
-    elif analysis_type == 'key':
-        summary_html = _generate_key_summary(results)
-        interactive_html = _generate_key_interactive(results)
-    elif analysis_type == 'structure':
-        summary_html = _generate_structure_summary(results)
-        interactive_html = _generate_structure_interactive(results)
-    elif analysis_type == 'chords':
-        summary_html = _generate_chords_summary(results)
-        interactive_html = _generate_chords_interactive(results)
-    elif analysis_type == 'genre':
-        summary_html = _generate_genre_summary(results)
-        interactive_html = _generate_genre_interactive(results)
+    summary_html = _generate_summary(results, analysis_type)
+    
+    if compact:
+        detail_path = output_path.with_name(f"{output_path.stem}_detail.html")
+        data_path = output_path.with_name(f"{output_path.stem}_data.json")
+        
+        with open(data_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, separators=(',', ':'))
+        
+        interactive_html = _generate_interactive(
+            decimate_results(results, analysis_type, max_points), analysis_type
+        )
+        if interactive_html:
+            _write_detail_page(results, audio_name, analysis_type, detail_path, plotly_tag)
+            interactive_html += f"""
+        <section>
+            <button type="button" class="collapsible">🔍 Full-Resolution Charts</button>
+            <div class="content">
+                {_lazy_frame(detail_path.name, 900)}
+            </div>
+        </section>
+        """
+        raw_json_html = _lazy_frame(data_path.name, 600)
     else:
-        summary_html = "<p>Analysis summary not available for this type.</p>"
-        interactive_html = ""
+        interactive_html = _generate_interactive(results, analysis_type)
+        raw_json_html = f"""<div class="json-container">
+                    <pre>{json.dumps(results, indent=2)}</pre>
+                </div>"""
     
     # Build complete HTML
     html_content = f"""<!DOCTYPE html>
@@ -64,7 +108,7 @@ def generate_html_report(
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Music Analysis: {audio_name}</title>
-    <script src="https://cdn.plot.ly/plotly-2.26.0.min.js"></script>
+    {plotly_tag}
     <style>
         * {{
             margin: 0;
@@ -282,9 +326,7 @@ def generate_html_report(
         <section>
             <button type="button" class="collapsible">📋 View Raw JSON Data</button>
             <div class="content">
-                <div class="json-container">
-                    <pre>{json.dumps(results, indent=2)}</pre>
-                </div>
+                {raw_json_html}
             </div>
         </section>
         
@@ -301,6 +343,11 @@ def generate_html_report(
             coll[i].addEventListener("click", function() {{
                 this.classList.toggle("active");
                 var content = this.nextElementSibling;
+                // Lazy sidecar frames load on first expand
+                var frame = content.querySelector("iframe[data-src]");
+                if (frame && !frame.getAttribute("src")) {{
+                    frame.setAttribute("src", frame.getAttribute("data-src"));
+                }}
                 if (content.style.maxHeight) {{
                     content.style.maxHeight = null;
                 }} else {{
@@ -317,6 +364,163 @@ def generate_html_report(
         f.write(html_content)
 
 
+def _generate_summary(results: Dict, analysis_type: str) -> str:
+    """Dispatch to the type-specific summary generator."""
+    generators = {
+        'tempo': _generate_tempo_summary,
+        'key': _generate_key_summary,
+        'structure': _generate_structure_summary,
+        'chords': _generate_chords_summary,
+        'genre': _generate_genre_summary,
+    }
+    if analysis_type not in generators:
+        return "<p>Analysis summary not available for this type.</p>"
+    return generators[analysis_type](results)
+
+
+def _generate_interactive(results: Dict, analysis_type: str) -> str:
+    """Dispatch to the type-specific interactive chart generator."""
+    generators = {
+        'tempo': _generate_tempo_interactive,
+        'key': _generate_key_interactive,
+        'structure': _generate_structure_interactive,
+        'chords': _generate_chords_interactive,
+        'genre': _generate_genre_interactive,
+    }
+    if analysis_type not in generators:
+        return ""
+    return generators[analysis_type](results)
+
+
+def decimate_results(results: Dict, analysis_type: str, max_points: int) -> Dict:
+    """
+    Return a shallow copy of results with long chart series downsampled.
+    
+    Event series (beats, analysis chunks) are thinned evenly; chord events
+    use LTTB on confidence so dips and peaks survive.
+    
+    Args:
+        results: Analysis results dictionary
+        analysis_type: Type of analysis
+        max_points: Maximum points per series
+        
+    Returns:
+        Results dictionary safe to inline in a report
+    """
+    decimated = dict(results)
+    
+    if analysis_type == 'tempo' and len(results.get('beats', [])) > max_points:
+        beats = results['beats']
+        decimated['beats'] = [beats[i] for i in stride_indices(len(beats), max_points)]
+    
+    elif analysis_type == 'chords' and len(results.get('chords', [])) > max_points:
+        chords = results['chords']
+        keep = lttb_indices(
+            [c['time'] for c in chords],
+            [c['confidence'] for c in chords],
+            max_points
+        )
+        decimated['chords'] = [chords[i] for i in keep]
+    
+    elif analysis_type == 'genre' and len(results.get('chunk_predictions', [])) > max_points:
+        chunks = results['chunk_predictions']
+        decimated['chunk_predictions'] = [
+            chunks[i] for i in stride_indices(len(chunks), max_points)
+        ]
+    
+    return decimated
+
+
+def _local_plotly_tag(output_dir: Path) -> str:
+    """
+    Reference a local plotly.js copy in the report directory.
+    
+    The script is taken from the machine-wide cache, which is seeded from the
+    installed `plotly` package on first use. All reports in a directory share
+    one copy. Falls back to the CDN if no local copy can be found.
+    
+    Args:
+        output_dir: Directory the report is written to
+        
+    Returns:
+        HTML script tag
+    """
+    target = output_dir / "plotly.min.js"
+    
+    if not target.exists():
+        if not PLOTLY_CACHE_PATH.exists():
+            try:
+                from plotly.offline import get_plotlyjs
+                
+                PLOTLY_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = PLOTLY_CACHE_PATH.with_name(f"{PLOTLY_CACHE_PATH.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(get_plotlyjs(), encoding='utf-8')
+                os.replace(tmp_path, PLOTLY_CACHE_PATH)
+            except ImportError:
+                print(
+                    "Warning: plotly not installed and no cached plotly.js at "
+                    f"{PLOTLY_CACHE_PATH}, report will load Plotly from CDN"
+                )
+                return f'<script src="{PLOTLY_CDN_URL}"></script>'
+        
+        # Copy then rename so parallel render workers never see a partial file
+        output_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        shutil.copyfile(PLOTLY_CACHE_PATH, tmp_path)
+        os.replace(tmp_path, target)
+    
+    return f'<script src="{target.name}"></script>'
+
+
+def _lazy_frame(src: str, height: int) -> str:
+    """Iframe that only loads `src` when its collapsible panel is opened."""
+    return (
+        f'<iframe data-src="{src}" loading="lazy" '
+        f'style="width: 100%; height: {height}px; border: none;"></iframe>'
+    )
+
+
+def _write_detail_page(
+    results: Dict,
+    audio_name: str,
+    analysis_type: str,
+    detail_path: Path,
+    plotly_tag: str
+) -> None:
+    """Write the full-resolution interactive charts as a standalone sidecar page."""
+    html_content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Full-Resolution Charts: {audio_name}</title>
+    {plotly_tag}
+    <style>
+        body {{
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            color: #333;
+            margin: 0;
+            padding: 10px;
+        }}
+        h2 {{
+            font-size: 1.2em;
+            margin: 10px 0;
+        }}
+        .metadata {{
+            background: #f8f9fa;
+            padding: 10px;
+            border-radius: 5px;
+        }}
+    </style>
+</head>
+<body>
+    {_generate_interactive(results, analysis_type)}
+</body>
+</html>"""
+    
+    with open(detail_path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+
 def _generate_tempo_summary(results: Dict) -> str:
     """Generate HTML summary for tempo analysis."""
     return f"""
@@ -8,11 +8,13 @@ from pathlib import Path
 from typing import Dict, Union
 
 import librosa
-import librosa.display
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
+from music_analysis.visualization.figures import release_figure, template_figure
+from music_analysis.visualization.raster import draw_chroma, draw_spans, draw_waveform
+
 
 def plot_chords(
     results: Dict,
@@ -23,7 +25,9 @@ def plot_chords(
     """
     Create visualization for chord detection.
     
-    Shows waveform and chromagram with chord labels overlaid.
+    Shows waveform and chromagram with chord labels overlaid. Chord regions
+    are drawn as batched collections and the chromagram as a single
+    pre-colored image, so long mixes with thousands of chords plot quickly.
     
     Args:
         results: Chord detection results dictionary
@@ -35,7 +39,8 @@ def plot_chords(
     y, sr = librosa.load(audio_path, sr=results['metadata']['sample_rate'])
     
     # Create figure with 3 subplots
-    fig, axes = plt.subplots(3, 1, figsize=figsize)
+    fig = template_figure('plot_chords', figsize)
+    axes = fig.subplots(3, 1)
     fig.suptitle(
         f"Chord Detection: {Path(audio_path).name}\n"
         f"Detected {results['chord_changes']} chord changes | "
@@ -46,8 +51,7 @@ def plot_chords(
     
     # === Plot 1: Waveform with chord regions ===
     ax1 = axes[0]
-    times = librosa.times_like(y, sr=sr)
-    ax1.plot(times, y, alpha=0.6, linewidth=0.5, color='steelblue')
+    draw_waveform(ax1, y, sr, color='steelblue', alpha=0.6)
     ax1.set_ylabel('Amplitude')
     ax1.set_title('Waveform with Chord Regions')
     ax1.grid(True, alpha=0.3)
@@ -58,18 +62,23 @@ def plot_chords(
     colors = plt.cm.tab20(np.linspace(0, 1, len(unique_chords)))
     chord_to_color = {chord: colors[i] for i, chord in enumerate(unique_chords)}
     
-    for chord_info in chords:
+    starts = np.array([c['time'] for c in chords], dtype=float)
+    ends = starts + np.array([c['duration'] for c in chords], dtype=float)
+    chord_colors = [chord_to_color.get(c['chord'], 'gray') for c in chords]
+    
+    # Labels need ~1% of the axis width to stay readable on long mixes
+    min_label_duration = max(2.0, results['duration'] / 100)
+    
+    if chords:
+        draw_spans(ax1, starts, ends, chord_colors, alpha=0.3, linewidth=0)
+    
+    for chord_info, color in zip(chords, chord_colors):
         start = chord_info['time']
         duration = chord_info['duration']
-        end = start + duration
         chord_name = chord_info['chord']
         
-        # Color region
-        color = chord_to_color.get(chord_name, 'gray')
-        ax1.axvspan(start, end, alpha=0.3, color=color)
-        
         # Add label if chord is wide enough
-        if duration > 2:
+        if duration > min_label_duration:
             mid_time = start + duration / 2
             ax1.text(
                 mid_time, ax1.get_ylim()[1] * 0.85,
@@ -88,42 +97,38 @@ def plot_chords(
     # Compute chromagram
     chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
     
-    img = librosa.display.specshow(
-        chroma,
-        sr=sr,
-        x_axis='time',
-        y_axis='chroma',
-        ax=ax2,
-        cmap='coolwarm'
-    )
+    img = draw_chroma(ax2, chroma, results['duration'], cmap='coolwarm')
     fig.colorbar(img, ax=ax2)
     ax2.set_title('Chromagram with Chord Boundaries')
     
     # Add chord boundaries
-    for chord_info in chords:
-        ax2.axvline(chord_info['time'], color='white', alpha=0.7, linewidth=2, linestyle='--')
+    ax2.vlines(
+        starts, 0, 1,
+        transform=ax2.get_xaxis_transform(),
+        colors='white', alpha=0.7, linewidth=2, linestyles='--'
+    )
     
     # === Plot 3: Chord timeline ===
     ax3 = axes[2]
     
     # Create timeline with chord names
     y_pos = 0
-    for i, chord_info in enumerate(chords):
+    if chords:
+        draw_spans(
+            ax3, starts, ends, chord_colors,
+            y_range=(y_pos - 0.4, y_pos + 0.4),
+            axis_coords=False,
+            alpha=0.7, edgecolor='black', linewidth=1
+        )
+    
+    for chord_info in chords:
         start = chord_info['time']
         duration = chord_info['duration']
         chord_name = chord_info['chord']
         confidence = chord_info['confidence']
         
-        # Draw bar
-        color = chord_to_color.get(chord_name, 'gray')
-        bar = ax3.barh(
-            y_pos, duration, left=start,
-            height=0.8, color=color, alpha=0.7,
-            edgecolor='black', linewidth=1
-        )
-        
         # Add label
-        if duration > 1:
+        if duration > min_label_duration / 2:
             ax3.text(
                 start + duration / 2, y_pos,
                 f"{chord_name}\n{confidence:.0%}",
@@ -161,9 +166,9 @@ def plot_chords(
     fig.text(0.5, 0.02, metadata_text, ha='center', fontsize=10, style='italic')
     
     # Save figure
-    plt.tight_layout(rect=[0, 0.03, 1, 0.96])
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout(rect=[0, 0.03, 1, 0.96])
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
 
 def plot_chord_statistics(
@@ -199,7 +204,8 @@ def plot_chord_statistics(
     counts = [chord_counts[c] for c in chord_names]
     
     # Create figure
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
+    fig = template_figure('plot_chord_statistics', figsize)
+    (ax1, ax2) = fig.subplots(1, 2)
     fig.suptitle('Chord Statistics', fontsize=14, fontweight='bold')
     
     # Plot 1: Duration
@@ -214,8 +220,8 @@ def plot_chord_statistics(
     ax2.set_title('Chord Frequency')
     ax2.grid(True, alpha=0.3, axis='x')
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
 
@@ -9,6 +9,8 @@ from typing import Dict, List, Union
 
 import matplotlib.pyplot as plt
 
+from music_analysis.visualization.figures import release_figure, template_figure
+
 
 PALETTE = [
     "#1f77b4",
@@ -55,7 +57,8 @@ def plot_genre(
     scores = [entry["score"] for entry in predictions]
     colors = _genre_color_mapping(labels or results.get("label_set", []))
 
-    fig, axes = plt.subplots(2, 1, figsize=figsize, sharex=False)
+    fig = template_figure('plot_genre', figsize)
+    axes = fig.subplots(2, 1, sharex=False)
     fig.suptitle(
         f"Genre Classification: {audio_name}",
         fontsize=14,
@@ -164,6 +167,6 @@ def plot_genre(
     )
     fig.text(0.5, 0.02, metadata_text, ha="center", fontsize=10, style="italic")
 
-    plt.tight_layout(rect=[0, 0.04, 1, 0.97])
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    fig.tight_layout(rect=[0, 0.04, 1, 0.97])
+    fig.savefig(output_path, dpi=150, bbox_inches="tight")
+    release_figure(fig)
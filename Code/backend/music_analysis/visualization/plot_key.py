@@ -8,10 +8,12 @@ from pathlib import Path
 from typing import Dict, Union
 
 import librosa
-import librosa.display
 import matplotlib.pyplot as plt
 import numpy as np
 
+from music_analysis.visualization.figures import release_figure, template_figure
+from music_analysis.visualization.raster import draw_chroma, draw_spans, draw_waveform
+
 
 # Key names for labeling
 KEY_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
@@ -56,7 +58,7 @@ def _plot_key_global(
     chroma = np.array(results['chroma_features'])
     
     # Create figure with 3 subplots
-    fig = plt.figure(figsize=figsize)
+    fig = template_figure('plot_key_global', figsize)
     gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
     
     # Title
@@ -70,14 +72,7 @@ def _plot_key_global(
     
     # === Plot 1: Chromagram (full span) ===
     ax1 = fig.add_subplot(gs[0, :])
-    img = librosa.display.specshow(
-        chroma,
-        sr=sr,
-        x_axis='time',
-        y_axis='chroma',
-        ax=ax1,
-        cmap='coolwarm'
-    )
+    img = draw_chroma(ax1, chroma, results['duration'], cmap='coolwarm')
     ax1.set_title('Chromagram (Pitch Class Energy Over Time)')
     fig.colorbar(img, ax=ax1, format='%+2.0f')
     
@@ -130,8 +125,7 @@ def _plot_key_global(
     
     # === Plot 4: Waveform with key info ===
     ax4 = fig.add_subplot(gs[2, :])
-    times = librosa.times_like(y, sr=sr)
-    ax4.plot(times, y, alpha=0.6, linewidth=0.5, color='steelblue')
+    draw_waveform(ax4, y, sr, color='steelblue', alpha=0.6)
     ax4.set_xlabel('Time (s)')
     ax4.set_ylabel('Amplitude')
     ax4.set_title('Audio Waveform')
@@ -160,8 +154,8 @@ def _plot_key_global(
     fig.text(0.5, 0.02, metadata_text, ha='center', fontsize=10, style='italic')
     
     # Save figure
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
 
 def _plot_key_timevarying(
@@ -175,7 +169,8 @@ def _plot_key_timevarying(
     y, sr = librosa.load(audio_path)
     
     # Create figure
-    fig, axes = plt.subplots(2, 1, figsize=figsize)
+    fig = template_figure('plot_key_timevarying', figsize)
+    axes = fig.subplots(2, 1)
     fig.suptitle(
         f"Time-Varying Key Detection: {Path(audio_path).name}\n"
         f"Overall Key: {results['overall_key']} {results['overall_scale']} | "
@@ -186,8 +181,7 @@ def _plot_key_timevarying(
     
     # === Plot 1: Waveform with key changes ===
     ax1 = axes[0]
-    times = librosa.times_like(y, sr=sr)
-    ax1.plot(times, y, alpha=0.6, linewidth=0.5, color='steelblue')
+    draw_waveform(ax1, y, sr, color='steelblue', alpha=0.6)
     ax1.set_ylabel('Amplitude')
     ax1.set_title('Waveform with Key Regions')
     ax1.grid(True, alpha=0.3)
@@ -196,21 +190,19 @@ def _plot_key_timevarying(
     key_timeline = results['key_timeline']
     colors = plt.cm.tab20(np.linspace(0, 1, results['num_changes']))
     
-    for i, entry in enumerate(key_timeline):
-        start_time = entry['time']
-        if i < len(key_timeline) - 1:
-            end_time = key_timeline[i + 1]['time']
-        else:
-            end_time = results['duration']
-        
-        ax1.axvspan(
-            start_time, end_time,
-            alpha=0.2,
-            color=colors[i % len(colors)]
-        )
-        
+    starts = np.array([e['time'] for e in key_timeline], dtype=float)
+    ends = np.append(starts[1:], results['duration'])
+    region_colors = colors[np.arange(len(key_timeline)) % len(colors)]
+    
+    # Labels need ~1% of the axis width to stay readable on long mixes
+    min_label_duration = max(5.0, results['duration'] / 100)
+    
+    if key_timeline:
+        draw_spans(ax1, starts, ends, region_colors, alpha=0.2, linewidth=0)
+    
+    for entry, start_time, end_time in zip(key_timeline, starts, ends):
         # Add key label
-        if end_time - start_time > 5:  # Only label if section is wide enough
+        if end_time - start_time > min_label_duration:  # Only label if section is wide enough
             mid_time = (start_time + end_time) / 2
             ax1.text(
                 mid_time, ax1.get_ylim()[1] * 0.9,
@@ -229,21 +221,17 @@ def _plot_key_timevarying(
     unique_keys = sorted(set(f"{e['key']} {e['scale']}" for e in key_timeline))
     key_to_idx = {k: i for i, k in enumerate(unique_keys)}
     
-    # Plot key changes
-    for entry in key_timeline:
-        key_str = f"{entry['key']} {entry['scale']}"
-        idx = key_to_idx[key_str]
-        ax2.scatter(
-            entry['time'], idx,
-            s=100 * entry['confidence'],
-            alpha=0.7,
-            color=colors[key_timeline.index(entry) % len(colors)]
-        )
+    # Plot key changes (one scatter call for all points)
+    indices = [key_to_idx[f"{e['key']} {e['scale']}"] for e in key_timeline]
+    ax2.scatter(
+        starts, indices,
+        s=[100 * e['confidence'] for e in key_timeline],
+        alpha=0.7,
+        color=region_colors
+    )
     
     # Connect points
-    times_plot = [e['time'] for e in key_timeline]
-    indices = [key_to_idx[f"{e['key']} {e['scale']}"] for e in key_timeline]
-    ax2.plot(times_plot, indices, 'k--', alpha=0.3, linewidth=1)
+    ax2.plot(starts, indices, 'k--', alpha=0.3, linewidth=1)
     
     ax2.set_yticks(range(len(unique_keys)))
     ax2.set_yticklabels(unique_keys)
@@ -262,7 +250,7 @@ def _plot_key_timevarying(
     fig.text(0.5, 0.02, metadata_text, ha='center', fontsize=10, style='italic')
     
     # Save figure
-    plt.tight_layout(rect=[0, 0.03, 1, 0.96])
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout(rect=[0, 0.03, 1, 0.96])
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
@@ -12,6 +12,8 @@ import librosa.display
 import matplotlib.pyplot as plt
 import numpy as np
 
+from music_analysis.visualization.figures import release_figure, template_figure
+
 
 def plot_structure(
     results: Dict,
@@ -34,7 +36,8 @@ def plot_structure(
     y, sr = librosa.load(audio_path, sr=results['metadata']['sample_rate'])
     
     # Create figure with 3 subplots
-    fig, axes = plt.subplots(3, 1, figsize=figsize)
+    fig = template_figure('plot_structure', figsize)
+    axes = fig.subplots(3, 1)
     fig.suptitle(
         f"Structure Analysis: {Path(audio_path).name}\n"
         f"Algorithm: {results['algorithm']} | "
@@ -144,9 +147,9 @@ def plot_structure(
     fig.text(0.5, 0.02, metadata_text, ha='center', fontsize=10, style='italic')
     
     # Save figure
-    plt.tight_layout(rect=[0, 0.03, 1, 0.96])
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout(rect=[0, 0.03, 1, 0.96])
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
 
 def plot_structure_similarity(
@@ -170,13 +173,14 @@ def plot_structure_similarity(
     segments = results['segments']
     
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    fig = template_figure('plot_structure_similarity', figsize)
+    ax = fig.subplots()
     
     # Plot similarity matrix
     im = ax.imshow(similarity_matrix, cmap='RdYlGn', aspect='auto', vmin=0, vmax=1)
     
     # Add colorbar
-    cbar = plt.colorbar(im, ax=ax)
+    cbar = fig.colorbar(im, ax=ax)
     cbar.set_label('Similarity', rotation=270, labelpad=20)
     
     # Set labels
@@ -195,9 +199,9 @@ def plot_structure_similarity(
     ax.set_yticks(np.arange(len(segments)) + 0.5, minor=True)
     ax.grid(which='minor', color='gray', linestyle='-', linewidth=0.5)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
 
 def plot_structure_hierarchical(
@@ -229,7 +233,8 @@ def plot_structure_hierarchical(
     num_levels = len(hierarchies)
     
     # Create figure
-    fig, axes = plt.subplots(num_levels + 1, 1, figsize=figsize, sharex=True)
+    fig = template_figure('plot_structure_hierarchical', figsize)
+    axes = fig.subplots(num_levels + 1, 1, sharex=True)
     fig.suptitle(
         f"Hierarchical Structure Analysis: {Path(audio_path).name}",
         fontsize=14,
@@ -278,8 +283,8 @@ def plot_structure_hierarchical(
     axes[-1].set_xlabel('Time (s)')
     axes[-1].set_xlim([0, duration])
     
-    plt.tight_layout(rect=[0, 0, 1, 0.96])
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout(rect=[0, 0, 1, 0.96])
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
 
@@ -9,9 +9,10 @@ from typing import Dict, Union
 
 import librosa
 import librosa.display
-import matplotlib.pyplot as plt
 import numpy as np
 
+from music_analysis.visualization.figures import release_figure, template_figure
+
 
 def plot_tempo(
     results: Dict,
@@ -34,7 +35,8 @@ def plot_tempo(
     y, sr = librosa.load(audio_path, sr=results['sr'])
     
     # Create figure
-    fig, axes = plt.subplots(3, 1, figsize=figsize)
+    fig = template_figure('plot_tempo', figsize)
+    axes = fig.subplots(3, 1)
     fig.suptitle(
         f"Tempo Analysis: {Path(audio_path).name}\n"
         f"Tempo: {results['tempo']} BPM | "
@@ -122,9 +124,9 @@ def plot_tempo(
     fig.text(0.5, 0.02, metadata_text, ha='center', fontsize=10, style='italic')
     
     # Save figure
-    plt.tight_layout(rect=[0, 0.03, 1, 0.96])
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout(rect=[0, 0.03, 1, 0.96])
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
 
 def plot_tempo_section(
@@ -162,7 +164,8 @@ def plot_tempo_section(
     ] - start_time  # Adjust to section time
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(14, 6))
+    fig = template_figure('plot_tempo_section', (14, 6))
+    ax = fig.subplots()
     
     # Plot waveform
     times = librosa.times_like(y, sr=sr)
@@ -190,7 +193,7 @@ def plot_tempo_section(
     )
     ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    release_figure(fig)
 
@@ -0,0 +1,200 @@
+"""
+Raster Helpers - Fast drawing of long matrices and event timelines
+
+Plot helpers that stay fast for hour-long tracks: dense matrices are turned
+into a uint8 RGBA image with a colormap lookup table and drawn with a single
+`imshow`, waveforms are drawn as a per-pixel min/max envelope, and event spans
+are batched into one `PolyCollection` instead of one artist per event.
+"""
+
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import matplotlib
+import numpy as np
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import Normalize
+
+
+# Pitch class labels for chroma rows
+CHROMA_LABELS = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# Columns kept when rasterizing matrices / waveforms; comfortably above the
+# pixel width of a 14 inch figure at 150 DPI
+DEFAULT_MAX_COLUMNS = 4096
+
+
+@lru_cache(maxsize=16)
+def colormap_lut(cmap: str, levels: int = 256) -> np.ndarray:
+    """
+    Get a colormap as a uint8 RGBA lookup table.
+
+    Args:
+        cmap: Matplotlib colormap name
+        levels: Number of table entries
+
+    Returns:
+        Array of shape (levels, 4), dtype uint8
+    """
+    colormap = matplotlib.colormaps[cmap].resampled(levels)
+    return (colormap(np.arange(levels)) * 255).round().astype(np.uint8)
+
+
+def pool_columns(matrix: np.ndarray, max_columns: int) -> np.ndarray:
+    """
+    Average adjacent columns so at most `max_columns` remain.
+
+    Args:
+        matrix: 2-D array (rows, frames)
+        max_columns: Maximum number of output columns
+
+    Returns:
+        Pooled matrix (unchanged if already narrow enough)
+    """
+    num_frames = matrix.shape[1]
+    if num_frames <= max_columns:
+        return matrix
+
+    edges = np.linspace(0, num_frames, max_columns + 1).astype(int)[:-1]
+    counts = np.diff(np.append(edges, num_frames))
+    return np.add.reduceat(matrix, edges, axis=1) / counts
+
+
+def rasterize_matrix(
+    matrix: np.ndarray,
+    cmap: str = 'coolwarm',
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+    max_columns: int = DEFAULT_MAX_COLUMNS
+) -> Tuple[np.ndarray, Normalize]:
+    """
+    Convert a matrix to a uint8 RGBA image via a colormap lookup table.
+
+    Args:
+        matrix: 2-D array (rows, frames)
+        cmap: Matplotlib colormap name
+        vmin: Lower color limit (default: matrix minimum)
+        vmax: Upper color limit (default: matrix maximum)
+        max_columns: Pool frames down to this many columns first
+
+    Returns:
+        Tuple of (RGBA image of shape (rows, columns, 4), color norm)
+    """
+    matrix = pool_columns(np.asarray(matrix, dtype=np.float32), max_columns)
+
+    vmin = float(np.min(matrix)) if vmin is None else vmin
+    vmax = float(np.max(matrix)) if vmax is None else vmax
+    scale = 255.0 / (vmax - vmin) if vmax > vmin else 0.0
+
+    levels = np.clip((matrix - vmin) * scale, 0, 255).astype(np.uint8)
+    return colormap_lut(cmap)[levels], Normalize(vmin=vmin, vmax=vmax)
+
+
+def draw_chroma(
+    ax,
+    chroma: np.ndarray,
+    duration: float,
+    cmap: str = 'coolwarm',
+    max_columns: int = DEFAULT_MAX_COLUMNS
+) -> ScalarMappable:
+    """
+    Draw a chromagram as one pre-colored image with a fixed time extent.
+
+    Args:
+        ax: Matplotlib axes
+        chroma: Chroma matrix (12, frames)
+        duration: Track duration in seconds (image x extent)
+        cmap: Matplotlib colormap name
+        max_columns: Maximum image columns
+
+    Returns:
+        ScalarMappable for `fig.colorbar`
+    """
+    image, norm = rasterize_matrix(chroma, cmap=cmap, max_columns=max_columns)
+
+    ax.imshow(
+        image,
+        origin='lower',
+        aspect='auto',
+        interpolation='nearest',
+        extent=[0, duration, -0.5, len(chroma) - 0.5]
+    )
+    ax.set_yticks(range(len(CHROMA_LABELS)))
+    ax.set_yticklabels(CHROMA_LABELS)
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Pitch class')
+
+    return ScalarMappable(norm=norm, cmap=cmap)
+
+
+def draw_waveform(
+    ax,
+    y: np.ndarray,
+    sr: int,
+    max_columns: int = DEFAULT_MAX_COLUMNS,
+    **kwargs
+) -> None:
+    """
+    Draw a waveform as its min/max envelope (one column per pixel or so).
+
+    Args:
+        ax: Matplotlib axes
+        y: Audio samples
+        sr: Sample rate
+        max_columns: Number of envelope columns
+        **kwargs: Passed to `fill_between` (color, alpha, ...)
+    """
+    num_columns = min(max_columns, len(y))
+    edges = np.linspace(0, len(y), num_columns + 1).astype(int)[:-1]
+
+    lows = np.minimum.reduceat(y, edges)
+    highs = np.maximum.reduceat(y, edges)
+    times = edges / sr
+
+    ax.fill_between(times, lows, highs, linewidth=0.5, **kwargs)
+
+
+def draw_spans(
+    ax,
+    starts: Sequence[float],
+    ends: Sequence[float],
+    colors,
+    y_range: Tuple[float, float] = (0.0, 1.0),
+    axis_coords: bool = True,
+    **kwargs
+) -> PolyCollection:
+    """
+    Draw many time spans as a single PolyCollection.
+
+    Replaces per-event `axvspan` (axis_coords=True, y in axes fraction) and
+    `barh` (axis_coords=False, y in data units) calls.
+
+    Args:
+        ax: Matplotlib axes
+        starts: Span start times
+        ends: Span end times
+        colors: One color per span (or a single color)
+        y_range: Vertical extent (bottom, top)
+        axis_coords: Interpret y_range in axes coordinates
+        **kwargs: Passed to PolyCollection (alpha, edgecolor, linewidth, ...)
+
+    Returns:
+        The added collection
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    bottom, top = y_range
+
+    verts = np.empty((len(starts), 4, 2))
+    verts[:, :, 0] = np.stack([starts, starts, ends, ends], axis=1)
+    verts[:, :, 1] = [bottom, top, top, bottom]
+
+    transform = ax.get_xaxis_transform() if axis_coords else ax.transData
+    collection = PolyCollection(verts, facecolors=colors, transform=transform, **kwargs)
+    ax.add_collection(collection)
+
+    if not axis_coords:
+        ax.autoscale_view()
+
+    return collection
@@ -0,0 +1,253 @@
+"""
+Render Pool - Parallel plot and HTML report generation
+
+The analyze_* CLIs hand their results to a RenderPool instead of drawing
+figures themselves. Jobs run in worker processes that switch matplotlib to the
+Agg backend before any plot module is imported, so matplotlib and
+librosa.display are never loaded by the CLI process. Each worker keeps its
+figure templates (see `figures.py`) alive across the tracks it renders.
+
+With one worker (or a single job) rendering happens inline, which avoids the
+process start-up cost for one-off runs.
+
+Workers are started with the spawn method. The BLAS / OpenMP thread limits
+are set in the environment they inherit, because forked workers would share
+numpy's thread pools, which the parent already sized at import.
+"""
+
+import importlib
+import multiprocessing
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# analysis_type -> (plot module, plot function)
+PLOT_FUNCTIONS = {
+    'tempo': ('music_analysis.visualization.plot_tempo', 'plot_tempo'),
+    'key': ('music_analysis.visualization.plot_key', 'plot_key'),
+    'chords': ('music_analysis.visualization.plot_chords', 'plot_chords'),
+    'structure': ('music_analysis.visualization.plot_structure', 'plot_structure'),
+    'genre': ('music_analysis.visualization.plot_genre', 'plot_genre'),
+}
+
+# Thread pools that would otherwise oversubscribe cores when every worker
+# starts its own BLAS / OpenMP pool
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def _use_agg_backend() -> None:
+    """Select the non-interactive Agg backend before pyplot is imported."""
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _init_worker() -> None:
+    """Process pool initializer: Agg backend (thread limits come from the environment)."""
+    _use_agg_backend()
+
+
+def default_workers(num_jobs: int) -> int:
+    """
+    Pick a worker count for a batch of render jobs.
+
+    Args:
+        num_jobs: Number of tracks to render
+
+    Returns:
+        Number of worker processes (1 means render inline)
+    """
+    return max(1, min(os.cpu_count() or 1, num_jobs))
+
+
+def render_outputs(
+    results: Dict,
+    audio_path: str,
+    output_stem: str,
+    analysis_type: str,
+    output_format: str = 'both',
+    plot_args: Tuple = (),
+    compact: bool = False,
+    max_points: int = 2000,
+    verbose: bool = False
+) -> Dict:
+    """
+    Render the plot and/or HTML report for one analysis result.
+
+    Errors are reported as warnings rather than raised, matching the CLIs:
+    a failed plot still produces an HTML report without the embedded image.
+
+    Args:
+        results: Analysis results dictionary
+        audio_path: Path to the analyzed audio file
+        output_stem: Output path without extension (e.g. `outputs/song_tempo`)
+        analysis_type: One of PLOT_FUNCTIONS
+        output_format: CLI output format ('json', 'plot', 'html', 'both')
+        plot_args: Extra positional arguments for the plot function
+        compact: Write a compact HTML report
+        max_points: Maximum points per chart series in compact reports
+        verbose: Include per-file success messages
+
+    Returns:
+        Dictionary with 'plot_path', 'html_path' (None if not written) and
+        'messages' (lines for the CLI to print)
+    """
+    messages: List[str] = []
+    plot_path = None
+    html_path = None
+
+    if output_format in ['plot', 'both', 'html']:
+        try:
+            module_name, function_name = PLOT_FUNCTIONS[analysis_type]
+            plot_function = getattr(importlib.import_module(module_name), function_name)
+
+            plot_path = Path(f"{output_stem}.png")
+            plot_function(results, audio_path, plot_path, *plot_args)
+
+            if verbose or output_format == 'plot':
+                messages.append(f"[OK] Plot saved: {plot_path}")
+
+        except ImportError:
+            messages.append("Warning: Visualization module not available. Skipping plots.")
+            plot_path = None
+        except Exception as e:
+            messages.append(f"Warning: Plot generation failed: {e}")
+            if verbose:
+                messages.append(traceback.format_exc().rstrip())
+            plot_path = None
+
+    if output_format in ['html', 'both']:
+        try:
+            from music_analysis.visualization.html_generator import generate_html_report
+
+            html_path = Path(f"{output_stem}.html")
+            generate_html_report(
+                results,
+                audio_path,
+                html_path,
+                plot_path,
+                analysis_type=analysis_type,
+                compact=compact,
+                max_points=max_points
+            )
+
+            if verbose:
+                messages.append(f"[OK] HTML report saved: {html_path}")
+
+        except ImportError:
+            messages.append("Warning: HTML generator not available. Skipping HTML report.")
+            html_path = None
+        except Exception as e:
+            messages.append(f"Warning: HTML generation failed: {e}")
+            if verbose:
+                messages.append(traceback.format_exc().rstrip())
+            html_path = None
+
+    return {
+        'plot_path': str(plot_path) if plot_path else None,
+        'html_path': str(html_path) if html_path else None,
+        'messages': messages,
+    }
+
+
+class RenderPool:
+    """
+    Dispatch render jobs to worker processes.
+
+    Jobs are collected in submission order. The process pool is only started
+    on the first submit with more than one worker; otherwise jobs run inline
+    when `results()` is iterated.
+
+    Usage:
+        with RenderPool(workers=8) as pool:
+            for track in tracks:
+                pool.submit(track.name, results, ...)
+            for name, outcome in pool.results():
+                ...
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize render pool.
+
+        Args:
+            workers: Number of worker processes (default: CPU count,
+                1 renders inline in the calling process)
+        """
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: List[Tuple[str, object]] = []
+        self._saved_env: Dict[str, Optional[str]] = {}
+
+    def submit(self, label: str, *args, **kwargs) -> None:
+        """
+        Queue a render job. Arguments are passed to `render_outputs`.
+
+        Args:
+            label: Identifier returned alongside the job's outcome
+        """
+        if self.workers <= 1:
+            self._jobs.append((label, (args, kwargs)))
+            return
+
+        if self._executor is None:
+            # Workers spawn lazily on submit: keep one BLAS thread per worker
+            # in the inherited environment until the pool is closed
+            for var in _THREAD_ENV_VARS:
+                self._saved_env[var] = os.environ.get(var)
+                os.environ.setdefault(var, '1')
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        self._jobs.append((label, self._executor.submit(render_outputs, *args, **kwargs)))
+
+    def results(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield (label, outcome) for each job in submission order.
+
+        Returns:
+            Iterator over `render_outputs` dictionaries
+        """
+        if self.workers <= 1 and self._jobs:
+            _use_agg_backend()
+
+        jobs, self._jobs = self._jobs, []
+        for label, job in jobs:
+            if isinstance(job, tuple):
+                args, kwargs = job
+                yield label, render_outputs(*args, **kwargs)
+                continue
+
+            try:
+                yield label, job.result()
+            except BrokenProcessPool as e:
+                yield label, {
+                    'plot_path': None,
+                    'html_path': None,
+                    'messages': [f"Warning: Render worker crashed: {e}"],
+                }
+
+    def close(self) -> None:
+        """Shut down worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        for var, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+        self._saved_env = {}
+
+    def __enter__(self) -> 'RenderPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
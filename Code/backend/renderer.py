@@ -8,13 +8,89 @@ Usage:
     renderer = Renderer(cppn, resolution=(1280, 720))
     for frame in renderer.render_sequence(audio_features, fps=30):
         ...
+
+A CPPNEnsemble (cppn_ensemble.py) or a list of CPPNs (any shapes, see
+MultiStyleCPPN) can be passed in place of a single CPPN; frames are then
+(num_members, H, W, 3) stacks, one image per member.
 """
 
 import numpy as np
 import torch
 import cv2
+import time
+from functools import lru_cache
 from tqdm import tqdm
-from typing import Iterator, List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional, Sequence, Union
+
+
+@lru_cache(maxsize=4)
+def _coordinate_grid(width: int, height: int, device: str) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Build (and cache) flattened pixel coordinates for a resolution.
+    
+    Renderers created for the same resolution and device - e.g. every config
+    of an in-process sweep - share one grid instead of rebuilding it.
+    
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+        device: Torch device string
+    
+    Returns:
+        Tuple of (x_flat, y_flat) tensors on device
+    """
+    # Use reduced coordinate range to balance with time/audio features
+    coord_scale = 0.5
+    x_coords = np.linspace(-coord_scale, coord_scale, width, dtype=np.float32)
+    y_coords = np.linspace(-coord_scale, coord_scale, height, dtype=np.float32)
+    
+    xx, yy = np.meshgrid(x_coords, y_coords)
+    
+    x_flat = torch.from_numpy(xx.flatten()).to(device)
+    y_flat = torch.from_numpy(yy.flatten()).to(device)
+    
+    return x_flat, y_flat
+
+
+def make_contact_sheet(
+    frames: List[np.ndarray],
+    columns: int = 4,
+    labels: Optional[List[str]] = None,
+    gap: int = 4
+) -> np.ndarray:
+    """
+    Tile equally sized frames into a single contact sheet image.
+    
+    Args:
+        frames: RGB frames (H, W, 3) as uint8
+        columns: Frames per row
+        labels: Optional caption drawn in the corner of each tile
+        gap: Black border between tiles in pixels
+    
+    Returns:
+        RGB contact sheet as uint8
+    """
+    height, width = frames[0].shape[:2]
+    columns = max(1, min(columns, len(frames)))
+    rows = (len(frames) + columns - 1) // columns
+    
+    sheet = np.zeros(
+        (rows * height + (rows - 1) * gap, columns * width + (columns - 1) * gap, 3),
+        dtype=np.uint8
+    )
+    
+    for i, frame in enumerate(frames):
+        row, col = divmod(i, columns)
+        y = row * (height + gap)
+        x = col * (width + gap)
+        sheet[y:y + height, x:x + width] = frame
+        
+        if labels:
+            font_scale = max(0.4, height / 720)
+            cv2.putText(sheet, labels[i], (x + 8, y + height - 8), cv2.FONT_HERSHEY_SIMPLEX,
+                        font_scale, (255, 255, 255), 1, cv2.LINE_AA)
+    
+    return sheet
 
 
 class Renderer:
@@ -25,19 +101,27 @@ class Renderer:
         cppn,
         resolution: Tuple[int, int] = (1280, 720),
         batch_size: int = None,
-        text_overlay: Optional[str] = None
+        text_overlay: Optional[Union[str, List[str]]] = None
     ):
         """
         Initialize renderer.
         
         Args:
-            cppn: CPPN network instance
+            cppn: CPPN network instance, CPPNEnsemble, or list of CPPNs
+                rendered together (wrapped in a MultiStyleCPPN)
             resolution: (width, height) in pixels
             batch_size: Number of pixels to process per batch
-            text_overlay: Optional text to overlay on each frame
+            text_overlay: Optional text to overlay on each frame (one
+                string per member for ensembles)
         """
+        if isinstance(cppn, (list, tuple)):
+            from cppn_ensemble import MultiStyleCPPN
+            cppn = MultiStyleCPPN(list(cppn))
+        
         self.cppn = cppn
         self.text_overlay = text_overlay
+        # Ensembles evaluate every member per pixel (None = single CPPN)
+        self.num_members = getattr(cppn, 'num_members', None)
         self.width, self.height = resolution
         self.total_pixels = self.width * self.height
         self.device = cppn.device
@@ -57,6 +141,10 @@ class Renderer:
                     self.batch_size = min(1_000_000, self.total_pixels)   # Smaller GPU: 1M
             else:
                 self.batch_size = 100000  # CPU fallback - larger batches
+            
+            # Keep ensemble outputs (members x batch) within the same budget
+            if self.num_members:
+                self.batch_size = max(1024, self.batch_size // self.num_members)
         else:
             self.batch_size = batch_size
         
@@ -79,35 +167,32 @@ class Renderer:
         print(f"  Resolution: {self.width}x{self.height} ({self.total_pixels:,} pixels)")
         print(f"  Batch size: {self.batch_size:,} pixels")
         print(f"  Device: {self.device}")
+        if self.num_members:
+            print(f"  Ensemble members: {self.num_members}")
         print(f"  Total batches: {(self.total_pixels + self.batch_size - 1) // self.batch_size}")
     
     def _prepare_coordinates(self):
         """Pre-generate normalized pixel coordinates and keep on device."""
-        # Use reduced coordinate range to balance with time/audio features
-        coord_scale = 0.5
-        x_coords = np.linspace(-coord_scale, coord_scale, self.width, dtype=np.float32)
-        y_coords = np.linspace(-coord_scale, coord_scale, self.height, dtype=np.float32)
-        
-        xx, yy = np.meshgrid(x_coords, y_coords)
-        
-        x_flat = torch.from_numpy(xx.flatten()).to(self.torch_device)
-        y_flat = torch.from_numpy(yy.flatten()).to(self.torch_device)
+        x_flat, y_flat = _coordinate_grid(self.width, self.height, str(self.torch_device))
         
         self.x_flat = x_flat
         self.y_flat = y_flat
         
         print(f"  Coordinate grid prepared: {len(x_flat):,} points on {self.device}")
     
-    def _add_text_overlay(self, frame: np.ndarray) -> np.ndarray:
+    def _add_text_overlay(self, frame: np.ndarray, text: Optional[str] = None) -> np.ndarray:
         """
         Add text overlay to frame.
         
         Args:
             frame: RGB frame (H, W, 3) as uint8
+            text: Text to draw (default: self.text_overlay)
             
         Returns:
             Frame with text overlay
         """
+        text = text or self.text_overlay
+        
         # Calculate text properties based on resolution
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = max(0.4, self.height / 1080)  # Scale with resolution
@@ -115,7 +200,7 @@ class Renderer:
         
         # Get text size
         (text_width, text_height), baseline = cv2.getTextSize(
-            self.text_overlay, font, font_scale, thickness
+            text, font, font_scale, thickness
         )
         
         # Position text at top-left with padding
@@ -135,11 +220,35 @@ class Renderer:
         frame = cv2.addWeighted(overlay, 0.6, frame, 0.4, 0)
         
         # Add white text
-        cv2.putText(frame, self.text_overlay, (x, y), font, 
+        cv2.putText(frame, text, (x, y), font, 
                    font_scale, (255, 255, 255), thickness, cv2.LINE_AA)
         
         return frame
     
+    def _finish_images(self, images: np.ndarray, overlay: bool = True) -> np.ndarray:
+        """
+        Convert member images to uint8 and draw the text overlay.
+        
+        Args:
+            images: Float RGB images (members, H, W, 3) in [0, 1]
+            overlay: Draw the text overlay (if set)
+        
+        Returns:
+            (H, W, 3) frame for a single CPPN, (members, H, W, 3) for ensembles
+        """
+        images = (images * 255).astype(np.uint8)
+        
+        if overlay and self.text_overlay:
+            texts = self.text_overlay
+            if isinstance(texts, str):
+                texts = [texts] * len(images)
+            images = np.stack([
+                self._add_text_overlay(image, text) if text else image
+                for image, text in zip(images, texts)
+            ])
+        
+        return images if self.num_members else images[0]
+    
     def render_frame(
         self,
         time: float,
@@ -155,10 +264,13 @@ class Renderer:
             show_progress: Show progress bar for this frame
         
         Returns:
-            RGB image (height, width, 3) as numpy uint8
+            RGB image (height, width, 3) as numpy uint8, or
+            (num_members, height, width, 3) for ensembles
         """
+        members = self.num_members or 1
+        
         # Prepare output buffer
-        rgb_output = np.zeros((self.total_pixels, 3), dtype=np.float32)
+        rgb_output = np.zeros((members, self.total_pixels, 3), dtype=np.float32)
         
         # Calculate number of batches
         num_batches = (self.total_pixels + self.batch_size - 1) // self.batch_size
@@ -199,19 +311,85 @@ class Renderer:
                 
                 # Store output (convert FP16 to FP32 for final image)
                 batch_output = batch_output.to(dtype=torch.float32).cpu().numpy()
-                rgb_output[start_idx:end_idx] = batch_output
+                rgb_output[:, start_idx:end_idx] = batch_output.reshape(members, batch_len, 3)
         
-        # Reshape to image
-        rgb_image = rgb_output.reshape(self.height, self.width, 3)
+        # Reshape to image, convert to uint8 and add text overlay if specified
+        return self._finish_images(rgb_output.reshape(members, self.height, self.width, 3))
+    
+    def render_stills(
+        self,
+        times: Sequence[float],
+        audio_features: np.ndarray,
+        overlay: bool = True
+    ) -> List[np.ndarray]:
+        """
+        Render several still frames with batched forward passes.
         
-        # Convert to uint8
-        rgb_image = (rgb_image * 255).astype(np.uint8)
+        Pixels of all stills are laid out back to back and evaluated in
+        `batch_size` chunks, so several stills share each forward pass
+        instead of paying one render_frame() call per still.
         
-        # Add text overlay if specified
-        if self.text_overlay:
-            rgb_image = self._add_text_overlay(rgb_image)
+        Args:
+            times: Normalized time (0 to 1) of each still
+            audio_features: Audio feature vectors, one row per still
+            overlay: Draw the text overlay (if set) on each still
         
-        return rgb_image
+        Returns:
+            List of RGB images (height, width, 3) as numpy uint8, or of
+            (num_members, height, width, 3) stacks for ensembles
+        """
+        num_stills = len(times)
+        if num_stills == 0:
+            return []
+        
+        members = self.num_members or 1
+        total = num_stills * self.total_pixels
+        rgb_output = np.empty((members, total, 3), dtype=np.float32)
+        
+        # Same input scaling as render_frame: time in [-1, 1], audio x3
+        time_tensor = torch.tensor(
+            [t * 2.0 - 1.0 for t in times], dtype=self.input_dtype, device=self.torch_device
+        )
+        audio_tensor = torch.from_numpy(np.asarray(audio_features)).to(
+            self.torch_device,
+            dtype=self.input_dtype
+        ) * 3.0
+        feature_dim = audio_tensor.shape[1]
+        
+        # The shared buffer only holds one frame; stills may use larger batches
+        chunk_size = min(self.batch_size, total)
+        if chunk_size <= len(self._batch_input):
+            input_buffer = self._batch_input
+        else:
+            input_buffer = torch.empty(
+                (chunk_size, self.cppn.input_dim),
+                dtype=self.input_dtype,
+                device=self.torch_device
+            )
+        
+        self.cppn.eval()
+        
+        with torch.no_grad():
+            for start_idx in range(0, total, chunk_size):
+                end_idx = min(start_idx + chunk_size, total)
+                batch_len = end_idx - start_idx
+                
+                flat_idx = torch.arange(start_idx, end_idx, device=self.torch_device)
+                pixel_idx = flat_idx % self.total_pixels
+                still_idx = flat_idx // self.total_pixels
+                
+                batch_input = input_buffer[:batch_len]
+                batch_input[:, 0].copy_(self.x_flat[pixel_idx])
+                batch_input[:, 1].copy_(self.y_flat[pixel_idx])
+                batch_input[:, 2].copy_(time_tensor[still_idx])
+                batch_input[:, 3:3 + feature_dim].copy_(audio_tensor[still_idx])
+                
+                batch_output = self.cppn(batch_input).to(dtype=torch.float32).cpu().numpy()
+                rgb_output[:, start_idx:end_idx] = batch_output.reshape(members, batch_len, 3)
+        
+        stills = rgb_output.reshape(members, num_stills, self.height, self.width, 3)
+        
+        return [self._finish_images(stills[:, i], overlay=overlay) for i in range(num_stills)]
     
     def _render_frame_batch(self, frame_indices: List[int], features: np.ndarray, 
                            evolve_rate: float = 0.0) -> List[Tuple[int, np.ndarray]]:
@@ -240,7 +418,8 @@ class Renderer:
         audio_analysis: dict,
         fps: int = 30,
         evolve_rate: float = 0.0,
-        clear_cache_every: int = 100
+        clear_cache_every: int = 100,
+        metrics=None
     ) -> Iterator[np.ndarray]:
         """
         Render sequence of frames from audio analysis.
@@ -248,11 +427,14 @@ class Renderer:
         Args:
             audio_analysis: Dictionary from AudioAnalyzer.analyze()
             fps: Frames per second
-            evolve_rate: CPPN weight evolution rate (0 = no evolution)
+            evolve_rate: CPPN weight evolution rate (0 = no evolution), or
+                one rate per member for ensembles
             clear_cache_every: Clear CUDA cache every N frames
+            metrics: Optional FrameMetrics updated with every frame (a list
+                with one FrameMetrics per member for ensembles)
         
         Returns:
-            List of RGB frames (numpy uint8 arrays)
+            List of RGB frames (numpy uint8 arrays; member stacks for ensembles)
         """
         features = audio_analysis['features']
         duration = audio_analysis['duration']
@@ -265,6 +447,8 @@ class Renderer:
         
         frame_stats = []  # Track RGB statistics
         rendered_count = 0
+        start_time = time.perf_counter()
+        evolving = bool(np.any(np.asarray(evolve_rate) > 0))
         
         # Process frames sequentially with progress bar
         for frame_idx in tqdm(range(num_frames), desc="Rendering frames"):
@@ -284,13 +468,21 @@ class Renderer:
                     'idx': frame_idx,
                     'mean': float(frame.mean()),
                     'std': float(frame_std),
-                    'r_mean': float(frame[:, :, 0].mean()),
-                    'g_mean': float(frame[:, :, 1].mean()),
-                    'b_mean': float(frame[:, :, 2].mean()),
+                    'r_mean': float(frame[..., 0].mean()),
+                    'g_mean': float(frame[..., 1].mean()),
+                    'b_mean': float(frame[..., 2].mean()),
                 })
             
+            # Streaming quality metrics on a downsampled copy
+            if metrics is not None:
+                if self.num_members:
+                    for member_metrics, member_frame in zip(metrics, frame):
+                        member_metrics.update(member_frame, audio_features)
+                else:
+                    metrics.update(frame, audio_features)
+            
             # Optional: Evolve CPPN weights for "living math" effect
-            if evolve_rate > 0 and frame_idx % 10 == 0:
+            if evolving and frame_idx % 10 == 0:
                 self.cppn.evolve_weights(mutation_rate=evolve_rate)
             
             # Clear CUDA cache periodically
@@ -323,6 +515,15 @@ class Renderer:
             for stat in frame_stats[:3]:
                 print(f"  Frame {stat['idx']}: mean={stat['mean']:.1f}, std={stat['std']:.1f}, " +
                       f"RGB=({stat['r_mean']:.0f}, {stat['g_mean']:.0f}, {stat['b_mean']:.0f})")
+        
+        if metrics is not None and not self.num_members and metrics.num_frames:
+            summary = metrics.summary()
+            elapsed = time.perf_counter() - start_time
+            print(f"\nQuality metrics ({100 * summary['overhead_s'] / max(elapsed, 1e-9):.1f}% of render time):")
+            print(f"  Entropy: {summary['spatial_entropy']:.2f}, edges: {summary['edge_density']:.3f}, "
+                  f"colors: {summary['color_diversity']:.2f}")
+            print(f"  Flicker: {summary['flicker']:.4f}, AV corr (onset/RMS): "
+                  f"{summary['av_onset_corr']:.2f}/{summary['av_rms_corr']:.2f}, score: {summary['score']:.3f}")
     
     def estimate_memory_usage(self) -> dict:
         """Estimate GPU/RAM memory requirements."""
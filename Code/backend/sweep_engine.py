@@ -0,0 +1,733 @@
+"""
+Sweep Engine - In-process rendering of many CPPN configurations
+
+Runs parameter / architecture sweeps without shelling out to cli.py per
+config. Each audio file is analyzed once; every config then only builds its
+CPPN, renders and encodes. Configs are spread over a process pool whose
+workers are capped to a few torch threads each, so a sweep is limited by
+rendering rather than by Python/torch startup and repeated audio analysis.
+
+Usage:
+    engine = SweepEngine(resolution='480p', fps=24, workers=4)
+    results = engine.run('song.mp3', [
+        {'layers': 2, 'hidden_dim': 8, 'seed': 42, 'output_path': 'a.mp4'},
+        {'layers': 3, 'hidden_dim': 4, 'seed': 42, 'output_path': 'b.mp4'},
+    ], duration=10)
+    engine.close()
+
+Config keys (all optional except output_path):
+    layers, hidden_dim, seed, audio_scale, evolve, text_overlay, output_path,
+    frame_time (seconds; writes <output>_frame.png),
+    sheet_times (seconds; writes a <output>_sheet.png contact sheet)
+
+Stills are rendered straight from the freshly built CPPN (before any weight
+evolution) in one batched pass, so previews need no video decode. Pass
+render_video=False to run() to produce only the stills.
+
+With a SweepStore (see sweep_store.py), seeded configs that were already
+rendered with identical parameters are linked into place instead of rendered,
+and the audio is only analyzed if something is left to render.
+
+Comparison runs can instead render several styles in one pass with
+render_styles(): every style (random config or trained .pth via 'weights')
+is evaluated on the same coordinate grid and per-frame inputs, same-shape
+styles batched together, producing one video per style and/or a tiled
+comparison video:
+
+    engine.render_styles('song.mp3', [
+        {'name': 'organic', 'weights': 'organic.pth', 'output_path': 'organic.mp4'},
+        {'name': 'simple', 'layers': 3, 'hidden_dim': 128, 'output_path': 'simple.mp4'},
+    ], duration=10, tiled_path='comparison.mp4')
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sweep_store import ARTIFACTS, SweepStore, file_sha256, sweep_key
+
+
+# Same presets as cli.py
+RESOLUTIONS = {
+    '360p': (640, 360),
+    '480p': (854, 480),
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '1440p': (2560, 1440),
+    '4k': (3840, 2160)
+}
+
+# Defaults matching cli.py
+DEFAULT_CONFIG = {
+    'layers': 4,
+    'hidden_dim': 256,
+    'seed': None,
+    'audio_scale': 0.05,
+    'evolve': 0.0,
+    'text_overlay': None
+}
+
+# Characters of captured worker output kept in each result
+_OUTPUT_TAIL = 500
+
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+# Contact sheet layout
+SHEET_COLUMNS = 4
+
+
+def _init_worker(threads: int):
+    """Process pool initializer: cap torch / BLAS threads, silence progress bars."""
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    os.environ['TQDM_DISABLE'] = '1'
+    
+    import torch
+    torch.set_num_threads(threads)
+
+
+def prepare_features(features: np.ndarray, audio_scale: float, device: str) -> np.ndarray:
+    """
+    Scale normalized audio features for CPPN input (as cli.py does).
+    
+    Args:
+        features: Min-max normalized features (num_frames, feature_dim)
+        audio_scale: Audio feature scaling factor
+        device: 'cuda' or 'cpu' (features are stored as FP16 on CUDA)
+    
+    Returns:
+        Scaled feature array
+    """
+    feature_dtype = np.float16 if device == 'cuda' else np.float32
+    return (features * audio_scale).astype(feature_dtype, copy=False)
+
+
+def feature_rows(features: np.ndarray, timestamps: List[float], fps: int) -> Tuple[List[float], np.ndarray]:
+    """
+    Look up the frame features and normalized time for still timestamps.
+    
+    Args:
+        features: Scaled audio features (num_frames, feature_dim)
+        timestamps: Times in seconds
+        fps: Frames per second the features were extracted at
+    
+    Returns:
+        Tuple of (normalized times as used by render_sequence, feature rows)
+    """
+    num_frames = len(features)
+    indices = [min(num_frames - 1, max(0, int(round(t * fps)))) for t in timestamps]
+    times = [idx / max(1, num_frames - 1) for idx in indices]
+    return times, features[indices]
+
+
+def write_png(path: str, frame: np.ndarray) -> str:
+    """Write an RGB frame as PNG."""
+    import cv2
+    cv2.imwrite(str(path), cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+    return str(path)
+
+
+def render_stills(renderer, params: Dict, features: np.ndarray, fps: int) -> Dict:
+    """
+    Render a config's representative frame and contact sheet in one pass.
+    
+    Args:
+        renderer: Renderer for the config's CPPN
+        params: Config merged with DEFAULT_CONFIG
+        features: Scaled audio features
+        fps: Frames per second
+    
+    Returns:
+        Dict with 'frame_path' and/or 'sheet_path' for what was written
+    """
+    from renderer import make_contact_sheet
+    
+    frame_times = [] if params.get('frame_time') is None else [params['frame_time']]
+    sheet_times = list(params.get('sheet_times') or [])
+    if not frame_times and not sheet_times:
+        return {}
+    
+    times, rows = feature_rows(features, frame_times + sheet_times, fps)
+    stills = renderer.render_stills(times, rows)
+    
+    stem = str(Path(params['output_path']).with_suffix(''))
+    written = {}
+    if frame_times:
+        written['frame_path'] = write_png(f"{stem}_frame.png", stills[0])
+    if sheet_times:
+        sheet = make_contact_sheet(
+            stills[len(frame_times):],
+            columns=SHEET_COLUMNS,
+            labels=[f"{t:.1f}s" for t in sheet_times]
+        )
+        written['sheet_path'] = write_png(f"{stem}_sheet.png", sheet)
+    
+    return written
+
+
+def render_config(
+    config: Dict,
+    features: np.ndarray,
+    duration: float,
+    audio_path: Optional[str],
+    resolution: Tuple[int, int],
+    fps: int,
+    device: str,
+    render_video: bool = True,
+    compile_backend: Optional[str] = None
+) -> Dict:
+    """
+    Build, render and encode one configuration in the current process.
+    
+    Args:
+        config: Sweep config (see module docstring)
+        features: Min-max normalized audio features
+        duration: Audio duration in seconds
+        audio_path: Audio file to mux into the video (None for silent)
+        resolution: (width, height)
+        fps: Frames per second
+        device: 'cuda' or 'cpu'
+        render_video: Render and encode the video (False: stills only)
+        compile_backend: Optional compiled inference backend (see
+            cppn_compile.py)
+    
+    Returns:
+        Result dict with 'success', 'output_path', 'file_size' or 'error',
+        'frame_path' / 'sheet_path' for stills, quality 'metrics' (see
+        frame_metrics.py) for videos, 'render_time', captured
+        'stdout' tail and the original 'config'
+    """
+    import torch
+    from cppn import CPPN
+    from cppn_compile import compile_cppn
+    from frame_metrics import FrameMetrics
+    from renderer import Renderer
+    from video_encoder import VideoEncoder
+    
+    params = {**DEFAULT_CONFIG, **config}
+    output_path = str(params['output_path'])
+    start_time = time.time()
+    captured = io.StringIO()
+    
+    try:
+        with contextlib.redirect_stdout(captured):
+            if params['seed'] is not None:
+                torch.manual_seed(params['seed'])
+                np.random.seed(params['seed'])
+            
+            scaled = prepare_features(features, params['audio_scale'], device)
+            
+            cppn = CPPN(
+                input_dim=2 + 1 + scaled.shape[1],  # x, y, time + features
+                hidden_dim=params['hidden_dim'],
+                num_layers=params['layers'],
+                device=device
+            )
+            renderer = Renderer(
+                compile_cppn(cppn, compile_backend),
+                resolution=resolution,
+                batch_size=None,
+                text_overlay=params['text_overlay']
+            )
+            
+            # Stills first: render_sequence may evolve the weights
+            result = render_stills(renderer, params, scaled, fps)
+            
+            if render_video:
+                metrics = FrameMetrics()
+                analysis = {'features': scaled, 'duration': duration, 'num_frames': len(scaled)}
+                frames = renderer.render_sequence(
+                    analysis, fps=fps, evolve_rate=params['evolve'], metrics=metrics
+                )
+                
+                encoder = VideoEncoder(output_path, fps=fps)
+                final_video = encoder.encode(frames, audio_path=audio_path, num_frames=len(scaled))
+                
+                # Silent renders come back as <name>.temp.mp4; the store and
+                # callers expect output_path (as encode_streams does)
+                if Path(final_video) != Path(output_path):
+                    shutil.move(str(final_video), output_path)
+                    final_video = output_path
+                result['output_path'] = str(final_video)
+                result['file_size'] = os.path.getsize(final_video)
+                result['metrics'] = metrics.summary()
+        
+        result.update({
+            'success': True,
+            'render_time': time.time() - start_time,
+            'stdout': captured.getvalue()[-_OUTPUT_TAIL:],
+            'config': config
+        })
+        return result
+    
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'render_time': time.time() - start_time,
+            'stdout': captured.getvalue()[-_OUTPUT_TAIL:],
+            'config': config
+        }
+
+
+def build_style_cppn(style: Dict, input_dim: int, device: str):
+    """
+    Build one style's CPPN: trained weights or a (seeded) random network.
+    
+    Args:
+        style: Style config merged with DEFAULT_CONFIG; 'weights' points to
+            a .pth file (architecture from the checkpoint), otherwise
+            layers / hidden_dim / seed are used
+        input_dim: Number of input features (coordinates + audio)
+        device: 'cuda' or 'cpu'
+    
+    Returns:
+        CPPN instance
+    """
+    import torch
+    from cppn import CPPN, load_cppn
+    
+    if style.get('weights'):
+        cppn, _ = load_cppn(style['weights'], input_dim, style['hidden_dim'], style['layers'], device)
+        return cppn
+    
+    if style['seed'] is not None:
+        torch.manual_seed(style['seed'])
+        np.random.seed(style['seed'])
+    
+    return CPPN(
+        input_dim=input_dim,
+        hidden_dim=style['hidden_dim'],
+        num_layers=style['layers'],
+        device=device
+    )
+
+
+def style_label(style: Dict) -> str:
+    """Short label for a style config."""
+    if style.get('name'):
+        return style['name']
+    if style.get('weights'):
+        return Path(style['weights']).stem
+    return f"{style['layers']}L×{style['hidden_dim']}D"
+
+
+def render_styles(
+    styles: List[Dict],
+    features: np.ndarray,
+    duration: float,
+    audio_path: Optional[str],
+    resolution: Tuple[int, int],
+    fps: int,
+    device: str,
+    tiled_path: Optional[str] = None,
+    frame_time: Optional[float] = None,
+    columns: int = SHEET_COLUMNS,
+    render_video: bool = True
+) -> Dict:
+    """
+    Render several styles in one pass over shared inputs.
+    
+    All styles go into one MultiStyleCPPN (same-shape styles are stacked and
+    evaluated together), so the coordinate grid, per-frame input batch and
+    features are built once per frame instead of once per style. Each
+    style's audio_scale is folded into its input layer.
+    
+    Args:
+        styles: Style configs (sweep config keys, plus optional 'name' and
+            'weights'); styles with an 'output_path' get their own video
+        features: Min-max normalized audio features
+        duration: Audio duration in seconds
+        audio_path: Audio file to mux into the videos (None for silent)
+        resolution: (width, height)
+        fps: Frames per second
+        device: 'cuda' or 'cpu'
+        tiled_path: Optional path of a tiled comparison video
+        frame_time: Optional still timestamp (writes <output>_frame.png for
+            every output, including the tiled one)
+        columns: Tiles per row in the comparison video
+        render_video: Render and encode videos (False: stills only)
+    
+    Returns:
+        Dict with per-style 'styles' results ('name', 'output_path',
+        'frame_path', 'metrics'), 'tiled_path' and 'render_time'
+    """
+    from cppn_ensemble import MultiStyleCPPN
+    from frame_metrics import FrameMetrics
+    from renderer import Renderer, make_contact_sheet
+    from video_encoder import encode_streams
+    
+    start_time = time.time()
+    styles = [{**DEFAULT_CONFIG, **style} for style in styles]
+    labels = [style_label(style) for style in styles]
+    
+    # Unscaled features; each style's audio_scale lives in its weights
+    shared = prepare_features(features, 1.0, device)
+    input_dim = 2 + 1 + shared.shape[1]  # x, y, time + features
+    
+    model = MultiStyleCPPN(
+        [build_style_cppn(style, input_dim, device) for style in styles],
+        labels=labels,
+        audio_scales=[style['audio_scale'] for style in styles]
+    )
+    renderer = Renderer(
+        model,
+        resolution=resolution,
+        batch_size=None,
+        text_overlay=[style['text_overlay'] for style in styles]
+    )
+    
+    results = [{'name': label, 'output_path': style.get('output_path')} for label, style in zip(labels, styles)]
+    video_indices = [i for i, style in enumerate(styles) if style.get('output_path')]
+    
+    def tile(stack) -> np.ndarray:
+        return make_contact_sheet(list(stack), columns=columns, labels=labels)
+    
+    # Stills first: render_sequence may evolve the weights
+    if frame_time is not None:
+        times, rows = feature_rows(shared, [frame_time], fps)
+        stack = renderer.render_stills(times, rows)[0]
+        for i in video_indices:
+            stem = str(Path(styles[i]['output_path']).with_suffix(''))
+            results[i]['frame_path'] = write_png(f"{stem}_frame.png", stack[i])
+        if tiled_path:
+            write_png(f"{Path(tiled_path).with_suffix('')}_frame.png", tile(stack))
+    
+    output_paths = [styles[i]['output_path'] for i in video_indices]
+    if tiled_path:
+        output_paths.append(tiled_path)
+    
+    if render_video and output_paths:
+        metrics = [FrameMetrics() for _ in styles]
+        analysis = {'features': shared, 'duration': duration, 'num_frames': len(shared)}
+        frames = renderer.render_sequence(
+            analysis, fps=fps, evolve_rate=[style['evolve'] for style in styles], metrics=metrics
+        )
+        
+        def frame_groups():
+            for stack in frames:
+                group = [stack[i] for i in video_indices]
+                if tiled_path:
+                    group.append(tile(stack))
+                yield group
+        
+        videos = encode_streams(frame_groups(), output_paths, fps=fps, audio_path=audio_path, num_frames=len(shared))
+        for i, video in zip(video_indices, videos):
+            results[i]['output_path'] = str(video)
+        for result, style_metrics in zip(results, metrics):
+            result['metrics'] = style_metrics.summary()
+    
+    return {
+        'styles': results,
+        'tiled_path': str(tiled_path) if tiled_path else None,
+        'render_time': time.time() - start_time
+    }
+
+
+class SweepEngine:
+    """Render many CPPN configs against shared, once-analyzed audio."""
+    
+    def __init__(
+        self,
+        resolution='480p',
+        fps: int = 24,
+        device: str = 'auto',
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        store: Optional[SweepStore] = None,
+        compile_backend: Optional[str] = None
+    ):
+        """
+        Initialize sweep engine.
+        
+        Args:
+            resolution: Preset name from RESOLUTIONS or (width, height)
+            fps: Frames per second
+            device: 'auto', 'cuda' or 'cpu'
+            workers: Render processes (default: half the CPU cores; CUDA
+                always renders in-process)
+            threads_per_worker: Torch threads per worker (default: cores
+                divided evenly between workers)
+            store: Optional SweepStore; seeded configs already rendered with
+                the same parameters are linked from it instead of rendered
+            compile_backend: Optional compiled inference backend
+                ('torchscript' or 'inductor'); each worker reuses compiled
+                graphs across configs of the same shape
+        """
+        import torch
+        
+        if device == 'auto':
+            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        
+        cpu_count = os.cpu_count() or 1
+        if device == 'cuda':
+            # One process owns the GPU; parallel CUDA contexts only contend
+            workers = 1
+        elif workers is None:
+            workers = max(1, cpu_count // 2)
+        
+        self.resolution = RESOLUTIONS[resolution] if isinstance(resolution, str) else tuple(resolution)
+        self.fps = fps
+        self.device = device
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.workers)
+        
+        self.store = store
+        self.compile_backend = compile_backend
+        
+        self._analysis_cache: Dict[Tuple[str, Optional[float]], Dict] = {}
+        self._audio_hashes: Dict[str, str] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def analyze(self, audio_path: str, duration: Optional[float] = None) -> Dict:
+        """
+        Analyze and normalize audio once per (file, duration).
+        
+        Args:
+            audio_path: Path to audio file
+            duration: Optional duration in seconds to process
+        
+        Returns:
+            Dict with normalized 'features', 'duration' and 'num_frames'
+        """
+        key = (str(Path(audio_path).resolve()), duration)
+        if key not in self._analysis_cache:
+            from audio_analyzer import AudioAnalyzer
+            
+            analyzer = AudioAnalyzer()
+            analysis = analyzer.analyze(str(audio_path), fps=self.fps, duration=duration)
+            
+            self._analysis_cache[key] = {
+                'features': analyzer.normalize_features(analysis['features'], method='minmax'),
+                'duration': analysis['duration'],
+                'num_frames': analysis['num_frames']
+            }
+        
+        return self._analysis_cache[key]
+    
+    def run(
+        self,
+        audio_path: str,
+        configs: List[Dict],
+        duration: Optional[float] = None,
+        mux_audio: bool = True,
+        on_result=None,
+        render_video: bool = True
+    ) -> List[Dict]:
+        """
+        Render every config against one audio file.
+        
+        Args:
+            audio_path: Path to audio file
+            configs: Sweep configs (each needs an 'output_path')
+            duration: Optional duration in seconds to process
+            mux_audio: Mux the audio track into each video
+            on_result: Optional callback(index, result) called as configs finish
+            render_video: Render videos (False: only the configured stills)
+        
+        Returns:
+            Results in the same order as configs; results served from the
+            store carry 'cached': True and their 'store_key'
+        """
+        results: List[Optional[Dict]] = [None] * len(configs)
+        jobs = list(configs)
+        keys: Dict[int, Tuple[str, Dict]] = {}
+        duplicates: List[int] = []
+        
+        if self.store is not None:
+            audio_sha256 = self._audio_hash(audio_path)
+            rendering = set()
+            for i, config in enumerate(configs):
+                params = self.store.key_params(
+                    {**DEFAULT_CONFIG, **config}, audio_sha256, duration,
+                    self.resolution, self.fps, self.device, mux_audio,
+                    self.compile_backend
+                )
+                if params is None:
+                    continue
+                
+                key = sweep_key(params)
+                if key in rendering:
+                    # Same entry directory as a job of this run: serve it
+                    # from the store once that job has finished
+                    duplicates.append(i)
+                    continue
+                
+                entry = self.store.lookup(key, config, render_video)
+                if entry is not None:
+                    results[i] = self._stored_result(entry, config)
+                    if on_result:
+                        on_result(i, results[i])
+                    continue
+                
+                # Render straight into the store; delivered to the run afterwards
+                keys[i] = (key, params)
+                rendering.add(key)
+                entry_dir = self.store.entry_dir(key)
+                entry_dir.mkdir(parents=True, exist_ok=True)
+                jobs[i] = {**config, 'output_path': str(entry_dir / ARTIFACTS['video'])}
+        
+        pending = [i for i in range(len(configs)) if results[i] is None and i not in duplicates]
+        if pending:
+            self._render_pending(audio_path, configs, jobs, pending, keys, results,
+                                 duration, mux_audio, on_result, render_video)
+        
+        if duplicates:
+            def on_duplicate(j: int, result: Dict):
+                if on_result:
+                    on_result(duplicates[j], result)
+            
+            repeated = self.run(audio_path, [configs[i] for i in duplicates], duration=duration,
+                                mux_audio=mux_audio, on_result=on_duplicate, render_video=render_video)
+            for i, result in zip(duplicates, repeated):
+                results[i] = result
+        
+        return results
+    
+    def _render_pending(
+        self,
+        audio_path: str,
+        configs: List[Dict],
+        jobs: List[Dict],
+        pending: List[int],
+        keys: Dict[int, Tuple[str, Dict]],
+        results: List[Optional[Dict]],
+        duration: Optional[float],
+        mux_audio: bool,
+        on_result,
+        render_video: bool
+    ):
+        """Render the configs run() could not serve from the store, filling results in place."""
+        analysis = self.analyze(audio_path, duration)
+        job_args = (
+            analysis['features'],
+            analysis['duration'],
+            str(audio_path) if mux_audio else None,
+            self.resolution,
+            self.fps,
+            self.device,
+            render_video,
+            self.compile_backend
+        )
+        
+        def finish(i: int, result: Dict):
+            result['config'] = configs[i]
+            if i in keys and result['success']:
+                key, params = keys[i]
+                entry = self.store.record(key, params, result)
+                result = {**result, **self._stored_result(entry, configs[i]), 'cached': False}
+            results[i] = result
+            if on_result:
+                on_result(i, result)
+        
+        if self.workers == 1:
+            for i in pending:
+                finish(i, render_config(jobs[i], *job_args))
+            return
+        
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.threads_per_worker,)
+            )
+        
+        futures = {
+            self._executor.submit(render_config, jobs[i], *job_args): i
+            for i in pending
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            finish(i, result)
+    
+    def render_styles(
+        self,
+        audio_path: str,
+        styles: List[Dict],
+        duration: Optional[float] = None,
+        mux_audio: bool = True,
+        tiled_path: Optional[str] = None,
+        frame_time: Optional[float] = None,
+        columns: int = SHEET_COLUMNS,
+        render_video: bool = True
+    ) -> Dict:
+        """
+        Render several styles against one audio file in a single pass.
+        
+        Runs in-process (one batched render instead of one job per style);
+        see the module-level render_styles() for the style keys and result.
+        
+        Args:
+            audio_path: Path to audio file
+            styles: Style configs
+            duration: Optional duration in seconds to process
+            mux_audio: Mux the audio track into each video
+            tiled_path: Optional path of a tiled comparison video
+            frame_time: Optional still timestamp in seconds
+            columns: Tiles per row in the comparison video
+            render_video: Render videos (False: only the stills)
+        
+        Returns:
+            Result dict from render_styles()
+        """
+        analysis = self.analyze(audio_path, duration)
+        return render_styles(
+            styles,
+            analysis['features'],
+            analysis['duration'],
+            str(audio_path) if mux_audio else None,
+            self.resolution,
+            self.fps,
+            self.device,
+            tiled_path=tiled_path,
+            frame_time=frame_time,
+            columns=columns,
+            render_video=render_video
+        )
+    
+    def _audio_hash(self, audio_path: str) -> str:
+        """Hash an audio file once per engine."""
+        path = str(Path(audio_path).resolve())
+        if path not in self._audio_hashes:
+            self._audio_hashes[path] = file_sha256(path)
+        return self._audio_hashes[path]
+    
+    def _stored_result(self, entry: Dict, config: Dict) -> Dict:
+        """Deliver a stored entry to the config's output path as a result dict."""
+        result = {
+            'success': True,
+            'cached': True,
+            'store_key': entry['key'],
+            'render_time': entry.get('render_time'),
+            'config': config
+        }
+        if entry.get('file_size') is not None:
+            result['file_size'] = entry['file_size']
+        if entry.get('metrics'):
+            result['metrics'] = entry['metrics']
+        result.update(self.store.deliver(entry, config['output_path']))
+        return result
+    
+    def close(self):
+        """Shut down worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
@@ -0,0 +1,348 @@
+"""
+Sweep Store - Content-addressed, resumable storage for sweep results
+
+Every rendered configuration is stored once under a key hashed from
+everything that determines its pixels: architecture, seed, render flags
+(audio scale, evolution, text overlay, audio mux), the SHA-256 of the audio
+file, the analyzed segment, resolution, FPS, device and compiled inference
+backend. A sweep that meets a
+key it has already rendered links the stored files into its run directory
+instead of rendering again, so repeated explorations only pay for new points
+in parameter space and an interrupted sweep resumes where it stopped.
+
+Layout:
+    sweep_store/
+        index.jsonl              one line per stored result / link (append-only)
+        objects/ab/abcdef.../
+            video.mp4, video_frame.png, video_sheet.png
+            result.json          written last; its presence marks completion
+
+Configs without a seed are random on every run and are never stored.
+
+Usage:
+    store = SweepStore()
+    with SweepEngine(resolution='480p', store=store) as engine:
+        engine.run('song.mp3', configs, duration=10)
+    best = store.query(resolution=[854, 480], top=10)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_STORE = Path(__file__).parent / 'explorations' / 'sweep_store'
+
+# Bump when the rendering pipeline changes in a way that alters output
+STORE_VERSION = 1
+
+# Config keys that affect the rendered frames
+KEY_FIELDS = ('layers', 'hidden_dim', 'seed', 'audio_scale', 'evolve', 'text_overlay')
+
+# Stored artifacts -> file name inside an entry directory
+ARTIFACTS = {
+    'video': 'video.mp4',
+    'frame': 'video_frame.png',
+    'sheet': 'video_sheet.png'
+}
+
+INDEX_NAME = 'index.jsonl'
+RESULT_NAME = 'result.json'
+
+# Read size for hashing audio files
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """Hash file contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sweep_key(params: Dict) -> str:
+    """
+    Hash the parameters that determine a rendered result.
+    
+    Args:
+        params: Dict from SweepStore.key_params()
+    
+    Returns:
+        Hex SHA-256 key
+    """
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _link_or_copy(source: Path, destination: Path):
+    """Hard-link a stored file into place, copying across devices."""
+    if destination.exists():
+        if os.path.samefile(source, destination):
+            return
+        destination.unlink()
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+class SweepStore:
+    """Content-addressed store of rendered sweep configurations."""
+    
+    def __init__(self, root=DEFAULT_STORE):
+        """
+        Initialize sweep store.
+        
+        Args:
+            root: Store directory (created on first write)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.index_path = self.root / INDEX_NAME
+    
+    @staticmethod
+    def key_params(
+        config: Dict,
+        audio_sha256: str,
+        duration: Optional[float],
+        resolution: Tuple[int, int],
+        fps: int,
+        device: str,
+        mux_audio: bool,
+        compile_backend: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Collect the parameters a result is keyed on.
+        
+        Args:
+            config: Sweep config merged with the engine defaults
+            audio_sha256: Hash of the audio file
+            duration: Analyzed segment length (None = full file)
+            resolution: (width, height)
+            fps: Frames per second
+            device: 'cuda' or 'cpu' (FP16 on CUDA renders differently)
+            mux_audio: Whether the audio track is muxed into the video
+            compile_backend: Compiled inference backend (fused kernels can
+                differ from eager in the last bits, and FP16 more than that)
+        
+        Returns:
+            Key parameters, or None if the config is not reproducible
+        """
+        if config.get('seed') is None:
+            return None
+        
+        params = {field: config.get(field) for field in KEY_FIELDS}
+        params.update({
+            'audio_sha256': audio_sha256,
+            'duration': duration,
+            'resolution': list(resolution),
+            'fps': fps,
+            'device': device,
+            'mux_audio': mux_audio,
+            'version': STORE_VERSION
+        })
+        # Only when set, so eager renders keep their existing keys
+        if compile_backend:
+            params['compile_backend'] = compile_backend
+        return params
+    
+    def entry_dir(self, key: str) -> Path:
+        """Directory holding one key's files."""
+        return self.objects_dir / key[:2] / key
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Load a completed entry (None if not stored)."""
+        try:
+            with open(self.entry_dir(key) / RESULT_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def lookup(self, key: str, config: Dict, render_video: bool = True) -> Optional[Dict]:
+        """
+        Find a stored entry holding every artifact a config asks for.
+        
+        Args:
+            key: Entry key
+            config: Sweep config (frame_time / sheet_times request stills)
+            render_video: Whether the video is required
+        
+        Returns:
+            The stored entry, or None if it must be (re-)rendered
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        
+        wanted = []
+        if render_video:
+            wanted.append('video')
+        if config.get('frame_time') is not None:
+            wanted.append('frame')
+        if config.get('sheet_times'):
+            wanted.append('sheet')
+        
+        entry_dir = self.entry_dir(key)
+        for name in wanted:
+            if name not in entry['files'] or not (entry_dir / entry['files'][name]).exists():
+                return None
+        return entry
+    
+    def record(self, key: str, params: Dict, result: Dict) -> Dict:
+        """
+        Store a successful render whose files were written into entry_dir(key).
+        
+        Args:
+            key: Entry key
+            params: Key parameters
+            result: Result dict from sweep_engine.render_config
+        
+        Returns:
+            The stored entry
+        """
+        entry_dir = self.entry_dir(key)
+        previous = self.get(key) or {}
+        
+        files = dict(previous.get('files', {}))
+        for name, file_name in ARTIFACTS.items():
+            if (entry_dir / file_name).exists():
+                files[name] = file_name
+        
+        entry = {
+            'key': key,
+            'params': params,
+            'files': files,
+            'file_size': result.get('file_size', previous.get('file_size')),
+            'metrics': result.get('metrics', previous.get('metrics')),
+            'render_time': result.get('render_time'),
+            'created': datetime.now().isoformat()
+        }
+        
+        # result.json last: an interrupted render leaves no completed entry
+        tmp_path = entry_dir / f"{RESULT_NAME}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        tmp_path.replace(entry_dir / RESULT_NAME)
+        
+        self._append_index({'event': 'result', **entry})
+        return entry
+    
+    def deliver(self, entry: Dict, output_path: str) -> Dict:
+        """
+        Link a stored entry's files next to a run's expected output path.
+        
+        Args:
+            entry: Stored entry
+            output_path: Video path the sweep config asked for
+        
+        Returns:
+            Dict with 'output_path', 'frame_path' and/or 'sheet_path'
+        """
+        entry_dir = self.entry_dir(entry['key'])
+        stem = str(Path(output_path).with_suffix(''))
+        destinations = {
+            'video': ('output_path', Path(output_path)),
+            'frame': ('frame_path', Path(f"{stem}_frame.png")),
+            'sheet': ('sheet_path', Path(f"{stem}_sheet.png"))
+        }
+        
+        delivered = {}
+        for name, file_name in entry['files'].items():
+            result_key, destination = destinations[name]
+            _link_or_copy(entry_dir / file_name, destination)
+            delivered[result_key] = str(destination)
+        
+        self._append_index({'event': 'link', 'key': entry['key'], 'path': str(Path(output_path).resolve())})
+        return delivered
+    
+    def _append_index(self, record: Dict):
+        """Append one record to the index."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    
+    def _read_index(self) -> Tuple[Dict[str, Dict], Dict[str, List[str]]]:
+        """Read entries (latest per key) and the run paths each key is linked to."""
+        entries: Dict[str, Dict] = {}
+        links: Dict[str, List[str]] = {}
+        
+        if not self.index_path.exists():
+            self.rebuild_index()
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line after a crash
+                    event = record.pop('event', 'result')
+                    if event == 'link':
+                        paths = links.setdefault(record['key'], [])
+                        if record['path'] not in paths:
+                            paths.append(record['path'])
+                    else:
+                        entries[record['key']] = record
+        except OSError:
+            pass
+        
+        return entries, links
+    
+    def rebuild_index(self):
+        """Recreate the index from the result.json files (links are lost)."""
+        if not self.objects_dir.exists():
+            return
+        
+        records = []
+        for result_path in sorted(self.objects_dir.glob(f'*/*/{RESULT_NAME}')):
+            try:
+                with open(result_path, 'r', encoding='utf-8') as f:
+                    records.append({'event': 'result', **json.load(f)})
+            except (OSError, ValueError):
+                continue
+        
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+        tmp_path.replace(self.index_path)
+    
+    def query(self, top: Optional[int] = None, **filters) -> List[Dict]:
+        """
+        Query stored results across all runs.
+        
+        Args:
+            top: Keep only the N best entries by metrics score
+            **filters: Key parameter values to match, e.g. layers=2,
+                resolution=[854, 480]; list/tuple/set values of scalar
+                parameters match any member
+        
+        Returns:
+            Entries (with 'links' to the run files) sorted by score, best first
+        """
+        entries, links = self._read_index()
+        
+        matched = []
+        for key, entry in entries.items():
+            params = entry.get('params', {})
+            ok = True
+            for name, wanted in filters.items():
+                value = params.get(name)
+                if isinstance(wanted, (set, tuple)) or (isinstance(wanted, list) and not isinstance(value, list)):
+                    ok = value in wanted
+                else:
+                    ok = value == wanted
+                if not ok:
+                    break
+            if ok:
+                matched.append({**entry, 'links': links.get(key, [])})
+        
+        matched.sort(key=lambda e: (e.get('metrics') or {}).get('score', -1.0), reverse=True)
+        return matched[:top] if top is not None else matched
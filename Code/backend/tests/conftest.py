@@ -0,0 +1,12 @@
+"""
+Shared pytest setup for the backend modules.
+
+Run from Code/backend:
+    python -m pytest tests/ music_analysis/tests/
+"""
+
+import sys
+from pathlib import Path
+
+# Backend modules import each other by top-level name (as cli.py does)
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,71 @@
+"""Tests for cppn_numpy: fast-math error bounds and agreement with CPPN.forward."""
+
+import numpy as np
+import pytest
+
+from cppn_numpy import NumpyCPPN, NumpyRenderer, fast_cos, fast_gaussian, fast_sin, max_error_vs_cppn
+
+
+# One 8-bit colour step: fast math must stay below it end to end
+COLOUR_STEP = 1 / 255
+
+
+def apply(function, x):
+    out = x.copy()
+    function(out, np.empty_like(x), np.empty_like(x))
+    return out
+
+
+@pytest.mark.parametrize('function, reference', [(fast_sin, np.sin), (fast_cos, np.cos)])
+def test_fast_trig_error_bound(function, reference):
+    x = np.linspace(-100, 100, 400001, dtype=np.float32)
+    
+    error = np.abs(apply(function, x) - reference(x.astype(np.float64)))
+    
+    # Documented: <= 2e-5 for |x| <= 100, plus ~1e-7·|x| from range reduction
+    assert np.all(error <= 2e-5 + 1e-7 * np.abs(x))
+
+
+def test_fast_gaussian_error_bound():
+    x = np.linspace(-20, 20, 400001, dtype=np.float32)
+    
+    error = np.abs(apply(fast_gaussian, x) - np.exp(-x.astype(np.float64) ** 2))
+    
+    assert error.max() <= 2e-6
+
+
+@pytest.fixture(params=[(8, 2), (32, 4), (256, 6)], ids=lambda shape: f"{shape[1]}x{shape[0]}")
+def cppn(request):
+    torch = pytest.importorskip('torch')
+    from cppn import CPPN
+    
+    hidden_dim, num_layers = request.param
+    torch.manual_seed(0)
+    return CPPN(input_dim=12, hidden_dim=hidden_dim, num_layers=num_layers, device='cpu')
+
+
+def test_matches_cppn_forward(cppn):
+    assert max_error_vs_cppn(NumpyCPPN.from_cppn(cppn), cppn) < 1e-4
+
+
+def test_fast_math_within_colour_step(cppn):
+    assert max_error_vs_cppn(NumpyCPPN.from_cppn(cppn, fast_math=True), cppn) < COLOUR_STEP
+
+
+def test_export_round_trip(cppn, tmp_path):
+    from cppn_numpy import export_weights
+    
+    path = export_weights(cppn, tmp_path / 'style.npz', {'prompt': 'test'})
+    loaded = NumpyCPPN.load(path)
+    x = np.random.default_rng(0).uniform(-0.5, 0.5, (1000, 12)).astype(np.float32)
+    
+    np.testing.assert_array_equal(loaded(x), NumpyCPPN.from_cppn(cppn)(x))
+
+
+def test_renderer_frame_shape(cppn):
+    renderer = NumpyRenderer(NumpyCPPN.from_cppn(cppn), resolution=(64, 36))
+    
+    frame = renderer.render_frame(0.5, np.full(9, 0.05, dtype=np.float32))
+    
+    assert frame.shape == (36, 64, 3)
+    assert frame.dtype == np.uint8
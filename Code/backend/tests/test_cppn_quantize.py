@@ -0,0 +1,70 @@
+"""Tests for cppn_quantize: the per-layer PSNR gate of QuantizedCPPN."""
+
+import math
+
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from cppn import CPPN
+from cppn_quantize import QuantizedCPPN, calibration_inputs, psnr, select_engine
+
+
+pytestmark = pytest.mark.skipif(select_engine() is None, reason="no quantized CPU engine in this torch build")
+
+
+@pytest.fixture
+def cppn():
+    torch.manual_seed(0)
+    return CPPN(input_dim=12, hidden_dim=64, num_layers=4, device='cpu')
+
+
+def quantize(cppn, min_psnr):
+    return QuantizedCPPN(cppn, min_psnr=min_psnr, num_samples=4096)
+
+
+def output_psnr(qcppn, cppn, seed=1):
+    x = calibration_inputs(cppn.input_dim, num_samples=4096, seed=seed)
+    with torch.no_grad():
+        return psnr(cppn(x), qcppn(x))
+
+
+def test_unreachable_gate_keeps_fp32(cppn):
+    qcppn = quantize(cppn, min_psnr=math.inf)
+    
+    assert qcppn.quantized == []
+    assert qcppn.report['quantized_layers'] == 0
+    assert not any(layer['quantized'] for layer in qcppn.report['layers'])
+    assert output_psnr(qcppn, cppn) == math.inf
+
+
+def test_open_gate_quantizes_every_layer(cppn):
+    qcppn = quantize(cppn, min_psnr=-math.inf)
+    
+    assert qcppn.quantized == list(range(cppn.num_layers + 1))
+    assert len(qcppn.report['layers']) == cppn.num_layers + 1
+
+
+def test_accepted_layers_meet_the_gate(cppn):
+    min_psnr = 40.0
+    qcppn = quantize(cppn, min_psnr=min_psnr)
+    
+    for layer in qcppn.report['layers']:
+        assert layer['quantized'] == (layer['psnr'] >= min_psnr)
+    if qcppn.quantized:
+        assert qcppn.report['psnr'] >= min_psnr
+        # Held out from calibration, with a small margin for sampling noise
+        assert output_psnr(qcppn, cppn) >= min_psnr - 3.0
+
+
+def test_evolution_requantizes_accepted_layers(cppn):
+    qcppn = quantize(cppn, min_psnr=-math.inf)
+    layers = list(qcppn.quantized)
+    
+    qcppn.evolve_weights(0.01)
+    x = calibration_inputs(cppn.input_dim, num_samples=1024, seed=2)
+    with torch.no_grad():
+        qcppn(x)
+    
+    assert qcppn.quantized == layers
+    assert output_psnr(qcppn, cppn) > 20.0
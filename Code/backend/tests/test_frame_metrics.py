@@ -0,0 +1,60 @@
+"""Tests for frame_metrics.FrameMetrics on degenerate sequences."""
+
+import numpy as np
+import pytest
+
+from frame_metrics import SCORE_WEIGHTS, FrameMetrics
+
+
+def test_empty_sequence():
+    assert FrameMetrics().summary() == {'num_frames': 0}
+
+
+def test_constant_frames():
+    metrics = FrameMetrics()
+    frame = np.full((90, 160, 3), 128, dtype=np.uint8)
+    features = np.linspace(0.0, 1.0, 9)
+    
+    for _ in range(5):
+        metrics.update(frame, features)
+    summary = metrics.summary()
+    
+    assert summary['num_frames'] == 5
+    for name in ('spatial_entropy', 'edge_density', 'color_diversity', 'flicker', 'flicker_std'):
+        assert summary[name] == pytest.approx(0.0, abs=1e-9)
+    
+    # No frame change: correlation with audio is undefined, reported as 0
+    assert summary['av_onset_corr'] == 0.0
+    assert summary['av_rms_corr'] == 0.0
+    
+    # Only the coherence term (no flicker -> 1.0) contributes
+    assert summary['score'] == pytest.approx(SCORE_WEIGHTS['coherence'])
+
+
+def test_single_frame():
+    metrics = FrameMetrics()
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (120, 200, 3), dtype=np.uint8)
+    
+    metrics.update(frame, rng.random(9))
+    summary = metrics.summary()
+    
+    assert summary['num_frames'] == 1
+    assert summary['flicker'] == 0.0
+    assert summary['flicker_std'] == 0.0
+    assert summary['av_onset_corr'] == 0.0
+    assert summary['av_rms_corr'] == 0.0
+    assert 0.0 < summary['spatial_entropy'] <= 1.0
+    assert 0.0 < summary['color_diversity'] <= 1.0
+    assert 0.0 <= summary['score'] <= 1.0
+
+
+def test_short_feature_vectors_are_ignored():
+    metrics = FrameMetrics()
+    
+    for value in (0, 255, 0):
+        metrics.update(np.full((8, 8, 3), value, dtype=np.uint8), np.zeros(3))
+    summary = metrics.summary()
+    
+    assert summary['flicker'] == pytest.approx(1.0)
+    assert summary['av_onset_corr'] == 0.0
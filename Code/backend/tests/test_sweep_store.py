@@ -0,0 +1,122 @@
+"""Tests for sweep_store: key stability and the record / lookup / deliver round trip."""
+
+import pytest
+
+from sweep_store import ARTIFACTS, STORE_VERSION, SweepStore, sweep_key
+
+
+CONFIG = {'layers': 2, 'hidden_dim': 8, 'seed': 42, 'audio_scale': 0.05, 'evolve': 0.0, 'text_overlay': None}
+
+
+def key_params(config=CONFIG, **overrides):
+    args = {
+        'audio_sha256': 'a' * 64,
+        'duration': 10.0,
+        'resolution': (854, 480),
+        'fps': 24,
+        'device': 'cpu',
+        'mux_audio': False
+    }
+    args.update(overrides)
+    return SweepStore.key_params(config, **args)
+
+
+def test_sweep_key_ignores_dict_order():
+    params = key_params()
+    reordered = dict(reversed(list(params.items())))
+    
+    assert sweep_key(params) == sweep_key(reordered)
+    assert len(sweep_key(params)) == 64
+
+
+def test_sweep_key_changes_with_any_key_field():
+    base = sweep_key(key_params())
+    
+    assert sweep_key(key_params({**CONFIG, 'seed': 43})) != base
+    assert sweep_key(key_params({**CONFIG, 'audio_scale': 0.1})) != base
+    assert sweep_key(key_params(fps=30)) != base
+    assert sweep_key(key_params(mux_audio=True)) != base
+    assert sweep_key(key_params(compile_backend='torchscript')) != base
+
+
+def test_key_params_stable_layout():
+    params = key_params()
+    
+    # Eager renders keep the keys they had before compile backends were keyed
+    assert 'compile_backend' not in params
+    assert params['version'] == STORE_VERSION
+    assert params['resolution'] == [854, 480]
+
+
+def test_unseeded_configs_are_not_stored():
+    assert key_params({**CONFIG, 'seed': None}) is None
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """A store holding one rendered video and still for CONFIG."""
+    store = SweepStore(tmp_path / 'store')
+    params = key_params()
+    key = sweep_key(params)
+    
+    entry_dir = store.entry_dir(key)
+    entry_dir.mkdir(parents=True)
+    (entry_dir / ARTIFACTS['video']).write_bytes(b'video')
+    (entry_dir / ARTIFACTS['frame']).write_bytes(b'frame')
+    
+    entry = store.record(key, params, {'file_size': 5, 'metrics': {'score': 0.5}, 'render_time': 1.5})
+    return store, key, entry
+
+
+def test_record_lists_existing_artifacts(stored):
+    store, key, entry = stored
+    
+    assert entry['files'] == {'video': ARTIFACTS['video'], 'frame': ARTIFACTS['frame']}
+    assert store.get(key) == entry
+
+
+def test_lookup_requires_every_requested_artifact(stored):
+    store, key, entry = stored
+    
+    assert store.lookup(key, {'frame_time': 2.0}) == entry
+    assert store.lookup(key, {}, render_video=False) == entry
+    assert store.lookup(key, {'sheet_times': [1.0, 2.0]}) is None
+    assert store.lookup(sweep_key(key_params(fps=30)), {}) is None
+
+
+def test_lookup_misses_when_a_file_is_gone(stored):
+    store, key, _ = stored
+    
+    (store.entry_dir(key) / ARTIFACTS['video']).unlink()
+    
+    assert store.lookup(key, {}) is None
+
+
+def test_deliver_round_trip(stored, tmp_path):
+    store, key, entry = stored
+    output_path = tmp_path / 'run' / 'arch_2L_8D_seed42.mp4'
+    
+    delivered = store.deliver(entry, str(output_path))
+    
+    assert delivered == {
+        'output_path': str(output_path),
+        'frame_path': str(tmp_path / 'run' / 'arch_2L_8D_seed42_frame.png')
+    }
+    assert output_path.read_bytes() == b'video'
+    assert (tmp_path / 'run' / 'arch_2L_8D_seed42_frame.png').read_bytes() == b'frame'
+    
+    # Delivering again over the same files is a no-op
+    store.deliver(entry, str(output_path))
+    assert output_path.read_bytes() == b'video'
+
+
+def test_query_reports_links(stored, tmp_path):
+    store, key, entry = stored
+    output_path = tmp_path / 'run' / 'arch_2L_8D_seed42.mp4'
+    store.deliver(entry, str(output_path))
+    
+    results = store.query(layers=2)
+    
+    assert [result['key'] for result in results] == [key]
+    assert results[0]['links'] == [str(output_path.resolve())]
+    assert store.query(layers=3) == []
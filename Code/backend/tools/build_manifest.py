@@ -0,0 +1,143 @@
+"""
+Build manifest for incremental page regeneration.
+
+Each exploration directory keeps a small `.build_manifest.json` recording,
+for every generated page, the template version and a fingerprint of each
+input file (size, mtime and SHA-256). A page is rebuilt only when its output
+is missing, the template version changed, or an input was added, removed or
+changed content.
+
+Unchanged files are recognised from `stat()` alone, so a no-op pass over
+hundreds of directories never reads video data. Files whose size or mtime
+changed are re-hashed, so touching a file without changing it does not force
+a rebuild.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+
+MANIFEST_NAME = '.build_manifest.json'
+
+# Read size for hashing large videos
+_HASH_CHUNK = 1024 * 1024
+
+
+def _sha256(path: Path) -> str:
+    """Hash file contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(directory: Path) -> Dict:
+    """Load a directory's manifest (empty if missing or unreadable)."""
+    try:
+        with open(directory / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(directory: Path, manifest: Dict):
+    """Write a directory's manifest atomically."""
+    path = directory / MANIFEST_NAME
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def fingerprint_inputs(
+    inputs: Iterable[Path],
+    previous: Optional[Dict] = None
+) -> Dict[str, Dict]:
+    """
+    Fingerprint input files, reusing hashes of files whose stat is unchanged.
+
+    Args:
+        inputs: Input file paths (missing files are ignored)
+        previous: Fingerprints from the last build, keyed by file name
+
+    Returns:
+        Dict mapping file name to {'size', 'mtime_ns', 'sha256'}
+    """
+    previous = previous or {}
+    fingerprints = {}
+
+    for path in inputs:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+
+        old = previous.get(path.name)
+        if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+            sha256 = old['sha256']
+        else:
+            sha256 = _sha256(path)
+
+        fingerprints[path.name] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256
+        }
+
+    return fingerprints
+
+
+def check_outputs(
+    directory: Path,
+    outputs: Iterable[str],
+    inputs: Iterable[Path],
+    template_version: str,
+    manifest: Optional[Dict] = None
+) -> Tuple[bool, Dict]:
+    """
+    Decide whether a page needs rebuilding.
+
+    Args:
+        directory: Directory holding the outputs and the manifest
+        outputs: Output file names; the first is the manifest key
+        inputs: Input files the outputs depend on
+        template_version: Version string of the generating template
+        manifest: Pre-loaded manifest (loaded from disk if None)
+
+    Returns:
+        Tuple of (stale, entry) where `entry` should be passed to
+        `record_build` after a successful rebuild
+    """
+    outputs = list(outputs)
+    manifest = load_manifest(directory) if manifest is None else manifest
+    old_entry = manifest.get(outputs[0], {})
+
+    fingerprints = fingerprint_inputs(inputs, old_entry.get('inputs'))
+    entry = {'template': template_version, 'inputs': fingerprints}
+
+    stale = (
+        old_entry.get('template') != template_version
+        or {name: fp['sha256'] for name, fp in old_entry.get('inputs', {}).items()}
+        != {name: fp['sha256'] for name, fp in fingerprints.items()}
+        or not all((directory / name).exists() for name in outputs)
+    )
+
+    return stale, entry
+
+
+def record_build(directory: Path, output: str, entry: Dict, manifest: Optional[Dict] = None):
+    """
+    Store a page's manifest entry after it was rebuilt.
+
+    Args:
+        directory: Directory holding the manifest
+        output: Output file name (manifest key)
+        entry: Entry returned by `check_outputs`
+        manifest: Pre-loaded manifest to update (loaded from disk if None)
+    """
+    manifest = load_manifest(directory) if manifest is None else manifest
+    manifest[output] = entry
+    save_manifest(directory, manifest)
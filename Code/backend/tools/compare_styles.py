@@ -0,0 +1,122 @@
+"""
+Style Comparison - Render several styles of one audio clip in a single pass
+
+Trained styles (.pth files from clip_optimize_cppn.py) and quick_explore.py
+presets are rendered together: the audio is analyzed once, the coordinate
+grid and per-frame inputs are built once per frame, and styles that share a
+shape are evaluated in one batched forward pass (see MultiStyleCPPN in
+cppn_ensemble.py).
+
+Outputs (explorations/style_comparisons/<timestamp>/):
+    comparison.mp4        tiled video with every style side by side
+    <style>.mp4           one video per style (unless --tiled-only)
+    *_frame.png           stills at --frame-time
+    metadata.json         styles and per-style quality metrics
+
+Usage:
+    python compare_styles.py --audio song.mp3 --weights ../explorations/trained/*/*.pth
+    python compare_styles.py --audio song.mp3 --presets simple reactive complex --tiled-only
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from quick_explore import PRESETS
+from sweep_engine import RESOLUTIONS, SweepEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Render trained styles and presets side by side in one batched pass'
+    )
+    parser.add_argument('--audio', type=str, required=True, help='Path to audio file')
+    parser.add_argument('--weights', type=str, nargs='*', default=[], help='Trained .pth style files')
+    parser.add_argument('--presets', type=str, nargs='*', default=[], choices=list(PRESETS.keys()),
+                        help='quick_explore.py presets to include')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for preset styles')
+    parser.add_argument('--audio-scale', type=float, default=0.05,
+                        help='Audio feature scaling for trained styles (default: 0.05)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of audio to render (default: 10)')
+    parser.add_argument('--resolution', type=str, default='360p', choices=list(RESOLUTIONS.keys()),
+                        help='Resolution of each style (default: 360p)')
+    parser.add_argument('--fps', type=int, default=24, help='Frames per second (default: 24)')
+    parser.add_argument('--columns', type=int, default=2, help='Tiles per row in the comparison (default: 2)')
+    parser.add_argument('--frame-time', type=float, default=None, help='Also write stills at this time (seconds)')
+    parser.add_argument('--tiled-only', action='store_true', help='Only write the tiled comparison video')
+    parser.add_argument('--device', type=str, default='auto', choices=['auto', 'cuda', 'cpu'])
+    
+    args = parser.parse_args()
+    
+    if not Path(args.audio).exists():
+        print(f"Error: Audio file not found: {args.audio}")
+        sys.exit(1)
+    
+    missing = [path for path in args.weights if not Path(path).exists()]
+    if missing:
+        print(f"Error: Weights file not found: {missing[0]}")
+        sys.exit(1)
+    
+    if not args.weights and not args.presets:
+        print("Error: Give at least one --weights file or --presets name")
+        sys.exit(1)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(__file__).parent.parent / 'explorations' / 'style_comparisons' / timestamp
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    styles = []
+    for path in args.weights:
+        styles.append({'name': Path(path).stem, 'weights': path, 'audio_scale': args.audio_scale})
+    for name in args.presets:
+        preset = {key: value for key, value in PRESETS[name].items() if key != 'desc'}
+        styles.append({**preset, 'name': name, 'seed': args.seed})
+    
+    if not args.tiled_only:
+        for style in styles:
+            style['output_path'] = str(output_dir / f"{style['name']}.mp4")
+    
+    print(f"Style Comparison")
+    print(f"Styles: {', '.join(style['name'] for style in styles)}")
+    print(f"Output directory: {output_dir}")
+    
+    with SweepEngine(resolution=args.resolution, fps=args.fps, device=args.device, workers=1) as engine:
+        result = engine.render_styles(
+            args.audio,
+            styles,
+            duration=args.duration,
+            tiled_path=str(output_dir / 'comparison.mp4'),
+            frame_time=args.frame_time,
+            columns=args.columns
+        )
+    
+    metadata = {
+        'audio': args.audio,
+        'duration': args.duration,
+        'resolution': args.resolution,
+        'fps': args.fps,
+        'styles': [{**style, **rendered} for style, rendered in zip(styles, result['styles'])],
+        'tiled_path': result['tiled_path'],
+        'render_time': result['render_time'],
+        'timestamp': timestamp
+    }
+    with open(output_dir / 'metadata.json', 'w') as f:
+        json.dump(metadata, f, indent=2)
+    
+    print(f"\n{'='*60}")
+    print(f"Rendered {len(styles)} styles in {result['render_time']:.1f}s")
+    for rendered in result['styles']:
+        score = (rendered.get('metrics') or {}).get('score')
+        score_text = f"{score:.3f}" if score is not None else "n/a"
+        print(f"  {rendered['name']:<30} score {score_text}")
+    print(f"Comparison: {result['tiled_path']}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Style Compression - Low-rank factorization of trained CPPN styles
+
+Factorizes the hidden layers of a CLIP-optimized style (.pth from
+clip_optimize_cppn.py) with truncated SVD (../cppn_compress.py), optionally
+fine-tunes the factorized network to match the original's output, and saves
+a checkpoint that cli.py --load-weights and the Renderer load as usual.
+
+Reported tradeoff (also stored under 'compression' in the checkpoint):
+    PSNR              compressed vs original output on held-out inputs
+    CLIP similarity   original and compressed, against the style's prompt
+                      (when the clip package and a prompt are available)
+    frames/sec        single-frame render speed of both at --resolution
+
+Usage:
+    python compress_style.py ../styles/organic.pth --error-budget 0.05
+    python compress_style.py ../styles/organic.pth --rank 32 --finetune-steps 300 --audio song.mp3
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cppn import load_cppn, save_cppn
+from cppn_compress import factorize_cppn, finetune, render_fps
+from cppn_distill import track_features
+from cppn_quantize import calibration_inputs, psnr
+from sweep_engine import RESOLUTIONS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compress a trained CPPN style with low-rank factorization')
+    parser.add_argument('weights', type=str, help='.pth style file')
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument('--rank', type=int, default=None, help='Fixed rank for every hidden layer')
+    budget.add_argument('--error-budget', type=float, default=None,
+                        help='Per-layer relative weight error budget (default: 0.05)')
+    parser.add_argument('--finetune-steps', type=int, default=0,
+                        help='Fine-tune steps against the original output (default: 0)')
+    parser.add_argument('--lr', type=float, default=1e-4, help='Fine-tune learning rate (default: 1e-4)')
+    parser.add_argument('--audio', type=str, default=None,
+                        help="Audio for sample inputs and CLIP scoring (default: the style's training audio)")
+    parser.add_argument('--audio-scale', type=float, default=0.05, help='Audio feature scaling (default: 0.05)')
+    parser.add_argument('--resolution', type=str, default='1080p', choices=list(RESOLUTIONS.keys()),
+                        help='Resolution for the frames/sec comparison (default: 1080p)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Output .pth (default: <style>_lowrank.pth next to the style)')
+    parser.add_argument('--no-clip', action='store_true', help='Skip CLIP similarity scoring')
+    parser.add_argument('--device', type=str, default='auto', choices=['auto', 'cuda', 'cpu'])
+    
+    args = parser.parse_args()
+    
+    weights_path = Path(args.weights)
+    if not weights_path.exists():
+        print(f"Error: Weights file not found: {weights_path}")
+        sys.exit(1)
+    
+    device = ('cuda' if torch.cuda.is_available() else 'cpu') if args.device == 'auto' else args.device
+    error_budget = args.error_budget if args.error_budget is not None else (None if args.rank else 0.05)
+    
+    # Compression and fine-tuning run in fp32
+    teacher, metadata = load_cppn(str(weights_path), input_dim=12, hidden_dim=256, num_layers=4, device=device)
+    teacher = teacher.float()
+    
+    # Sample inputs from the track's real feature distribution
+    audio_path = args.audio or metadata.get('audio_file')
+    scaled, raw_row = None, None
+    if audio_path and Path(audio_path).exists():
+        scaled, raw_row = track_features(audio_path, args.audio_scale)
+    else:
+        print("Warning: No audio found. Sampling audio inputs from the default --audio-scale range")
+    
+    train_inputs = calibration_inputs(teacher.input_dim, scaled, num_samples=131072, seed=0)
+    test_inputs = calibration_inputs(teacher.input_dim, scaled, num_samples=65536, seed=1).to(device)
+    
+    print(f"\nStyle Compression: {weights_path.name}")
+    student = factorize_cppn(teacher, rank=args.rank, error_budget=error_budget)
+    ranks = ', '.join(f"{i}:{r}" if r else f"{i}:dense" for i, r in enumerate(student.ranks))
+    print(f"  Ranks per layer: {ranks}")
+    print(f"  Parameters: {teacher.count_parameters():,} -> {student.count_parameters():,}")
+    
+    with torch.no_grad():
+        reference = teacher(test_inputs)
+        factorized_psnr = psnr(reference, student(test_inputs))
+    print(f"  PSNR after SVD: {factorized_psnr:.1f} dB")
+    
+    if args.finetune_steps > 0:
+        print(f"\nFine-tuning against the original ({args.finetune_steps} steps)...")
+        finetune(student, teacher, train_inputs, steps=args.finetune_steps, learning_rate=args.lr)
+    
+    with torch.no_grad():
+        final_psnr = psnr(reference, student(test_inputs))
+    
+    report = {
+        'source': str(weights_path),
+        'rank': args.rank,
+        'error_budget': error_budget,
+        'ranks': student.ranks,
+        'finetune_steps': args.finetune_steps,
+        'parameters': student.count_parameters(),
+        'source_parameters': teacher.count_parameters(),
+        'psnr_svd': factorized_psnr,
+        'psnr': final_psnr
+    }
+    
+    # CLIP similarity of both, as during optimization
+    if not args.no_clip and metadata.get('prompt') and raw_row is not None:
+        try:
+            from clip_optimize_cppn import clip_similarity
+            
+            source_score, score = clip_similarity(
+                [teacher, student], metadata['prompt'], raw_row,
+                clip_model_name=metadata.get('clip_model', 'RN50'), device=device
+            )
+            report['source_clip_similarity'] = source_score
+            report['clip_similarity'] = score
+        except ImportError:
+            print("Warning: CLIP not installed. Skipping CLIP similarity")
+    
+    resolution = RESOLUTIONS[args.resolution]
+    row = scaled[len(scaled) // 2] if scaled is not None else np.full(teacher.input_dim - 3, 0.025, dtype=np.float32)
+    report['source_fps'] = render_fps(teacher, resolution, row)
+    report['fps'] = render_fps(student, resolution, row)
+    
+    output_path = args.output or weights_path.with_name(f"{weights_path.stem}_lowrank.pth")
+    save_cppn(student, output_path, {**metadata, 'compression': report})
+    
+    print(f"\n{'='*60}")
+    print(f"{'':<16}{'original':>12}{'compressed':>12}")
+    print(f"{'Parameters':<16}{report['source_parameters']:>12,}{report['parameters']:>12,}")
+    print(f"{'PSNR (dB)':<16}{'-':>12}{final_psnr:>12.1f}")
+    if 'clip_similarity' in report:
+        print(f"{'CLIP':<16}{report['source_clip_similarity']:>12.4f}{report['clip_similarity']:>12.4f}")
+    print(f"{'FPS @ ' + args.resolution:<16}{report['source_fps']:>12.2f}{report['fps']:>12.2f}")
+    print(f"\n[OK] Compressed style: {output_path}")
+    print(f"   python cli.py {{audio}} output.mp4 --load-weights {output_path}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Style Distillation - Train small, fast students of trained CPPN styles
+
+Trains a small CPPN (e.g. 2×16) to reproduce a CLIP-optimized style
+(../cppn_distill.py) on inputs sampled across the track's real audio
+features, and stores it next to the style as <style>_student_<L>x<H>.pth
+with a fidelity report (PSNR, CLIP similarity, frames/sec vs the teacher).
+
+cli.py then picks the student automatically for --stills previews and for
+renders that would exceed --time-budget (--student always/never overrides).
+
+Usage:
+    python distill_style.py ../styles/organic.pth --layers 2 --hidden-dim 16
+    python distill_style.py ../styles/organic.pth --layers 3 --hidden-dim 32 --steps 4000 --audio song.mp3
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cppn import load_cppn, save_cppn
+from cppn_compress import render_fps
+from cppn_distill import distill, student_path, track_features
+from sweep_engine import RESOLUTIONS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distill a trained CPPN style into a small student network')
+    parser.add_argument('weights', type=str, help='Teacher .pth style file')
+    parser.add_argument('--layers', type=int, default=2, help='Student hidden layers (default: 2)')
+    parser.add_argument('--hidden-dim', type=int, default=16, help='Student hidden dim (default: 16)')
+    parser.add_argument('--steps', type=int, default=2000, help='Training steps (default: 2000)')
+    parser.add_argument('--lr', type=float, default=1e-3, help='Learning rate (default: 1e-3)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--audio', type=str, default=None,
+                        help="Audio whose features are sampled (default: the style's training audio)")
+    parser.add_argument('--audio-scale', type=float, default=0.05, help='Audio feature scaling (default: 0.05)')
+    parser.add_argument('--resolution', type=str, default='1080p', choices=list(RESOLUTIONS.keys()),
+                        help='Resolution for the frames/sec comparison (default: 1080p)')
+    parser.add_argument('--no-clip', action='store_true', help='Skip CLIP similarity scoring')
+    parser.add_argument('--device', type=str, default='auto', choices=['auto', 'cuda', 'cpu'])
+    
+    args = parser.parse_args()
+    
+    weights_path = Path(args.weights)
+    if not weights_path.exists():
+        print(f"Error: Weights file not found: {weights_path}")
+        sys.exit(1)
+    
+    device = ('cuda' if torch.cuda.is_available() else 'cpu') if args.device == 'auto' else args.device
+    
+    # Distillation runs in fp32
+    teacher, metadata = load_cppn(str(weights_path), input_dim=12, hidden_dim=256, num_layers=4, device=device)
+    teacher = teacher.float()
+    
+    audio_path = args.audio or metadata.get('audio_file')
+    scaled, raw_row = None, None
+    if audio_path and Path(audio_path).exists():
+        scaled, raw_row = track_features(audio_path, args.audio_scale)
+    else:
+        print("Warning: No audio found. Sampling audio inputs from the default --audio-scale range")
+    
+    print(f"\nStyle Distillation: {weights_path.name}")
+    print(f"  Teacher: {teacher.num_layers}L × {teacher.hidden_dim}D ({teacher.count_parameters():,} parameters)")
+    print(f"  Student: {args.layers}L × {args.hidden_dim}D, {args.steps} steps")
+    
+    student, report = distill(
+        teacher,
+        scaled,
+        hidden_dim=args.hidden_dim,
+        num_layers=args.layers,
+        steps=args.steps,
+        learning_rate=args.lr,
+        seed=args.seed
+    )
+    report.update({
+        'teacher': weights_path.name,
+        'audio_file': str(audio_path) if scaled is not None else None,
+        'audio_scale': args.audio_scale,
+        'resolution': args.resolution
+    })
+    
+    if not args.no_clip and metadata.get('prompt') and raw_row is not None:
+        try:
+            from clip_optimize_cppn import clip_similarity
+            
+            report['teacher_clip_similarity'], report['clip_similarity'] = clip_similarity(
+                [teacher, student], metadata['prompt'], raw_row,
+                clip_model_name=metadata.get('clip_model', 'RN50'), device=device
+            )
+        except ImportError:
+            print("Warning: CLIP not installed. Skipping CLIP similarity")
+    
+    resolution = RESOLUTIONS[args.resolution]
+    row = scaled[len(scaled) // 2] if scaled is not None else np.full(teacher.input_dim - 3, 0.025, dtype=np.float32)
+    report['teacher_fps'] = render_fps(teacher, resolution, row)
+    report['fps'] = render_fps(student, resolution, row)
+    
+    output_path = save_cppn(
+        student,
+        student_path(weights_path, args.layers, args.hidden_dim),
+        {**metadata, 'distillation': report}
+    )
+    
+    print(f"\n{'='*60}")
+    print(f"{'':<16}{'teacher':>12}{'student':>12}")
+    print(f"{'Parameters':<16}{report['teacher_parameters']:>12,}{report['parameters']:>12,}")
+    print(f"{'PSNR (dB)':<16}{'-':>12}{report['psnr']:>12.1f}")
+    if 'clip_similarity' in report:
+        print(f"{'CLIP':<16}{report['teacher_clip_similarity']:>12.4f}{report['clip_similarity']:>12.4f}")
+    print(f"{'FPS @ ' + args.resolution:<16}{report['teacher_fps']:>12.2f}{report['fps']:>12.2f}")
+    print(f"\n[OK] Student: {output_path}")
+    print(f"   Used automatically by cli.py --load-weights {weights_path} for --stills and --time-budget")
+    print(f"{'='*60}\n")
+
+
+if __name__ == '__main__':
+    main()
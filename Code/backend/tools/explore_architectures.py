@@ -7,8 +7,14 @@ to discover optimal configurations for organic biological patterns.
 Ultra-small networks for maximum visual coherence.
 Includes text overlay showing architecture parameters on each video.
 
+Renders go through the sweep store (../sweep_store.py): configurations
+already rendered with the same audio, segment and settings by any earlier
+run are linked in instead of rendered again, and an interrupted run can be
+finished with --resume.
+
 Usage:
     python explore_architectures.py [--audio path/to/audio.mp3] [--duration 10]
+    python explore_architectures.py --resume ../explorations/architecture_matrix/20251015_213644
 """
 
 import os
@@ -17,13 +23,14 @@ import argparse
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple
-import subprocess
+from typing import List, Dict, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from cppn import CPPN
+from sweep_engine import SweepEngine
+from sweep_store import DEFAULT_STORE, SweepStore
 import torch
 
 
@@ -34,6 +41,10 @@ ARCHITECTURE_MATRIX = {
     'seeds': [42, 123, 456]  # 3 different random seeds per configuration
 }
 
+# Representative frame timestamp (seconds) and contact sheet size
+FRAME_TIME = 5.0
+SHEET_FRAMES = 8
+
 
 def create_output_directory() -> Path:
     """Create timestamped output directory for this exploration run."""
@@ -80,15 +91,44 @@ def calculate_params(layers: int, hidden_dim: int, input_dim: int = 12, output_d
     return params
 
 
-def run_generation(config: Dict, audio_path: str, output_path: str, duration: int = 10) -> Dict:
+def build_sweep_job(config: Dict, output_path: str, frame_time: Optional[float] = FRAME_TIME,
+                    sheet_times: Optional[List[float]] = None) -> Dict:
+    """
+    Turn an architecture configuration into a sweep engine job.
+    
+    Args:
+        config: Architecture configuration dict
+        output_path: Path for output video
+        frame_time: Timestamp of the representative frame (None to skip)
+        sheet_times: Timestamps for a contact sheet (None to skip)
+        
+    Returns:
+        Job dict for SweepEngine.run (includes the text overlay)
+    """
+    text_overlay = f"{config['layers']}L × {config['hidden_dim']}D | Seed {config['seed']} | {config['params']:,} params"
+    return {
+        **config,
+        'text_overlay': text_overlay,
+        'output_path': output_path,
+        'frame_time': frame_time,
+        'sheet_times': sheet_times
+    }
+
+
+def run_generation(config: Dict, audio_path: str, output_path: str, duration: int = 10,
+                   engine: SweepEngine = None) -> Dict:
     """
     Run video generation with specific architecture configuration.
     
+    Renders in-process through a SweepEngine; pass a shared engine when
+    generating several configs so the audio is only analyzed once.
+    
     Args:
         config: Architecture configuration dict
         audio_path: Path to audio file
         output_path: Path for output video
         duration: Duration of clip in seconds
+        engine: Optional shared SweepEngine (480p / 24 FPS one is created if None)
         
     Returns:
         Dict with generation results and metadata
@@ -98,84 +138,15 @@ def run_generation(config: Dict, audio_path: str, output_path: str, duration: in
     print(f"Parameters: {config['params']:,}")
     print(f"{'='*60}")
     
-    # Build CLI command with text overlay showing architecture
-    text_overlay = f"{config['layers']}L × {config['hidden_dim']}D | Seed {config['seed']} | {config['params']:,} params"
-    cmd = [
-        sys.executable,
-        str(Path(__file__).parent.parent / 'cli.py'),
-        audio_path,
-        output_path,
-        '--resolution', '480p',  # Low res for fast exploration
-        '--fps', '24',           # Lower FPS for speed
-        '--layers', str(config['layers']),
-        '--hidden-dim', str(config['hidden_dim']),
-        '--seed', str(config['seed']),
-        '--duration', str(duration),
-        '--text-overlay', text_overlay
-    ]
-    
-    try:
-        # Run generation
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Check if output file was created
-        if os.path.exists(output_path):
-            file_size = os.path.getsize(output_path)
-            
-            return {
-                'success': True,
-                'output_path': output_path,
-                'file_size': file_size,
-                'stdout': result.stdout[-500:] if len(result.stdout) > 500 else result.stdout,
-                'config': config
-            }
-        else:
-            return {
-                'success': False,
-                'error': 'Output file not created',
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'config': config
-            }
-            
-    except subprocess.CalledProcessError as e:
-        return {
-            'success': False,
-            'error': str(e),
-            'stdout': e.stdout,
-            'stderr': e.stderr,
-            'config': config
-        }
-    except Exception as e:
-        return {
-            'success': False,
-            'error': str(e),
-            'config': config
-        }
-
-
-def extract_representative_frame(video_path: str, output_path: str, timestamp: float = 5.0):
-    """Extract a representative frame from video using ffmpeg."""
-    try:
-        cmd = [
-            'ffmpeg',
-            '-ss', str(timestamp),
-            '-i', video_path,
-            '-vframes', '1',
-            '-q:v', '2',
-            '-y',  # Overwrite
-            output_path
-        ]
-        subprocess.run(cmd, capture_output=True, check=True)
-        return True
-    except Exception as e:
-        print(f"Warning: Failed to extract frame: {e}")
-        return False
+    job = build_sweep_job(config, output_path)
+    if engine is not None:
+        result = engine.run(audio_path, [job], duration=duration)[0]
+    else:
+        with SweepEngine(resolution='480p', fps=24, workers=1) as own_engine:
+            result = own_engine.run(audio_path, [job], duration=duration)[0]
+    
+    result['config'] = config
+    return result
 
 
 def generate_exploration_report(configs: List[Dict], results: List[Dict], output_dir: Path):
@@ -225,13 +196,39 @@ def generate_exploration_report(configs: List[Dict], results: List[Dict], output
             key = f"{layers}L_{hidden_dim}D"
             if key in arch_groups:
                 group = arch_groups[key]
-                avg_size = sum(r['file_size'] for r in group) / len(group) / (1024*1024)
+                avg_size = sum(r.get('file_size', 0) for r in group) / len(group) / (1024*1024)
                 params = group[0]['config']['params']
                 report += f"| {layers} | {hidden_dim} | {params:,} | {len(group)} | ✅ | {avg_size:.1f} |\n"
             else:
                 params = calculate_params(layers, hidden_dim)
                 report += f"| {layers} | {hidden_dim} | {params:,} | 0 | ❌ | - |\n"
     
+    # Automatic ranking from the quality metrics computed while rendering
+    scored = sorted(
+        (r for r in results if r['success'] and r.get('metrics')),
+        key=lambda r: r['metrics']['score'],
+        reverse=True
+    )
+    if scored:
+        report += f"""
+---
+
+## Automatic Ranking
+
+Heuristic score from metrics computed during rendering (see `frame_metrics.py`).
+Use it to prune before manual rating: `python rate_architectures.py --top 10`.
+
+| Rank | Config | Score | Entropy | Edges | Colors | Flicker | AV corr (onset / RMS) |
+|------|--------|-------|---------|-------|--------|---------|-----------------------|
+"""
+        for rank, result in enumerate(scored, 1):
+            config = result['config']
+            m = result['metrics']
+            report += (f"| {rank} | {config['layers']}L × {config['hidden_dim']}D seed {config['seed']} | "
+                       f"{m['score']:.3f} | {m['spatial_entropy']:.2f} | {m['edge_density']:.3f} | "
+                       f"{m['color_diversity']:.2f} | {m['flicker']:.4f} | "
+                       f"{m['av_onset_corr']:.2f} / {m['av_rms_corr']:.2f} |\n")
+    
     report += f"""
 ---
 
@@ -322,7 +319,47 @@ def main():
     parser.add_argument(
         '--skip-frames',
         action='store_true',
-        help='Skip frame extraction (faster)'
+        help='Skip representative frame rendering'
+    )
+    parser.add_argument(
+        '--stills-only',
+        action='store_true',
+        help='Only render representative frames (no videos) for fast previews'
+    )
+    parser.add_argument(
+        '--contact-sheet',
+        action='store_true',
+        help=f'Also render a {SHEET_FRAMES}-frame contact sheet per configuration'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Parallel render processes (default: half the CPU cores, 1 on CUDA)'
+    )
+    parser.add_argument(
+        '--compile',
+        type=str,
+        default=None,
+        choices=['torchscript', 'inductor'],
+        help='Compiled CPPN inference (see cppn_compile.py); speeds up small networks on CPU'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default=None,
+        help='Continue an interrupted run in this output directory'
+    )
+    parser.add_argument(
+        '--store',
+        type=str,
+        default=str(DEFAULT_STORE),
+        help='Sweep store that deduplicates renders across runs (default: explorations/sweep_store)'
+    )
+    parser.add_argument(
+        '--no-store',
+        action='store_true',
+        help='Render every configuration, ignoring the sweep store'
     )
     
     args = parser.parse_args()
@@ -345,8 +382,16 @@ def main():
             print(f"Error: Audio file not found: {audio_path}")
             sys.exit(1)
     
-    # Create output directory
-    output_dir = create_output_directory()
+    # Create output directory (or reuse the interrupted one)
+    if args.resume:
+        output_dir = Path(args.resume)
+        if not output_dir.is_dir():
+            print(f"Error: Directory not found: {output_dir}")
+            sys.exit(1)
+        if args.no_store:
+            print("Warning: --resume without the sweep store re-renders every configuration")
+    else:
+        output_dir = create_output_directory()
     print(f"\nArchitecture Matrix Exploration")
     print(f"Output directory: {output_dir}")
     print(f"Audio: {audio_path}")
@@ -360,30 +405,46 @@ def main():
     print(f"   Seeds: {ARCHITECTURE_MATRIX['seeds']}")
     print(f"   Total: {len(ARCHITECTURE_MATRIX['layers'])} × {len(ARCHITECTURE_MATRIX['hidden_dims'])} × {len(ARCHITECTURE_MATRIX['seeds'])} = {len(configs)}")
     
-    # Run generations
-    results = []
-    for i, config in enumerate(configs, 1):
-        print(f"\n[{i}/{len(configs)}] Processing configuration {config['id']}...")
-        
-        # Generate output filename
+    # Run generations in-process: audio is analyzed once for the whole sweep
+    frame_time = None if args.skip_frames else min(FRAME_TIME, args.duration / 2)
+    sheet_times = None
+    if args.contact_sheet:
+        sheet_times = [args.duration * (i + 0.5) / SHEET_FRAMES for i in range(SHEET_FRAMES)]
+    
+    jobs = []
+    for config in configs:
         output_filename = f"arch_{config['layers']}L_{config['hidden_dim']}D_seed{config['seed']}.mp4"
-        output_path = str(output_dir / output_filename)
-        
-        # Run generation
-        result = run_generation(config, audio_path, output_path, args.duration)
-        results.append(result)
-        
-        # Extract representative frame
-        if result['success'] and not args.skip_frames:
-            frame_path = str(output_dir / output_filename.replace('.mp4', '_frame.png'))
-            extract_representative_frame(output_path, frame_path)
+        jobs.append(build_sweep_job(config, str(output_dir / output_filename), frame_time, sheet_times))
+    
+    completed = 0
+    
+    def report_result(index: int, result: Dict):
+        nonlocal completed
+        completed += 1
+        config = configs[index]
+        result['config'] = config
+        label = f"[{completed}/{len(configs)}] Config {config['id']}: {config['layers']}L × {config['hidden_dim']}D (seed={config['seed']})"
         
         # Print status
-        if result['success']:
+        if result['success'] and result.get('cached'):
+            print(f"{label} - Already rendered (store)")
+        elif result['success'] and args.stills_only:
+            print(f"{label} - Stills in {result['render_time']:.2f}s")
+        elif result['success']:
             size_mb = result['file_size'] / (1024 * 1024)
-            print(f"Success - {size_mb:.1f} MB")
+            score = f", score {result['metrics']['score']:.3f}" if result.get('metrics') else ''
+            print(f"{label} - Success - {size_mb:.1f} MB in {result['render_time']:.1f}s{score}")
         else:
-            print(f"Failed - {result.get('error', 'Unknown error')}")
+            print(f"{label} - Failed - {result.get('error', 'Unknown error')}")
+    
+    store = None if args.no_store else SweepStore(args.store)
+    
+    with SweepEngine(resolution='480p', fps=24, workers=args.workers, store=store,
+                     compile_backend=args.compile) as engine:
+        print(f"\nRendering on {engine.device} with {engine.workers} worker(s), "
+              f"{engine.threads_per_worker} thread(s) each")
+        results = engine.run(audio_path, jobs, duration=args.duration, on_result=report_result,
+                             render_video=not args.stills_only)
     
     # Generate report
     print(f"\n{'='*60}")
@@ -395,10 +456,11 @@ def main():
     
     # Final summary
     successful = sum(1 for r in results if r['success'])
+    cached = sum(1 for r in results if r.get('cached'))
     print(f"\n{'='*60}")
     print(f"Exploration Complete!")
     print(f"{'='*60}")
-    print(f"Successful: {successful}/{len(configs)}")
+    print(f"Successful: {successful}/{len(configs)} ({cached} reused from the sweep store)")
     print(f"Output: {output_dir}")
     print(f"Report: {report_path}")
     print(f"\nNext: Review videos and run rate_architectures.py")
@@ -5,11 +5,17 @@ Generates multiple short videos with different CPPN configurations
 to explore the parameter space and find interesting visual styles.
 """
 
-import subprocess
+import argparse
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sweep_engine import SweepEngine
+
 # Parameter presets to explore
 PRESETS = {
     "organic_flow": {
@@ -71,39 +77,42 @@ PRESETS = {
 }
 
 
-def run_generation(audio_path, output_path, preset_name, params, resolution="480p", fps=24):
-    """Run CLI with specific parameters"""
-    
-    cmd = [
-        "python", "cli.py",
-        str(audio_path),
-        str(output_path),
-        "--resolution", resolution,
-        "--fps", str(fps),
-        "--layers", str(params["layers"]),
-        "--hidden-dim", str(params["hidden_dim"]),
-        "--audio-scale", str(params["audio_scale"]),
-        "--evolve", str(params["evolve"])
-    ]
-    
+def print_preset(preset_name, params):
+    """Print a preset header"""
     print(f"\n{'='*60}")
     print(f"Preset: {preset_name}")
     print(f"Description: {params['description']}")
     print(f"Parameters: layers={params['layers']}, dim={params['hidden_dim']}, "
           f"audio_scale={params['audio_scale']}, evolve={params['evolve']}")
     print(f"{'='*60}\n")
+
+
+def run_generation(audio_path, output_path, preset_name, params, resolution="480p", fps=24,
+                   engine=None):
+    """Render one preset in-process (pass a shared engine to reuse the audio analysis)"""
+    
+    print_preset(preset_name, params)
     
-    try:
-        subprocess.run(cmd, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error generating {preset_name}: {e}")
-        return False
+    job = {**params, "output_path": str(output_path)}
+    if engine is not None:
+        result = engine.run(audio_path, [job])[0]
+    else:
+        with SweepEngine(resolution=resolution, fps=fps, workers=1) as own_engine:
+            result = own_engine.run(audio_path, [job])[0]
+    
+    if not result["success"]:
+        print(f"Error generating {preset_name}: {result['error']}")
+    return result["success"]
 
 
 def main():
     """Generate exploration videos"""
     
+    parser = argparse.ArgumentParser(description="Render every CPPN preset for one audio file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parallel render processes (default: half the CPU cores, 1 on CUDA)")
+    args = parser.parse_args()
+    
     # Setup
     output_dir = Path("explorations")
     output_dir.mkdir(exist_ok=True)
@@ -137,24 +146,31 @@ def main():
     audio_path = available_audio[0]
     print(f"\nUsing: {audio_path.name}")
     
-    # Generate with each preset
+    # Generate every preset against a single audio analysis
+    preset_names = list(PRESETS)
+    jobs = [
+        {**PRESETS[name], "output_path": str(run_dir / f"{name}.mp4")}
+        for name in preset_names
+    ]
+    for preset_name in preset_names:
+        print_preset(preset_name, PRESETS[preset_name])
+    
+    def report_result(index, result):
+        if result["success"]:
+            print(f"[OK] {preset_names[index]} ({result['render_time']:.1f}s)")
+        else:
+            print(f"Error generating {preset_names[index]}: {result['error']}")
+    
+    # Small resolution and lower FPS for fast generation
+    with SweepEngine(resolution="480p", fps=24, workers=args.workers) as engine:
+        outcomes = engine.run(audio_path, jobs, on_result=report_result)
+    
     results = {}
-    for preset_name, params in PRESETS.items():
-        output_path = run_dir / f"{preset_name}.mp4"
-        
-        success = run_generation(
-            audio_path,
-            output_path,
-            preset_name,
-            params,
-            resolution="480p",  # Small for fast generation
-            fps=24              # Lower FPS for speed
-        )
-        
+    for preset_name, job, outcome in zip(preset_names, jobs, outcomes):
         results[preset_name] = {
-            "success": success,
-            "params": params,
-            "output": str(output_path)
+            "success": outcome["success"],
+            "params": PRESETS[preset_name],
+            "output": job["output_path"]
         }
     
     # Save results summary
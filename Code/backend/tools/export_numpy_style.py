@@ -0,0 +1,59 @@
+"""
+Export Styles for the NumPy Backend - .pth -> torch-free .npz
+
+Converts CLIP-optimized styles (clip_optimize_cppn.py) to the .npz format
+read by cppn_numpy.NumpyCPPN, and checks each export against CPPN.forward
+(exact and fast-math NumPy paths).
+
+Usage:
+    python export_numpy_style.py ../explorations/trained/*/*.pth
+    python export_numpy_style.py style.pth --output-dir ../styles/numpy
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cppn import load_cppn
+from cppn_numpy import NumpyCPPN, export_weights, max_error_vs_cppn
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export .pth CPPN styles to torch-free .npz files for cppn_numpy.py'
+    )
+    parser.add_argument('weights', type=str, nargs='+', help='.pth style files')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Directory for .npz files (default: next to each .pth)')
+    parser.add_argument('--layers', type=int, default=4,
+                        help='Layers for old checkpoints without cppn_config (default: 4)')
+    parser.add_argument('--hidden-dim', type=int, default=256,
+                        help='Hidden dim for old checkpoints without cppn_config (default: 256)')
+    
+    args = parser.parse_args()
+    
+    for weights_path in map(Path, args.weights):
+        if not weights_path.exists():
+            print(f"Warning: Weights file not found: {weights_path}")
+            continue
+        
+        cppn, metadata = load_cppn(
+            str(weights_path), input_dim=12, hidden_dim=args.hidden_dim, num_layers=args.layers, device='cpu'
+        )
+        
+        output_dir = Path(args.output_dir) if args.output_dir else weights_path.parent
+        output_path = export_weights(cppn, output_dir / f"{weights_path.stem}.npz", metadata)
+        
+        exact = max_error_vs_cppn(NumpyCPPN.load(output_path), cppn)
+        fast = max_error_vs_cppn(NumpyCPPN.load(output_path, fast_math=True), cppn)
+        
+        print(f"[OK] {weights_path.name} -> {output_path}")
+        print(f"  {cppn.num_layers}L × {cppn.hidden_dim}D, max RGB error vs CPPN.forward: "
+              f"{exact:.2e} (exact), {fast:.2e} (fast math)")
+
+
+if __name__ == '__main__':
+    main()
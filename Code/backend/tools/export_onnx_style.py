@@ -0,0 +1,63 @@
+"""
+Export Styles to ONNX - .pth -> portable .onnx
+
+Converts CLIP-optimized styles (clip_optimize_cppn.py) to ONNX graphs with a
+dynamic batch axis, architecture taken from each checkpoint's cppn_config
+and metadata embedded in the file. Exports are checked against CPPN.forward
+with onnxruntime when it is installed.
+
+Render exported styles without torch:
+    python numpy_preview.py --audio song.mp3 --style style.onnx --threads 4 --video render.mp4
+
+Usage:
+    python export_onnx_style.py ../explorations/trained/*/*.pth
+    python export_onnx_style.py style.pth --output-dir ../styles/onnx
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cppn import load_cppn
+from cppn_numpy import max_error_vs_cppn
+from cppn_onnx import OPSET_VERSION, OnnxCPPN, export_onnx
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export .pth CPPN styles to ONNX (dynamic batch axis)')
+    parser.add_argument('weights', type=str, nargs='+', help='.pth style files')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Directory for .onnx files (default: next to each .pth)')
+    parser.add_argument('--opset', type=int, default=OPSET_VERSION, help=f'ONNX opset (default: {OPSET_VERSION})')
+    parser.add_argument('--layers', type=int, default=4,
+                        help='Layers for old checkpoints without cppn_config (default: 4)')
+    parser.add_argument('--hidden-dim', type=int, default=256,
+                        help='Hidden dim for old checkpoints without cppn_config (default: 256)')
+    
+    args = parser.parse_args()
+    
+    for weights_path in map(Path, args.weights):
+        if not weights_path.exists():
+            print(f"Warning: Weights file not found: {weights_path}")
+            continue
+        
+        cppn, metadata = load_cppn(
+            str(weights_path), input_dim=12, hidden_dim=args.hidden_dim, num_layers=args.layers, device='cpu'
+        )
+        
+        output_dir = Path(args.output_dir) if args.output_dir else weights_path.parent
+        output_path = export_onnx(cppn, output_dir / f"{weights_path.stem}.onnx", metadata, opset_version=args.opset)
+        print(f"[OK] {weights_path.name} -> {output_path} ({cppn.num_layers}L × {cppn.hidden_dim}D)")
+        
+        try:
+            error = max_error_vs_cppn(OnnxCPPN(output_path), cppn)
+            print(f"  Max RGB error vs CPPN.forward: {error:.2e}")
+        except ImportError:
+            print("  Warning: onnxruntime not installed, export not checked")
+
+
+if __name__ == '__main__':
+    main()
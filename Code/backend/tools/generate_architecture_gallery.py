@@ -3,13 +3,34 @@
 Generate beautiful HTML gallery for architecture exploration results.
 
 Creates an interactive gallery with video previews, stats, and filtering.
+
+The page itself stays small as runs accumulate:
+- Each video gets one small JPEG thumbnail in `.thumbs/`, named by the hash of
+  the video's contents, so it is generated once and shared across rebuilds
+- Card data lives in `gallery_data.js`; cards are rendered a page at a time
+  with `loading="lazy"` images instead of being inlined in the HTML
+- Video hashes are cached in `.thumbs/index.json` (see build_manifest.py), so
+  a rebuild only hashes and thumbnails videos from new or changed runs
 """
 
+import argparse
 import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
-import base64
+from typing import List, Dict, Optional
+
+from build_manifest import fingerprint_inputs
+
+
+THUMB_DIR_NAME = '.thumbs'
+THUMB_WIDTH = 320
+THUMB_TIMESTAMP = 5.0
+
+# Cards rendered per gallery page
+PAGE_SIZE = 48
 
 
 def get_all_exploration_runs() -> List[Path]:
@@ -19,7 +40,7 @@ def get_all_exploration_runs() -> List[Path]:
         return []
     
     # Get all timestamped directories
-    runs = sorted([d for d in base_dir.iterdir() if d.is_dir()], reverse=True)
+    runs = sorted([d for d in base_dir.iterdir() if d.is_dir() and not d.name.startswith('.')], reverse=True)
     return runs
 
 
@@ -32,19 +53,78 @@ def load_exploration_metadata(run_dir: Path) -> Dict:
     return None
 
 
-def generate_gallery_html(output_path: Path):
-    """Generate comprehensive HTML gallery."""
+def load_thumb_index(thumb_dir: Path) -> Dict:
+    """Load cached video fingerprints, keyed by run name."""
+    try:
+        with open(thumb_dir / 'index.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_thumb_index(thumb_dir: Path, index: Dict):
+    """Save cached video fingerprints."""
+    thumb_dir.mkdir(parents=True, exist_ok=True)
+    with open(thumb_dir / 'index.json', 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+
+def make_thumbnail(source: Path, thumb_path: Path, is_video: bool = True) -> bool:
+    """
+    Write a small JPEG thumbnail with ffmpeg.
     
-    runs = get_all_exploration_runs()
+    Args:
+        source: Video file (frame taken at THUMB_TIMESTAMP) or still image
+        thumb_path: Output JPEG path
+        is_video: Seek into the source before grabbing a frame
     
-    if not runs:
-        print("No exploration runs found!")
-        return
+    Returns:
+        True if the thumbnail was written
+    """
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error']
+    if is_video:
+        cmd += ['-ss', str(THUMB_TIMESTAMP)]
+    cmd += [
+        '-i', str(source),
+        '-vframes', '1',
+        '-vf', f'scale={THUMB_WIDTH}:-2',
+        '-q:v', '5',
+        str(thumb_path)
+    ]
     
-    print(f"Found {len(runs)} exploration runs")
+    # Write to a temporary name so an interrupted run never leaves a
+    # truncated file under the content-addressed name
+    tmp_path = thumb_path.with_name(f"tmp_{thumb_path.name}")
+    cmd[-1] = str(tmp_path)
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+        tmp_path.replace(thumb_path)
+        return True
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Warning: Failed to create thumbnail for {source.name}: {e}")
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+
+def collect_gallery_entries(runs: List[Path], gallery_dir: Path, workers: int) -> List[Dict]:
+    """
+    Collect card data for every successful configuration, creating any
+    missing thumbnails.
+    
+    Args:
+        runs: Exploration run directories
+        gallery_dir: Directory the gallery is written to
+        workers: Parallel thumbnail jobs
+    
+    Returns:
+        List of card dictionaries (JSON-serializable)
+    """
+    thumb_dir = gallery_dir / THUMB_DIR_NAME
+    thumb_dir.mkdir(parents=True, exist_ok=True)
+    index = load_thumb_index(thumb_dir)
     
-    # Collect all configurations across all runs
     all_configs = []
+    thumb_jobs = {}
     
     for run_dir in runs:
         metadata = load_exploration_metadata(run_dir)
@@ -52,24 +132,47 @@ def generate_gallery_html(output_path: Path):
             continue
         
         run_name = run_dir.name
-        matrix = metadata.get('matrix', {})
+        successful = []
         
         # Process each result
         for result in metadata.get('results', []):
             if not result['success']:
                 continue
             
-            config = result['config']
             # Resolve path - it might be relative in the metadata
             video_path = Path(result['output_path'])
             if not video_path.is_absolute():
                 video_path = (run_dir / video_path).resolve()
+            if not video_path.exists():
+                # Runs copied from another machine: look next to metadata.json
+                video_path = run_dir.resolve() / Path(result['output_path'].replace('\\', '/')).name
+            successful.append((result, video_path))
+        
+        # Hashes are reused for videos whose size and mtime are unchanged
+        fingerprints = fingerprint_inputs(
+            [video_path for _, video_path in successful],
+            index.get(run_name)
+        )
+        index[run_name] = fingerprints
+        
+        for result, video_path in successful:
+            config = result['config']
             
             # Find frame if it exists
             frame_path = video_path.parent / video_path.name.replace('.mp4', '_frame.png')
             
-            # Calculate relative path from the output HTML location
-            gallery_dir = Path(__file__).parent.parent / 'explorations' / 'architecture_matrix'
+            thumb_src = None
+            fingerprint = fingerprints.get(video_path.name)
+            if fingerprint:
+                thumb_name = f"{fingerprint['sha256'][:20]}.jpg"
+                thumb_path = thumb_dir / thumb_name
+                if not thumb_path.exists() and thumb_path not in thumb_jobs:
+                    # Prefer the already extracted frame over decoding the video
+                    if frame_path.exists():
+                        thumb_jobs[thumb_path] = (frame_path, False)
+                    else:
+                        thumb_jobs[thumb_path] = (video_path, True)
+                thumb_src = f"{THUMB_DIR_NAME}/{thumb_name}"
             
             all_configs.append({
                 'run': run_name,
@@ -77,14 +180,67 @@ def generate_gallery_html(output_path: Path):
                 'hidden_dim': config['hidden_dim'],
                 'seed': config['seed'],
                 'params': config['params'],
-                'file_size_mb': result['file_size'] / (1024 * 1024),
-                'video_path': video_path.relative_to(gallery_dir.resolve()),
-                'frame_path': frame_path.relative_to(gallery_dir.resolve()) if frame_path.exists() else None,
+                'file_size_mb': round(result['file_size'] / (1024 * 1024), 2),
+                'video_path': Path(os.path.relpath(video_path, gallery_dir.resolve())).as_posix(),
+                'thumb_path': thumb_src,
                 'config_id': f"{config['layers']}L_{config['hidden_dim']}D_seed{config['seed']}"
             })
     
+    # Drop runs that no longer exist from the index
+    for run_name in set(index) - {run_dir.name for run_dir in runs}:
+        del index[run_name]
+    save_thumb_index(thumb_dir, index)
+    
+    if thumb_jobs:
+        print(f"Creating {len(thumb_jobs)} new thumbnails...")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            created = dict(zip(
+                thumb_jobs,
+                pool.map(lambda job: make_thumbnail(job[1][0], job[0], job[1][1]), thumb_jobs.items())
+            ))
+        
+        failed = {f"{THUMB_DIR_NAME}/{path.name}" for path, ok in created.items() if not ok}
+        for config in all_configs:
+            if config['thumb_path'] in failed:
+                config['thumb_path'] = None
+    
+    return all_configs
+
+
+def write_gallery_data(all_configs: List[Dict], data_path: Path) -> bool:
+    """
+    Write card data as a script (loads from file:// without a server).
+    
+    Returns:
+        True if the file changed
+    """
+    content = "window.GALLERY_DATA = " + json.dumps(all_configs, separators=(',', ':')) + ";\n"
+    if data_path.exists() and data_path.read_text(encoding='utf-8') == content:
+        return False
+    data_path.write_text(content, encoding='utf-8')
+    return True
+
+
+def generate_gallery_html(output_path: Path, workers: Optional[int] = None):
+    """Generate comprehensive HTML gallery."""
+    
+    runs = get_all_exploration_runs()
+    
+    if not runs:
+        print("No exploration runs found!")
+        return
+    
+    print(f"Found {len(runs)} exploration runs")
+    
+    # Collect all configurations across all runs
+    all_configs = collect_gallery_entries(runs, output_path.parent, workers or os.cpu_count() or 1)
+    
     print(f"Found {len(all_configs)} successful configurations")
     
+    data_path = output_path.parent / 'gallery_data.js'
+    if write_gallery_data(all_configs, data_path):
+        print(f"Gallery data updated: {data_path}")
+    
     # Generate HTML
     html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -365,6 +521,34 @@ def generate_gallery_html(output_path: Path):
             transform: rotate(90deg);
         }}
         
+        .video-preview .no-thumb {{
+            background: #000;
+            width: 100%;
+            height: 100%;
+        }}
+        
+        .pagination {{
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            gap: 20px;
+            margin: 30px 0;
+        }}
+        
+        .pagination button {{
+            background: rgba(255, 255, 255, 0.1);
+            border: 1px solid rgba(255, 255, 255, 0.2);
+            color: #e4e4e4;
+            padding: 10px 20px;
+            border-radius: 8px;
+            cursor: pointer;
+        }}
+        
+        .pagination button:disabled {{
+            opacity: 0.4;
+            cursor: default;
+        }}
+        
         .no-results {{
             text-align: center;
             padding: 60px;
@@ -451,109 +635,124 @@ def generate_gallery_html(output_path: Path):
         </div>
     </div>
     
-    <div class="gallery" id="gallery">
-"""
+    <div class="gallery" id="gallery"></div>
     
-    # Add video cards
-    for config in all_configs:
-        frame_src = str(config['frame_path']) if config['frame_path'] else ""
-        video_src = str(config['video_path'])
-        
-        html += f"""        <div class="video-card" 
-             data-layers="{config['layers']}" 
-             data-dim="{config['hidden_dim']}" 
-             data-seed="{config['seed']}"
-             data-params="{config['params']}"
-             data-size="{config['file_size_mb']:.2f}"
-             data-run="{config['run']}"
-             onclick="openModal('{video_src}')">
-            <div class="video-preview">
-"""
-        
-        if frame_src:
-            html += f'                <img src="{frame_src}" alt="Preview">\n'
-        else:
-            html += '                <div style="background: #000; width: 100%; height: 100%;"></div>\n'
+    <div class="pagination">
+        <button id="prevPage">&larr; Previous</button>
+        <span id="pageInfo"></span>
+        <button id="nextPage">Next &rarr;</button>
+    </div>
+    
+    <div class="modal" id="videoModal">
+        <div class="modal-content">
+            <span class="close-modal" onclick="closeModal()">&times;</span>
+            <video id="modalVideo" controls autoplay loop>
+                <source src="" type="video/mp4">
+            </video>
+        </div>
+    </div>
+    
+    <script src="gallery_data.js"></script>
+    <script>
+        const PAGE_SIZE = """ + str(PAGE_SIZE) + """;
+        const gallery = document.getElementById('gallery');
+        const layerFilter = document.getElementById('layerFilter');
+        const dimFilter = document.getElementById('dimFilter');
+        const seedFilter = document.getElementById('seedFilter');
+        const sortBy = document.getElementById('sortBy');
+        const pageInfo = document.getElementById('pageInfo');
+        const prevPage = document.getElementById('prevPage');
+        const nextPage = document.getElementById('nextPage');
+        
+        const sortFields = {
+            params: 'params',
+            layers: 'layers',
+            hidden_dim: 'hidden_dim',
+            file_size: 'file_size_mb'
+        };
+        
+        let visible = [];
+        let page = 0;
+        
+        function escapeHtml(text) {
+            const div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }
         
-        html += """                <div class="play-overlay"></div>
+        function cardHtml(config, index) {
+            const preview = config.thumb_path
+                ? `<img src="${escapeHtml(config.thumb_path)}" alt="Preview" loading="lazy" decoding="async">`
+                : '<div class="no-thumb"></div>';
+            
+            return `
+        <div class="video-card" data-index="${index}">
+            <div class="video-preview">
+                ${preview}
+                <div class="play-overlay"></div>
             </div>
             <div class="video-info">
-                <div class="config-title">{config_id}</div>
+                <div class="config-title">${escapeHtml(config.config_id)}</div>
                 <div class="config-details">
                     <div class="detail">
                         <div class="detail-label">Layers</div>
-                        <div class="detail-value">{layers}</div>
+                        <div class="detail-value">${config.layers}</div>
                     </div>
                     <div class="detail">
                         <div class="detail-label">Hidden Dim</div>
-                        <div class="detail-value">{hidden_dim}</div>
+                        <div class="detail-value">${config.hidden_dim}</div>
                     </div>
                     <div class="detail">
                         <div class="detail-label">Parameters</div>
-                        <div class="detail-value">{params:,}</div>
+                        <div class="detail-value">${config.params.toLocaleString()}</div>
                     </div>
                     <div class="detail">
                         <div class="detail-label">File Size</div>
-                        <div class="detail-value">{file_size_mb:.1f} MB</div>
+                        <div class="detail-value">${config.file_size_mb.toFixed(1)} MB</div>
                     </div>
                 </div>
-                <span class="run-badge">{run}</span>
+                <span class="run-badge">${escapeHtml(config.run)}</span>
             </div>
-        </div>
-""".format(**config)
-    
-    html += """    </div>
-    
-    <div class="modal" id="videoModal">
-        <div class="modal-content">
-            <span class="close-modal" onclick="closeModal()">&times;</span>
-            <video id="modalVideo" controls autoplay loop>
-                <source src="" type="video/mp4">
-            </video>
-        </div>
-    </div>
-    
-    <script>
-        const gallery = document.getElementById('gallery');
-        const layerFilter = document.getElementById('layerFilter');
-        const dimFilter = document.getElementById('dimFilter');
-        const seedFilter = document.getElementById('seedFilter');
-        const sortBy = document.getElementById('sortBy');
+        </div>`;
+        }
+        
+        function renderPage() {
+            const pages = Math.max(1, Math.ceil(visible.length / PAGE_SIZE));
+            page = Math.min(page, pages - 1);
+            
+            const slice = visible.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE);
+            gallery.innerHTML = slice.length
+                ? slice.map(i => cardHtml(window.GALLERY_DATA[i], i)).join('')
+                : '<div class="no-results">No configurations match these filters</div>';
+            
+            pageInfo.textContent = `Page ${page + 1} of ${pages} (${visible.length} configurations)`;
+            prevPage.disabled = page === 0;
+            nextPage.disabled = page >= pages - 1;
+        }
         
         function filterAndSort() {
-            const cards = Array.from(gallery.querySelectorAll('.video-card'));
+            const data = window.GALLERY_DATA || [];
             
             // Filter
-            cards.forEach(card => {
-                const layerMatch = layerFilter.value === 'all' || card.dataset.layers === layerFilter.value;
-                const dimMatch = dimFilter.value === 'all' || card.dataset.dim === dimFilter.value;
-                const seedMatch = seedFilter.value === 'all' || card.dataset.seed === seedFilter.value;
-                
-                if (layerMatch && dimMatch && seedMatch) {
-                    card.style.display = 'block';
-                } else {
-                    card.style.display = 'none';
-                }
+            visible = data.map((_, i) => i).filter(i => {
+                const config = data[i];
+                const layerMatch = layerFilter.value === 'all' || String(config.layers) === layerFilter.value;
+                const dimMatch = dimFilter.value === 'all' || String(config.hidden_dim) === dimFilter.value;
+                const seedMatch = seedFilter.value === 'all' || String(config.seed) === seedFilter.value;
+                return layerMatch && dimMatch && seedMatch;
             });
             
-            // Sort visible cards
-            const visibleCards = cards.filter(card => card.style.display !== 'none');
+            // Sort
             const sortKey = sortBy.value;
-            
-            visibleCards.sort((a, b) => {
-                let aVal, bVal;
-                
+            visible.sort((a, b) => {
                 if (sortKey === 'run') {
-                    return b.dataset.run.localeCompare(a.dataset.run);
-                } else {
-                    aVal = parseFloat(a.dataset[sortKey]);
-                    bVal = parseFloat(b.dataset[sortKey]);
-                    return aVal - bVal;
+                    return data[b].run.localeCompare(data[a].run);
                 }
+                return data[a][sortFields[sortKey]] - data[b][sortFields[sortKey]];
             });
             
-            // Reorder in DOM
-            visibleCards.forEach(card => gallery.appendChild(card));
+            page = 0;
+            renderPage();
         }
         
         layerFilter.addEventListener('change', filterAndSort);
@@ -561,6 +760,16 @@ def generate_gallery_html(output_path: Path):
         seedFilter.addEventListener('change', filterAndSort);
         sortBy.addEventListener('change', filterAndSort);
         
+        prevPage.addEventListener('click', () => { page -= 1; renderPage(); window.scrollTo(0, 0); });
+        nextPage.addEventListener('click', () => { page += 1; renderPage(); window.scrollTo(0, 0); });
+        
+        gallery.addEventListener('click', (e) => {
+            const card = e.target.closest('.video-card');
+            if (card) {
+                openModal(window.GALLERY_DATA[card.dataset.index].video_path);
+            }
+        });
+        
         function openModal(videoSrc) {
             const modal = document.getElementById('videoModal');
             const video = document.getElementById('modalVideo');
@@ -596,17 +805,29 @@ def generate_gallery_html(output_path: Path):
 </html>
 """
     
-    # Write HTML file
-    output_path.write_text(html, encoding='utf-8')
+    # Write HTML file (unchanged unless the filter options changed)
+    if not output_path.exists() or output_path.read_text(encoding='utf-8') != html:
+        output_path.write_text(html, encoding='utf-8')
     print(f"\nGallery generated: {output_path}")
     print(f"\nOpen in browser: file:///{output_path.absolute()}")
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description='Generate the architecture exploration gallery'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Parallel thumbnail jobs (default: CPU count)'
+    )
+    args = parser.parse_args()
+    
     output_dir = Path(__file__).parent.parent / 'explorations' / 'architecture_matrix'
     output_file = output_dir / 'index.html'
     
-    generate_gallery_html(output_file)
+    generate_gallery_html(output_file, workers=args.workers)
     
     print("\n" + "="*60)
     print("Gallery generation complete!")
@@ -0,0 +1,123 @@
+"""
+NumPy Preview - Torch-free stills and videos from exported styles
+
+Renders an .npz style (see export_numpy_style.py), an .onnx style (see
+export_onnx_style.py, run with onnxruntime) or a random network with
+cppn_numpy.py only - no torch import - so render nodes and the desktop
+preview start in milliseconds instead of seconds.
+
+Usage:
+    python numpy_preview.py --audio song.mp3 --style style.npz --stills 2,5,8
+    python numpy_preview.py --audio song.mp3 --style style.onnx --threads 4 --video render.mp4
+    python numpy_preview.py --audio song.mp3 --layers 2 --hidden-dim 8 --seed 42 --video preview.mp4
+"""
+
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cppn_numpy import NumpyCPPN, NumpyRenderer
+from sweep_engine import RESOLUTIONS, feature_rows, prepare_features, write_png
+
+
+def random_model(input_dim: int, hidden_dim: int, num_layers: int, seed: int = None, **kwargs) -> NumpyCPPN:
+    """
+    Random network with CPPN's initialization scheme (xavier uniform, zero biases).
+    
+    Args:
+        input_dim: Number of input features
+        hidden_dim: Hidden layer dimension
+        num_layers: Number of hidden layers
+        seed: Optional random seed (NumPy stream; differs from torch seeds)
+        **kwargs: Passed to NumpyCPPN
+    
+    Returns:
+        NumpyCPPN instance
+    """
+    rng = np.random.default_rng(seed)
+    
+    def xavier(fan_out, fan_in, gain):
+        bound = gain * np.sqrt(6.0 / (fan_in + fan_out))
+        return rng.uniform(-bound, bound, (fan_out, fan_in))
+    
+    dims = [input_dim] + [hidden_dim] * num_layers
+    weights = [xavier(dims[i + 1], dims[i], 5.0) for i in range(num_layers)]
+    biases = [np.zeros(hidden_dim) for _ in range(num_layers)]
+    return NumpyCPPN(weights, biases, xavier(3, hidden_dim, 1.0), np.zeros(3), **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Torch-free CPPN stills and videos (NumPy backend)')
+    parser.add_argument('--audio', type=str, required=True, help='Path to audio file')
+    parser.add_argument('--style', type=str, default=None, help='.npz or .onnx style (default: random network)')
+    parser.add_argument('--layers', type=int, default=2, help='Layers of a random network (default: 2)')
+    parser.add_argument('--hidden-dim', type=int, default=8, help='Hidden dim of a random network (default: 8)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed of a random network')
+    parser.add_argument('--audio-scale', type=float, default=0.05, help='Audio feature scaling (default: 0.05)')
+    parser.add_argument('--duration', type=float, default=None, help='Seconds of audio to process')
+    parser.add_argument('--resolution', type=str, default='360p', choices=list(RESOLUTIONS.keys()),
+                        help='Output resolution (default: 360p)')
+    parser.add_argument('--fps', type=int, default=24, help='Frames per second (default: 24)')
+    parser.add_argument('--stills', type=str, default=None, help='Comma-separated timestamps in seconds')
+    parser.add_argument('--video', type=str, default=None, help='Also render a video to this path')
+    parser.add_argument('--output-dir', type=str, default='.', help='Directory for stills (default: .)')
+    parser.add_argument('--fast-math', action='store_true', help='Polynomial sin/cos/exp (see cppn_numpy.py)')
+    parser.add_argument('--threads', type=int, default=None, help='onnxruntime intra-op threads for .onnx styles')
+    
+    args = parser.parse_args()
+    
+    if not Path(args.audio).exists():
+        print(f"Error: Audio file not found: {args.audio}")
+        sys.exit(1)
+    
+    from audio_analyzer import AudioAnalyzer
+    
+    analyzer = AudioAnalyzer()
+    analysis = analyzer.analyze(args.audio, fps=args.fps, duration=args.duration)
+    features = prepare_features(
+        analyzer.normalize_features(analysis['features'], method='minmax'), args.audio_scale, 'cpu'
+    )
+    
+    if args.style and Path(args.style).suffix == '.onnx':
+        from cppn_onnx import OnnxCPPN
+        model = OnnxCPPN(args.style, num_threads=args.threads)
+    elif args.style:
+        model = NumpyCPPN.load(args.style, fast_math=args.fast_math)
+    else:
+        model = random_model(2 + 1 + features.shape[1], args.hidden_dim, args.layers,
+                             seed=args.seed, fast_math=args.fast_math)
+    renderer = NumpyRenderer(model, resolution=RESOLUTIONS[args.resolution])
+    print(f"NumPy renderer ready {1000 * (time.perf_counter() - _START):.0f} ms after start "
+          f"({model.num_layers}L × {model.hidden_dim}D, tile {model.tile_size:,} pixels)")
+    
+    if args.stills:
+        timestamps = [float(t) for t in args.stills.split(',') if t.strip()]
+        times, rows = feature_rows(features, timestamps, args.fps)
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stem = Path(args.style).stem if args.style else f"random_{args.layers}x{args.hidden_dim}"
+        for timestamp, frame in zip(timestamps, renderer.render_stills(times, rows)):
+            print(f"[OK] Still: {write_png(output_dir / f'{stem}_{timestamp:g}s.png', frame)}")
+    
+    if args.video:
+        from frame_metrics import FrameMetrics
+        from video_encoder import VideoEncoder
+        
+        metrics = FrameMetrics()
+        frames = renderer.render_sequence({'features': features, 'num_frames': len(features)}, metrics=metrics)
+        encoder = VideoEncoder(args.video, fps=args.fps)
+        encoder.encode(frames, audio_path=args.audio, num_frames=len(features))
+        print(f"  Quality score: {metrics.summary().get('score', 0.0):.3f}")
+
+
+if __name__ == '__main__':
+    main()
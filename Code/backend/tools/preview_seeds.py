@@ -0,0 +1,150 @@
+"""
+Seed Preview - Evaluate many seeds of one architecture in a single pass
+
+Stacks the weights of every seed into a CPPNEnsemble (cppn_ensemble.py) and
+renders them together on one shared coordinate grid, so previewing 100 seeds
+of a small architecture costs about as much as a few single renders.
+
+Outputs (explorations/seed_previews/<timestamp>/):
+    seeds_sheet.png       labeled contact sheet, one tile per seed
+    seed_<n>.mp4          per-seed videos (--video), ranked by quality score
+    metadata.json         seeds, settings and per-seed metrics
+
+Seeds reproduce exactly with cli.py --seed / sweep configs (without
+--evolve: evolution noise is drawn per ensemble, not per seed).
+
+Usage:
+    python preview_seeds.py --audio song.mp3 --layers 2 --hidden-dim 8 --seeds 100
+    python preview_seeds.py --audio song.mp3 --seed-list 7 42 1337 --video --duration 10
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cppn_ensemble import CPPNEnsemble
+from frame_metrics import FrameMetrics
+from renderer import Renderer, make_contact_sheet
+from sweep_engine import RESOLUTIONS, SweepEngine, feature_rows, prepare_features, write_png
+from video_encoder import encode_streams
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Preview many seeds of one CPPN architecture in a single batched render'
+    )
+    parser.add_argument('--audio', type=str, required=True, help='Path to audio file')
+    parser.add_argument('--layers', type=int, default=2, help='Number of hidden layers (default: 2)')
+    parser.add_argument('--hidden-dim', type=int, default=8, help='Hidden layer dimension (default: 8)')
+    parser.add_argument('--seeds', type=int, default=100, help='Number of seeds (default: 100)')
+    parser.add_argument('--seed-start', type=int, default=0, help='First seed (default: 0)')
+    parser.add_argument('--seed-list', type=int, nargs='*', default=None, help='Explicit seeds (overrides --seeds)')
+    parser.add_argument('--audio-scale', type=float, default=0.05, help='Audio feature scaling (default: 0.05)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of audio to analyze (default: 10)')
+    parser.add_argument('--resolution', type=str, default='360p', choices=list(RESOLUTIONS.keys()),
+                        help='Output resolution (default: 360p)')
+    parser.add_argument('--fps', type=int, default=24, help='Frames per second (default: 24)')
+    parser.add_argument('--time', type=float, default=None, help='Timestamp of the preview frame (default: middle)')
+    parser.add_argument('--columns', type=int, default=10, help='Contact sheet columns (default: 10)')
+    parser.add_argument('--video', action='store_true', help='Also encode one video per seed')
+    parser.add_argument('--evolve', type=float, default=0.0, help='Weight evolution rate for videos (default: 0)')
+    parser.add_argument('--device', type=str, default='auto', choices=['auto', 'cuda', 'cpu'])
+    
+    args = parser.parse_args()
+    
+    audio_path = Path(args.audio)
+    if not audio_path.exists():
+        print(f"Error: Audio file not found: {audio_path}")
+        sys.exit(1)
+    
+    seeds = args.seed_list or list(range(args.seed_start, args.seed_start + args.seeds))
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(__file__).parent.parent / 'explorations' / 'seed_previews' / timestamp
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    print(f"Seed Preview")
+    print(f"Architecture: {args.layers}L × {args.hidden_dim}D, {len(seeds)} seeds")
+    print(f"Output directory: {output_dir}")
+    
+    # Analysis and feature scaling shared with sweeps
+    engine = SweepEngine(resolution=args.resolution, fps=args.fps, device=args.device, workers=1)
+    analysis = engine.analyze(str(audio_path), duration=args.duration)
+    features = prepare_features(analysis['features'], args.audio_scale, engine.device)
+    
+    ensemble = CPPNEnsemble.from_seeds(
+        seeds,
+        input_dim=2 + 1 + features.shape[1],  # x, y, time + features
+        hidden_dim=args.hidden_dim,
+        num_layers=args.layers,
+        device=engine.device
+    )
+    renderer = Renderer(ensemble, resolution=engine.resolution)
+    
+    # One preview frame per seed, all from the same forward passes
+    frame_time = args.time if args.time is not None else analysis['duration'] / 2
+    times, rows = feature_rows(features, [frame_time], args.fps)
+    
+    start = time.perf_counter()
+    stack = renderer.render_stills(times, rows)[0]
+    elapsed = time.perf_counter() - start
+    
+    sheet = make_contact_sheet(list(stack), columns=args.columns, labels=ensemble.labels)
+    sheet_path = write_png(output_dir / 'seeds_sheet.png', sheet)
+    print(f"\n[OK] {len(seeds)} previews in {elapsed:.2f}s ({1000 * elapsed / len(seeds):.1f} ms per seed)")
+    print(f"  Contact sheet: {sheet_path}")
+    
+    metadata = {
+        'audio': str(audio_path),
+        'layers': args.layers,
+        'hidden_dim': args.hidden_dim,
+        'audio_scale': args.audio_scale,
+        'duration': args.duration,
+        'resolution': list(engine.resolution),
+        'fps': args.fps,
+        'device': engine.device,
+        'frame_time': frame_time,
+        'seeds': seeds,
+        'sheet_path': sheet_path,
+        'timestamp': timestamp
+    }
+    
+    if args.video:
+        metrics = [FrameMetrics() for _ in seeds]
+        scaled = {'features': features, 'duration': analysis['duration'], 'num_frames': len(features)}
+        frames = renderer.render_sequence(scaled, fps=args.fps, evolve_rate=args.evolve, metrics=metrics)
+        
+        video_paths = encode_streams(
+            frames,
+            [output_dir / f"seed_{seed}.mp4" for seed in seeds],
+            fps=args.fps,
+            audio_path=str(audio_path),
+            num_frames=len(features)
+        )
+        
+        results = [
+            {'seed': seed, 'output_path': str(path), 'metrics': member_metrics.summary()}
+            for seed, path, member_metrics in zip(seeds, video_paths, metrics)
+        ]
+        results.sort(key=lambda r: r['metrics'].get('score', 0.0), reverse=True)
+        metadata['evolve'] = args.evolve
+        metadata['results'] = results
+        
+        print(f"\nTop seeds by quality score:")
+        for result in results[:10]:
+            print(f"  seed {result['seed']:>6}: {result['metrics']['score']:.3f}")
+    
+    with open(output_dir / 'metadata.json', 'w') as f:
+        json.dump(metadata, f, indent=2)
+    
+    print(f"\n[OK] Metadata: {output_dir / 'metadata.json'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Query the sweep store across every exploration run.
+
+Lists stored configurations (best automatic quality score first) with the
+run directories their videos were linked into.
+
+Usage:
+    python query_sweeps.py --top 10
+    python query_sweeps.py --layers 2 3 --hidden-dim 8 --resolution 480p
+    python query_sweeps.py --json > sweeps.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sweep_engine import RESOLUTIONS
+from sweep_store import DEFAULT_STORE, SweepStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query rendered sweep configurations')
+    parser.add_argument('--store', type=str, default=str(DEFAULT_STORE), help='Sweep store directory')
+    parser.add_argument('--layers', type=int, nargs='+', help='Layer counts to include')
+    parser.add_argument('--hidden-dim', type=int, nargs='+', help='Hidden dims to include')
+    parser.add_argument('--seed', type=int, nargs='+', help='Seeds to include')
+    parser.add_argument('--resolution', choices=list(RESOLUTIONS.keys()), help='Resolution preset')
+    parser.add_argument('--fps', type=int, help='Frames per second')
+    parser.add_argument('--top', type=int, default=None, help='Show only the N best by score')
+    parser.add_argument('--json', action='store_true', help='Print entries as JSON')
+    
+    args = parser.parse_args()
+    
+    filters = {}
+    if args.layers:
+        filters['layers'] = set(args.layers)
+    if args.hidden_dim:
+        filters['hidden_dim'] = set(args.hidden_dim)
+    if args.seed:
+        filters['seed'] = set(args.seed)
+    if args.resolution:
+        filters['resolution'] = list(RESOLUTIONS[args.resolution])
+    if args.fps:
+        filters['fps'] = args.fps
+    
+    entries = SweepStore(args.store).query(top=args.top, **filters)
+    
+    if args.json:
+        print(json.dumps(entries, indent=2))
+        return
+    
+    if not entries:
+        print(f"No stored sweeps match in {args.store}")
+        return
+    
+    print(f"{'Rank':>4}  {'Config':<18} {'Score':>6}  {'Res':>9} {'FPS':>4} {'Dur':>5}  Runs")
+    for rank, entry in enumerate(entries, 1):
+        params = entry['params']
+        score = (entry.get('metrics') or {}).get('score')
+        score_text = '-' if score is None else f"{score:.3f}"
+        config = f"{params['layers']}L × {params['hidden_dim']}D s{params['seed']}"
+        runs = sorted({Path(p).parent.name for p in entry['links']})
+        print(f"{rank:>4}  {config:<18} {score_text:>6}  "
+              f"{params['resolution'][0]}x{params['resolution'][1]:<4} {params['fps']:>4} "
+              f"{params['duration'] if params['duration'] is not None else 'full':>5}  {', '.join(runs)}")
+    
+    print(f"\n{len(entries)} configuration(s) from {args.store}")
+
+
+if __name__ == '__main__':
+    main()
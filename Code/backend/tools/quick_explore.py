@@ -5,14 +5,53 @@ Cuts audio into segments and generates multiple visual variations
 for rapid parameter space exploration.
 """
 
-import subprocess
+import argparse
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 import librosa
 import soundfile as sf
 import numpy as np
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sweep_engine import SweepEngine
+
+
+# Quick test presets (optimized for speed and variety)
+PRESETS = {
+    "simple": {
+        "layers": 3,
+        "hidden_dim": 128,
+        "audio_scale": 0.05,
+        "evolve": 0.0,
+        "desc": "Simple patterns"
+    },
+    "reactive": {
+        "layers": 4,
+        "hidden_dim": 256,
+        "audio_scale": 0.15,
+        "evolve": 0.0,
+        "desc": "Strong audio response"
+    },
+    "complex": {
+        "layers": 6,
+        "hidden_dim": 256,
+        "audio_scale": 0.05,
+        "evolve": 0.0,
+        "desc": "Complex structures"
+    },
+    "evolving": {
+        "layers": 4,
+        "hidden_dim": 256,
+        "audio_scale": 0.08,
+        "evolve": 0.005,
+        "desc": "Living patterns"
+    }
+}
+
 
 def cut_audio_segments(audio_path, output_dir, segment_duration=15, num_segments=3):
     """
@@ -100,40 +139,19 @@ def cut_audio_segments(audio_path, output_dir, segment_duration=15, num_segments
     return segment_paths
 
 
-def generate_variations(audio_segment, output_dir, quick_mode=True):
-    """Generate multiple CPPN variations for a single audio segment"""
-    
-    # Quick test presets (optimized for speed and variety)
-    presets = {
-        "simple": {
-            "layers": 3,
-            "hidden_dim": 128,
-            "audio_scale": 0.05,
-            "evolve": 0.0,
-            "desc": "Simple patterns"
-        },
-        "reactive": {
-            "layers": 4,
-            "hidden_dim": 256,
-            "audio_scale": 0.15,
-            "evolve": 0.0,
-            "desc": "Strong audio response"
-        },
-        "complex": {
-            "layers": 6,
-            "hidden_dim": 256,
-            "audio_scale": 0.05,
-            "evolve": 0.0,
-            "desc": "Complex structures"
-        },
-        "evolving": {
-            "layers": 4,
-            "hidden_dim": 256,
-            "audio_scale": 0.08,
-            "evolve": 0.005,
-            "desc": "Living patterns"
-        }
-    }
+def generate_variations(audio_segment, output_dir, quick_mode=True, engine=None, single_pass=False):
+    """
+    Generate multiple CPPN variations for a single audio segment.
+    
+    All presets are rendered in-process from one analysis of the segment.
+    Pass a shared SweepEngine to keep its worker pool across segments; its
+    resolution / FPS then take precedence over quick_mode.
+    
+    With single_pass, all presets are rendered together in one batched pass
+    over shared inputs, which also writes a tiled
+    <segment>_comparison.mp4 next to the per-preset videos.
+    """
+    presets = PRESETS
     
     if quick_mode:
         # Even faster for initial exploration
@@ -145,41 +163,54 @@ def generate_variations(audio_segment, output_dir, quick_mode=True):
     
     results = []
     segment_name = audio_segment["name"]
+    preset_names = list(presets)
+    # Mid-segment still for thumbnails.html, rendered without decoding the video
+    frame_time = audio_segment["duration"] / 2
+    jobs = [
+        {**presets[name], "output_path": str(output_dir / f"{segment_name}_{name}.mp4"),
+         "frame_time": frame_time}
+        for name in preset_names
+    ]
     
-    for preset_name, params in presets.items():
-        output_path = output_dir / f"{segment_name}_{preset_name}.mp4"
-        
-        cmd = [
-            "python", "cli.py",
-            str(audio_segment["path"]),
-            str(output_path),
-            "--resolution", resolution,
-            "--fps", str(fps),
-            "--layers", str(params["layers"]),
-            "--hidden-dim", str(params["hidden_dim"]),
-            "--audio-scale", str(params["audio_scale"]),
-            "--evolve", str(params["evolve"])
-        ]
-        
+    def report_result(index, result):
+        preset_name = preset_names[index]
+        params = presets[preset_name]
         print(f"\n  => {preset_name}: {params['desc']}")
-        
-        try:
-            subprocess.run(cmd, check=True, capture_output=True)
-            results.append({
-                "preset": preset_name,
-                "params": params,
-                "output": str(output_path),
-                "success": True
-            })
-            print(f"    [OK] Generated: {output_path.name}")
-        except subprocess.CalledProcessError as e:
-            print(f"    [ERROR] Failed: {e}")
-            results.append({
-                "preset": preset_name,
-                "params": params,
-                "output": str(output_path),
-                "success": False
-            })
+        if result["success"]:
+            print(f"    [OK] Generated: {Path(result['output_path']).name}")
+        else:
+            print(f"    [ERROR] Failed: {result['error']}")
+    
+    own_engine = engine is None
+    if own_engine:
+        engine = SweepEngine(resolution=resolution, fps=fps)
+    
+    try:
+        if single_pass:
+            styles = [{**job, "name": name} for name, job in zip(preset_names, jobs)]
+            rendered = engine.render_styles(
+                str(audio_segment["path"]),
+                styles,
+                tiled_path=str(output_dir / f"{segment_name}_comparison.mp4"),
+                frame_time=frame_time
+            )
+            outcomes = [{**style, "success": True} for style in rendered["styles"]]
+            for i, outcome in enumerate(outcomes):
+                report_result(i, outcome)
+            print(f"\n  => Comparison: {Path(rendered['tiled_path']).name}")
+        else:
+            outcomes = engine.run(str(audio_segment["path"]), jobs, on_result=report_result)
+    finally:
+        if own_engine:
+            engine.close()
+    
+    for preset_name, job, outcome in zip(preset_names, jobs, outcomes):
+        results.append({
+            "preset": preset_name,
+            "params": presets[preset_name],
+            "output": job["output_path"],
+            "success": outcome["success"]
+        })
     
     return results
 
@@ -310,6 +341,10 @@ def create_comparison_html(exploration_dir, segments_info, results):
 
 def main():
     """Main exploration workflow"""
+    parser = argparse.ArgumentParser(description="Quick CPPN parameter exploration on short audio segments")
+    parser.add_argument("--single-pass", action="store_true",
+                        help="Render all presets of a segment together (adds a tiled comparison video)")
+    args = parser.parse_args()
     
     print("=" * 60)
     print("CPPN Parameter Exploration - Quick Test")
@@ -353,10 +388,13 @@ def main():
     print("\nStep 2: Generating CPPN variations...")
     all_results = []
     
-    for segment in segments:
-        print(f"\nProcessing segment: {segment['name']} ({segment['description']})")
-        results = generate_variations(segment, exploration_dir, quick_mode=True)
-        all_results.extend(results)
+    with SweepEngine(resolution="360p", fps=24) as engine:
+        for segment in segments:
+            print(f"\nProcessing segment: {segment['name']} ({segment['description']})")
+            results = generate_variations(
+                segment, exploration_dir, quick_mode=True, engine=engine, single_pass=args.single_pass
+            )
+            all_results.extend(results)
     
     # Step 3: Create comparison page
     print("\nStep 3: Creating comparison page...")
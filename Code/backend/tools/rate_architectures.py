@@ -80,6 +80,18 @@ def parse_video_filename(filename: str) -> Dict:
         return None
 
 
+def metrics_by_video(metadata: Dict) -> Dict[str, Dict]:
+    """Map video file names to the automatic quality metrics recorded by the sweep."""
+    if not metadata:
+        return {}
+    
+    metrics = {}
+    for result in metadata.get('results', []):
+        if result.get('success') and result.get('metrics') and result.get('output_path'):
+            metrics[Path(result['output_path']).name] = result['metrics']
+    return metrics
+
+
 def get_rating(prompt: str, min_val: int = 1, max_val: int = 5) -> int:
     """Get integer rating from user."""
     while True:
@@ -107,7 +119,7 @@ def get_notes() -> str:
     return notes if notes else None
 
 
-def rate_video(video_path: Path, video_num: int, total_videos: int) -> Dict:
+def rate_video(video_path: Path, video_num: int, total_videos: int, auto_metrics: Dict = None) -> Dict:
     """Rate a single video."""
     print(f"\n{'='*60}")
     print(f"Video {video_num}/{total_videos}: {video_path.name}")
@@ -121,6 +133,13 @@ def rate_video(video_path: Path, video_num: int, total_videos: int) -> Dict:
         print(f"  Hidden dim: {arch_info['hidden_dim']}")
         print(f"  Seed: {arch_info['seed']}")
     
+    if auto_metrics:
+        print(f"\nAutomatic metrics (score {auto_metrics['score']:.3f}):")
+        print(f"  Entropy: {auto_metrics['spatial_entropy']:.2f}, edges: {auto_metrics['edge_density']:.3f}, "
+              f"colors: {auto_metrics['color_diversity']:.2f}")
+        print(f"  Flicker: {auto_metrics['flicker']:.4f}, AV corr (onset/RMS): "
+              f"{auto_metrics['av_onset_corr']:.2f}/{auto_metrics['av_rms_corr']:.2f}")
+    
     # Play video
     print(f"\nOpening video... (close when done watching)")
     play_video(video_path)
@@ -165,6 +184,8 @@ def rate_video(video_path: Path, video_num: int, total_videos: int) -> Dict:
         },
         'notes': notes
     }
+    if auto_metrics:
+        rating['auto_metrics'] = auto_metrics
     
     print(f"\n✅ Rated: Overall {overall:.2f}/5.0")
     
@@ -376,6 +397,12 @@ def main():
         action='store_true',
         help='Resume rating from existing ratings.json'
     )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=None,
+        help='Only rate the N videos with the best automatic quality score'
+    )
     
     args = parser.parse_args()
     
@@ -427,6 +454,16 @@ def main():
     # Filter out already rated videos
     videos_to_rate = [v for v in videos if v.name not in rated_videos]
     
+    # Rank by automatic metrics so the best candidates come first
+    auto_metrics = metrics_by_video(metadata)
+    if auto_metrics:
+        videos_to_rate.sort(key=lambda v: auto_metrics.get(v.name, {}).get('score', -1.0), reverse=True)
+        print(f"📈 Ordered by automatic quality score ({len(auto_metrics)} videos scored)")
+    if args.top is not None:
+        if not auto_metrics:
+            print("Warning: No automatic metrics in metadata.json; --top keeps filename order")
+        videos_to_rate = videos_to_rate[:args.top]
+    
     if not videos_to_rate:
         print("\n✅ All videos already rated!")
         generate_catalog(existing_ratings, exploration_dir)
@@ -445,7 +482,7 @@ def main():
     ratings = existing_ratings.copy()
     
     for i, video_path in enumerate(videos_to_rate, 1):
-        rating = rate_video(video_path, i, len(videos_to_rate))
+        rating = rate_video(video_path, i, len(videos_to_rate), auto_metrics.get(video_path.name))
         
         if rating is None:
             print("\nQuitting...")
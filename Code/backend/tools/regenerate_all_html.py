@@ -1,19 +1,61 @@
 """
 Regenerate comparison HTML for all exploration directories
 Creates fresh HTML files with proper video embedding
+
+Pages are only rebuilt when their inputs (videos, metadata.json, ratings.json)
+or the page template changed since the last run; see build_manifest.py.
+Rebuilds run in parallel.
+
+Usage:
+    python tools/regenerate_all_html.py [--force] [--workers N]
 """
 
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
-def create_html(exploration_dir):
-    """Generate fresh HTML comparison page"""
+from build_manifest import check_outputs, load_manifest, record_build
+
+
+OUTPUT_NAME = "comparison.html"
+
+# Bump whenever the HTML produced by create_html changes
+TEMPLATE_VERSION = "2"
+
+
+def comparison_inputs(exploration_dir):
+    """Files the comparison page depends on"""
+    videos = sorted(exploration_dir.glob("*.mp4"))
+    return videos + [exploration_dir / "metadata.json", exploration_dir / "ratings.json"]
+
+
+def create_html(exploration_dir, force=False):
+    """
+    Generate fresh HTML comparison page if its inputs changed.
+    
+    Returns:
+        'built', 'current' (up to date) or 'skipped' (no videos)
+    """
     
     # Check if directory has video files
     video_files = list(exploration_dir.glob("*.mp4"))
     if not video_files:
         print(f"  [SKIP] No videos in {exploration_dir.name}")
-        return False
+        return 'skipped'
+    
+    manifest = load_manifest(exploration_dir)
+    stale, entry = check_outputs(
+        exploration_dir, [OUTPUT_NAME], comparison_inputs(exploration_dir),
+        TEMPLATE_VERSION, manifest
+    )
+    
+    if not (stale or force):
+        # Refresh stat info (e.g. touched files) so the next run stays hash-free
+        if entry != manifest.get(OUTPUT_NAME):
+            record_build(exploration_dir, OUTPUT_NAME, entry, manifest)
+        return 'current'
     
     print(f"  [GENERATING] {exploration_dir.name}...")
     
@@ -211,17 +253,35 @@ def create_html(exploration_dir):
 """
     
     # Write HTML file
-    output_path = exploration_dir / "comparison.html"
+    output_path = exploration_dir / OUTPUT_NAME
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html)
     
+    record_build(exploration_dir, OUTPUT_NAME, entry, manifest)
+    
     print(f"    [OK] Created {output_path}")
-    return True
+    return 'built'
 
 
 def main():
     """Regenerate HTML for all explorations"""
     
+    parser = argparse.ArgumentParser(
+        description='Regenerate comparison HTML for exploration directories whose inputs changed'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rebuild every page, ignoring the build manifest'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Parallel rebuilds (default: CPU count)'
+    )
+    args = parser.parse_args()
+    
     explorations_dir = Path("explorations")
     
     if not explorations_dir.exists():
@@ -236,14 +296,17 @@ def main():
         return
     
     print(f"\nFound {len(exploration_dirs)} exploration directories")
-    print("Regenerating HTML files with explicit video dimensions...\n")
+    print("Regenerating changed HTML files...\n")
     
-    success_count = 0
-    for exp_dir in sorted(exploration_dirs):
-        if create_html(exp_dir):
-            success_count += 1
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        statuses = list(pool.map(
+            lambda exp_dir: create_html(exp_dir, force=args.force),
+            sorted(exploration_dirs)
+        ))
     
-    print(f"\n[COMPLETE] Regenerated {success_count} HTML files")
+    success_count = statuses.count('built')
+    print(f"\n[COMPLETE] Regenerated {success_count} HTML files "
+          f"({statuses.count('current')} up to date)")
     print("\nOpen any comparison.html in Chrome or Firefox to view results")
     print("If videos still don't show, the codec may need conversion")
 
@@ -2,23 +2,72 @@
 """
 Regenerate exploration report from existing architecture matrix output.
 Useful when the original run generated videos but failed during report creation.
+
+Videos rendered through the sweep store get their recorded quality metrics
+and render times back from it.
+
+Reports are only rebuilt when the videos, ratings.json or the report template
+changed since the last run (see build_manifest.py). Passing a parent such as
+explorations/architecture_matrix checks every run directory below it, in
+parallel.
+
+metadata.json is the run's record, not a build output: reconstructed results
+are merged into it without replacing recorded values (original timestamp,
+metrics, render times), and it is only rewritten from scratch with --force.
 """
 
+import importlib
+import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import List
+
+from build_manifest import check_outputs, load_manifest, record_build
+
+
+REPORT_OUTPUTS = ['EXPLORATION_REPORT.md']
+
+# Bump whenever the report or metadata layout changes
+TEMPLATE_VERSION = '3'
+
+
+def report_inputs(output_dir: Path) -> List[Path]:
+    """Files the report depends on."""
+    return sorted(output_dir.glob('arch_*.mp4')) + [output_dir / 'ratings.json']
+
+
+def find_output_dirs(paths: List[Path]) -> List[Path]:
+    """Expand parent directories into the exploration runs they contain."""
+    output_dirs = []
+    for path in paths:
+        if (path / 'metadata.json').exists() or any(path.glob('arch_*.mp4')):
+            output_dirs.append(path)
+        else:
+            output_dirs.extend(sorted(d for d in path.iterdir() if d.is_dir()))
+    return output_dirs
+
 
-# Import functions from explore_architectures
-from explore_architectures import (
-    generate_exploration_report,
-    calculate_params,
-    ARCHITECTURE_MATRIX
-)
+def stored_results_by_path() -> dict:
+    """Map run video paths to their sweep store entries (metrics, render time)."""
+    from sweep_store import SweepStore
+    
+    by_path = {}
+    for entry in SweepStore().query():
+        for path in entry['links']:
+            by_path[path] = entry
+    return by_path
 
 
-def reconstruct_metadata(output_dir: Path):
+def reconstruct_metadata(output_dir: Path, stored: dict = None):
     """Reconstruct configs and results from output directory."""
+    # Imported here: explore_architectures pulls in torch, which would
+    # dominate the runtime of a pass where nothing needs rebuilding
+    from explore_architectures import calculate_params, ARCHITECTURE_MATRIX
+    
+    stored = stored or {}
     configs = []
     results = []
     
@@ -42,12 +91,23 @@ def reconstruct_metadata(output_dir: Path):
                 
                 if video_path.exists():
                     file_size = video_path.stat().st_size
-                    results.append({
+                    result = {
                         'config': config,
                         'success': True,
                         'file_size': file_size,
                         'output_path': str(video_path)
-                    })
+                    }
+                    
+                    # Recover what the sweep recorded for this video
+                    entry = stored.get(str(video_path.resolve()))
+                    if entry:
+                        result['store_key'] = entry['key']
+                        if entry.get('metrics'):
+                            result['metrics'] = entry['metrics']
+                        if entry.get('render_time') is not None:
+                            result['render_time'] = entry['render_time']
+                    
+                    results.append(result)
                 else:
                     results.append({
                         'config': config,
@@ -60,12 +120,64 @@ def reconstruct_metadata(output_dir: Path):
     return configs, results
 
 
-def save_metadata(configs, results, output_dir: Path):
-    """Save metadata as JSON."""
+def result_key(result: dict) -> tuple:
+    """Identify a result by its configuration."""
+    config = result.get('config', {})
+    return config.get('layers'), config.get('hidden_dim'), config.get('seed')
+
+
+def merge_results(recorded: List[dict], reconstructed: List[dict]) -> List[dict]:
+    """
+    Merge reconstructed results into the recorded ones.
+    
+    Recorded successful results keep every value they have and only gain
+    missing fields; recorded failures are replaced when the video now exists.
+    
+    Args:
+        recorded: Results from the existing metadata.json
+        reconstructed: Results from reconstruct_metadata()
+    
+    Returns:
+        Merged results (recorded order, new configurations appended)
+    """
+    rebuilt = {result_key(result): result for result in reconstructed}
+    merged = []
+    for result in recorded:
+        new = rebuilt.pop(result_key(result), None)
+        if new is None:
+            merged.append(result)
+        elif result.get('success'):
+            merged.append({**new, **result})
+        else:
+            merged.append(new if new['success'] else result)
+    
+    merged.extend(rebuilt.values())
+    return merged
+
+
+def load_metadata(output_dir: Path) -> dict:
+    """Existing metadata.json of a run ({} if missing or unreadable)."""
+    metadata_path = output_dir / 'metadata.json'
+    if not metadata_path.exists():
+        return {}
+    try:
+        with open(metadata_path) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Warning: Could not read {metadata_path}: {e}")
+        return {}
+
+
+def save_metadata(configs, results, output_dir: Path, recorded: dict = None):
+    """Save metadata as JSON, keeping the recorded timestamp and matrix."""
+    from explore_architectures import ARCHITECTURE_MATRIX
+    
+    recorded = recorded or {}
     metadata = {
-        'timestamp': datetime.now().isoformat(),
-        'matrix': ARCHITECTURE_MATRIX,
-        'total_configs': len(configs),
+        **recorded,
+        'timestamp': recorded.get('timestamp', datetime.now().isoformat()),
+        'matrix': recorded.get('matrix', ARCHITECTURE_MATRIX),
+        'total_configs': max(len(configs), recorded.get('total_configs', 0)),
         'results': results
     }
     
@@ -76,23 +188,19 @@ def save_metadata(configs, results, output_dir: Path):
     print(f"Metadata saved to: {metadata_path}")
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python regenerate_report.py <output_directory>")
-        print("\nExample:")
-        print("  python regenerate_report.py ../explorations/architecture_matrix/20251015_213644")
-        sys.exit(1)
-    
-    output_dir = Path(sys.argv[1])
-    
-    if not output_dir.exists():
-        print(f"Error: Directory not found: {output_dir}")
-        sys.exit(1)
+def regenerate(output_dir: Path, entry: dict, manifest: dict, stored: dict = None,
+               force: bool = False) -> Path:
+    """Rebuild the report for one exploration run and merge its metadata (force: rewrite it)."""
+    from explore_architectures import generate_exploration_report
     
     print(f"\nRegenerating report for: {output_dir}")
     
-    # Reconstruct metadata from files
-    configs, results = reconstruct_metadata(output_dir)
+    # Reconstruct metadata from files (and the sweep store, when available),
+    # keeping what the run itself recorded
+    configs, results = reconstruct_metadata(output_dir, stored)
+    recorded = {} if force else load_metadata(output_dir)
+    if recorded.get('results'):
+        results = merge_results(recorded['results'], results)
     
     successful = sum(1 for r in results if r['success'])
     failed = len(results) - successful
@@ -100,22 +208,71 @@ def main():
     print(f"   Found: {successful} successful, {failed} failed")
     
     # Generate report
-    print(f"\nGenerating exploration report...")
     report_path = generate_exploration_report(configs, results, output_dir)
     
     # Save metadata
-    save_metadata(configs, results, output_dir)
+    save_metadata(configs, results, output_dir, recorded)
+    
+    record_build(output_dir, REPORT_OUTPUTS[0], entry, manifest)
+    return report_path
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != '--force']
+    force = len(args) != len(sys.argv) - 1
+    
+    if not args:
+        print("Usage: python regenerate_report.py [--force] <output_directory> [...]")
+        print("\nExample:")
+        print("  python regenerate_report.py ../explorations/architecture_matrix/20251015_213644")
+        print("  python regenerate_report.py ../explorations/architecture_matrix")
+        sys.exit(1)
+    
+    paths = [Path(arg) for arg in args]
+    for path in paths:
+        if not path.exists():
+            print(f"Error: Directory not found: {path}")
+            sys.exit(1)
+    
+    output_dirs = find_output_dirs(paths)
+    
+    # Check every run against its manifest; this stays stat()-only when
+    # nothing changed
+    def check(output_dir):
+        manifest = load_manifest(output_dir)
+        stale, entry = check_outputs(
+            output_dir, REPORT_OUTPUTS, report_inputs(output_dir),
+            TEMPLATE_VERSION, manifest
+        )
+        if not (stale or force) and entry != manifest.get(REPORT_OUTPUTS[0]):
+            record_build(output_dir, REPORT_OUTPUTS[0], entry, manifest)
+        return output_dir, stale or force, entry, manifest
+    
+    workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        checks = list(pool.map(check, output_dirs))
+        stale = [(d, entry, manifest) for d, is_stale, entry, manifest in checks if is_stale]
+        
+        stored = {}
+        if stale:
+            # Import once up front: the workers' function-level imports of
+            # explore_architectures (and torch) would otherwise race
+            importlib.import_module('explore_architectures')
+            stored = stored_results_by_path()
+        
+        report_paths = list(pool.map(lambda job: regenerate(*job, stored, force=force), stale))
     
     # Summary
     print(f"\n{'='*60}")
     print(f"Report regeneration complete!")
     print(f"{'='*60}")
-    print(f"Output: {output_dir}")
-    print(f"Report: {report_path}")
+    print(f"Checked: {len(output_dirs)} | Rebuilt: {len(report_paths)} | "
+          f"Up to date: {len(output_dirs) - len(report_paths)}")
+    for report_path in report_paths:
+        print(f"Report: {report_path}")
     print(f"\nNext: Review videos and run rate_architectures.py")
     print(f"{'='*60}\n")
 
 
 if __name__ == '__main__':
     main()
-
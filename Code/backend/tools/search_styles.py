@@ -0,0 +1,522 @@
+"""
+Style Search - Sample-efficient search over CPPN parameter space
+
+Instead of rendering a full grid (ARCHITECTURE_MATRIX / PRESETS), candidates
+are scored on cheap renders and only the best are promoted:
+
+1. Successive halving: every candidate is rendered at the first (small,
+   short) rung and scored with the automatic quality metrics
+   (frame_metrics.py) or, where available, manual ratings from
+   rate_architectures.py. The best 1/eta move to the next, more expensive
+   rung, until the survivors get full renders.
+2. Between rounds, new candidates are proposed by a Tree-structured Parzen
+   Estimator: configs that look like the best-scoring ones so far, and
+   unlike the worst, are preferred over uniform random draws.
+
+All renders go through the sweep store, so repeating a search (or extending
+it with more rounds) never re-renders a (config, rung) pair.
+
+Usage:
+    python search_styles.py --audio song.mp3
+    python search_styles.py --audio song.mp3 --rounds 3 --candidates 27 --eta 3
+    python search_styles.py --audio song.mp3 --ratings ../explorations/architecture_matrix/RUN/ratings.json
+    python search_styles.py --audio song.mp3 --check-cache    # repeated rungs must not re-render
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sweep_engine import DEFAULT_CONFIG, SweepEngine
+from sweep_store import DEFAULT_STORE, SweepStore
+
+
+# Parameter space: categorical lists or (low, high, 'log') ranges
+SEARCH_SPACE = {
+    'layers': [2, 3, 4, 5],
+    'hidden_dim': [4, 6, 8, 16, 32],
+    'audio_scale': (0.02, 0.3, 'log'),
+    'evolve': [0.0, 0.001, 0.003, 0.005]
+}
+
+# Seeds are drawn from this range; a seed is part of the style, so TPE
+# keeps the parent's seed as often as it keeps a categorical value
+SEED_RANGE = (0, 9999)
+TPE_KEEP = 0.7
+
+# Cost ladder: early rungs are cheap, the last one is the real render
+RUNGS = [
+    {'resolution': '360p', 'fps': 12, 'duration': 4},
+    {'resolution': '360p', 'fps': 24, 'duration': 8},
+    {'resolution': '480p', 'fps': 24, 'duration': None}  # None: --duration
+]
+
+# TPE settings: share of observations treated as "good", and draws per proposal
+TPE_GAMMA = 0.25
+TPE_DRAWS = 24
+
+
+# Audio scale / evolution suffix of config_label() in search video names
+LABEL_PATTERN = re.compile(r'_a[0-9.]+_e[0-9.e-]+$')
+
+
+def config_label(config: Dict) -> str:
+    """Short human-readable config label (also used in file names)."""
+    return (f"{config['layers']}L_{config['hidden_dim']}D_seed{config['seed']}"
+            f"_a{config['audio_scale']:.3f}_e{config['evolve']:g}")
+
+
+def sample_random(rng: random.Random) -> Dict:
+    """Draw one config uniformly from SEARCH_SPACE."""
+    config = {}
+    for name, space in SEARCH_SPACE.items():
+        if isinstance(space, list):
+            config[name] = rng.choice(space)
+        else:
+            low, high, _ = space
+            config[name] = round(math.exp(rng.uniform(math.log(low), math.log(high))), 4)
+    config['seed'] = rng.randint(*SEED_RANGE)
+    return config
+
+
+def _density(config: Dict, observations: List[Dict]) -> float:
+    """Parzen density of a config under a set of observed configs."""
+    density = 1.0
+    for name, space in SEARCH_SPACE.items():
+        if isinstance(space, list):
+            # Categorical: smoothed frequency
+            count = sum(1 for obs in observations if obs[name] == config[name])
+            density *= (count + 1) / (len(observations) + len(space))
+        else:
+            # Continuous: Gaussian kernels in log space
+            low, high, _ = space
+            bandwidth = (math.log(high) - math.log(low)) / max(2.0, math.sqrt(len(observations)))
+            x = math.log(config[name])
+            kernel = sum(
+                math.exp(-0.5 * ((x - math.log(obs[name])) / bandwidth) ** 2)
+                for obs in observations
+            )
+            density *= (kernel + 1e-3) / (len(observations) * bandwidth)
+    return density
+
+
+def propose_tpe(history: List[Tuple[Dict, float]], rng: random.Random) -> Dict:
+    """
+    Propose a config with a Tree-structured Parzen Estimator.
+    
+    Args:
+        history: (config, score) pairs observed at the first rung
+        rng: Random generator
+    
+    Returns:
+        Config maximizing l(x) / g(x) among TPE_DRAWS candidates drawn
+        around the good observations
+    """
+    ranked = sorted(history, key=lambda item: item[1], reverse=True)
+    num_good = max(1, int(math.ceil(TPE_GAMMA * len(ranked))))
+    good = [config for config, _ in ranked[:num_good]]
+    bad = [config for config, _ in ranked[num_good:]] or good
+    
+    best, best_ratio = None, -1.0
+    for _ in range(TPE_DRAWS):
+        # Perturb a good config: keep each categorical value (and the seed)
+        # with p=TPE_KEEP, jitter continuous values in log space
+        base = rng.choice(good)
+        candidate = sample_random(rng)
+        if rng.random() < TPE_KEEP:
+            candidate['seed'] = base['seed']
+        for name, space in SEARCH_SPACE.items():
+            if isinstance(space, list):
+                if rng.random() < TPE_KEEP:
+                    candidate[name] = base[name]
+            else:
+                low, high, _ = space
+                x = math.log(base[name]) + rng.gauss(0.0, 0.25)
+                candidate[name] = round(math.exp(min(math.log(high), max(math.log(low), x))), 4)
+        
+        ratio = _density(candidate, good) / _density(candidate, bad)
+        if ratio > best_ratio:
+            best, best_ratio = candidate, ratio
+    
+    return best
+
+
+def load_ratings(paths: List[str]) -> Dict[str, float]:
+    """
+    Load manual ratings (rate_architectures.py) as scores in [0, 1].
+    
+    Ratings of search renders (arch_<config_label>.mp4) apply to exactly that
+    config; ratings of architecture matrix videos (arch_2L_32D_seed42.mp4)
+    to the DEFAULT_CONFIG audio scale and evolution they were rendered with.
+    
+    Args:
+        paths: ratings.json files
+    
+    Returns:
+        Dict mapping config_label() to overall rating / 5
+    """
+    ratings = {}
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read ratings {path}: {e}")
+            continue
+        
+        for rating in data.get('ratings', []):
+            arch = rating.get('architecture')
+            if not arch:
+                continue
+            stem = Path(rating.get('video', '')).stem
+            if LABEL_PATTERN.search(stem):
+                key = stem[len('arch_'):]
+            else:
+                key = config_label({**DEFAULT_CONFIG, **arch})
+            ratings[key] = rating['ratings']['overall'] / 5.0
+    return ratings
+
+
+def score_result(result: Dict, ratings: Dict[str, float]) -> float:
+    """Score a render: failures first, then a manual rating when one exists, else the automatic score."""
+    if not result['success']:
+        return -1.0
+    rated = ratings.get(config_label(result['config']))
+    if rated is not None:
+        return rated
+    return (result.get('metrics') or {}).get('score', 0.0)
+
+
+class StyleSearch:
+    """Successive-halving search with TPE proposals between rounds."""
+    
+    def __init__(
+        self,
+        audio_path: str,
+        output_dir: Path,
+        duration: float,
+        eta: int = 3,
+        workers: Optional[int] = None,
+        store: Optional[SweepStore] = None,
+        ratings: Optional[Dict] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize search.
+        
+        Args:
+            audio_path: Audio file to render against
+            output_dir: Directory for rung renders and the search log
+            duration: Seconds of audio for the final rung
+            eta: Keep the best 1/eta candidates at every rung
+            workers: Render processes per rung engine
+            store: Sweep store used to skip repeated renders
+            ratings: Manual ratings from load_ratings()
+            seed: Seed of the proposal random generator
+        """
+        self.audio_path = audio_path
+        self.output_dir = output_dir
+        self.duration = duration
+        self.eta = eta
+        self.workers = workers
+        self.store = store
+        self.ratings = ratings or {}
+        self.rng = random.Random(seed)
+        
+        self.history: List[Tuple[Dict, float]] = []  # first-rung observations
+        self.evaluations: List[Dict] = []
+        self.finalists: List[Dict] = []
+        self.renders = 0
+        self.cached = 0
+    
+    def propose(self, count: int) -> List[Dict]:
+        """Propose new candidates (random until there is history to model)."""
+        seen = {config_label(config) for config, _ in self.history}
+        candidates = []
+        while len(candidates) < count:
+            if len(self.history) >= 2 * len(SEARCH_SPACE):
+                config = propose_tpe(self.history, self.rng)
+            else:
+                config = sample_random(self.rng)
+            label = config_label(config)
+            if label not in seen:
+                seen.add(label)
+                candidates.append(config)
+        return candidates
+    
+    def evaluate(self, rung_index: int, candidates: List[Dict]) -> List[Tuple[Dict, float]]:
+        """
+        Render and score candidates at one rung.
+        
+        Args:
+            rung_index: Index into RUNGS
+            candidates: Configs to evaluate
+        
+        Returns:
+            (config, score) pairs, best first
+        """
+        rung = RUNGS[rung_index]
+        duration = rung['duration'] or self.duration
+        final = rung_index == len(RUNGS) - 1
+        rung_dir = self.output_dir / ('final' if final else f"rung{rung_index}")
+        rung_dir.mkdir(parents=True, exist_ok=True)
+        
+        jobs = []
+        for config in candidates:
+            # arch_ prefix: file names parse in rate_architectures.py
+            job = {**config, 'output_path': str(rung_dir / f"arch_{config_label(config)}.mp4")}
+            if final:
+                job['frame_time'] = min(5.0, duration / 2)
+                job['text_overlay'] = (f"{config['layers']}L × {config['hidden_dim']}D | Seed {config['seed']} | "
+                                       f"audio {config['audio_scale']:.3f} | evolve {config['evolve']:g}")
+            jobs.append(job)
+        
+        print(f"\nRung {rung_index}: {len(jobs)} candidate(s) at {rung['resolution']} / "
+              f"{rung['fps']} FPS / {duration}s")
+        
+        with SweepEngine(resolution=rung['resolution'], fps=rung['fps'],
+                         workers=self.workers, store=self.store) as engine:
+            results = engine.run(self.audio_path, jobs, duration=duration, mux_audio=final)
+        
+        scored = []
+        for config, result in zip(candidates, results):
+            score = score_result({**result, 'config': config}, self.ratings)
+            scored.append((config, score))
+            
+            if result.get('cached'):
+                self.cached += 1
+            else:
+                self.renders += 1
+            
+            self.evaluations.append({
+                'rung': rung_index,
+                'config': config,
+                'score': score,
+                'success': result['success'],
+                'metrics': result.get('metrics'),
+                'output_path': result.get('output_path'),
+                'error': result.get('error')
+            })
+            status = f"{score:.3f}" if result['success'] else f"failed ({result.get('error')})"
+            print(f"  {config_label(config)}: {status}")
+        
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored
+    
+    def run_round(self, num_candidates: int) -> List[Tuple[Dict, float]]:
+        """
+        Run one successive-halving bracket.
+        
+        Args:
+            num_candidates: Candidates sampled for the first rung
+        
+        Returns:
+            Final-rung (config, score) pairs, best first
+        """
+        candidates = self.propose(num_candidates)
+        
+        scored = []
+        for rung_index in range(len(RUNGS)):
+            scored = self.evaluate(rung_index, candidates)
+            if rung_index == 0:
+                self.history.extend(scored)
+            if rung_index < len(RUNGS) - 1:
+                keep = max(1, len(scored) // self.eta)
+                candidates = [config for config, score in scored[:keep] if score >= 0]
+                if not candidates:
+                    print("Warning: No candidate rendered successfully; stopping this round")
+                    return []
+        
+        self.finalists.extend(scored)
+        return scored
+    
+    def save(self, grid_size: int) -> Path:
+        """Write the search log and a markdown summary."""
+        ranked = sorted(self.finalists, key=lambda item: item[1], reverse=True)
+        
+        log = {
+            'timestamp': datetime.now().isoformat(),
+            'audio': str(self.audio_path),
+            'search_space': {k: list(v) if isinstance(v, (list, tuple)) else v for k, v in SEARCH_SPACE.items()},
+            'rungs': RUNGS,
+            'eta': self.eta,
+            'renders': self.renders,
+            'cached': self.cached,
+            'evaluations': self.evaluations,
+            'ranking': [{'config': config, 'score': score} for config, score in ranked]
+        }
+        with open(self.output_dir / 'search_log.json', 'w') as f:
+            json.dump(log, f, indent=2)
+        
+        report = f"""# Style Search Report
+
+**Date:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+**Audio:** `{Path(self.audio_path).name}`
+**Renders:** {self.renders} new, {self.cached} reused from the sweep store
+**Full renders:** {len(self.finalists)} (a grid over the same space with one seed per cell needs {grid_size:,})
+
+---
+
+## Finalists
+
+| Rank | Layers | Hidden Dim | Seed | Audio Scale | Evolve | Score |
+|------|--------|------------|------|-------------|--------|-------|
+"""
+        for rank, (config, score) in enumerate(ranked, 1):
+            report += (f"| {rank} | {config['layers']} | {config['hidden_dim']} | {config['seed']} | "
+                       f"{config['audio_scale']:.3f} | {config['evolve']:g} | {score:.3f} |\n")
+        
+        report += """
+---
+
+Videos and representative frames of the finalists are in `final/`.
+Review them, then rate with `python rate_architectures.py <this directory>/final`
+and pass the ratings back with `--ratings` to steer the next search.
+"""
+        report_path = self.output_dir / 'SEARCH_REPORT.md'
+        report_path.write_text(report, encoding='utf-8')
+        
+        # metadata.json in the layout rate_architectures.py reads
+        final_results = [e for e in self.evaluations if e['rung'] == len(RUNGS) - 1]
+        if final_results:
+            metadata = {
+                'timestamp': log['timestamp'],
+                'matrix': {
+                    'layers': sorted({e['config']['layers'] for e in final_results}),
+                    'hidden_dims': sorted({e['config']['hidden_dim'] for e in final_results}),
+                    'seeds': sorted({e['config']['seed'] for e in final_results})
+                },
+                'total_configs': len(final_results),
+                'results': final_results
+            }
+            with open(self.output_dir / 'final' / 'metadata.json', 'w') as f:
+                json.dump(metadata, f, indent=2)
+        
+        return report_path
+
+
+def grid_size(continuous_steps: int = 5) -> int:
+    """Number of cells in a grid over SEARCH_SPACE (continuous axes at N steps)."""
+    size = 1
+    for space in SEARCH_SPACE.values():
+        size *= len(space) if isinstance(space, list) else continuous_steps
+    return size
+
+
+def check_cache(audio_path: str, workers: Optional[int] = None, num_candidates: int = 2) -> bool:
+    """
+    Check that repeating a rung reuses every render from the sweep store.
+    
+    Evaluates the same candidates twice at the first (silent) rung against a
+    temporary store.
+    
+    Args:
+        audio_path: Audio file to render against
+        workers: Render processes
+        num_candidates: Candidates to evaluate
+    
+    Returns:
+        True if the second evaluation rendered nothing
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        search = StyleSearch(
+            audio_path,
+            tmp_dir / 'search',
+            duration=RUNGS[0]['duration'],
+            workers=workers,
+            store=SweepStore(tmp_dir / 'store'),
+            seed=0
+        )
+        candidates = search.propose(num_candidates)
+        
+        search.evaluate(0, candidates)
+        first_renders = search.renders
+        search.evaluate(0, candidates)
+        repeated = search.renders - first_renders
+    
+    print(f"\nCache check: {first_renders} render(s), then {repeated} on the repeated rung")
+    return repeated == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Search CPPN parameter space with successive halving and TPE proposals'
+    )
+    parser.add_argument('--audio', type=str, required=True, help='Path to audio file')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of audio for final renders (default: 10)')
+    parser.add_argument('--rounds', type=int, default=2, help='Successive-halving brackets (default: 2)')
+    parser.add_argument('--candidates', type=int, default=27, help='Candidates per bracket (default: 27)')
+    parser.add_argument('--eta', type=int, default=3, help='Keep 1/eta of candidates per rung (default: 3)')
+    parser.add_argument('--ratings', type=str, nargs='*', default=[], help='ratings.json files to score by')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel render processes')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the proposal sampler')
+    parser.add_argument('--store', type=str, default=str(DEFAULT_STORE), help='Sweep store directory')
+    parser.add_argument('--no-store', action='store_true', help='Do not reuse or record renders')
+    parser.add_argument('--check-cache', action='store_true',
+                        help='Only check that a repeated rung is served from the store, then exit')
+    
+    args = parser.parse_args()
+    
+    if not Path(args.audio).exists():
+        print(f"Error: Audio file not found: {args.audio}")
+        sys.exit(1)
+    
+    if args.check_cache:
+        if check_cache(args.audio, workers=args.workers):
+            print("[OK] Repeated rung served from the sweep store")
+            sys.exit(0)
+        print("Error: Repeated rung was re-rendered")
+        sys.exit(1)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(__file__).parent.parent / 'explorations' / 'style_search' / timestamp
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    search = StyleSearch(
+        args.audio,
+        output_dir,
+        duration=args.duration,
+        eta=args.eta,
+        workers=args.workers,
+        store=None if args.no_store else SweepStore(args.store),
+        ratings=load_ratings(args.ratings),
+        seed=args.seed
+    )
+    
+    print("Style Search")
+    print(f"Output directory: {output_dir}")
+    print(f"Rounds: {args.rounds} × {args.candidates} candidates, eta={args.eta}")
+    
+    for round_index in range(args.rounds):
+        print(f"\n{'='*60}")
+        print(f"Round {round_index + 1}/{args.rounds}")
+        print(f"{'='*60}")
+        search.run_round(args.candidates)
+    
+    report_path = search.save(grid_size())
+    
+    ranked = sorted(search.finalists, key=lambda item: item[1], reverse=True)
+    print(f"\n{'='*60}")
+    print("Search Complete!")
+    print(f"{'='*60}")
+    print(f"Renders: {search.renders} new, {search.cached} reused")
+    if ranked:
+        config, score = ranked[0]
+        print(f"Best: {config_label(config)} (score {score:.3f})")
+    print(f"Report: {report_path}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == '__main__':
+    main()
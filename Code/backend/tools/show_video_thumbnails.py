@@ -2,6 +2,9 @@
 """
 Show video thumbnails instead of embedded videos
 Much more reliable than HTML video embedding
+
+Thumbnails are the `<video>_frame.png` stills the sweep engine renders
+alongside each video, so no video has to be decoded to build the page.
 """
 
 import os
@@ -32,7 +35,9 @@ def create_thumbnail_html(exploration_dir):
             segment, preset = name.split('_', 1)
             if segment not in segments:
                 segments[segment] = []
-            segments[segment].append((preset, video.name))
+            # Stills rendered by the sweep engine sit next to each video
+            frame = video.with_name(f"{video.stem}_frame.png")
+            segments[segment].append((preset, video.name, frame.name if frame.exists() else None))
     
     # Preset descriptions
     preset_descriptions = {
@@ -159,16 +164,23 @@ def create_thumbnail_html(exploration_dir):
         <div class="video-grid">
 '''
         
-        for preset, video_file in videos_list:
+        for preset, video_file, frame_file in videos_list:
             desc = preset_descriptions.get(preset, preset)
             params = preset_params.get(preset, 'Unknown parameters')
             
+            if frame_file:
+                thumbnail = f'''<img class="thumbnail" src="{frame_file}" alt="{preset} video thumbnail" 
+                     onclick="window.open('{video_file}', '_blank')">'''
+            else:
+                # No rendered still: let the browser show the first frame
+                thumbnail = f'''<video class="thumbnail" src="{video_file}" preload="metadata" muted
+                     onclick="window.open('{video_file}', '_blank')"></video>'''
+            
             html += f'''
             <div class="video-card">
                 <h3>{preset.title()}</h3>
                 <p class="description">{desc}</p>
-                <img class="thumbnail" src="{video_file}" alt="{preset} video thumbnail" 
-                     onclick="window.open('{video_file}', '_blank')">
+                {thumbnail}
                 <a href="{video_file}" class="download-link" download>
                     Download Video
                 </a>
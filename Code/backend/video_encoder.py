@@ -14,7 +14,7 @@ import shutil
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
@@ -273,6 +273,77 @@ class VideoEncoder:
         print(f"[OK] Exported {len(frames)} frames to {frames_dir}")
 
 
+def encode_streams(
+    frame_groups: Iterable[Sequence[np.ndarray]],
+    output_paths: List[str],
+    fps: int = 30,
+    audio_path: Optional[str] = None,
+    num_frames: Optional[int] = None,
+    codec: str = 'mp4v'
+) -> List[Path]:
+    """
+    Encode several videos from one frame stream in a single pass.
+    
+    Each item of `frame_groups` holds the current frame of every output
+    (e.g. the (members, H, W, 3) stack an ensemble Renderer yields, or a
+    list that also carries a tiled comparison frame), so frames never have
+    to be buffered per video. Outputs may differ in size.
+    
+    Args:
+        frame_groups: Iterable of per-output frames, one entry per output path
+        output_paths: Output video file paths
+        fps: Frames per second
+        audio_path: Path to original audio file (muxed into every video)
+        num_frames: Optional count for progress display
+        codec: Video codec ('mp4v' or 'avc1')
+    
+    Returns:
+        Paths to the generated video files
+    """
+    encoders = [VideoEncoder(path, fps=fps, codec=codec) for path in output_paths]
+    temp_paths = [encoder.output_path.with_suffix('.temp.mp4') for encoder in encoders]
+    writers = []
+    frame_count = 0
+    progress = tqdm(total=num_frames, desc=f"Encoding {len(encoders)} videos")
+    
+    try:
+        for group in frame_groups:
+            if not writers:
+                fourcc = cv2.VideoWriter_fourcc(*codec)
+                for temp_path, frame in zip(temp_paths, group):
+                    height, width = frame.shape[:2]
+                    writer = cv2.VideoWriter(str(temp_path), fourcc, fps, (width, height))
+                    if not writer.isOpened():
+                        raise RuntimeError(f"Failed to open video writer for {temp_path}")
+                    writers.append(writer)
+            
+            for encoder, writer, frame in zip(encoders, writers, group):
+                encoder._write_frame(writer, frame, frame_count, None)
+            frame_count += 1
+            progress.update(1)
+    finally:
+        progress.close()
+        for writer in writers:
+            writer.release()
+    
+    if not writers:
+        raise ValueError("No frames to encode")
+    
+    final_videos = []
+    for encoder, temp_path in zip(encoders, temp_paths):
+        if audio_path:
+            final_video = encoder._mux_audio(temp_path, audio_path)
+            if temp_path.exists():
+                temp_path.unlink()
+        else:
+            shutil.move(str(temp_path), str(encoder.output_path))
+            final_video = encoder.output_path
+        final_videos.append(final_video)
+    
+    print(f"[OK] {len(final_videos)} videos saved ({frame_count} frames each)")
+    return final_videos
+
+
 if __name__ == '__main__':
     # Test video encoder
     print("Testing VideoEncoder...")